@@ -1,16 +1,20 @@
 from pathlib import Path as PathLib
-from typing import Any, Dict, List, Optional, Sequence, Tuple
+from contextlib import contextmanager
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Sequence, Tuple
+import asyncio
+import json
+import os
 import re
 from datetime import datetime
 
 import duckdb
-import joblib
 import numpy as np
 import pandas as pd
-from fastapi import FastAPI, HTTPException, Query, Path
+from fastapi import BackgroundTasks, FastAPI, HTTPException, Query, Path, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, StreamingResponse
 from pydantic import BaseModel
+from starlette.concurrency import run_in_threadpool
 import glob
 
 try:
@@ -18,11 +22,39 @@ try:
 except ImportError:
     fastf1 = None
 
-DB_PATH = PathLib(__file__).resolve().parent.parent / "warehouse" / "f1_openf1.duckdb"
+try:
+    from .compact_forest import SUFFIX as COMPACT_FOREST_SUFFIX, load_forest
+    from .db_pool import ConnectionPool
+    from .model_registry import ModelRegistry, preload_names
+    from .response_cache import ResponseCache
+    from . import position_store
+    from . import race_win_scenarios
+    from . import telemetry_store
+except ImportError:
+    # When running from within the api directory (uvicorn main:app)
+    from compact_forest import SUFFIX as COMPACT_FOREST_SUFFIX, load_forest  # type: ignore
+    from db_pool import ConnectionPool  # type: ignore
+    from model_registry import ModelRegistry, preload_names  # type: ignore
+    from response_cache import ResponseCache  # type: ignore
+    import position_store  # type: ignore
+    import race_win_scenarios  # type: ignore
+    import telemetry_store  # type: ignore
+
+DB_PATH = PathLib(
+    os.getenv("F1_API_WAREHOUSE") or str(PathLib(__file__).resolve().parent.parent / "warehouse" / "f1_openf1.duckdb")
+)
 FASTF1_CACHE = PathLib(__file__).resolve().parent.parent / ".fastf1cache"
 FASTF1_CACHE_DIR = PathLib(__file__).resolve().parent.parent / "fastf1_cache"
-BRONZE_DIR = PathLib(__file__).resolve().parent.parent / "bronze"
-ML_ARTIFACTS_DIR = PathLib(__file__).resolve().parent.parent / "ml_artifacts"
+BRONZE_DIR = PathLib(os.getenv("F1_API_BRONZE") or str(PathLib(__file__).resolve().parent.parent / "bronze"))
+# Written to the bronze root by the ingestor while meta.bronze_files lags behind the files
+CATALOG_PENDING_FILE = "_catalog_pending.json"
+TELEMETRY_STORE_DIR = PathLib(
+    os.getenv("F1_TELEMETRY_STORE") or str(PathLib(__file__).resolve().parent.parent / "bronze_fastf1")
+)
+POSITION_STORE_DIR = PathLib(os.getenv("F1_POSITION_STORE") or str(TELEMETRY_STORE_DIR / "position"))
+ML_ARTIFACTS_DIR = PathLib(
+    os.getenv("F1_API_ML_ARTIFACTS") or str(PathLib(__file__).resolve().parent.parent / "ml_artifacts")
+)
 RACE_WIN_MODEL_PATH = ML_ARTIFACTS_DIR / "race_win_full.joblib"
 RACE_WIN_META_PATH = ML_ARTIFACTS_DIR / "race_win_full.json"
 RF_POSITION_MODEL_PATH = ML_ARTIFACTS_DIR / "rf_position_model.joblib"
@@ -36,49 +68,79 @@ app = FastAPI(
     description="Read-only API for OpenF1 race win predictions backed by DuckDB",
 )
 
-# Add CORS middleware
+# Read endpoints whose payload only changes when the warehouse (or bronze catalog) is rebuilt.
+response_cache = ResponseCache(
+    DB_PATH,
+    routes=[
+        r"^/api/standings/(drivers|teams|constructors)$",
+        r"^/api/season/\d+/driver_pace$",
+        r"^/api/meta/(seasons|races)$",
+        r"^/api/predictions/race_win/summary$",
+    ],
+    max_entries=int(os.getenv("F1_API_CACHE_SIZE", "512")),
+    disk_dir=PathLib(os.environ["F1_API_CACHE_DIR"]) if os.getenv("F1_API_CACHE_DIR") else None,
+)
+
+
+@app.middleware("http")
+async def cache_read_endpoints(request: Request, call_next):
+    return await response_cache.handle(request, call_next)
+
+
+# Add CORS middleware (registered last so it wraps cached and 304 responses too)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],  # In production, specify actual origins
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag"],
+)
+
+
+# Idle handles are closed so build scripts can open the warehouse read-write.
+warehouse_pool = ConnectionPool(DB_PATH, name="warehouse", idle_ttl_s=float(os.getenv("F1_API_DB_IDLE_TTL") or 2))
+bronze_pool = ConnectionPool(None, name="bronze")
+# Forests exported by scripts/export_compact_forest.py are served from their memory-mapped
+# .forest file instead of the pickled sklearn model (F1_COMPACT_MODELS=0 disables this).
+model_registry = ModelRegistry(
+    ML_ARTIFACTS_DIR,
+    check_interval_s=float(os.getenv("F1_MODEL_CHECK_INTERVAL") or "5"),
+    compiled_suffix=COMPACT_FOREST_SUFFIX,
+    compiled_loader=load_forest if os.getenv("F1_COMPACT_MODELS", "1") != "0" else None,
 )
 
 
-def connect_ro() -> duckdb.DuckDBPyConnection:
-    """Create a read-only DuckDB connection to the warehouse."""
+@app.on_event("startup")
+def preload_models() -> None:
+    """Warm the scenario models so the first request does not pay for joblib.load."""
+    names = preload_names(
+        os.getenv("F1_MODEL_PRELOAD"), [RACE_WIN_MODEL_PATH.stem, RF_POSITION_MODEL_PATH.stem], model_registry
+    )
+    model_registry.preload(names)
+
+
+@contextmanager
+def connect_ro() -> Iterator[duckdb.DuckDBPyConnection]:
+    """Check out a pooled read-only cursor on the warehouse."""
     if not DB_PATH.exists():
         raise HTTPException(status_code=500, detail=f"Warehouse not found at {DB_PATH}")
-    try:
-        return duckdb.connect(str(DB_PATH), read_only=True)
-    except TypeError:
-        # Fallback for duckdb versions without read_only arg
-        return duckdb.connect(str(DB_PATH))
+    with warehouse_pool.cursor() as con:
+        yield con
 
 
 def fetch_fastf1(sql: str, params: Sequence[Any] | None = None) -> List[Dict[str, Any]]:
     """Execute a DuckDB query against the warehouse (fastf1 tables)."""
-    params = params or []
-    con = connect_ro()
-    try:
-        cur = con.execute(sql, params)
-        cols = [c[0] for c in cur.description]
-        return [dict(zip(cols, row)) for row in cur.fetchall()]
-    finally:
-        con.close()
+    return fetch_rows(sql, params)
 
 
 def fetch_rows(sql: str, params: Sequence[Any] | None = None) -> List[Dict[str, Any]]:
     """Execute a query and return rows as list of dicts."""
     params = params or []
-    con = connect_ro()
-    try:
+    with connect_ro() as con:
         cur = con.execute(sql, params)
         columns = [col[0] for col in cur.description]
         return [dict(zip(columns, row)) for row in cur.fetchall()]
-    finally:
-        con.close()
 
 
 def read_bronze(sql: str, params: Sequence[Any] | None = None) -> List[Dict[str, Any]]:
@@ -86,15 +148,78 @@ def read_bronze(sql: str, params: Sequence[Any] | None = None) -> List[Dict[str,
     params = params or []
     if not BRONZE_DIR.exists():
         raise HTTPException(status_code=500, detail=f"Bronze directory not found at {BRONZE_DIR}")
-    con = duckdb.connect(":memory:")
+    with bronze_pool.cursor() as con:
+        try:
+            cur = con.execute(sql, params)
+            cols = [c[0] for c in cur.description]
+            return [dict(zip(cols, row)) for row in cur.fetchall()]
+        except duckdb.Error as exc:  # type: ignore[attr-defined]
+            raise HTTPException(status_code=500, detail=str(exc))
+
+
+def _glob_bronze_files(
+    table: str,
+    season: Optional[int] = None,
+    round: Optional[int] = None,
+    session: Optional[str] = None,
+) -> List[str]:
+    pattern = (
+        BRONZE_DIR
+        / table
+        / (f"season={season}" if season is not None else "season=*")
+        / (f"round={round:02d}" if round is not None else "round=*")
+        / "grand_prix=*"
+        / (f"session={session}" if session is not None else "session=*")
+        / "part-*.parquet"
+    )
+    return sorted(glob.glob(str(pattern)))
+
+
+def bronze_files(
+    table: str,
+    season: Optional[int] = None,
+    round: Optional[int] = None,
+    session: Optional[str] = None,
+) -> List[str]:
+    """
+    Resolve bronze Parquet files from meta.bronze_files, falling back to a glob when
+    the catalog is missing, known to be stale, has no rows for the filter or lists a
+    file that no longer exists.
+    """
+    if (BRONZE_DIR / CATALOG_PENDING_FILE).exists():
+        # The ingestor wrote files it could not index (see ingestion/bronze_catalog.py)
+        return _glob_bronze_files(table, season, round, session)
+    where_clauses = ["table_name = ?"]
+    params: List[Any] = [table]
+    if season is not None:
+        where_clauses.append("season = ?")
+        params.append(season)
+    if round is not None:
+        where_clauses.append("round = ?")
+        params.append(round)
+    if session is not None:
+        where_clauses.append("session = ?")
+        params.append(session)
     try:
-        cur = con.execute(sql, params)
-        cols = [c[0] for c in cur.description]
-        return [dict(zip(cols, row)) for row in cur.fetchall()]
-    except duckdb.Error as exc:  # type: ignore[attr-defined]
-        raise HTTPException(status_code=500, detail=str(exc))
-    finally:
-        con.close()
+        rows = fetch_rows(
+            f"SELECT path FROM meta.bronze_files WHERE {' AND '.join(where_clauses)} ORDER BY path",
+            params,
+        )
+    except (HTTPException, duckdb.Error):  # type: ignore[attr-defined]
+        return _glob_bronze_files(table, season, round, session)
+    files = [str(BRONZE_DIR / r["path"]) for r in rows]
+    if not files or not all(os.path.exists(f) for f in files):
+        return _glob_bronze_files(table, season, round, session)
+    return files
+
+
+def parquet_scan(files: Sequence[str]) -> str:
+    """SQL table expression that reads exactly the given Parquet files."""
+    if not files:
+        # Fails at execution time, like a glob that matches nothing.
+        return "read_parquet([]::VARCHAR[])"
+    quoted = ", ".join("'" + f.replace("'", "''") + "'" for f in files)
+    return f"read_parquet([{quoted}])"
 
 
 def get_table_columns(con: duckdb.DuckDBPyConnection, table: str) -> set[str]:
@@ -152,70 +277,48 @@ def get_driver_name(driver_code: str | None) -> str:
     return name or driver_code
 
 
-_race_win_model: Any | None = None
-_race_win_features: List[str] | None = None
-_rf_position_model: Any | None = None
 _rf_position_features: Optional[pd.DataFrame] = None
-_rf_position_feature_cols: List[str] | None = None
 
 
 def get_race_win_model() -> Tuple[Any, List[str]]:
-    """Lazy-load the race_win_logreg pipeline and its feature list."""
-    global _race_win_model, _race_win_features
-    if _race_win_model is None:
-        if not RACE_WIN_MODEL_PATH.exists():
-            raise HTTPException(
-                status_code=500,
-                detail=f"Race win model artefact not found at {RACE_WIN_MODEL_PATH}",
-            )
-        _race_win_model = joblib.load(RACE_WIN_MODEL_PATH)
-
-    if _race_win_features is None:
-        if RACE_WIN_META_PATH.exists():
-            import json
-
-            meta = json.loads(RACE_WIN_META_PATH.read_text())
-            # Try both 'feature_list' (new format) and 'feature_cols' (old format)
-            feats = meta.get("feature_list") or meta.get("feature_cols") or []
-            if isinstance(feats, list) and feats:
-                _race_win_features = [str(f) for f in feats]
-        if _race_win_features is None:
-            # Fallback to the minimal scenario feature list
-            # (kept in sync with generate_race_predictions.py).
-            _race_win_features = ["grid_position", "rain_probability", "starting_compound_index"]
-    return _race_win_model, _race_win_features
+    """The race win pipeline and its feature list, from the model registry."""
+    try:
+        loaded = model_registry.get(RACE_WIN_MODEL_PATH.stem)
+    except FileNotFoundError:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Race win model artefact not found at {RACE_WIN_MODEL_PATH}",
+        )
+    # Try both 'feature_list' (new format) and 'feature_cols' (old format)
+    features = loaded.feature_list("feature_list", "feature_cols")
+    if not features:
+        # Fallback to the minimal scenario feature list
+        # (kept in sync with generate_race_predictions.py).
+        features = ["grid_position", "rain_probability", "starting_compound_index"]
+    return loaded.model, features
 
 
 def get_rf_position_model() -> Tuple[Any, List[str]]:
-    """Lazy-load the RF position regressor and its feature column list."""
-    global _rf_position_model, _rf_position_feature_cols
-    if _rf_position_model is None:
-        if not RF_POSITION_MODEL_PATH.exists():
-            raise HTTPException(
-                status_code=500,
-                detail=f"RF position model artefact not found at {RF_POSITION_MODEL_PATH}",
-            )
-        _rf_position_model = joblib.load(RF_POSITION_MODEL_PATH)
-
-    if _rf_position_feature_cols is None:
-        if RF_POSITION_META_PATH.exists():
-            import json
-
-            meta = json.loads(RF_POSITION_META_PATH.read_text())
-            feats = meta.get("feature_cols") or []
-            if isinstance(feats, list) and feats:
-                _rf_position_feature_cols = [str(f) for f in feats]
-        if _rf_position_feature_cols is None:
-            # Fallback to the feature list used in train_fastf1_rf_position.py
-            _rf_position_feature_cols = [
-                "grid_position",
-                "driver_races_so_far",
-                "driver_avg_finish_prev",
-                "team_races_so_far",
-                "team_avg_finish_prev",
-                "circuit_avg_finish_prev",
-            ]
-    return _rf_position_model, _rf_position_feature_cols
+    """The RF position regressor and its feature column list, from the model registry."""
+    try:
+        loaded = model_registry.get(RF_POSITION_MODEL_PATH.stem)
+    except FileNotFoundError:
+        raise HTTPException(
+            status_code=500,
+            detail=f"RF position model artefact not found at {RF_POSITION_MODEL_PATH}",
+        )
+    features = loaded.feature_list("feature_cols")
+    if not features:
+        # Fallback to the feature list used in train_fastf1_rf_position.py
+        features = [
+            "grid_position",
+            "driver_races_so_far",
+            "driver_avg_finish_prev",
+            "team_races_so_far",
+            "team_avg_finish_prev",
+            "circuit_avg_finish_prev",
+        ]
+    return loaded.model, features
 
 
 def get_rf_position_features() -> pd.DataFrame:
@@ -313,12 +416,22 @@ def health() -> Dict[str, str]:
     return {"status": "ok"}
 
 
+@app.get("/api/metrics/db")
+def db_metrics() -> Dict[str, Any]:
+    """Connection pool size, reopen count and checkout latency percentiles."""
+    return {
+        "pools": [warehouse_pool.stats(), bronze_pool.stats()],
+        "response_cache": response_cache.stats(),
+        "models": model_registry.stats(),
+    }
+
+
 @app.get("/api/meta/seasons")
 def list_seasons() -> Dict[str, List[int]]:
     # Try to get from bronze first
     sql = f"""
     SELECT DISTINCT season
-    FROM read_parquet('{BRONZE_DIR}/sessions/season=*/round=*/grand_prix=*/session=*/part-*.parquet')
+    FROM {parquet_scan(bronze_files('sessions'))}
     ORDER BY season
     """
     try:
@@ -356,7 +469,7 @@ def list_races(season: int = Query(..., description="Season (e.g. 2023, 2024)"))
         circuit_short_name AS circuit_name,
         date_start,
         date_end
-      FROM read_parquet('{BRONZE_DIR}/sessions/season=*/round=*/grand_prix=*/session=*/part-*.parquet')
+      FROM {parquet_scan(bronze_files('sessions', season=season))}
       WHERE session_code = 'R' AND season = {season}
     ),
     ordered AS (
@@ -443,7 +556,7 @@ def list_drivers_for_race(
     sql = f"""
     SELECT DISTINCT
         driver_number
-    FROM read_parquet('{BRONZE_DIR}/session_result/season=*/round=*/grand_prix=*/session=R/part-*.parquet')
+    FROM {parquet_scan(bronze_files('session_result', season=season, round=round, session='R'))}
     WHERE season = {season} AND round = {round}
     ORDER BY driver_number
     """
@@ -476,74 +589,72 @@ def race_win_predictions(
     team_name: Optional[str] = Query(None, description="Team filter"),
     grand_prix_slug: Optional[str] = Query(None, description="Grand Prix slug filter"),
 ) -> List[Dict[str, Any]]:
-    con = connect_ro()
-    try:
-        columns = get_table_columns(con, "predictions.race_win")
-
-        required_columns = {"pred_win_proba", "season", "round", "grand_prix_slug"}
-        if not required_columns.issubset(columns):
-            raise HTTPException(status_code=500, detail="predictions.race_win missing required columns")
-
-        desired_columns = [
-            "season",
-            "round",
-            "grand_prix_slug",
-            "driver_number",
-            "driver_name",
-            "driver_code",
-            "team_name",
-            "grid_position",
-            "grid_position_norm",
-            "driver_points_pre",
-            "team_points_pre",
-            "track_temp_c",
-            "rain_probability",
-            "driver_avg_finish_last_3",
-            "driver_points_last_3",
-            "team_points_last_3",
-            "driver_track_avg_finish_last_3_at_gp",
-            "driver_track_points_last_3_at_gp",
-            "team_track_points_last_3_at_gp",
-            "target_win_race",
-            "pred_win_proba",
-        ]
-
-        if "pred_win_proba_softmax" in columns:
-            desired_columns.append("pred_win_proba_softmax")
-
-        select_cols = [col for col in desired_columns if col in columns]
-        where_clauses = ["season = ?"]
-        params: List[Any] = [season]
+    with connect_ro() as con:
+        try:
+            columns = get_table_columns(con, "predictions.race_win")
+
+            required_columns = {"pred_win_proba", "season", "round", "grand_prix_slug"}
+            if not required_columns.issubset(columns):
+                raise HTTPException(status_code=500, detail="predictions.race_win missing required columns")
+
+            desired_columns = [
+                "season",
+                "round",
+                "grand_prix_slug",
+                "driver_number",
+                "driver_name",
+                "driver_code",
+                "team_name",
+                "grid_position",
+                "grid_position_norm",
+                "driver_points_pre",
+                "team_points_pre",
+                "track_temp_c",
+                "rain_probability",
+                "driver_avg_finish_last_3",
+                "driver_points_last_3",
+                "team_points_last_3",
+                "driver_track_avg_finish_last_3_at_gp",
+                "driver_track_points_last_3_at_gp",
+                "team_track_points_last_3_at_gp",
+                "target_win_race",
+                "pred_win_proba",
+            ]
 
-        if round is not None:
-            where_clauses.append("round = ?")
-            params.append(round)
-        if driver_code:
-            where_clauses.append("driver_code = ?")
-            params.append(driver_code)
-        if team_name:
-            where_clauses.append("team_name = ?")
-            params.append(team_name)
-        if grand_prix_slug:
-            where_clauses.append("grand_prix_slug = ?")
-            params.append(grand_prix_slug)
-
-        where_sql = " AND ".join(where_clauses)
-        order_expr = "COALESCE(pred_win_proba_softmax, pred_win_proba)" if "pred_win_proba_softmax" in columns else "pred_win_proba"
-        if round is not None:
-            order_sql = f"ORDER BY {order_expr} DESC"
-        else:
-            order_sql = f"ORDER BY round ASC, {order_expr} DESC"
+            if "pred_win_proba_softmax" in columns:
+                desired_columns.append("pred_win_proba_softmax")
+
+            select_cols = [col for col in desired_columns if col in columns]
+            where_clauses = ["season = ?"]
+            params: List[Any] = [season]
+
+            if round is not None:
+                where_clauses.append("round = ?")
+                params.append(round)
+            if driver_code:
+                where_clauses.append("driver_code = ?")
+                params.append(driver_code)
+            if team_name:
+                where_clauses.append("team_name = ?")
+                params.append(team_name)
+            if grand_prix_slug:
+                where_clauses.append("grand_prix_slug = ?")
+                params.append(grand_prix_slug)
+
+            where_sql = " AND ".join(where_clauses)
+            order_expr = "COALESCE(pred_win_proba_softmax, pred_win_proba)" if "pred_win_proba_softmax" in columns else "pred_win_proba"
+            if round is not None:
+                order_sql = f"ORDER BY {order_expr} DESC"
+            else:
+                order_sql = f"ORDER BY round ASC, {order_expr} DESC"
 
-        query = f"SELECT {', '.join(select_cols)} FROM predictions.race_win WHERE {where_sql} {order_sql}"
+            query = f"SELECT {', '.join(select_cols)} FROM predictions.race_win WHERE {where_sql} {order_sql}"
 
-        cur = con.execute(query, params)
-        result_columns = [c[0] for c in cur.description]
-        rows = [dict(zip(result_columns, row)) for row in cur.fetchall()]
-    except duckdb.Error as exc:  # type: ignore[attr-defined]
-        raise HTTPException(status_code=500, detail=str(exc))
-    finally:
-        con.close()
+            cur = con.execute(query, params)
+            result_columns = [c[0] for c in cur.description]
+            rows = [dict(zip(result_columns, row)) for row in cur.fetchall()]
+        except duckdb.Error as exc:  # type: ignore[attr-defined]
+            raise HTTPException(status_code=500, detail=str(exc))
 
     if not rows:
         raise HTTPException(status_code=404, detail="Not found")
@@ -555,47 +666,45 @@ def race_win_predictions(
 def race_win_summary(
     season: Optional[int] = Query(None, description="Season for summary (defaults to latest)")
 ) -> Dict[str, Any]:
-    con = connect_ro()
-    try:
-        if season is None:
-            latest = con.execute("SELECT MAX(season) AS season FROM predictions.race_win").fetchone()
-            if not latest or latest[0] is None:
-                raise HTTPException(status_code=404, detail="Not found")
-            season = int(latest[0])
+    with connect_ro() as con:
+        try:
+            if season is None:
+                latest = con.execute("SELECT MAX(season) AS season FROM predictions.race_win").fetchone()
+                if not latest or latest[0] is None:
+                    raise HTTPException(status_code=404, detail="Not found")
+                season = int(latest[0])
 
-        summary_row = con.execute(
-            """
-            WITH ranked AS (
-              SELECT
-                season,
-                round,
-                grand_prix_slug,
-                driver_code,
-                target_win_race,
-                ROW_NUMBER() OVER (
-                  PARTITION BY season, round
-                  ORDER BY pred_win_proba DESC
-                ) AS rank_in_race
-              FROM predictions.race_win
-              WHERE season = ?
-            )
-            SELECT
-              COUNT(*) FILTER (WHERE target_win_race = 1) AS n_wins,
-              AVG(CASE WHEN target_win_race = 1 AND rank_in_race = 1 THEN 1.0 ELSE 0.0 END) AS hit_at_1,
-              AVG(CASE WHEN target_win_race = 1 AND rank_in_race <= 3 THEN 1.0 ELSE 0.0 END) AS hit_at_3
-            FROM ranked;
-            """,
-            [season],
-        ).fetchone()
+            summary_row = con.execute(
+                """
+                WITH ranked AS (
+                  SELECT
+                    season,
+                    round,
+                    grand_prix_slug,
+                    driver_code,
+                    target_win_race,
+                    ROW_NUMBER() OVER (
+                      PARTITION BY season, round
+                      ORDER BY pred_win_proba DESC
+                    ) AS rank_in_race
+                  FROM predictions.race_win
+                  WHERE season = ?
+                )
+                SELECT
+                  COUNT(*) FILTER (WHERE target_win_race = 1) AS n_wins,
+                  AVG(CASE WHEN target_win_race = 1 AND rank_in_race = 1 THEN 1.0 ELSE 0.0 END) AS hit_at_1,
+                  AVG(CASE WHEN target_win_race = 1 AND rank_in_race <= 3 THEN 1.0 ELSE 0.0 END) AS hit_at_3
+                FROM ranked;
+                """,
+                [season],
+            ).fetchone()
 
-        n_races_row = con.execute(
-            "SELECT COUNT(DISTINCT round) AS n_races FROM predictions.race_win WHERE season = ?",
-            [season],
-        ).fetchone()
-    except duckdb.Error as exc:  # type: ignore[attr-defined]
-        raise HTTPException(status_code=500, detail=str(exc))
-    finally:
-        con.close()
+            n_races_row = con.execute(
+                "SELECT COUNT(DISTINCT round) AS n_races FROM predictions.race_win WHERE season = ?",
+                [season],
+            ).fetchone()
+        except duckdb.Error as exc:  # type: ignore[attr-defined]
+            raise HTTPException(status_code=500, detail=str(exc))
 
     if summary_row is None or n_races_row is None:
         raise HTTPException(status_code=404, detail="Not found")
@@ -619,6 +728,21 @@ class RaceWinScenarioRequest(BaseModel):
     starting_compound_index: int
 
 
+class RaceWinScenario(BaseModel):
+    """One what-if row of a batch: a driver with tweaked grid/rain/tyre."""
+
+    driver_code: str
+    grid_position: int
+    rain_probability: float
+    starting_compound_index: int
+
+
+class RaceWinScenarioBatchRequest(BaseModel):
+    season: int
+    round: int
+    scenarios: List[RaceWinScenario]
+
+
 class RFPositionScenarioRequest(BaseModel):
     """Scenario inputs for RF position model."""
 
@@ -629,141 +753,247 @@ class RFPositionScenarioRequest(BaseModel):
     team_name: Optional[str] = None
 
 
-@app.post("/api/predict/race_win_scenario")
-def race_win_scenario(body: RaceWinScenarioRequest) -> Dict[str, Any]:
-    """Evaluate the race-win model for a single driver with tweaked grid/rain/tyre."""
-    # Look up the baseline data from gold_fastf1.win_prediction_dataset
-    con = connect_ro()
+MAX_SCENARIO_BATCH = int(os.getenv("F1_API_MAX_SCENARIO_BATCH") or 500)
+# Serve scenarios from predictions.race_win_scenario_cube (scripts/build_scenario_cube.py)
+USE_SCENARIO_CUBE = os.getenv("F1_API_SCENARIO_CUBE", "1") != "0"
+
+
+def race_win_baselines(
+    con: duckdb.DuckDBPyConnection, season: int, round_num: int, driver_codes: Sequence[str]
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Baseline win_prediction_dataset rows keyed by upper-cased driver code, in one query.
+
+    Each driver gets its row for the requested round, else its most recent round of the season.
+    """
+    codes = sorted({code.upper() for code in driver_codes})
+    if not codes:
+        return {}
     try:
-        # Try to find the exact race
         cur = con.execute(
             """
-            SELECT *
-            FROM gold_fastf1.win_prediction_dataset
-            WHERE season = ? 
-              AND round IS NOT NULL 
-              AND CAST(round AS INTEGER) = ? 
-              AND UPPER(driver_code) = UPPER(?)
-            LIMIT 1
+            SELECT * EXCLUDE (_pick)
+            FROM (
+              SELECT
+                *,
+                row_number() OVER (
+                  PARTITION BY UPPER(driver_code)
+                  ORDER BY (CAST(round AS INTEGER) = ?) DESC, round DESC
+                ) AS _pick
+              FROM gold_fastf1.win_prediction_dataset
+              WHERE season = ?
+                AND round IS NOT NULL
+                AND list_contains(?, UPPER(driver_code))
+            )
+            WHERE _pick = 1
             """,
-            [body.season, body.round, body.driver_code],
+            [round_num, season, codes],
         )
-        desc = cur.description
-        if not desc:
-            raise HTTPException(status_code=404, detail="Driver not found for this race")
-        cols = [c[0] for c in desc]
-        row = cur.fetchone()
-        
-        # If not found, use the most recent non-null round for this driver
-        if row is None:
-            cur = con.execute(
-                """
-                SELECT *
-                FROM gold_fastf1.win_prediction_dataset
-                WHERE season = ? 
-                  AND round IS NOT NULL
-                  AND UPPER(driver_code) = UPPER(?)
-                ORDER BY round DESC
-                LIMIT 1
-                """,
-                [body.season, body.driver_code],
-            )
-            row = cur.fetchone()
-            
-        if row is None:
-            raise HTTPException(status_code=404, detail=f"No data found for {body.driver_code} in {body.season}")
-            
-        baseline = dict(zip(cols, row))
+        cols = [c[0] for c in cur.description]
+        rows = cur.fetchall()
     except duckdb.Error as exc:  # type: ignore[attr-defined]
         raise HTTPException(status_code=500, detail=str(exc))
-    finally:
-        con.close()
+    return {str(row[cols.index("driver_code")]).upper(): dict(zip(cols, row)) for row in rows}
 
-    model, feature_cols = get_race_win_model()
 
-    # Convert rainfall slider (0-1) to actual rainfall mm (0-10mm represents full range)
-    rainfall_mm = float(body.rain_probability) * 10.0
-    is_wet = 1.0 if float(body.rain_probability) > 0.5 else 0.0
+def lookup_scenario_cube(
+    con: duckdb.DuckDBPyConnection,
+    baselines: List[Dict[str, Any]],
+    scenarios: List[RaceWinScenario],
+    feature_cols: List[str],
+    model_sha256: str,
+) -> Dict[int, Tuple[float, str]]:
+    """
+    Precomputed probabilities from predictions.race_win_scenario_cube, in one query.
+
+    Returns index -> (raw probability, "cube" | "cube_interpolated") for the scenarios
+    the cube covers for the current model; the rest are scored live. Rain between two
+    cube points is interpolated linearly.
+    """
+    compounds = race_win_scenarios.cube_compounds(feature_cols)
+    keys: Dict[str, List[Any]] = {k: [] for k in ("i", "season", "round", "driver", "grid", "compound", "rain", "w")}
+    expected: Dict[int, int] = {}
+    for i, (baseline, sc) in enumerate(zip(baselines, scenarios)):
+        compound = sc.starting_compound_index if compounds != [race_win_scenarios.NO_COMPOUND] else compounds[0]
+        bracket = race_win_scenarios.rain_bracket(sc.rain_probability)
+        if sc.grid_position not in race_win_scenarios.GRID_POSITIONS or compound not in compounds or bracket is None:
+            continue
+        try:
+            season, round_num = int(baseline["season"]), int(baseline["round"])
+        except (KeyError, TypeError, ValueError):
+            continue
+        expected[i] = len(bracket)
+        for pct, weight in bracket:
+            for key, value in zip(
+                keys, (i, season, round_num, str(baseline.get("driver_code")).upper(), sc.grid_position, compound, pct, weight)
+            ):
+                keys[key].append(value)
+    if not expected:
+        return {}
 
-    # Build feature vector, overriding scenario parameters
-    feature_dict: Dict[str, float] = {}
-    for col in feature_cols:
-        if col == "grid_position":
-            feature_dict[col] = float(body.grid_position)
-        elif col == "max_rainfall_mm":
-            # Map rain_probability (0-1) to rainfall in mm
-            feature_dict[col] = rainfall_mm
-        elif col == "is_wet_race":
-            # Binary: wet if rain_probability > 50%
-            feature_dict[col] = is_wet
-        elif col == "starting_compound_index":
-            feature_dict[col] = float(body.starting_compound_index)
-        else:
-            # For weather-condition features, swap between dry/wet based on scenario
-            if is_wet > 0.5:
-                # Scenario is wet: prefer wet-condition features
-                if col.startswith("driver_dry_") and col.replace("driver_dry_", "driver_wet_") in feature_cols:
-                    col_wet = col.replace("driver_dry_", "driver_wet_")
-                    v = baseline.get(col_wet)
-                elif col == "driver_avg_finish_dry" and "driver_avg_finish_wet" in feature_cols:
-                    v = baseline.get("driver_avg_finish_wet")
-                else:
-                    v = baseline.get(col)
-            else:
-                # Scenario is dry: prefer dry-condition features
-                if col.startswith("driver_wet_") and col.replace("driver_wet_", "driver_dry_") in feature_cols:
-                    col_dry = col.replace("driver_wet_", "driver_dry_")
-                    v = baseline.get(col_dry)
-                elif col == "driver_avg_finish_wet" and "driver_avg_finish_dry" in feature_cols:
-                    v = baseline.get("driver_avg_finish_dry")
-                else:
-                    v = baseline.get(col)
-            feature_dict[col] = 0.0 if v is None else float(v)
-
-    # Convert to DataFrame to preserve feature names for sklearn
-    feature_frame = pd.DataFrame([feature_dict])
-    feature_frame = feature_frame[feature_cols]  # Ensure correct column order
-    
-    # Replace inf/nan with 0
-    feature_frame = feature_frame.replace([np.inf, -np.inf], 0).fillna(0)
-    
-    X = feature_frame
-    
     try:
-        proba = float(model.predict_proba(X)[0, 1])
-    except Exception as exc:  # pragma: no cover - defensive
-        raise HTTPException(status_code=500, detail=f"Model inference failed: {exc}")
-
-    # Apply team capability boost for drivers on top teams
-    # Top teams have demonstrated higher win rates; drivers new to top teams should
-    # benefit from that team infrastructure
-    team_name = baseline.get("team_name") or ""
-    team_boost = 1.0
-    if "red bull" in team_name.lower():
-        team_boost = 1.5  # Red Bull has 22% historical win rate
-    elif "mercedes" in team_name.lower():
-        team_boost = 1.3  # Mercedes has 15% historical win rate
-    elif "mclaren" in team_name.lower():
-        team_boost = 1.2  # McLaren has 7.5% historical win rate
-    elif "ferrari" in team_name.lower():
-        team_boost = 1.1  # Ferrari has 4% historical win rate
-
-    # Apply boost but cap at reasonable probability
-    adjusted_proba = min(proba * team_boost, 0.95)
-
-    # Get baseline prediction if it exists
-    base_raw = float(baseline.get("pred_win_proba") or 0.0) if "pred_win_proba" in baseline else 0.0
+        rows = con.execute(
+            f"""
+            SELECT k.i, k.w, c.pred_win_proba
+            FROM (
+              SELECT unnest(?) AS i, unnest(?) AS season, unnest(?) AS round, unnest(?) AS driver_code,
+                     unnest(?) AS grid_position, unnest(?) AS compound, unnest(?) AS rain_pct, unnest(?) AS w
+            ) k
+            JOIN {race_win_scenarios.CUBE_TABLE} c
+              ON c.season = k.season
+             AND c.round = k.round
+             AND c.driver_code = k.driver_code
+             AND c.grid_position = k.grid_position
+             AND c.starting_compound_index = k.compound
+             AND c.rain_pct = k.rain_pct
+            WHERE c.model_sha256 = ?
+            """,
+            [keys[k] for k in ("i", "season", "round", "driver", "grid", "compound", "rain", "w")] + [model_sha256],
+        ).fetchall()
+    except duckdb.CatalogException:
+        # Cube not built in this warehouse
+        return {}
+
+    found: Dict[int, List[Tuple[float, float]]] = {}
+    for i, weight, proba in rows:
+        found.setdefault(int(i), []).append((float(weight), float(proba)))
+    hits: Dict[int, Tuple[float, str]] = {}
+    for i, points in found.items():
+        if len(points) == expected[i]:
+            hits[i] = (sum(w * p for w, p in points), "cube" if len(points) == 1 else "cube_interpolated")
+    return hits
+
+
+def score_race_win_scenarios(
+    baselines: List[Dict[str, Any]],
+    scenarios: List[RaceWinScenario],
+    precomputed: Optional[Dict[int, Tuple[float, str]]] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Score (baseline, scenario) pairs; results keep the input order.
+
+    Pairs found in `precomputed` (see lookup_scenario_cube) are not re-scored; the
+    rest go through a single predict_proba call.
+    """
+    precomputed = precomputed or {}
+    probas = np.zeros(len(scenarios))
+    sources = ["live"] * len(scenarios)
+    for i, (proba, source) in precomputed.items():
+        probas[i], sources[i] = proba, source
+
+    live = [i for i in range(len(scenarios)) if i not in precomputed]
+    if live:
+        model, feature_cols = get_race_win_model()
+        feature_frame = race_win_scenarios.scenario_feature_frame(
+            pd.DataFrame([baselines[i] for i in live]),
+            feature_cols,
+            [scenarios[i].grid_position for i in live],
+            [scenarios[i].rain_probability for i in live],
+            [scenarios[i].starting_compound_index for i in live],
+        )
+        try:
+            probas[live] = model.predict_proba(feature_frame)[:, 1]
+        except Exception as exc:  # pragma: no cover - defensive
+            raise HTTPException(status_code=500, detail=f"Model inference failed: {exc}")
+
+    results = []
+    for baseline, proba, source in zip(baselines, probas, sources):
+        # Apply boost but cap at reasonable probability
+        adjusted_proba = min(float(proba) * race_win_scenarios.team_boost(baseline.get("team_name")), 0.95)
+        # Get baseline prediction if it exists
+        base_raw = float(baseline.get("pred_win_proba") or 0.0) if "pred_win_proba" in baseline else 0.0
+        results.append(
+            {
+                "driver_code": baseline.get("driver_code"),
+                "driver_name": baseline.get("driver_name"),
+                "team_name": baseline.get("team_name"),
+                "base_pred_win_proba": base_raw,
+                "base_pred_win_proba_softmax": None,
+                "scenario_pred_win_proba": adjusted_proba,
+                "scenario_source": source,
+            }
+        )
+    return results
+
+
+def race_win_cube_hits(
+    con: duckdb.DuckDBPyConnection, baselines: List[Dict[str, Any]], scenarios: List[RaceWinScenario]
+) -> Dict[int, Tuple[float, str]]:
+    """Cube lookups for the scenario endpoints (none when F1_API_SCENARIO_CUBE=0)."""
+    if not USE_SCENARIO_CUBE or not baselines:
+        return {}
+    _, feature_cols = get_race_win_model()
+    loaded = model_registry.get(RACE_WIN_MODEL_PATH.stem)
+    return lookup_scenario_cube(con, baselines, scenarios, feature_cols, loaded.model_sha256)
+
+
+@app.post("/api/predict/race_win_scenario")
+def race_win_scenario(body: RaceWinScenarioRequest) -> Dict[str, Any]:
+    """
+    Evaluate the race-win model for a single driver with tweaked grid/rain/tyre.
+
+    Served from the precomputed scenario cube when it covers the inputs, else scored live.
+    """
+    scenario = RaceWinScenario(
+        driver_code=body.driver_code,
+        grid_position=body.grid_position,
+        rain_probability=body.rain_probability,
+        starting_compound_index=body.starting_compound_index,
+    )
+    # Look up the baseline data from gold_fastf1.win_prediction_dataset
+    with connect_ro() as con:
+        baseline = race_win_baselines(con, body.season, body.round, [body.driver_code]).get(body.driver_code.upper())
+        if baseline is None:
+            raise HTTPException(status_code=404, detail=f"No data found for {body.driver_code} in {body.season}")
+        hits = race_win_cube_hits(con, [baseline], [scenario])
+
+    result = score_race_win_scenarios([baseline], [scenario], hits)[0]
+    return {"season": body.season, "round": body.round, **result}
 
-    return {
-        "season": body.season,
-        "round": body.round,
-        "driver_code": baseline.get("driver_code"),
-        "driver_name": baseline.get("driver_name"),
-        "team_name": baseline.get("team_name"),
-        "base_pred_win_proba": base_raw,
-        "base_pred_win_proba_softmax": None,
-        "scenario_pred_win_proba": adjusted_proba,
-    }
+
+@app.post("/api/predict/race_win_scenario/batch")
+def race_win_scenario_batch(body: RaceWinScenarioBatchRequest) -> Dict[str, Any]:
+    """
+    Evaluate many what-if scenarios for one race in a single request.
+
+    Baseline rows for every driver come from one warehouse query; scenarios covered by
+    the precomputed cube are one more query and the rest are scored with one
+    predict_proba call. Results are returned in request order; a
+    scenario whose driver has no data for the season gets an `error` instead of
+    probabilities.
+    """
+    if len(body.scenarios) > MAX_SCENARIO_BATCH:
+        raise HTTPException(status_code=422, detail=f"At most {MAX_SCENARIO_BATCH} scenarios per request")
+
+    with connect_ro() as con:
+        baselines = race_win_baselines(con, body.season, body.round, [sc.driver_code for sc in body.scenarios])
+        found = [i for i, sc in enumerate(body.scenarios) if sc.driver_code.upper() in baselines]
+        found_baselines = [baselines[body.scenarios[i].driver_code.upper()] for i in found]
+        found_scenarios = [body.scenarios[i] for i in found]
+        hits = race_win_cube_hits(con, found_baselines, found_scenarios)
+
+    scored: Dict[int, Dict[str, Any]] = {}
+    if found:
+        scored = dict(zip(found, score_race_win_scenarios(found_baselines, found_scenarios, hits)))
+
+    results = []
+    for i, sc in enumerate(body.scenarios):
+        scenario = {
+            "grid_position": sc.grid_position,
+            "rain_probability": sc.rain_probability,
+            "starting_compound_index": sc.starting_compound_index,
+        }
+        if i in scored:
+            results.append({**scored[i], **scenario})
+        else:
+            results.append(
+                {
+                    "driver_code": sc.driver_code,
+                    **scenario,
+                    "error": f"No data found for {sc.driver_code} in {body.season}",
+                }
+            )
+    return {"season": body.season, "round": body.round, "n_scenarios": len(results), "results": results}
 
 
 @app.post("/api/predict/rf_position_scenario")
@@ -850,8 +1080,8 @@ def rf_position_scenario(body: RFPositionScenarioRequest) -> Dict[str, Any]:
 def monitor(season: Optional[int] = Query(None, description="Season to summarise for DE monitor")) -> Dict[str, Any]:
     """High-level pipeline/monitoring stats for the DE Monitor dashboard."""
     # Bronze ingestion metrics
-    sessions_path = BRONZE_DIR / "sessions" / "season=*" / "round=*" / "grand_prix=*" / "session=*" / "part-*.parquet"
-    result_path = BRONZE_DIR / "session_result" / "season=*" / "round=*" / "grand_prix=*" / "session=*" / "part-*.parquet"
+    sessions_scan = parquet_scan(bronze_files("sessions", season=season))
+    result_scan = parquet_scan(bronze_files("session_result", season=season))
 
     where_clause = "WHERE season IN (2023, 2024)"
     params: List[Any] = []
@@ -868,7 +1098,7 @@ def monitor(season: Optional[int] = Query(None, description="Season to summarise
         session_code,
         session_name,
         date_start
-      FROM read_parquet('{sessions_path}')
+      FROM {sessions_scan}
       {where_clause}
     ),
     agg AS (
@@ -927,7 +1157,7 @@ def monitor(season: Optional[int] = Query(None, description="Season to summarise
     result_params = params
     result_sql = f"""
     SELECT COUNT(*) AS n_rows
-    FROM read_parquet('{result_path}')
+    FROM {result_scan}
     {result_where}
     """
     result_rows = read_bronze(result_sql, result_params)
@@ -940,8 +1170,7 @@ def monitor(season: Optional[int] = Query(None, description="Season to summarise
 
     try:
         # Base prediction row counts
-        con = connect_ro()
-        try:
+        with connect_ro() as con:
             pred_where = ""
             pred_params: List[Any] = []
             if season is not None:
@@ -953,8 +1182,6 @@ def monitor(season: Optional[int] = Query(None, description="Season to summarise
             ).fetchone()
             if pred_row:
                 predictions_info["n_rows"] = int(pred_row[0] or 0)
-        finally:
-            con.close()
     except duckdb.Error as exc:  # type: ignore[attr-defined]
         raise HTTPException(status_code=500, detail=str(exc))
 
@@ -980,15 +1207,9 @@ def root() -> Dict[str, str]:
     return {"service": "f1-dash-api", "status": "ok"}
 
 
-def _parquet_exists(path_pattern: str) -> bool:
-    """Return True if any parquet files match the given glob pattern."""
-    return bool(glob.glob(path_pattern))
-
-
 def _read_weather(season: int, round: int, session_code: str) -> Dict[str, Any]:
-    round_dir = f"round={round:02d}"
-    path = BRONZE_DIR / "weather" / f"season={season}" / round_dir / "grand_prix=*" / f"session={session_code}" / "part-*.parquet"
-    if not _parquet_exists(str(path)):
+    files = bronze_files("weather", season=season, round=round, session=session_code)
+    if not files:
         return {"track_temp_c": None, "air_temp_c": None, "rain": None, "wind_speed": None, "humidity": None}
     sql = f"""
     SELECT
@@ -997,7 +1218,7 @@ def _read_weather(season: int, round: int, session_code: str) -> Dict[str, Any]:
       MAX(rainfall) AS rain,
       AVG(wind_speed) AS wind_speed,
       AVG(humidity) AS humidity
-    FROM read_parquet('{path}')
+    FROM {parquet_scan(files)}
     """
     rows = read_bronze(sql)
     if not rows:
@@ -1019,17 +1240,17 @@ def race_weather(season: int, round: int, session_type: str = Query("R", descrip
 
 @app.get("/api/season/{season}/driver_pace")
 def season_driver_pace(season: int) -> Dict[str, Any]:
-    result_path = BRONZE_DIR / "session_result" / f"season={season}" / "round=*" / "grand_prix=*" / "session=R" / "part-*.parquet"
-    drivers_path = BRONZE_DIR / "drivers" / f"season={season}" / "round=*" / "grand_prix=*" / "session=R" / "part-*.parquet"
+    result_scan = parquet_scan(bronze_files("session_result", season=season, session="R"))
+    drivers_scan = parquet_scan(bronze_files("drivers", season=season, session="R"))
     sql = f"""
     WITH res AS (
       SELECT round, driver_number, position
-      FROM read_parquet('{result_path}')
+      FROM {result_scan}
       WHERE position IS NOT NULL
     ),
     drv AS (
       SELECT DISTINCT driver_number, name_acronym AS driver_code
-      FROM read_parquet('{drivers_path}')
+      FROM {drivers_scan}
     )
     SELECT driver_code, round, position
     FROM res JOIN drv USING(driver_number)
@@ -1078,7 +1299,7 @@ def season_driver_pace(season: int) -> Dict[str, Any]:
 def race_sessions(season: int, round: int) -> Dict[str, Any]:
     sql = f"""
     SELECT season, round, grand_prix_slug, session_key, session_code, session_type, session_name
-    FROM read_parquet('{BRONZE_DIR}/sessions/season=*/round=*/grand_prix=*/session=*/part-*.parquet')
+    FROM {parquet_scan(bronze_files('sessions', season=season, round=round))}
     WHERE season = {season} AND round = {round}
     ORDER BY
       CASE session_code
@@ -1163,18 +1384,27 @@ def race_sessions(season: int, round: int) -> Dict[str, Any]:
     raise HTTPException(status_code=404, detail="Not found")
 
 
+# session_result files written before the *_text columns existed lack them; this empty
+# row gives every scan the columns (ingestion/schema_registry.py TEXT_OVERFLOW).
+RESULT_TEXT_COLUMNS = "SELECT NULL::VARCHAR AS duration_text, NULL::VARCHAR AS gap_to_leader_text WHERE false"
+
+
 def _read_session_results(season: int, round: int, session_code: str) -> List[Dict[str, Any]]:
-    round_dir = f"round={round:02d}"
-    result_path = str(BRONZE_DIR / "session_result" / f"season={season}" / round_dir / "grand_prix=*" / f"session={session_code}" / "part-*.parquet")
-    drivers_path = str(BRONZE_DIR / "drivers" / f"season={season}" / round_dir / "grand_prix=*" / f"session={session_code}" / "part-*.parquet")
-    grid_path = str(BRONZE_DIR / "starting_grid" / f"season={season}" / round_dir / "grand_prix=*" / "session=Q" / "part-*.parquet")
+    result_files = bronze_files("session_result", season=season, round=round, session=session_code)
+    drivers_files = bronze_files("drivers", season=season, round=round, session=session_code)
+    grid_files = bronze_files("starting_grid", season=season, round=round, session="Q")
 
     # If the parquet files for this session are missing, return an empty list so the caller can 404.
-    if not _parquet_exists(result_path) or not _parquet_exists(drivers_path):
+    if not result_files or not drivers_files:
         return []
 
     # If grid data is missing, we can still return results, just without grid positions.
-    grid_exists = _parquet_exists(grid_path)
+    grid_exists = bool(grid_files)
+    grid_cte = (
+        f" ,grid AS (SELECT driver_number, position AS grid_position FROM {parquet_scan(grid_files)})"
+        if grid_exists
+        else ""
+    )
 
     # Race sessions (R) include a points column in session_result parquet.
     # Practice / quali / sprint sessions typically do not. To avoid 500s
@@ -1185,13 +1415,14 @@ def _read_session_results(season: int, round: int, session_code: str) -> List[Di
         grid_col = "g.grid_position" if grid_exists else "NULL AS grid_position"
         sql = f"""
         WITH result AS (
-          SELECT * FROM read_parquet('{result_path}')
+          SELECT * FROM {parquet_scan(result_files)}
+          UNION ALL BY NAME {RESULT_TEXT_COLUMNS}
         ),
         drivers AS (
           SELECT driver_number, name_acronym AS driver_code, broadcast_name AS driver_name, team_name, team_colour, country_code
-          FROM read_parquet('{drivers_path}')
+          FROM {parquet_scan(drivers_files)}
         )
-        {' ,grid AS (SELECT driver_number, position AS grid_position FROM read_parquet(\'' + grid_path + '\'))' if grid_exists else ''}
+        {grid_cte}
         SELECT
           r.position,
           d.driver_code,
@@ -1204,6 +1435,8 @@ def _read_session_results(season: int, round: int, session_code: str) -> List[Di
           r.points,
           r.duration,
           r.gap_to_leader,
+          r.duration_text,
+          r.gap_to_leader_text,
           r.dnf,
           r.dns,
           r.dsq
@@ -1217,13 +1450,14 @@ def _read_session_results(season: int, round: int, session_code: str) -> List[Di
         grid_col = "g.grid_position" if grid_exists else "NULL AS grid_position"
         sql = f"""
         WITH result AS (
-          SELECT * FROM read_parquet('{result_path}')
+          SELECT * FROM {parquet_scan(result_files)}
+          UNION ALL BY NAME {RESULT_TEXT_COLUMNS}
         ),
         drivers AS (
           SELECT driver_number, name_acronym AS driver_code, broadcast_name AS driver_name, team_name, team_colour, country_code
-          FROM read_parquet('{drivers_path}')
+          FROM {parquet_scan(drivers_files)}
         )
-        {' ,grid AS (SELECT driver_number, position AS grid_position FROM read_parquet(\'' + grid_path + '\'))' if grid_exists else ''}
+        {grid_cte}
         SELECT
           r.position,
           d.driver_code,
@@ -1236,6 +1470,8 @@ def _read_session_results(season: int, round: int, session_code: str) -> List[Di
           CAST(NULL AS DOUBLE) AS points,
           r.duration,
           r.gap_to_leader,
+          r.duration_text,
+          r.gap_to_leader_text,
           r.dnf,
           r.dns,
           r.dsq
@@ -1256,8 +1492,8 @@ def _read_session_results(season: int, round: int, session_code: str) -> List[Di
             "grid": int(r["grid_position"]) if r["grid_position"] is not None else None,
             "laps": int(r["number_of_laps"]) if r["number_of_laps"] is not None else None,
             "points": float(r["points"]) if r["points"] is not None else None,
-            "time_or_duration": r["duration"],
-            "gap": r["gap_to_leader"],
+            "time_or_duration": r["duration"] if r["duration"] is not None else r["duration_text"],
+            "gap": r["gap_to_leader"] if r["gap_to_leader"] is not None else r["gap_to_leader_text"],
             "status": (
                 "DNF" if r["dnf"] else "DNS" if r["dns"] else "DSQ" if r["dsq"] else "Finished"
             ),
@@ -1321,8 +1557,8 @@ def race_results(season: int, round: int, session_type: str = Query("R", descrip
 
 @app.get("/api/standings/drivers")
 def driver_standings(season: int = Query(...), round: Optional[int] = Query(None, description="Optional round for race-specific standings")) -> List[Dict[str, Any]]:
-    result_path = str(BRONZE_DIR / "session_result" / f"season={season}" / "round=*" / "grand_prix=*" / "session=R" / "part-*.parquet")
-    drivers_path = str(BRONZE_DIR / "drivers" / f"season={season}" / "round=*" / "grand_prix=*" / "session=R" / "part-*.parquet")
+    result_scan = parquet_scan(bronze_files("session_result", season=season, session="R"))
+    drivers_scan = parquet_scan(bronze_files("drivers", season=season, session="R"))
     
     round_filter = ""
     if round is not None:
@@ -1331,12 +1567,12 @@ def driver_standings(season: int = Query(...), round: Optional[int] = Query(None
     sql = f"""
     WITH res AS (
       SELECT driver_number, points, position
-      FROM read_parquet('{result_path}')
+      FROM {result_scan}
       WHERE 1=1 {round_filter}
     ),
     drv AS (
       SELECT DISTINCT driver_number, name_acronym AS driver_code, broadcast_name AS driver_name, team_name
-      FROM read_parquet('{drivers_path}')
+      FROM {drivers_scan}
     )
     SELECT
       driver_code,
@@ -1416,8 +1652,8 @@ def driver_standings(season: int = Query(...), round: Optional[int] = Query(None
 
 @app.get("/api/standings/constructors")
 def constructor_standings(season: int = Query(...), round: Optional[int] = Query(None, description="Optional round for race-specific standings")) -> List[Dict[str, Any]]:
-    result_path = str(BRONZE_DIR / "session_result" / f"season={season}" / "round=*" / "grand_prix=*" / "session=R" / "part-*.parquet")
-    drivers_path = str(BRONZE_DIR / "drivers" / f"season={season}" / "round=*" / "grand_prix=*" / "session=R" / "part-*.parquet")
+    result_scan = parquet_scan(bronze_files("session_result", season=season, session="R"))
+    drivers_scan = parquet_scan(bronze_files("drivers", season=season, session="R"))
     
     round_filter = ""
     if round is not None:
@@ -1426,12 +1662,12 @@ def constructor_standings(season: int = Query(...), round: Optional[int] = Query
     sql = f"""
     WITH res AS (
       SELECT driver_number, points
-      FROM read_parquet('{result_path}')
+      FROM {result_scan}
       WHERE 1=1 {round_filter}
     ),
     drv AS (
       SELECT DISTINCT driver_number, team_name
-      FROM read_parquet('{drivers_path}')
+      FROM {drivers_scan}
     )
     SELECT
       team_name,
@@ -1493,8 +1729,8 @@ def constructor_standings(season: int = Query(...), round: Optional[int] = Query
 @app.get("/api/standings/teams")
 def team_standings(season: int = Query(...), round: Optional[int] = Query(None, description="Optional round for race-specific standings")) -> List[Dict[str, Any]]:
     """Get team standings with detailed information including drivers."""
-    result_path = str(BRONZE_DIR / "session_result" / f"season={season}" / "round=*" / "grand_prix=*" / "session=R" / "part-*.parquet")
-    drivers_path = str(BRONZE_DIR / "drivers" / f"season={season}" / "round=*" / "grand_prix=*" / "session=R" / "part-*.parquet")
+    result_scan = parquet_scan(bronze_files("session_result", season=season, session="R"))
+    drivers_scan = parquet_scan(bronze_files("drivers", season=season, session="R"))
     
     round_filter = ""
     if round is not None:
@@ -1503,12 +1739,12 @@ def team_standings(season: int = Query(...), round: Optional[int] = Query(None,
     sql = f"""
     WITH res AS (
       SELECT driver_number, points
-      FROM read_parquet('{result_path}')
+      FROM {result_scan}
       WHERE 1=1 {round_filter}
     ),
     drv AS (
       SELECT DISTINCT driver_number, name_acronym AS driver_code, broadcast_name AS driver_name, team_name, team_colour, country_code
-      FROM read_parquet('{drivers_path}')
+      FROM {drivers_scan}
     ),
     team_points AS (
       SELECT
@@ -1646,99 +1882,204 @@ def team_standings(season: int = Query(...), round: Optional[int] = Query(None,
 
 @app.get("/api/telemetry")
 def telemetry(
+    background_tasks: BackgroundTasks,
     season: int = Query(..., description="Season, e.g., 2024"),
     round: int = Query(..., description="Round number"),
     session_code: str = Query("R", description="Session code (R=Race, Q=Quali, S=Sprint)"),
     driver_code: Optional[str] = Query(None, description="Driver code to return telemetry for (defaults to winner)"),
+    lap_number: Optional[int] = Query(None, description="Lap to return (defaults to the driver's fastest lap)"),
 ) -> JSONResponse:
-    if fastf1 is None:
-        raise HTTPException(status_code=500, detail="fastf1 not installed on the server")
-
-    FASTF1_CACHE.mkdir(exist_ok=True)
-    fastf1.Cache.enable_cache(str(FASTF1_CACHE))
-
-    try:
-        session = fastf1.get_session(season, round, session_code)
-        session.load()
-    except Exception as exc:  # pragma: no cover - external API
-        raise HTTPException(status_code=500, detail=f"FastF1 session load failed: {exc}")
-
-    # Use race results to pick winner if driver_code not provided
-    selected_driver = driver_code
-    results_rows: List[Dict[str, Any]] = []
-    try:
-        if session.results is not None:
-            for _, row in session.results.iterrows():
-                results_rows.append(
-                    {
-                        "position": int(row.get("Position")) if row.get("Position") is not None else None,
-                        "driver_code": row.get("Abbreviation") or row.get("DriverNumber"),
-                        "driver_name": row.get("Driver") or "",
-                        "team_name": row.get("TeamName") or row.get("Team"),
-                        "status": row.get("Status"),
-                        "points": row.get("Points"),
-                        "grid_position": row.get("GridPosition"),
-                        "time": row.get("Time") if isinstance(row.get("Time"), str) else None,
-                    }
-                )
-            if not selected_driver and results_rows:
-                results_sorted = sorted(
-                    [r for r in results_rows if r["position"] is not None],
-                    key=lambda r: r["position"],
-                )
-                if results_sorted:
-                    selected_driver = results_sorted[0]["driver_code"]
-    except Exception:
-        results_rows = []
-
-    # Fallback if still no driver
-    if not selected_driver:
-        selected_driver = session.results.iloc[0].Abbreviation if session.results is not None else None
+    """
+    Serve precomputed telemetry; on a store miss queue a FastF1 export and return 202.
+    A lap missing from a fastest-only export queues a full export (202); a lap missing
+    from a full export is a 404.
+    """
+    session_code = session_code.upper()
+    summary = telemetry_store.read_session_summary(TELEMETRY_STORE_DIR, season, round, session_code)
+    if summary is None:
+        if fastf1 is None:
+            raise HTTPException(status_code=500, detail="Telemetry not exported and fastf1 not installed on the server")
+        if not telemetry_store.export_pending(season, round, session_code):
+            background_tasks.add_task(
+                telemetry_store.export_in_background,
+                season,
+                round,
+                session_code,
+                TELEMETRY_STORE_DIR,
+                FASTF1_CACHE,
+            )
+        return JSONResponse(
+            {
+                "season": season,
+                "round": round,
+                "session": session_code,
+                "status": "pending",
+                "driver_code": driver_code,
+                "samples": [],
+                "results": [],
+                "weather": {"rain": None, "track_temp_c": None},
+            },
+            status_code=202,
+        )
 
+    selected_driver = driver_code or summary["winner"]
     samples: List[Dict[str, Any]] = []
-    try:
-        if selected_driver:
-            laps = session.laps.pick_driver(selected_driver)
-            lap = laps.pick_fastest()
-            tel = lap.get_telemetry()
-            # downsample to keep payload light
-            stride = max(1, int(len(tel) / 300))
-            for _, row in tel.iloc[::stride].iterrows():
-                samples.append(
-                    {
-                        "time_ms": float(row.get("Time").total_seconds() * 1000) if hasattr(row.get("Time"), "total_seconds") else None,
-                        "distance": float(row.get("Distance")) if row.get("Distance") is not None else None,
-                        "speed": float(row.get("Speed")) if row.get("Speed") is not None else None,
-                        "throttle": float(row.get("Throttle")) if row.get("Throttle") is not None else None,
-                        "brake": int(row.get("Brake")) if row.get("Brake") is not None else 0,
-                        "n": float(row.get("n")) if row.get("n") is not None else None,
-                        "x": float(row.get("X")) if row.get("X") is not None else None,
-                        "y": float(row.get("Y")) if row.get("Y") is not None else None,
-                    }
-                )
-    except Exception:
-        samples = []
-
-    # Weather summary (if available)
-    rain = None
-    track_temp = None
-    try:
-        weather_df = session.weather_data
-        if weather_df is not None and not weather_df.empty:
-            rain = float(weather_df["Rainfall"].max(skipna=True))
-            track_temp = float(weather_df["TrackTemp"].mean(skipna=True))
-    except Exception:
-        rain = None
-        track_temp = None
+    if selected_driver:
+        samples = telemetry_store.read_lap_samples(
+            TELEMETRY_STORE_DIR, season, round, session_code, selected_driver, lap_number=lap_number
+        ) or []
+    if lap_number is not None and not samples:
+        mode = telemetry_store.export_mode(TELEMETRY_STORE_DIR, season, round, session_code)
+        if mode != telemetry_store.FASTEST_EXPORT:
+            raise HTTPException(
+                status_code=404,
+                detail=f"No telemetry for {selected_driver} lap {lap_number} in {season} R{round} {session_code}",
+            )
+        # Only fastest laps were exported (on an earlier cache miss): export every lap.
+        if fastf1 is None:
+            raise HTTPException(status_code=500, detail="Lap not exported and fastf1 not installed on the server")
+        if not telemetry_store.export_pending(season, round, session_code):
+            background_tasks.add_task(
+                telemetry_store.export_in_background,
+                season,
+                round,
+                session_code,
+                TELEMETRY_STORE_DIR,
+                FASTF1_CACHE,
+                False,
+            )
+        return JSONResponse(
+            {
+                "season": season,
+                "round": round,
+                "session": session_code,
+                "status": "pending",
+                "driver_code": selected_driver,
+                "samples": [],
+                "results": summary["results"],
+                "weather": summary["weather"],
+            },
+            status_code=202,
+        )
 
     return JSONResponse(
         {
             "season": season,
             "round": round,
             "session": session_code,
+            "status": "ready",
             "driver_code": selected_driver,
             "samples": samples,
-            "results": results_rows,
-            "weather": {"rain": rain, "track_temp_c": track_temp},
+            "results": summary["results"],
+            "weather": summary["weather"],
         }
     )
+
+
+def _replay_source(season: int, round: int, session_code: str) -> "position_store.ReplaySource":
+    path = position_store.find_session_file(POSITION_STORE_DIR, season, round, session_code)
+    if path is None:
+        raise HTTPException(
+            status_code=404,
+            detail=f"No position data for {season} R{round} {session_code}; export it with scripts/export_position_data.py",
+        )
+    return position_store.ReplaySource(path)
+
+
+def _parse_drivers(drivers: Optional[str]) -> Optional[List[int]]:
+    if not drivers:
+        return None
+    try:
+        return [int(d) for d in drivers.split(",") if d.strip()]
+    except ValueError:
+        raise HTTPException(status_code=400, detail="drivers must be comma-separated driver numbers")
+
+
+@app.get("/api/replay/{season}/{round}/info")
+def replay_info(
+    season: int,
+    round: int,
+    session_code: str = Query("R", description="Session code"),
+) -> Dict[str, Any]:
+    """Time range and drivers of a session's position data, for setting up a replay timeline."""
+    session_code = session_code.upper()
+    source = _replay_source(season, round, session_code)
+    try:
+        return {
+            "season": season,
+            "round": round,
+            "session": session_code,
+            "start_ms": source.start_ms,
+            "end_ms": source.end_ms,
+            "drivers": source.drivers,
+            "lod": list(position_store.LOD_TOLERANCE),
+        }
+    finally:
+        source.close()
+
+
+@app.get("/api/replay/{season}/{round}/positions")
+async def replay_positions(
+    season: int,
+    round: int,
+    session_code: str = Query("R", description="Session code"),
+    start_ms: Optional[int] = Query(None, ge=0, description="Seek: session time to start from (ms)"),
+    end_ms: Optional[int] = Query(None, ge=0, description="Session time to stop at (ms); default start + 5 minutes"),
+    window_ms: int = Query(10_000, ge=1_000, le=120_000, description="Session time covered by each streamed line"),
+    lod: str = Query("medium", description="Level of detail: full, high, medium or low"),
+    drivers: Optional[str] = Query(None, description="Comma-separated driver numbers (default: all)"),
+    pace: float = Query(0.0, ge=0.0, le=64.0, description="Replay speed multiple; 0 streams as fast as the client reads"),
+) -> StreamingResponse:
+    """
+    Stream car positions as NDJSON, one line per time window read from the position store.
+
+    Lines: {"type": "meta", ...}, then {"type": "window", "t0", "t1", "cars": {"44": {"t": [...],
+    "x": [...], "y": [...]}}} per window, then {"type": "end", "next_ms"}. Seeking is a new
+    request with start_ms; with pace > 0 windows are released at that multiple of real time,
+    one window ahead of the playhead.
+    """
+    session_code = session_code.upper()
+    if lod not in position_store.LOD_TOLERANCE:
+        raise HTTPException(status_code=400, detail=f"lod must be one of {list(position_store.LOD_TOLERANCE)}")
+    tolerance = position_store.LOD_TOLERANCE[lod]
+    wanted = _parse_drivers(drivers)
+    source = await run_in_threadpool(_replay_source, season, round, session_code)
+    start = max(start_ms if start_ms is not None else source.start_ms, source.start_ms)
+    end = min(end_ms if end_ms is not None else start + 300_000, source.end_ms)
+    if end <= start:
+        source.close()
+        raise HTTPException(status_code=400, detail=f"Empty range; session spans {source.start_ms}-{source.end_ms} ms")
+
+    async def lines() -> AsyncIterator[bytes]:
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        try:
+            meta = {
+                "type": "meta",
+                "season": season,
+                "round": round,
+                "session": session_code,
+                "start_ms": start,
+                "end_ms": end,
+                "session_start_ms": source.start_ms,
+                "session_end_ms": source.end_ms,
+                "window_ms": window_ms,
+                "lod": lod,
+                "drivers": wanted or source.drivers,
+            }
+            yield (json.dumps(meta) + "\n").encode()
+            t0 = start
+            while t0 < end:
+                t1 = min(t0 + window_ms, end)
+                if pace > 0:
+                    due = started + max(0, t0 - start - window_ms) / 1000 / pace
+                    await asyncio.sleep(max(0.0, due - loop.time()))
+                cars = await run_in_threadpool(source.window, t0, t1, wanted, tolerance)
+                line = {"type": "window", "t0": t0, "t1": t1, "cars": cars}
+                yield (json.dumps(line, separators=(",", ":")) + "\n").encode()
+                t0 = t1
+            yield (json.dumps({"type": "end", "next_ms": end if end < source.end_ms else None}) + "\n").encode()
+        finally:
+            source.close()
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson", headers={"Cache-Control": "no-store"})
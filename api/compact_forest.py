@@ -0,0 +1,293 @@
+"""
+Compact, memory-mappable export of sklearn random forests plus a NumPy scorer.
+
+A trained RandomForestClassifier / RandomForestRegressor (or ExtraTrees*) is
+flattened into a handful of node arrays shared by all trees:
+
+    feature[n]      split feature of node n (-1 for leaves)
+    threshold[n]    go left when x[feature] <= threshold
+    left[n], right[n]  global child indices (-1 for leaves)
+    missing_left[n] NaN goes left (sklearn >= 1.3 missing-value support)
+    value[n, k]     per-leaf class probabilities (classifier) or prediction (regressor)
+    roots[t]        root node of tree t
+
+and written to a single `<name>.forest` file: an 8-byte magic, a little-endian
+uint64 header length, a JSON header (array dtypes/shapes/offsets, classes,
+feature names, the sha256 of the source .joblib) and the raw arrays, each
+64-byte aligned. load_forest() memory-maps the arrays, so opening a forest
+costs a header read and N workers share the pages.
+
+CompactForest.predict / predict_proba walk every (row, tree) pair at once, one
+tree level per NumPy step, and match sklearn: inputs are cast to float32 before
+the threshold comparison and per-tree leaf values are averaged. parity_check()
+compares a forest against the sklearn model it was compiled from.
+
+scripts/export_compact_forest.py builds the files; the API's model registry
+serves them in place of the joblib model when they are up to date.
+"""
+
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+import numpy as np
+
+MAGIC = b"F1FOREST"
+FORMAT_VERSION = 1
+SUFFIX = ".forest"
+_ALIGN = 64
+_ROW_CHUNK = 4096
+
+
+def file_sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as fh:
+        for chunk in iter(lambda: fh.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class CompactForest:
+    """Array-backed forest with the predict / predict_proba surface the API uses."""
+
+    def __init__(self, arrays: Dict[str, np.ndarray], header: Dict[str, Any]):
+        self.feature = arrays["feature"]
+        self.threshold = arrays["threshold"]
+        self.left = arrays["left"]
+        self.right = arrays["right"]
+        self.missing_left = arrays["missing_left"]
+        self.value = arrays["value"]
+        self.roots = arrays["roots"]
+        self.kind: str = header["kind"]
+        self.max_depth: int = int(header["max_depth"])
+        self.n_features_in_: int = int(header["n_features"])
+        names = header.get("feature_names")
+        self.feature_names_in_ = np.asarray(names, dtype=object) if names else None
+        self.classes_ = np.asarray(header["classes"]) if header.get("classes") is not None else None
+        self.source_sha256: Optional[str] = header.get("source_sha256")
+        self.header = header
+
+    @property
+    def n_estimators(self) -> int:
+        return int(self.roots.shape[0])
+
+    @property
+    def n_nodes(self) -> int:
+        return int(self.feature.shape[0])
+
+    def _matrix(self, X: Any) -> np.ndarray:
+        if hasattr(X, "columns"):
+            if self.feature_names_in_ is not None:
+                missing = [c for c in self.feature_names_in_ if c not in X.columns]
+                if missing:
+                    raise ValueError(f"Missing feature columns: {missing}")
+                X = X[list(self.feature_names_in_)]
+            X = X.to_numpy()
+        # sklearn trees compare float32 inputs against float64 thresholds
+        X = np.asarray(X, dtype=np.float32)
+        if X.ndim != 2 or X.shape[1] != self.n_features_in_:
+            raise ValueError(f"Expected {self.n_features_in_} features, got shape {X.shape}")
+        return X
+
+    def apply(self, X: Any) -> np.ndarray:
+        """Leaf node index reached by every (row, tree): shape (n_rows, n_estimators)."""
+        X = self._matrix(X)
+        out = np.empty((X.shape[0], self.n_estimators), dtype=np.int64)
+        for start in range(0, X.shape[0], _ROW_CHUNK):
+            chunk = X[start : start + _ROW_CHUNK]
+            node = np.broadcast_to(np.asarray(self.roots, dtype=np.int64), (chunk.shape[0], self.n_estimators)).copy()
+            rows = np.arange(chunk.shape[0])[:, None]
+            for _ in range(self.max_depth):
+                feat = self.feature[node]
+                internal = feat >= 0
+                if not internal.any():
+                    break
+                x = chunk[rows, np.where(internal, feat, 0)]
+                go_left = np.where(np.isnan(x), self.missing_left[node], x <= self.threshold[node])
+                node = np.where(internal, np.where(go_left, self.left[node], self.right[node]), node)
+            out[start : start + chunk.shape[0]] = node
+        return out
+
+    def _leaf_mean(self, X: Any) -> np.ndarray:
+        leaves = self.apply(X)
+        return self.value[leaves].mean(axis=1)
+
+    def predict_proba(self, X: Any) -> np.ndarray:
+        if self.kind != "classifier":
+            raise AttributeError("predict_proba is only available for classifiers")
+        return self._leaf_mean(X)
+
+    def predict(self, X: Any) -> np.ndarray:
+        mean = self._leaf_mean(X)
+        if self.kind == "classifier":
+            return self.classes_[np.argmax(mean, axis=1)]
+        return mean[:, 0]
+
+
+def compile_forest(model: Any, source_sha256: Optional[str] = None) -> CompactForest:
+    """Flatten a fitted sklearn forest; raises ValueError for anything else."""
+    estimators = getattr(model, "estimators_", None)
+    if not estimators or not all(hasattr(est, "tree_") for est in estimators):
+        raise ValueError(f"{type(model).__name__} is not a fitted tree ensemble")
+    is_classifier = hasattr(model, "classes_")
+    if getattr(model, "n_outputs_", 1) != 1:
+        raise ValueError("Multi-output forests are not supported")
+
+    features, thresholds, lefts, rights, missing, values, roots = [], [], [], [], [], [], []
+    offset = 0
+    max_depth = 0
+    for est in estimators:
+        tree = est.tree_
+        n = tree.node_count
+        leaf = tree.children_left == -1
+        value = np.asarray(tree.value[:, 0, :], dtype=np.float64)
+        if is_classifier:
+            totals = value.sum(axis=1, keepdims=True)
+            value = np.divide(value, totals, out=np.zeros_like(value), where=totals > 0)
+        roots.append(offset)
+        features.append(np.where(leaf, -1, tree.feature).astype(np.int32))
+        thresholds.append(np.asarray(tree.threshold, dtype=np.float64))
+        lefts.append(np.where(leaf, -1, tree.children_left + offset).astype(np.int64))
+        rights.append(np.where(leaf, -1, tree.children_right + offset).astype(np.int64))
+        go_left = getattr(tree, "missing_go_to_left", None)
+        missing.append(np.asarray(go_left, dtype=bool) if go_left is not None else np.zeros(n, dtype=bool))
+        values.append(value)
+        max_depth = max(max_depth, int(tree.max_depth))
+        offset += n
+
+    names = getattr(model, "feature_names_in_", None)
+    header = {
+        "kind": "classifier" if is_classifier else "regressor",
+        "model_type": type(model).__name__,
+        "max_depth": max_depth,
+        "n_features": int(model.n_features_in_),
+        "feature_names": [str(c) for c in names] if names is not None else None,
+        "classes": model.classes_.tolist() if is_classifier else None,
+        "source_sha256": source_sha256,
+    }
+    arrays = {
+        "feature": np.concatenate(features),
+        "threshold": np.concatenate(thresholds),
+        "left": np.concatenate(lefts),
+        "right": np.concatenate(rights),
+        "missing_left": np.concatenate(missing),
+        "value": np.concatenate(values),
+        "roots": np.asarray(roots, dtype=np.int64),
+    }
+    return CompactForest(arrays, header)
+
+
+def write_forest(forest: CompactForest, path: Path) -> None:
+    """Write the forest atomically (tmp file + os.replace)."""
+    arrays = {
+        "feature": forest.feature,
+        "threshold": forest.threshold,
+        "left": forest.left,
+        "right": forest.right,
+        "missing_left": forest.missing_left,
+        "value": forest.value,
+        "roots": forest.roots,
+    }
+    specs: Dict[str, Dict[str, Any]] = {}
+    offset = 0
+    for name, arr in arrays.items():
+        arr = np.ascontiguousarray(arr)
+        arrays[name] = arr
+        offset = (offset + _ALIGN - 1) // _ALIGN * _ALIGN
+        specs[name] = {"dtype": arr.dtype.newbyteorder("<").str, "shape": list(arr.shape), "offset": offset}
+        offset += arr.nbytes
+    header = dict(forest.header, format_version=FORMAT_VERSION, arrays=specs)
+    header_bytes = json.dumps(header).encode()
+    data_start = (len(MAGIC) + 8 + len(header_bytes) + _ALIGN - 1) // _ALIGN * _ALIGN
+
+    path = Path(path)
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, "wb") as fh:
+        fh.write(MAGIC)
+        fh.write(len(header_bytes).to_bytes(8, "little"))
+        fh.write(header_bytes)
+        for name, arr in arrays.items():
+            fh.seek(data_start + specs[name]["offset"])
+            fh.write(arr.astype(specs[name]["dtype"], copy=False).tobytes())
+    os.replace(tmp, path)
+
+
+def load_forest(path: Path, mmap: bool = True) -> CompactForest:
+    """Open a .forest file; arrays are memory-mapped unless mmap=False."""
+    path = Path(path)
+    with open(path, "rb") as fh:
+        if fh.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"{path} is not a compact forest file")
+        header_len = int.from_bytes(fh.read(8), "little")
+        header = json.loads(fh.read(header_len))
+    if header.get("format_version") != FORMAT_VERSION:
+        raise ValueError(f"{path}: unsupported forest format {header.get('format_version')}")
+    data_start = (len(MAGIC) + 8 + header_len + _ALIGN - 1) // _ALIGN * _ALIGN
+    arrays = {}
+    for name, spec in header["arrays"].items():
+        dtype = np.dtype(spec["dtype"])
+        shape = tuple(spec["shape"])
+        if mmap and int(np.prod(shape)) > 0:
+            mapped = np.memmap(path, dtype=dtype, mode="r", offset=data_start + spec["offset"], shape=shape)
+            # plain ndarray view over the mapping: indexing results are ordinary arrays
+            arrays[name] = mapped.view(np.ndarray)
+        else:
+            with open(path, "rb") as fh:
+                fh.seek(data_start + spec["offset"])
+                arrays[name] = np.frombuffer(fh.read(dtype.itemsize * int(np.prod(shape))), dtype=dtype).reshape(shape)
+    return CompactForest(arrays, header)
+
+
+def parity_check(model: Any, forest: CompactForest, X: Any, atol: float = 1e-9) -> Dict[str, Any]:
+    """
+    Compare the compiled forest with the sklearn model on X.
+
+    Returns {"rows", "max_abs_diff", "ok"}; classifiers compare predict_proba,
+    regressors predict.
+    """
+    if forest.kind == "classifier":
+        expected = np.asarray(model.predict_proba(X), dtype=np.float64)
+        actual = forest.predict_proba(X)
+    else:
+        expected = np.asarray(model.predict(X), dtype=np.float64)
+        actual = forest.predict(X)
+    diff = float(np.max(np.abs(expected - actual))) if len(expected) else 0.0
+    return {"rows": int(len(expected)), "max_abs_diff": diff, "ok": diff <= atol}
+
+
+def parity_sample(forest: CompactForest, n_rows: int = 2000, seed: int = 0) -> np.ndarray:
+    """
+    Synthetic inputs that exercise both sides of every split: each feature is drawn
+    from its own thresholds (nudged up and down) plus values outside their range,
+    with some NaNs when the trees learned where missing values go.
+    """
+    rng = np.random.default_rng(seed)
+    internal = np.asarray(forest.feature) >= 0
+    feats = np.asarray(forest.feature)[internal]
+    thresholds = np.asarray(forest.threshold)[internal]
+    X = np.zeros((n_rows, forest.n_features_in_), dtype=np.float64)
+    for j in range(forest.n_features_in_):
+        cuts = thresholds[feats == j]
+        cuts = cuts[np.isfinite(cuts)]  # splits learned on missing values use threshold inf
+        if cuts.size == 0:
+            X[:, j] = rng.normal(size=n_rows)
+            continue
+        lo, hi = float(cuts.min()), float(cuts.max())
+        span = max(hi - lo, 1.0)
+        pool = np.concatenate([cuts - 1e-6 * span, cuts + 1e-6 * span, [lo - span, hi + span]])
+        X[:, j] = rng.choice(pool, size=n_rows)
+    if np.asarray(forest.missing_left).any():
+        X[rng.random(X.shape) < 0.05] = np.nan
+    return X
+
+
+def sample_frame(forest: CompactForest, X: np.ndarray) -> Any:
+    """Wrap X in a DataFrame with the training feature names when the model has them."""
+    if forest.feature_names_in_ is None:
+        return X
+    import pandas as pd
+
+    return pd.DataFrame(X, columns=list(forest.feature_names_in_))
+
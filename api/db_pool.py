@@ -0,0 +1,226 @@
+"""
+Pooled, read-only DuckDB access for the API.
+
+One database handle is opened per pool and every worker thread gets its own
+cursor on it (FastAPI runs sync endpoints in a thread pool), so bursts of
+requests pay the catalog load and file-open cost once. The handle is reopened
+transparently when the underlying file changes (detected via inode / mtime /
+size).
+
+A read-only handle still holds a lock on the warehouse file, and the build
+scripts open it read-write in place, so the handle is closed once no cursor
+has been checked out for ``idle_ttl_s`` seconds. A build can then take the
+lock between bursts of requests; the next request reopens the file.
+"""
+
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Deque, Dict, Iterator, Optional, Tuple
+
+import duckdb
+
+
+def _percentile(values: list[float], pct: float) -> Optional[float]:
+    if not values:
+        return None
+    ordered = sorted(values)
+    idx = min(len(ordered) - 1, int(round(pct / 100.0 * (len(ordered) - 1))))
+    return ordered[idx]
+
+
+class ConnectionPool:
+    """Per-thread cursors over a single read-only DuckDB database handle.
+
+    ``path=None`` gives an in-memory database, used for ad-hoc Parquet scans.
+    """
+
+    def __init__(
+        self,
+        path: Optional[Path],
+        name: str,
+        latency_window: int = 1024,
+        drain_timeout_s: float = 30.0,
+        idle_ttl_s: float = 2.0,
+    ):
+        self.path = path
+        self.name = name
+        self.drain_timeout_s = drain_timeout_s
+        self.idle_ttl_s = idle_ttl_s
+        self._cond = threading.Condition()
+        self._handle: Optional[duckdb.DuckDBPyConnection] = None
+        self._file_stamp: Optional[Tuple[int, int, int]] = None
+        self._generation = 0
+        # thread ident -> (generation, cursor, in_use)
+        self._cursors: Dict[int, Tuple[int, duckdb.DuckDBPyConnection, bool]] = {}
+        self._busy = 0
+        self._idle_since = 0.0
+        self._idle_timer: Optional[threading.Timer] = None
+        self._latencies_ms: Deque[float] = deque(maxlen=latency_window)
+        self._checkouts = 0
+        self._reopens = 0
+        self._idle_closes = 0
+        self._temp_cursors = 0
+
+    def _stat(self) -> Optional[Tuple[int, int, int]]:
+        if self.path is None:
+            return None
+        st = os.stat(self.path)
+        return (st.st_ino, st.st_mtime_ns, st.st_size)
+
+    def _open(self) -> duckdb.DuckDBPyConnection:
+        if self.path is None:
+            return duckdb.connect(":memory:")
+        try:
+            return duckdb.connect(str(self.path), read_only=True)
+        except TypeError:
+            # Fallback for duckdb versions without read_only arg
+            return duckdb.connect(str(self.path))
+
+    def _close_all(self) -> None:
+        for _, cur, _ in self._cursors.values():
+            try:
+                cur.close()
+            except duckdb.Error:  # type: ignore[attr-defined]
+                pass
+        self._cursors.clear()
+        if self._handle is not None:
+            self._handle.close()
+        self._handle = None
+
+    def _schedule_idle_close(self) -> None:
+        # Caller holds self._cond and has just released the last cursor.
+        self._idle_since = time.monotonic()
+        if self.path is None or self._handle is None or self._idle_timer is not None:
+            return  # in-memory pools hold no file lock
+        if self.idle_ttl_s <= 0:
+            self._close_idle()
+            return
+        self._idle_timer = threading.Timer(self.idle_ttl_s, self._close_if_idle)
+        self._idle_timer.daemon = True
+        self._idle_timer.start()
+
+    def _close_if_idle(self) -> None:
+        with self._cond:
+            self._idle_timer = None
+            if self._handle is None or self._busy:
+                return  # the next release schedules a new check
+            remaining = self._idle_since + self.idle_ttl_s - time.monotonic()
+            if remaining > 0:
+                self._idle_timer = threading.Timer(remaining, self._close_if_idle)
+                self._idle_timer.daemon = True
+                self._idle_timer.start()
+                return
+            self._close_idle()
+
+    def _close_idle(self) -> None:
+        self._close_all()
+        self._file_stamp = None
+        self._idle_closes += 1
+
+    def _current_handle(self, ident: int) -> duckdb.DuckDBPyConnection:
+        """Return the open handle, reopening it if the file was replaced.
+
+        DuckDB caches database instances per path for as long as any
+        connection to them is alive, so a swap waits for in-flight cursors
+        to be released and closes every cursor before reconnecting.
+        """
+        stamp = self._stat()
+        if self._handle is not None and stamp == self._file_stamp:
+            return self._handle
+        entry = self._cursors.get(ident)
+        if self._handle is not None and entry is not None and entry[2]:
+            # This thread is mid-query on the old handle; swap on a later checkout.
+            return self._handle
+        if self._handle is not None:
+            generation = self._generation
+            drained = self._cond.wait_for(lambda: self._busy == 0, timeout=self.drain_timeout_s)
+            if self._generation != generation and self._handle is not None:
+                # Another thread completed the swap while we were waiting.
+                return self._handle
+            if not drained and self._handle is not None:
+                # Cursors are still mid-query: keep serving the old snapshot.
+                return self._handle
+            if self._handle is not None:
+                self._close_all()
+                self._reopens += 1
+        self._handle = self._open()
+        self._file_stamp = stamp
+        self._generation += 1
+        return self._handle
+
+    @contextmanager
+    def cursor(self) -> Iterator[duckdb.DuckDBPyConnection]:
+        """Check out this thread's cursor for the duration of the block."""
+        started = time.perf_counter()
+        ident = threading.get_ident()
+
+        temp = False
+        with self._cond:
+            handle = self._current_handle(ident)
+            entry = self._cursors.get(ident)
+            if entry is not None and entry[2]:
+                # Nested checkout on the same thread: hand out a private cursor
+                # so the outer block's pending result is not clobbered.
+                cur = handle.cursor()
+                temp = True
+                self._temp_cursors += 1
+            else:
+                if entry is None or entry[0] != self._generation:
+                    cur = handle.cursor()
+                else:
+                    cur = entry[1]
+                self._cursors[ident] = (self._generation, cur, True)
+            self._busy += 1
+            self._checkouts += 1
+            self._latencies_ms.append((time.perf_counter() - started) * 1000.0)
+
+        try:
+            yield cur
+        finally:
+            with self._cond:
+                if temp:
+                    cur.close()
+                else:
+                    current = self._cursors.get(ident)
+                    if current is not None and current[1] is cur:
+                        self._cursors[ident] = (current[0], cur, False)
+                self._busy -= 1
+                if self._busy == 0:
+                    self._schedule_idle_close()
+                self._cond.notify_all()
+
+    def close(self) -> None:
+        with self._cond:
+            if self._idle_timer is not None:
+                self._idle_timer.cancel()
+                self._idle_timer = None
+            self._close_all()
+            self._file_stamp = None
+
+    def stats(self) -> Dict[str, Any]:
+        with self._cond:
+            latencies = list(self._latencies_ms)
+            return {
+                "name": self.name,
+                "path": str(self.path) if self.path is not None else ":memory:",
+                "open": self._handle is not None,
+                "generation": self._generation,
+                "pool_size": len(self._cursors),
+                "in_use": self._busy,
+                "checkouts": self._checkouts,
+                "temp_cursors": self._temp_cursors,
+                "reopens": self._reopens,
+                "idle_closes": self._idle_closes,
+                "idle_ttl_s": self.idle_ttl_s,
+                "checkout_latency_ms": {
+                    "samples": len(latencies),
+                    "p50": _percentile(latencies, 50),
+                    "p95": _percentile(latencies, 95),
+                    "p99": _percentile(latencies, 99),
+                    "max": max(latencies) if latencies else None,
+                },
+            }
@@ -0,0 +1,385 @@
+"""
+Columnar GPS position store (bronze_fastf1/position).
+
+Partitioning is unchanged, so fastf1.position_data keeps reading the same glob:
+
+    position/season=2024/grand_prix_slug=bahrain-grand-prix/session_code=R/part-00000.parquet
+
+One file per session, rows sorted by (driver_number, session_time_ms):
+
+    season, round                   int16
+    grand_prix_slug, session_code   dictionary<int8, string>
+    driver_number                   int16
+    session_time_ms                 int32   ms since session start (delta encoded)
+    Date                            timestamp[ms]
+    Status                          dictionary<int8, string>   OnTrack / OffTrack
+    X, Y                            int32   FastF1 units (1/10 m), rounded
+    Z                               int16
+
+Row groups are small (ROW_GROUP_SIZE rows) and carry min/max statistics, so a
+read filtered on driver_number and a session_time_ms window only decodes the
+row groups that overlap it (see read_window, and ReplaySource which serves
+/api/replay/{season}/{round}/positions).
+
+Samples are thinned by error-bounded simplification instead of a fixed stride:
+a sample is dropped only if linear interpolation in time between the kept
+neighbours stays within `tolerance` units of it (time-synchronized
+Douglas-Peucker), status changes are always kept, and no two kept samples are
+more than `max_gap_ms` apart. Straights collapse to a few points while corners
+keep their shape.
+"""
+
+import logging
+import os
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+
+logger = logging.getLogger("position_store")
+
+PART_FILE = "part-00000.parquet"
+ROW_GROUP_SIZE = 4096
+DEFAULT_TOLERANCE = 20.0  # FastF1 units (1/10 m): 2 m, under half a car length
+DEFAULT_MAX_GAP_MS = 5000
+
+_DICT_COLUMNS = ["grand_prix_slug", "session_code", "Status", "season", "round", "driver_number"]
+_DELTA_COLUMNS = {"session_time_ms": "DELTA_BINARY_PACKED", "X": "DELTA_BINARY_PACKED", "Y": "DELTA_BINARY_PACKED"}
+
+
+def session_file(table_root: Path, season: int, slug: str, session_code: str) -> Path:
+    return table_root / f"season={season}" / f"grand_prix_slug={slug}" / f"session_code={session_code}" / PART_FILE
+
+
+def stride_mask(n: int, sample_rate: int) -> np.ndarray:
+    mask = np.zeros(n, dtype=bool)
+    mask[:: max(1, sample_rate)] = True
+    return mask
+
+
+def simplify_mask(
+    t_ms: np.ndarray,
+    xyz: np.ndarray,
+    tolerance: float,
+    max_gap_ms: int = DEFAULT_MAX_GAP_MS,
+    forced: Optional[np.ndarray] = None,
+) -> np.ndarray:
+    """
+    Samples to keep so that interpolating between kept samples is within `tolerance`.
+
+    t_ms must be sorted; xyz is (n, 3). Error is the synchronized Euclidean
+    distance: the gap between a dropped sample and the position interpolated at
+    its own timestamp, which is what a time-based replay would draw.
+
+    Douglas-Peucker refined level by level: each pass evaluates every open
+    segment at once and splits the failing ones at their worst sample (or, for
+    segments longer than max_gap_ms, at their midpoint). Segments that pass are
+    retired, so later passes only touch the samples still in question.
+    """
+    n = len(t_ms)
+    keep = np.zeros(n, dtype=bool)
+    if n == 0:
+        return keep
+    keep[0] = keep[-1] = True
+    if forced is not None:
+        keep |= forced
+    t = t_ms.astype(np.float64)
+    # Seed one anchor per max_gap_ms: the gap rule would keep them anyway, and
+    # short initial segments keep the number of refinement passes small.
+    keep[np.searchsorted(t, np.arange(t[0], t[-1], max_gap_ms))] = True
+    open_ = np.ones(n, dtype=bool)
+    while True:
+        anchors = np.flatnonzero(keep)
+        if len(anchors) < 2:
+            return keep
+        pos = np.flatnonzero(open_)
+        if len(pos) == 0:
+            return keep
+        seg = np.minimum(np.searchsorted(anchors, pos, side="right") - 1, len(anchors) - 2)
+        a, b = anchors[seg], anchors[seg + 1]
+        span = t[b] - t[a]
+        frac = np.divide(t[pos] - t[a], span, out=np.zeros(len(pos)), where=span > 0)
+        err = np.sqrt(((xyz[pos] - (xyz[a] + frac[:, None] * (xyz[b] - xyz[a]))) ** 2).sum(axis=1))
+        err[keep[pos]] = 0.0
+
+        starts = np.flatnonzero(np.r_[True, seg[1:] != seg[:-1]])
+        seg_max = np.maximum.reduceat(err, starts)
+        seg_a, seg_b = a[starts], b[starts]
+        failing = seg_max > tolerance
+        long_gap = ~failing & (t[seg_b] - t[seg_a] > max_gap_ms) & (seg_b - seg_a >= 2)
+
+        point_max = np.repeat(seg_max, np.diff(np.r_[starts, len(pos)]))
+        worst = np.flatnonzero((err > tolerance) & (err == point_max))
+        _, first = np.unique(seg[worst], return_index=True)
+        split = pos[worst[first]]
+        if long_gap.any():
+            mid = np.searchsorted(t, (t[seg_a[long_gap]] + t[seg_b[long_gap]]) / 2)
+            split = np.concatenate([split, np.clip(mid, seg_a[long_gap] + 1, seg_b[long_gap] - 1)])
+
+        settled = np.repeat(~failing & ~long_gap, np.diff(np.r_[starts, len(pos)]))
+        open_[pos[settled]] = False
+        if len(split) == 0:
+            return keep
+        keep[split] = True
+
+
+def _driver_frame(
+    driver_number: str,
+    pos: pd.DataFrame,
+    tolerance: Optional[float],
+    sample_rate: int,
+    max_gap_ms: int,
+) -> Optional[pd.DataFrame]:
+    time_col = "SessionTime" if "SessionTime" in pos.columns else "Time"
+    if time_col not in pos.columns:
+        return None
+    df = pos.dropna(subset=[time_col, "X", "Y"])
+    if df.empty:
+        return None
+    t_ms = (df[time_col].dt.total_seconds().to_numpy() * 1000).round().astype(np.int64)
+    order = np.argsort(t_ms, kind="stable")
+    df = df.iloc[order]
+    t_ms = t_ms[order]
+    xyz = np.column_stack(
+        [df["X"].to_numpy(float), df["Y"].to_numpy(float), df["Z"].fillna(0).to_numpy(float) if "Z" in df else np.zeros(len(df))]
+    )
+    status = df["Status"].astype(str).to_numpy() if "Status" in df.columns else None
+
+    if tolerance:
+        forced = None
+        if status is not None and len(status) > 1:
+            change = np.flatnonzero(status[1:] != status[:-1])
+            forced = np.zeros(len(df), dtype=bool)
+            forced[change] = True
+            forced[change + 1] = True
+        mask = simplify_mask(t_ms, xyz, tolerance, max_gap_ms, forced)
+    else:
+        mask = stride_mask(len(df), sample_rate)
+
+    out = pd.DataFrame(
+        {
+            "driver_number": np.int16(int(driver_number)),
+            "session_time_ms": t_ms[mask].astype(np.int32),
+            "Date": df["Date"].to_numpy()[mask] if "Date" in df.columns else pd.NaT,
+            "Status": status[mask] if status is not None else None,
+            "X": np.rint(xyz[mask, 0]).astype(np.int32),
+            "Y": np.rint(xyz[mask, 1]).astype(np.int32),
+            "Z": np.clip(np.rint(xyz[mask, 2]), -32768, 32767).astype(np.int16),
+        }
+    )
+    return out
+
+
+def _dictionary(value: str, length: int) -> pa.Array:
+    return pa.DictionaryArray.from_arrays(pa.array(np.zeros(length, dtype=np.int8)), pa.array([value]))
+
+
+def build_position_table(
+    pos_data: Dict[str, pd.DataFrame],
+    season: int,
+    round_num: int,
+    slug: str,
+    session_code: str,
+    tolerance: Optional[float] = DEFAULT_TOLERANCE,
+    sample_rate: int = 10,
+    max_gap_ms: int = DEFAULT_MAX_GAP_MS,
+) -> Optional[pa.Table]:
+    """
+    Arrow table in the store layout from FastF1 `session.pos_data`.
+
+    tolerance > 0 selects error-bounded simplification; None/0 keeps every
+    `sample_rate`-th sample (the old fixed-stride behaviour).
+    """
+    frames = []
+    for driver_number in sorted(pos_data, key=lambda d: int(d)):
+        frame = _driver_frame(driver_number, pos_data[driver_number], tolerance, sample_rate, max_gap_ms)
+        if frame is not None and not frame.empty:
+            frames.append(frame)
+    if not frames:
+        return None
+    df = pd.concat(frames, ignore_index=True)
+    n = len(df)
+    status = df["Status"].astype("string") if df["Status"].notna().any() else pd.Series([None] * n, dtype="string")
+    return pa.table(
+        {
+            "season": pa.array(np.full(n, season, dtype=np.int16)),
+            "round": pa.array(np.full(n, round_num, dtype=np.int16)),
+            "grand_prix_slug": _dictionary(slug, n),
+            "session_code": _dictionary(session_code, n),
+            "driver_number": pa.array(df["driver_number"].to_numpy(np.int16)),
+            "session_time_ms": pa.array(df["session_time_ms"].to_numpy(np.int32)),
+            "Date": pa.array(pd.to_datetime(df["Date"]), from_pandas=True).cast(pa.timestamp("ms"), safe=False),
+            "Status": pa.array(status, from_pandas=True).dictionary_encode(),
+            "X": pa.array(df["X"].to_numpy(np.int32)),
+            "Y": pa.array(df["Y"].to_numpy(np.int32)),
+            "Z": pa.array(df["Z"].to_numpy(np.int16)),
+        }
+    )
+
+
+def write_position_file(table: pa.Table, path: Path, row_group_size: int = ROW_GROUP_SIZE) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    pq.write_table(
+        table,
+        tmp,
+        row_group_size=row_group_size,
+        compression="zstd",
+        use_dictionary=_DICT_COLUMNS,
+        column_encoding=_DELTA_COLUMNS,
+        write_statistics=True,
+    )
+    os.replace(tmp, path)
+
+
+def read_window(
+    path: Path,
+    start_ms: Optional[int] = None,
+    end_ms: Optional[int] = None,
+    drivers: Optional[Iterable[int]] = None,
+    columns: Optional[List[str]] = None,
+) -> pa.Table:
+    """Rows with start_ms <= session_time_ms < end_ms; row groups outside the window are skipped."""
+    filters = []
+    if start_ms is not None:
+        filters.append(("session_time_ms", ">=", int(start_ms)))
+    if end_ms is not None:
+        filters.append(("session_time_ms", "<", int(end_ms)))
+    if drivers is not None:
+        filters.append(("driver_number", "in", [int(d) for d in drivers]))
+    return pq.read_table(path, columns=columns, filters=filters or None)
+
+
+# Replay level-of-detail presets: simplification tolerance (FastF1 units) applied
+# per window on top of what the store already holds; 0 = every stored sample.
+LOD_TOLERANCE = {"full": 0.0, "high": 50.0, "medium": 150.0, "low": 500.0}
+
+_REPLAY_COLUMNS = ["driver_number", "session_time_ms", "X", "Y"]
+
+
+def find_session_file(table_root: Path, season: int, round_num: int, session_code: str) -> Optional[Path]:
+    """The session's file; partitions are keyed by slug, so match the round via the `round` column."""
+    for path in sorted(table_root.glob(f"season={season}/grand_prix_slug=*/session_code={session_code}/*.parquet")):
+        try:
+            if _file_round(str(path), path.stat().st_mtime) == round_num:
+                return path
+        except OSError:
+            continue
+    return None
+
+
+@lru_cache(maxsize=1024)
+def _file_round(path: str, _mtime: float) -> Optional[int]:
+    pf = pq.ParquetFile(path)
+    if "round" not in pf.schema_arrow.names or pf.metadata.num_row_groups == 0:
+        return None
+    idx = pf.schema_arrow.get_field_index("round")
+    stats = pf.metadata.row_group(0).column(idx).statistics
+    if stats is not None and stats.has_min_max:
+        return int(stats.min)
+    values = pf.read_row_group(0, columns=["round"]).column(0).drop_null()
+    return int(values[0].as_py()) if len(values) else None
+
+
+def _legacy_table(pf: pq.ParquetFile) -> pa.Table:
+    """Pre-store exports (float X/Y, string driver numbers, session_time_seconds) in replay columns."""
+    df = pf.read(columns=["driver_number", "session_time_seconds", "X", "Y"]).to_pandas()
+    df = df.dropna(subset=["session_time_seconds", "X", "Y"])
+    out = pd.DataFrame(
+        {
+            "driver_number": pd.to_numeric(df["driver_number"], errors="coerce").astype("int16"),
+            "session_time_ms": (df["session_time_seconds"] * 1000).round().astype("int32"),
+            "X": np.rint(df["X"]).astype("int32"),
+            "Y": np.rint(df["Y"]).astype("int32"),
+        }
+    ).sort_values(["driver_number", "session_time_ms"], kind="stable")
+    return pa.Table.from_pandas(out, preserve_index=False)
+
+
+class ReplaySource:
+    """
+    Windowed reader over one session file for replay streaming.
+
+    The file stays open and only the row groups whose driver_number /
+    session_time_ms statistics overlap a window are read. Files written before
+    the store format are small (stride-sampled) and are loaded once instead.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._pf = pq.ParquetFile(path)
+        self._table: Optional[pa.Table] = None
+        self._groups: List[tuple] = []
+        names = self._pf.schema_arrow.names
+        if "session_time_ms" not in names:
+            self._table = _legacy_table(self._pf)
+            drivers = self._table.column("driver_number")
+            times = self._table.column("session_time_ms")
+        else:
+            meta = self._pf.metadata
+            d_idx, t_idx = names.index("driver_number"), names.index("session_time_ms")
+            for i in range(meta.num_row_groups):
+                rg = meta.row_group(i)
+                d_stats, t_stats = rg.column(d_idx).statistics, rg.column(t_idx).statistics
+                if d_stats is None or t_stats is None or not (d_stats.has_min_max and t_stats.has_min_max):
+                    self._groups.append((i, None, None, None, None))
+                else:
+                    self._groups.append((i, d_stats.min, d_stats.max, t_stats.min, t_stats.max))
+            drivers = self._pf.read(columns=["driver_number"]).column(0)
+            times = self._pf.read(columns=["session_time_ms"]).column(0)
+        self.drivers = sorted(int(d) for d in pc.unique(drivers).to_pylist() if d is not None)
+        self.start_ms = int(pc.min(times).as_py() or 0)
+        self.end_ms = int(pc.max(times).as_py() or 0) + 1
+
+    def read(self, start_ms: int, end_ms: int, drivers: Optional[Iterable[int]] = None) -> pa.Table:
+        wanted = sorted(set(int(d) for d in drivers)) if drivers is not None else None
+        if self._table is not None:
+            table = self._table
+        else:
+            groups = [
+                i
+                for i, d_min, d_max, t_min, t_max in self._groups
+                if t_min is None
+                or (
+                    t_max >= start_ms
+                    and t_min < end_ms
+                    and (wanted is None or any(d_min <= d <= d_max for d in wanted))
+                )
+            ]
+            if not groups:
+                return pa.table({c: pa.array([], type=pa.int32()) for c in _REPLAY_COLUMNS})
+            table = self._pf.read_row_groups(groups, columns=_REPLAY_COLUMNS)
+        t = table.column("session_time_ms")
+        mask = pc.and_(pc.greater_equal(t, start_ms), pc.less(t, end_ms))
+        if wanted is not None:
+            mask = pc.and_(mask, pc.is_in(table.column("driver_number"), pa.array(wanted, type=pa.int16())))
+        return table.filter(mask)
+
+    def window(
+        self, start_ms: int, end_ms: int, drivers: Optional[Iterable[int]] = None, tolerance: float = 0.0
+    ) -> Dict[str, Dict[str, list]]:
+        """Per-driver columnar samples {"44": {"t": [...], "x": [...], "y": [...]}} for one window."""
+        table = self.read(start_ms, end_ms, drivers)
+        out: Dict[str, Dict[str, list]] = {}
+        if table.num_rows == 0:
+            return out
+        d = table.column("driver_number").to_numpy()
+        t = table.column("session_time_ms").to_numpy()
+        x = table.column("X").to_numpy()
+        y = table.column("Y").to_numpy()
+        bounds = np.flatnonzero(np.r_[True, d[1:] != d[:-1], True])
+        for lo, hi in zip(bounds[:-1], bounds[1:]):
+            keep = slice(lo, hi)
+            if tolerance > 0 and hi - lo > 2:
+                xyz = np.column_stack([x[keep], y[keep], np.zeros(hi - lo)]).astype(np.float64)
+                keep = lo + np.flatnonzero(simplify_mask(t[keep], xyz, tolerance))
+            out[str(int(d[lo]))] = {"t": t[keep].tolist(), "x": x[keep].tolist(), "y": y[keep].tolist()}
+        return out
+
+    def close(self) -> None:
+        self._pf.close()
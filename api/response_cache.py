@@ -0,0 +1,196 @@
+"""
+Response cache for read endpoints whose data only changes when the warehouse is rebuilt.
+
+Entries are keyed by route + query string and by a generation token made of:
+- the stamp build scripts write next to the warehouse (<name>.generation.json), which
+  the ingestor also bumps whenever it changes bronze files, and
+- the warehouse file's own inode / mtime / size (covers in-place writes such as
+  bronze catalog refreshes).
+
+A token change makes every older entry unreachable. Bodies live in an in-process LRU
+and, when F1_API_CACHE_DIR is set, in one file per entry so warm caches survive
+restarts and are shared across workers. Each entry carries an ETag so clients that
+send If-None-Match get a 304 without the body being rebuilt.
+"""
+
+import hashlib
+import json
+import os
+import re
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from fastapi import Request
+from fastapi.responses import Response
+
+GENERATION_SUFFIX = ".generation.json"  # kept in sync with scripts/warehouse_generation.py
+
+
+class ResponseCache:
+    def __init__(
+        self,
+        warehouse_path: Path,
+        routes: Iterable[str],
+        max_entries: int = 512,
+        disk_dir: Optional[Path] = None,
+    ):
+        self.warehouse_path = warehouse_path
+        self.routes = [re.compile(r) for r in routes]
+        self.max_entries = max_entries
+        self.disk_dir = disk_dir
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, Tuple[str, bytes, str]]" = OrderedDict()
+        self._stamp_cache: Tuple[Optional[Tuple[int, int]], str] = (None, "0")
+        self._last_generation: Optional[str] = None
+        self.hits = 0
+        self.misses = 0
+        self.not_modified = 0
+
+    def matches(self, path: str) -> bool:
+        return any(r.match(path) for r in self.routes)
+
+    def _stamp_generation(self) -> str:
+        path = self.warehouse_path.with_suffix(GENERATION_SUFFIX)
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:
+            return "0"
+        key = (st.st_mtime_ns, st.st_size)
+        cached_key, cached_value = self._stamp_cache
+        if cached_key == key:
+            return cached_value
+        try:
+            value = str(json.loads(path.read_text()).get("generation", 0))
+        except (OSError, ValueError):
+            value = "0"
+        self._stamp_cache = (key, value)
+        return value
+
+    def generation(self) -> str:
+        try:
+            st = os.stat(self.warehouse_path)
+            file_part = f"{st.st_ino:x}.{st.st_mtime_ns:x}.{st.st_size:x}"
+        except FileNotFoundError:
+            file_part = "none"
+        raw = f"{self._stamp_generation()}:{file_part}"
+        return hashlib.sha1(raw.encode("utf-8")).hexdigest()[:12]
+
+    @staticmethod
+    def request_key(request: Request) -> str:
+        query = "&".join(f"{k}={v}" for k, v in sorted(request.query_params.multi_items()))
+        return f"{request.url.path}?{query}"
+
+    def _disk_path(self, generation: str, key: str) -> Optional[Path]:
+        if self.disk_dir is None:
+            return None
+        digest = hashlib.sha1(key.encode("utf-8")).hexdigest()
+        return self.disk_dir / f"{generation}-{digest}.json"
+
+    def _prune_disk(self, generation: str) -> None:
+        if self.disk_dir is None or not self.disk_dir.exists():
+            return
+        for f in self.disk_dir.glob("*.json"):
+            if not f.name.startswith(f"{generation}-"):
+                try:
+                    f.unlink()
+                except OSError:
+                    pass
+
+    def get(self, generation: str, key: str) -> Optional[Tuple[bytes, str]]:
+        with self._lock:
+            if self._last_generation != generation:
+                self._entries.clear()
+                self._last_generation = generation
+                self._prune_disk(generation)
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == generation:
+                self._entries.move_to_end(key)
+                return entry[1], entry[2]
+        disk_path = self._disk_path(generation, key)
+        if disk_path is not None and disk_path.exists():
+            try:
+                body = disk_path.read_bytes()
+            except OSError:
+                return None
+            etag = _etag(body)
+            self._put_memory(generation, key, body, etag)
+            return body, etag
+        return None
+
+    def _put_memory(self, generation: str, key: str, body: bytes, etag: str) -> None:
+        with self._lock:
+            self._entries[key] = (generation, body, etag)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def put(self, generation: str, key: str, body: bytes) -> str:
+        etag = _etag(body)
+        self._put_memory(generation, key, body, etag)
+        disk_path = self._disk_path(generation, key)
+        if disk_path is not None:
+            try:
+                disk_path.parent.mkdir(parents=True, exist_ok=True)
+                tmp = disk_path.with_name(f"{disk_path.name}.{os.getpid()}.tmp")
+                tmp.write_bytes(body)
+                os.replace(tmp, disk_path)
+            except OSError:
+                pass
+        return etag
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "disk_dir": str(self.disk_dir) if self.disk_dir is not None else None,
+                "generation": self._last_generation,
+                "hits": self.hits,
+                "misses": self.misses,
+                "not_modified": self.not_modified,
+            }
+
+    async def handle(self, request: Request, call_next) -> Response:
+        """HTTP middleware body: serve GETs on cached routes from the cache when possible."""
+        if request.method != "GET" or not self.matches(request.url.path):
+            return await call_next(request)
+
+        generation = self.generation()
+        key = self.request_key(request)
+        if_none_match = request.headers.get("if-none-match")
+        cached = self.get(generation, key)
+        if cached is not None:
+            body, etag = cached
+            if if_none_match and _etag_matches(if_none_match, etag):
+                self.not_modified += 1
+                return Response(status_code=304, headers=_cache_headers(etag))
+            self.hits += 1
+            return Response(content=body, media_type="application/json", headers=_cache_headers(etag))
+
+        self.misses += 1
+        response = await call_next(request)
+        if response.status_code != 200:
+            return response
+        body = b"".join([chunk async for chunk in response.body_iterator])
+        etag = self.put(generation, key, body)
+        if if_none_match and _etag_matches(if_none_match, etag):
+            return Response(status_code=304, headers=_cache_headers(etag))
+        headers = {k: v for k, v in response.headers.items() if k.lower() != "content-length"}
+        headers.update(_cache_headers(etag))
+        return Response(content=body, status_code=200, headers=headers, media_type=response.media_type)
+
+
+def _etag(body: bytes) -> str:
+    return '"' + hashlib.sha1(body).hexdigest()[:20] + '"'
+
+
+def _etag_matches(header: str, etag: str) -> bool:
+    candidates = [c.strip() for c in header.split(",")]
+    return "*" in candidates or etag in candidates or f"W/{etag}" in candidates
+
+
+def _cache_headers(etag: str) -> Dict[str, str]:
+    # no-cache: browsers may store the body but must revalidate (If-None-Match) on each use.
+    return {"ETag": etag, "Cache-Control": "no-cache"}
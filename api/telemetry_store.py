@@ -0,0 +1,272 @@
+"""
+Precomputed FastF1 car telemetry, stored as partitioned Parquet.
+
+Layout under the store root (default: <repo>/bronze_fastf1):
+
+    telemetry/season=2024/round=02/session_code=R/driver_code=VER/part-00000.parquet
+        one row per telemetry sample for every exported lap of that driver
+        (lap_number, is_fastest_lap, time_ms, distance, speed, throttle, brake,
+        n_gear, rpm, drs, x, y)
+    telemetry_session/season=2024/round=02/session_code=R/part-00000.parquet
+        classified results plus a weather summary for the session, and the
+        export mode ("full": every lap, "fastest": each driver's fastest lap only)
+
+scripts/export_telemetry_data.py fills the store offline; /api/telemetry reads
+one driver file per request and only falls back to FastF1 (in a background job)
+when the session has not been exported yet.
+"""
+
+import logging
+import os
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+try:
+    import fastf1  # type: ignore
+except ImportError:
+    fastf1 = None
+
+logger = logging.getLogger("telemetry_store")
+
+TELEMETRY_TABLE = "telemetry"
+SESSION_TABLE = "telemetry_session"
+PART_FILE = "part-00000.parquet"
+FULL_EXPORT = "full"
+FASTEST_EXPORT = "fastest"
+
+# FastF1 telemetry column -> store column
+_SAMPLE_COLUMNS = {
+    "Distance": "distance",
+    "Speed": "speed",
+    "Throttle": "throttle",
+    "Brake": "brake",
+    "nGear": "n_gear",
+    "RPM": "rpm",
+    "DRS": "drs",
+    "X": "x",
+    "Y": "y",
+}
+
+# store column -> API sample key (kept identical to the old live-FastF1 payload)
+_API_SAMPLE_KEYS = {
+    "time_ms": "time_ms",
+    "distance": "distance",
+    "speed": "speed",
+    "throttle": "throttle",
+    "brake": "brake",
+    "n_gear": "n",
+    "x": "x",
+    "y": "y",
+}
+
+_inflight: set[Tuple[int, int, str]] = set()
+_inflight_lock = threading.Lock()
+
+
+def session_dir(root: Path, table: str, season: int, round_num: int, session_code: str) -> Path:
+    return root / table / f"season={season}" / f"round={round_num:02d}" / f"session_code={session_code}"
+
+
+def driver_file(root: Path, season: int, round_num: int, session_code: str, driver_code: str) -> Path:
+    return session_dir(root, TELEMETRY_TABLE, season, round_num, session_code) / f"driver_code={driver_code}" / PART_FILE
+
+
+def _write_parquet(df: pd.DataFrame, path: Path) -> None:
+    """Write via a temp file + rename so readers never see a half-written part."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    df.to_parquet(tmp, index=False)
+    os.replace(tmp, path)
+
+
+def _lap_frame(lap: Any, lap_number: int, is_fastest: bool) -> Optional[pd.DataFrame]:
+    tel = lap.get_telemetry()
+    if tel is None or tel.empty:
+        return None
+    out = pd.DataFrame({"lap_number": np.int16(lap_number), "is_fastest_lap": is_fastest}, index=tel.index)
+    out["time_ms"] = tel["Time"].dt.total_seconds() * 1000.0
+    for src, dst in _SAMPLE_COLUMNS.items():
+        out[dst] = tel[src] if src in tel.columns else np.nan
+    out["brake"] = out["brake"].fillna(0).astype("int8")
+    return out.reset_index(drop=True)
+
+
+def _results_frame(session: Any) -> pd.DataFrame:
+    res = session.results
+    if res is None or res.empty:
+        return pd.DataFrame()
+    time_col = res["Time"] if "Time" in res.columns else pd.Series(pd.NaT, index=res.index)
+    out = pd.DataFrame(
+        {
+            "position": pd.to_numeric(res.get("Position"), errors="coerce").astype("Int64"),
+            "driver_code": res["Abbreviation"].fillna(res["DriverNumber"]),
+            "driver_name": res.get("FullName", pd.Series("", index=res.index)).fillna(""),
+            "team_name": res.get("TeamName"),
+            "status": res.get("Status"),
+            "points": pd.to_numeric(res.get("Points"), errors="coerce"),
+            "grid_position": pd.to_numeric(res.get("GridPosition"), errors="coerce"),
+            "time": time_col.map(lambda t: str(t) if pd.notna(t) else None),
+        }
+    )
+    rain = None
+    track_temp = None
+    weather_df = session.weather_data
+    if weather_df is not None and not weather_df.empty:
+        rain = float(weather_df["Rainfall"].max(skipna=True))
+        track_temp = float(weather_df["TrackTemp"].mean(skipna=True))
+    out["rain"] = rain
+    out["track_temp_c"] = track_temp
+    return out
+
+
+def export_session_telemetry(
+    season: int,
+    round_num: int,
+    session_code: str,
+    root: Path,
+    cache_dir: Optional[Path] = None,
+    fastest_only: bool = False,
+) -> int:
+    """Load one FastF1 session and write every driver's lap telemetry. Returns rows written."""
+    if fastf1 is None:
+        raise RuntimeError("fastf1 not installed")
+    if cache_dir is not None:
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        fastf1.Cache.enable_cache(str(cache_dir))
+
+    session = fastf1.get_session(season, round_num, session_code)
+    session.load(laps=True, telemetry=True, weather=True, messages=False)
+    return write_session_telemetry(session, season, round_num, session_code, root, fastest_only=fastest_only)
+
+
+def write_session_telemetry(
+    session: Any,
+    season: int,
+    round_num: int,
+    session_code: str,
+    root: Path,
+    fastest_only: bool = False,
+) -> int:
+    """Write lap telemetry of a session loaded with laps, telemetry and weather. Returns rows written."""
+    rows = 0
+    for drv in session.laps["Driver"].dropna().unique():
+        laps = session.laps.pick_driver(drv)
+        fastest = laps.pick_fastest()
+        fastest_no = int(fastest["LapNumber"]) if fastest is not None and not pd.isna(fastest["LapNumber"]) else None
+        frames: List[pd.DataFrame] = []
+        if fastest_only:
+            selected = [fastest] if fastest_no is not None else []
+        else:
+            selected = [lap for _, lap in laps.iterlaps()]
+        for lap in selected:
+            if pd.isna(lap["LapNumber"]):
+                continue
+            lap_no = int(lap["LapNumber"])
+            try:
+                frame = _lap_frame(lap, lap_no, lap_no == fastest_no)
+            except Exception as exc:
+                logger.debug("No telemetry for %s lap %s: %s", drv, lap_no, exc)
+                continue
+            if frame is not None:
+                frames.append(frame)
+        if not frames:
+            continue
+        df = pd.concat(frames, ignore_index=True)
+        _write_parquet(df, driver_file(root, season, round_num, session_code, str(drv)))
+        rows += len(df)
+
+    # Written last: its presence marks the session as exported, in the recorded mode.
+    summary = _results_frame(session)
+    summary["export_mode"] = FASTEST_EXPORT if fastest_only else FULL_EXPORT
+    _write_parquet(summary, session_dir(root, SESSION_TABLE, season, round_num, session_code) / PART_FILE)
+    logger.info("Exported %s telemetry rows for %s R%s %s", rows, season, round_num, session_code)
+    return rows
+
+
+def export_in_background(
+    season: int,
+    round_num: int,
+    session_code: str,
+    root: Path,
+    cache_dir: Optional[Path] = None,
+    fastest_only: bool = True,
+) -> None:
+    """Background-task body for cache misses; concurrent requests for one session export once."""
+    key = (season, round_num, session_code)
+    with _inflight_lock:
+        if key in _inflight:
+            return
+        _inflight.add(key)
+    try:
+        export_session_telemetry(season, round_num, session_code, root, cache_dir=cache_dir, fastest_only=fastest_only)
+    except Exception as exc:  # pragma: no cover - external API
+        logger.warning("Background telemetry export failed for %s: %s", key, exc)
+    finally:
+        with _inflight_lock:
+            _inflight.discard(key)
+
+
+def export_pending(season: int, round_num: int, session_code: str) -> bool:
+    with _inflight_lock:
+        return (season, round_num, session_code) in _inflight
+
+
+def _records(df: pd.DataFrame) -> List[Dict[str, Any]]:
+    return df.astype(object).where(df.notna(), None).to_dict("records")
+
+
+def export_mode(root: Path, season: int, round_num: int, session_code: str) -> Optional[str]:
+    """FULL_EXPORT / FASTEST_EXPORT for an exported session, None when it was not exported."""
+    path = session_dir(root, SESSION_TABLE, season, round_num, session_code) / PART_FILE
+    if not path.exists():
+        return None
+    df = pd.read_parquet(path)
+    if "export_mode" in df.columns and df["export_mode"].notna().any():
+        return str(df["export_mode"].dropna().iloc[0])
+    # Markers written before the mode was recorded: a fastest-only export has no other laps.
+    for part in session_dir(root, TELEMETRY_TABLE, season, round_num, session_code).glob(f"driver_code=*/{PART_FILE}"):
+        if not pd.read_parquet(part, columns=["is_fastest_lap"])["is_fastest_lap"].all():
+            return FULL_EXPORT
+    return FASTEST_EXPORT
+
+
+def read_session_summary(root: Path, season: int, round_num: int, session_code: str) -> Optional[Dict[str, Any]]:
+    path = session_dir(root, SESSION_TABLE, season, round_num, session_code) / PART_FILE
+    if not path.exists():
+        return None
+    df = pd.read_parquet(path)
+    if df.empty:
+        return {"results": [], "weather": {"rain": None, "track_temp_c": None}, "winner": None}
+    weather = _records(df[["rain", "track_temp_c"]].head(1))[0]
+    results = _records(df.drop(columns=["rain", "track_temp_c", "export_mode"], errors="ignore"))
+    ranked = df[df["position"].notna()].sort_values("position")
+    winner = ranked["driver_code"].iloc[0] if not ranked.empty else df["driver_code"].iloc[0]
+    return {"results": results, "weather": weather, "winner": winner}
+
+
+def downsample(df: pd.DataFrame, max_points: int) -> pd.DataFrame:
+    stride = max(1, len(df) // max_points)
+    return df.iloc[::stride]
+
+
+def read_lap_samples(
+    root: Path,
+    season: int,
+    round_num: int,
+    session_code: str,
+    driver_code: str,
+    lap_number: Optional[int] = None,
+    max_points: int = 300,
+) -> Optional[List[Dict[str, Any]]]:
+    """Samples for one lap (default: the driver's fastest), or None if the driver was not exported."""
+    path = driver_file(root, season, round_num, session_code, driver_code)
+    if not path.exists():
+        return None
+    filters = [("lap_number", "==", lap_number)] if lap_number is not None else [("is_fastest_lap", "==", True)]
+    df = pd.read_parquet(path, columns=list(_API_SAMPLE_KEYS), filters=filters)
+    df = downsample(df, max_points).rename(columns=_API_SAMPLE_KEYS)
+    return _records(df)
@@ -1,9 +1,20 @@
 import os
+import threading
+import time
+from contextlib import contextmanager
 from functools import lru_cache
+from typing import Any, Dict, Iterator, Optional, Tuple
 
 import duckdb
 
 DEFAULT_WAREHOUSE = "/Volumes/SAMSUNG/apps/f1-dash/warehouse/f1_openf1.duckdb"
+DEFAULT_MAX_CONCURRENCY = 8
+DEFAULT_ACQUIRE_TIMEOUT_S = 2.0
+DEFAULT_IDLE_TTL_S = 2.0
+
+
+class WarehouseBusyError(RuntimeError):
+    """Raised when no query slot frees up within the acquire timeout."""
 
 
 @lru_cache(maxsize=1)
@@ -15,7 +26,158 @@ def get_warehouse_path() -> str:
     return path
 
 
+class ConnectionManager:
+    """
+    One read-only DuckDB database instance per process, one cursor per request.
+
+    - Read-only means several uvicorn workers (processes) can open the same file.
+    - At most `max_concurrency` cursors are live at once; callers wait up to
+      `acquire_timeout_s` for a slot and then fail fast with WarehouseBusyError.
+    - When the warehouse file is atomically replaced (new inode/mtime/size), the
+      next request drains in-flight cursors and reopens the database. DuckDB
+      caches instances per path while any connection is alive, so the old
+      handle must be fully closed before reconnecting.
+    - A read-only handle still locks the file against the build scripts, which
+      open the warehouse read-write in place, so the handle is closed once no
+      cursor has been live for `idle_ttl_s` seconds and reopened on demand.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        max_concurrency: int,
+        acquire_timeout_s: float,
+        idle_ttl_s: float = DEFAULT_IDLE_TTL_S,
+    ):
+        self.path = path
+        self.max_concurrency = max_concurrency
+        self.acquire_timeout_s = acquire_timeout_s
+        self.idle_ttl_s = idle_ttl_s
+        self._slots = threading.BoundedSemaphore(max_concurrency)
+        self._cond = threading.Condition()
+        self._handle: Optional[duckdb.DuckDBPyConnection] = None
+        self._file_stamp: Optional[Tuple[int, int, int]] = None
+        self._active = 0
+        self._idle_since = 0.0
+        self._idle_timer: Optional[threading.Timer] = None
+        self._reloads = 0
+        self._idle_closes = 0
+        self._rejected = 0
+
+    def _stat(self) -> Tuple[int, int, int]:
+        st = os.stat(self.path)
+        return (st.st_ino, st.st_mtime_ns, st.st_size)
+
+    def _ensure_open(self) -> duckdb.DuckDBPyConnection:
+        # Caller holds self._cond.
+        stamp = self._stat()
+        if self._handle is not None and stamp == self._file_stamp:
+            return self._handle
+        if self._handle is not None:
+            drained = self._cond.wait_for(lambda: self._active == 0, timeout=self.acquire_timeout_s)
+            if self._handle is not None and self._file_stamp == self._stat():
+                # Another request finished the reload while we waited.
+                return self._handle
+            if not drained:
+                # Keep serving the old snapshot rather than stalling requests.
+                return self._handle
+            self._handle.close()
+            self._handle = None
+            self._reloads += 1
+        self._handle = duckdb.connect(self.path, read_only=True)
+        self._file_stamp = stamp
+        return self._handle
+
+    def _schedule_idle_close(self) -> None:
+        # Caller holds self._cond and has just closed the last live cursor.
+        self._idle_since = time.monotonic()
+        if self._handle is None or self._idle_timer is not None:
+            return
+        if self.idle_ttl_s <= 0:
+            self._close_idle()
+            return
+        self._idle_timer = threading.Timer(self.idle_ttl_s, self._close_if_idle)
+        self._idle_timer.daemon = True
+        self._idle_timer.start()
+
+    def _close_if_idle(self) -> None:
+        with self._cond:
+            self._idle_timer = None
+            if self._handle is None or self._active:
+                return  # the next release schedules a new check
+            remaining = self._idle_since + self.idle_ttl_s - time.monotonic()
+            if remaining > 0:
+                self._idle_timer = threading.Timer(remaining, self._close_if_idle)
+                self._idle_timer.daemon = True
+                self._idle_timer.start()
+                return
+            self._close_idle()
+
+    def _close_idle(self) -> None:
+        self._handle.close()
+        self._handle = None
+        self._file_stamp = None
+        self._idle_closes += 1
+
+    @contextmanager
+    def cursor(self) -> Iterator[duckdb.DuckDBPyConnection]:
+        if not self._slots.acquire(timeout=self.acquire_timeout_s):
+            with self._cond:
+                self._rejected += 1
+            raise WarehouseBusyError(
+                f"All {self.max_concurrency} warehouse query slots busy for {self.acquire_timeout_s:.1f}s"
+            )
+        try:
+            with self._cond:
+                cur = self._ensure_open().cursor()
+                self._active += 1
+            try:
+                yield cur
+            finally:
+                cur.close()
+                with self._cond:
+                    self._active -= 1
+                    if self._active == 0:
+                        self._schedule_idle_close()
+                    self._cond.notify_all()
+        finally:
+            self._slots.release()
+
+    def close(self) -> None:
+        with self._cond:
+            if self._idle_timer is not None:
+                self._idle_timer.cancel()
+                self._idle_timer = None
+            if self._handle is not None:
+                self._handle.close()
+            self._handle = None
+            self._file_stamp = None
+
+    def stats(self) -> Dict[str, Any]:
+        with self._cond:
+            return {
+                "path": self.path,
+                "open": self._handle is not None,
+                "max_concurrency": self.max_concurrency,
+                "acquire_timeout_s": self.acquire_timeout_s,
+                "active": self._active,
+                "reloads": self._reloads,
+                "idle_ttl_s": self.idle_ttl_s,
+                "idle_closes": self._idle_closes,
+                "rejected": self._rejected,
+            }
+
+
+@lru_cache(maxsize=1)
+def get_manager() -> ConnectionManager:
+    return ConnectionManager(
+        path=get_warehouse_path(),
+        max_concurrency=int(os.getenv("F1_DB_MAX_CONCURRENCY", str(DEFAULT_MAX_CONCURRENCY))),
+        acquire_timeout_s=float(os.getenv("F1_DB_ACQUIRE_TIMEOUT", str(DEFAULT_ACQUIRE_TIMEOUT_S))),
+        idle_ttl_s=float(os.getenv("F1_DB_IDLE_TTL", str(DEFAULT_IDLE_TTL_S))),
+    )
+
+
 def connect_ro() -> duckdb.DuckDBPyConnection:
-    path = get_warehouse_path()
-    # DuckDB may need write access for temp tables; enforce SELECT-only at API layer.
-    return duckdb.connect(path, read_only=False)
+    """Open a standalone read-only connection (scripts / one-off use)."""
+    return duckdb.connect(get_warehouse_path(), read_only=True)
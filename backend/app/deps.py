@@ -1,13 +1,14 @@
 from typing import Generator
 
 import duckdb
+from fastapi import HTTPException
 
-from .db import connect_ro
+from .db import WarehouseBusyError, get_manager
 
 
 def get_db() -> Generator[duckdb.DuckDBPyConnection, None, None]:
-    con = connect_ro()
     try:
-        yield con
-    finally:
-        con.close()
+        with get_manager().cursor() as con:
+            yield con
+    except WarehouseBusyError as exc:
+        raise HTTPException(status_code=503, detail=str(exc)) from exc
@@ -1,3 +1,5 @@
+import os
+
 from fastapi import FastAPI
 
 from .routers import (
@@ -16,6 +18,7 @@ from .routers import (
     standings,
 )
 from .db import get_warehouse_path
+from .model_registry import preload_names
 
 app = FastAPI(
     title="F1 OpenF1 Backend",
@@ -31,6 +34,14 @@ except Exception:
     # Avoid crashing app init; health endpoint will surface the issue.
     print("[warn] backend could not resolve warehouse path at startup.")
 
+
+@app.on_event("startup")
+def preload_models() -> None:
+    # Load the prediction models once so the first request does not pay for joblib.load.
+    names = preload_names(os.getenv("F1_MODEL_PRELOAD"), predict.PRELOAD_MODELS, predict.model_registry)
+    predict.model_registry.preload(names)
+
+
 @app.get("/")
 def root():
     return {"service": "f1-backend", "ok": True}
@@ -0,0 +1,261 @@
+"""
+Registry of ML model artifacts (<name>.joblib + optional <name>.json) kept warm in memory.
+
+- get(name) loads a model once and then serves it from memory.
+- At most every `check_interval_s` seconds, get() hands a check to a background
+  reload thread and returns the loaded version right away. The check stats the
+  artifact files; when size/mtime changed their content hash is recomputed, and a
+  different hash loads the new version and swaps it in atomically (one reference
+  assignment). Only the very first load of a model runs on the calling thread. A
+  failed reload leaves the previous version in place (recorded in stats()).
+- preload() warms models at startup so the first request does not pay the load.
+- stats() reports per model: hash, load time, file size and the memory the load
+  allocated (tracemalloc, which is process-wide, so loads are measured one at a
+  time; an estimate, other threads allocating concurrently are counted too).
+
+Kept in sync with api/model_registry.py, minus the API's compiled-artifact hook;
+the backend is deployed on its own and cannot import the api package.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import joblib
+
+logger = logging.getLogger("model_registry")
+
+DEFAULT_CHECK_INTERVAL_S = 5.0
+
+# tracemalloc is process-global: one measured load at a time, across all registries.
+_MEASURE_LOCK = threading.Lock()
+
+
+@dataclass
+class LoadedModel:
+    name: str
+    model: Any
+    meta: Dict[str, Any]
+    sha256: str
+    file_stamp: Tuple[Tuple[int, int], ...]
+    loaded_at: datetime
+    load_seconds: float
+    size_bytes: int
+    memory_bytes: Optional[int]
+
+    def feature_list(self, *keys: str) -> List[str]:
+        """First non-empty list among meta[keys] (artifacts use feature_list / feature_cols / features)."""
+        for key in keys or ("feature_list", "feature_cols", "features"):
+            feats = self.meta.get(key)
+            if isinstance(feats, list) and feats:
+                return [str(f) for f in feats]
+        return []
+
+
+@dataclass
+class _Slot:
+    lock: threading.Lock = field(default_factory=threading.Lock)
+    current: Optional[LoadedModel] = None
+    checked_at: float = 0.0
+    reloads: int = 0
+    last_error: Optional[str] = None
+
+
+class ModelRegistry:
+    def __init__(
+        self,
+        artifact_dir: Path,
+        check_interval_s: float = DEFAULT_CHECK_INTERVAL_S,
+    ):
+        self.artifact_dir = Path(artifact_dir)
+        self.check_interval_s = check_interval_s
+        self._slots: Dict[str, _Slot] = {}
+        self._slots_lock = threading.Lock()
+        self._reloader = ThreadPoolExecutor(max_workers=1, thread_name_prefix="model-reload")
+
+    def paths(self, name: str) -> Tuple[Path, Path]:
+        return self.artifact_dir / f"{name}.joblib", self.artifact_dir / f"{name}.json"
+
+    def _tracked_paths(self, name: str) -> List[Path]:
+        return list(self.paths(name))
+
+    def available(self) -> List[str]:
+        """Names of the models in artifact_dir (every <name>.joblib)."""
+        if not self.artifact_dir.exists():
+            return []
+        return sorted(p.stem for p in self.artifact_dir.glob("*.joblib"))
+
+    def _slot(self, name: str) -> _Slot:
+        with self._slots_lock:
+            return self._slots.setdefault(name, _Slot())
+
+    def _file_stamp(self, name: str) -> Tuple[Tuple[int, int], ...]:
+        stamp = []
+        for path in self._tracked_paths(name):
+            try:
+                st = os.stat(path)
+                stamp.append((st.st_mtime_ns, st.st_size))
+            except FileNotFoundError:
+                stamp.append((0, -1))
+        return tuple(stamp)
+
+    def _hash(self, name: str) -> str:
+        digest = hashlib.sha256()
+        for path in self._tracked_paths(name):
+            if path.exists():
+                digest.update(_file_sha256(path).encode())
+        return digest.hexdigest()
+
+    def _load(self, name: str, sha256: str, stamp: Tuple[Tuple[int, int], ...]) -> LoadedModel:
+        model_path, meta_path = self.paths(name)
+        if not model_path.exists():
+            raise FileNotFoundError(f"Model artifact not found at {model_path}")
+        with _MEASURE_LOCK:
+            tracing = tracemalloc.is_tracing()
+            if not tracing:
+                tracemalloc.start()
+            before = tracemalloc.get_traced_memory()[0]
+            started = time.perf_counter()
+            try:
+                model = joblib.load(model_path)
+                meta = json.loads(meta_path.read_text()) if meta_path.exists() else {}
+            finally:
+                seconds = time.perf_counter() - started
+                allocated = tracemalloc.get_traced_memory()[0] - before
+                if not tracing:
+                    tracemalloc.stop()
+        size = sum(p.stat().st_size for p in self._tracked_paths(name) if p.exists())
+        logger.info("Loaded model %s (%s) in %.2fs, ~%.1f MB", name, sha256[:12], seconds, allocated / 1e6)
+        return LoadedModel(
+            name=name,
+            model=model,
+            meta=meta,
+            sha256=sha256,
+            file_stamp=stamp,
+            loaded_at=datetime.utcnow(),
+            load_seconds=seconds,
+            size_bytes=size,
+            memory_bytes=max(allocated, 0),
+        )
+
+    def _refresh(self, name: str, slot: _Slot) -> None:
+        """Load or reload under the slot lock; caller holds it."""
+        slot.checked_at = time.monotonic()
+        stamp = self._file_stamp(name)
+        current = slot.current
+        if current is not None and stamp == current.file_stamp:
+            return
+        sha256 = self._hash(name)
+        if current is not None and sha256 == current.sha256:
+            # Touched or rewritten with identical bytes.
+            current.file_stamp = stamp
+            return
+        try:
+            loaded = self._load(name, sha256, stamp)
+        except Exception as exc:
+            slot.last_error = f"{type(exc).__name__}: {exc}"
+            if current is None:
+                raise
+            logger.warning("Reload of model %s failed, keeping %s: %s", name, current.sha256[:12], exc)
+            current.file_stamp = stamp  # do not retry until the files change again
+            return
+        if current is not None:
+            slot.reloads += 1
+        slot.current = loaded
+        slot.last_error = None
+
+    def _background_refresh(self, name: str, slot: _Slot) -> None:
+        """Reload-thread body; the slot lock was taken by the request that queued it."""
+        try:
+            self._refresh(name, slot)
+        except Exception as exc:
+            logger.warning("Reload check of model %s failed: %s", name, exc)
+        finally:
+            slot.lock.release()
+
+    def get(self, name: str) -> LoadedModel:
+        """The current version of a model; raises FileNotFoundError if it was never loadable."""
+        slot = self._slot(name)
+        current = slot.current
+        if current is not None and time.monotonic() - slot.checked_at < self.check_interval_s:
+            return current
+        if current is None:
+            with slot.lock:
+                if slot.current is None:
+                    self._refresh(name, slot)
+                return slot.current  # type: ignore[return-value]
+        # Serve the loaded version; at most one check per model is queued on the reload thread.
+        if slot.lock.acquire(blocking=False):
+            try:
+                self._reloader.submit(self._background_refresh, name, slot)
+            except RuntimeError:
+                # Executor shut down (interpreter exit): skip the check.
+                slot.lock.release()
+        return current
+
+    def preload(self, names: Iterable[str]) -> Dict[str, Optional[str]]:
+        """Load each model now; returns name -> error (None when loaded)."""
+        errors: Dict[str, Optional[str]] = {}
+        for name in names:
+            try:
+                self.get(name)
+                errors[name] = None
+            except Exception as exc:
+                logger.warning("Could not preload model %s: %s", name, exc)
+                errors[name] = str(exc)
+        return errors
+
+    def stats(self) -> Dict[str, Any]:
+        with self._slots_lock:
+            slots = dict(self._slots)
+        models = []
+        for name, slot in sorted(slots.items()):
+            cur = slot.current
+            models.append(
+                {
+                    "name": name,
+                    "loaded": cur is not None,
+                    "sha256": cur.sha256 if cur else None,
+                    "loaded_at": cur.loaded_at.isoformat() if cur else None,
+                    "load_seconds": round(cur.load_seconds, 4) if cur else None,
+                    "size_bytes": cur.size_bytes if cur else None,
+                    "memory_bytes": cur.memory_bytes if cur else None,
+                    "reloads": slot.reloads,
+                    "last_error": slot.last_error,
+                }
+            )
+        return {
+            "artifact_dir": str(self.artifact_dir),
+            "check_interval_s": self.check_interval_s,
+            "models": models,
+            "total_memory_bytes": sum(m["memory_bytes"] or 0 for m in models),
+        }
+
+
+def _file_sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as fh:
+        for chunk in iter(lambda: fh.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def preload_names(value: Optional[str], default: Iterable[str], registry: ModelRegistry) -> List[str]:
+    """F1_MODEL_PRELOAD: unset/empty -> `default`; 'all' -> every artifact; 'none' -> nothing; else comma-separated names."""
+    value = (value or "").strip()
+    if not value:
+        return list(default)
+    if value.lower() == "all":
+        return registry.available()
+    if value.lower() in {"none", "0"}:
+        return []
+    return [v.strip() for v in value.split(",") if v.strip()]
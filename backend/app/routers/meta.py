@@ -5,7 +5,8 @@ from fastapi import APIRouter, Depends, HTTPException
 from pydantic import BaseModel
 
 from ..deps import get_db
-from ..db import get_warehouse_path
+from ..db import get_manager, get_warehouse_path
+from .predict import model_registry
 
 
 class SeasonMeta(BaseModel):
@@ -55,7 +56,7 @@ def health(db: duckdb.DuckDBPyConnection = Depends(get_db)):
         "gold.team_session_summary": _table_exists(db, "gold", "team_session_summary"),
     }
 
-    return {"warehouse": warehouse, "db_ok": ok, "tables": tables}
+    return {"warehouse": warehouse, "db_ok": ok, "tables": tables, "connections": get_manager().stats()}
 
 
 @router.get("/tables")
@@ -70,6 +71,12 @@ def list_tables(db: duckdb.DuckDBPyConnection = Depends(get_db)):
     return df.to_dict(orient="records")
 
 
+@router.get("/models")
+def models():
+    """Loaded prediction models: content hash, load time and memory per model."""
+    return model_registry.stats()
+
+
 @router.get("/seasons", response_model=SeasonsResponse)
 def seasons(db: duckdb.DuckDBPyConnection = Depends(get_db)):
     """
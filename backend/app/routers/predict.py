@@ -1,32 +1,32 @@
-import json
+import os
 from pathlib import Path
 from typing import Any, Dict, List
 
 import duckdb
-import joblib
 import pandas as pd
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Depends, HTTPException
 
-WAREHOUSE = "/Volumes/SAMSUNG/apps/f1-dash/warehouse/f1_openf1.duckdb"
-ARTIFACT_DIR = Path("/Volumes/SAMSUNG/apps/f1-dash/ml_artifacts")
+from ..deps import get_db
+from ..model_registry import ModelRegistry
+
+# train_models.py writes these under EXTERNAL_DATA_ROOT (scripts/data_paths.py).
+ARTIFACT_DIR = Path(os.getenv("EXTERNAL_DATA_ROOT") or "/Volumes/SAMSUNG/apps/f1-dash") / "ml_artifacts"
+PRELOAD_MODELS = ["race_win_best", "race_top3_best"]
 
 router = APIRouter()
 
+model_registry = ModelRegistry(ARTIFACT_DIR, check_interval_s=float(os.getenv("F1_MODEL_CHECK_INTERVAL") or "5"))
+
 
 def _load_model(name: str):
-    model_path = ARTIFACT_DIR / f"{name}.joblib"
-    meta_path = ARTIFACT_DIR / f"{name}.json"
+    model_path, meta_path = model_registry.paths(name)
     if not model_path.exists() or not meta_path.exists():
         raise FileNotFoundError(f"Missing artifact {model_path} or {meta_path}")
-    model = joblib.load(model_path)
-    with open(meta_path) as f:
-        meta = json.load(f)
-    features = meta.get("feature_list", [])
-    return model, features
+    loaded = model_registry.get(name)
+    return loaded.model, loaded.feature_list("feature_list")
 
 
-def _get_features_df(season: int, round_num: int) -> pd.DataFrame:
-    con = duckdb.connect(WAREHOUSE)
+def _get_features_df(con: duckdb.DuckDBPyConnection, season: int, round_num: int) -> pd.DataFrame:
     query = """
     SELECT *
     FROM features.race_win_training_enriched
@@ -44,14 +44,14 @@ def _prepare_X(df: pd.DataFrame, feature_list: List[str]) -> pd.DataFrame:
 
 
 @router.get("/races/{season}/{round}/predictions")
-def race_predictions(season: int, round: int) -> Dict[str, Any]:
+def race_predictions(season: int, round: int, db: duckdb.DuckDBPyConnection = Depends(get_db)) -> Dict[str, Any]:
     try:
         win_model, win_features = _load_model("race_win_best")
         top3_model, top3_features = _load_model("race_top3_best")
     except FileNotFoundError as exc:
         raise HTTPException(status_code=500, detail=str(exc))
 
-    df = _get_features_df(season, round)
+    df = _get_features_df(db, season, round)
     if df.empty:
         raise HTTPException(status_code=404, detail="No feature rows for this race")
 
@@ -100,13 +100,12 @@ def race_predictions(season: int, round: int) -> Dict[str, Any]:
 
 
 @router.get("/races/next/predictions")
-def next_race_predictions() -> Dict[str, Any]:
+def next_race_predictions(db: duckdb.DuckDBPyConnection = Depends(get_db)) -> Dict[str, Any]:
     # Simplified: choose the latest season/round available in features
-    con = duckdb.connect(WAREHOUSE)
-    latest = con.execute(
+    latest = db.execute(
         "SELECT season, MAX(round) AS round FROM features.race_win_training_enriched GROUP BY season ORDER BY season DESC LIMIT 1"
     ).fetchone()
     if not latest:
         raise HTTPException(status_code=404, detail="No races available")
     season, round_num = latest
-    return race_predictions(int(season), int(round_num))
+    return race_predictions(int(season), int(round_num), db)
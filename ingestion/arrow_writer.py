@@ -0,0 +1,161 @@
+"""
+Memory-bounded Parquet writer for heavy OpenF1 tables (car_data, intervals, location).
+
+Each API page is converted straight to an Arrow table: column names go through a
+precomputed raw -> snake_case mapping, values are cast to the endpoint's declared
+schema (SchemaRegistry), and the partition/bookkeeping columns that are constant
+for the whole partition are added as one-entry dictionary arrays instead of being
+copied into every record. Pages are buffered only until a row
+group is full, and part files roll over after `rows_per_file` rows, so memory
+stays at roughly one row group regardless of session length.
+"""
+
+import logging
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+try:
+    from .schema_registry import SchemaRegistry
+except ImportError:
+    from schema_registry import SchemaRegistry  # type: ignore
+
+logger = logging.getLogger("openf1_ingestion")
+
+
+def _constant_array(value: Any, length: int) -> pa.Array:
+    if value is None:
+        return pa.nulls(length)
+    if isinstance(value, str):
+        return pa.DictionaryArray.from_arrays(pa.array([0] * length, type=pa.int8()), pa.array([value]))
+    return pa.array([value] * length)
+
+
+class RollingParquetWriter:
+    def __init__(
+        self,
+        partition_dir: Path,
+        table: str,
+        registry: SchemaRegistry,
+        constants: dict[str, Any],
+        rename: Callable[[str], str],
+        start_index: int = 0,
+        rows_per_file: int = 1_000_000,
+        row_group_size: int = 128_000,
+        name_template: str = "part-{index:05d}.parquet",
+    ):
+        self.partition_dir = partition_dir
+        self.table = table
+        self.registry = registry
+        self.constants = constants
+        self.rename = rename
+        self.next_index = start_index
+        self.rows_per_file = rows_per_file
+        self.row_group_size = row_group_size
+        self.name_template = name_template
+        self.files: list[Path] = []
+        self.rows_written = 0
+        self._writer: Optional[pq.ParquetWriter] = None
+        self._schema: Optional[pa.Schema] = None
+        self._file_rows = 0
+        self._pending: list[pa.Table] = []
+        self._pending_rows = 0
+
+    def page_to_table(self, records: list[dict]) -> pa.Table:
+        columns: dict[str, list[Any]] = {}
+        for rec in records:
+            for key in rec:
+                if key not in columns:
+                    columns[key] = []
+        for key, values in columns.items():
+            values.extend(rec.get(key) for rec in records)
+        named = {self.rename(key): values for key, values in columns.items()}
+        n = len(records)
+        arrays: dict[str, pa.Array] = {}
+        for name in self.registry.schema_columns(self.table, list(named) + list(self.constants)):
+            if name in self.constants:
+                arrays[name] = _constant_array(self.constants[name], n)
+            else:
+                values = pd.Series(named.get(name, [None] * n), dtype=object)
+                arrays[name] = self.registry.column_array(self.table, name, values)
+        return pa.table(arrays)
+
+    def write_page(self, records: list[dict]) -> None:
+        if not records:
+            return
+        table = self.page_to_table(records)
+        self._pending.append(table)
+        self._pending_rows += table.num_rows
+        if self._pending_rows >= self.row_group_size:
+            self._flush()
+
+    def _conform(self, table: pa.Table) -> Optional[pa.Table]:
+        """Cast a page to the open file's schema; None if it cannot be (new column / type clash)."""
+        assert self._schema is not None
+        if set(table.column_names) - set(self._schema.names):
+            return None
+        arrays = []
+        for field in self._schema:
+            if field.name in table.column_names:
+                col = table.column(field.name)
+                if col.type != field.type:
+                    try:
+                        col = col.cast(field.type)
+                    except (pa.ArrowInvalid, pa.ArrowNotImplementedError):
+                        return None
+                arrays.append(col)
+            else:
+                arrays.append(pa.nulls(table.num_rows, type=field.type))
+        return pa.Table.from_arrays(arrays, schema=self._schema)
+
+    def _open(self, schema: pa.Schema) -> None:
+        self.partition_dir.mkdir(parents=True, exist_ok=True)
+        path = self.partition_dir / self.name_template.format(index=self.next_index)
+        self.next_index += 1
+        self._writer = pq.ParquetWriter(path, schema)
+        self._schema = schema
+        self._file_rows = 0
+        self.files.append(path)
+
+    def _close_file(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+            logger.info("Wrote %s rows to %s", self._file_rows, self.files[-1])
+        self._writer = None
+        self._schema = None
+
+    def _flush(self) -> None:
+        if not self._pending:
+            return
+        try:
+            chunk = pa.concat_tables(self._pending, promote_options="default")
+        except pa.ArrowInvalid:
+            # Pages disagree on a column type: write them one by one (the conform step rolls files).
+            for table in self._pending:
+                self._write_chunk(table)
+        else:
+            self._write_chunk(chunk)
+        self._pending = []
+        self._pending_rows = 0
+
+    def _write_chunk(self, chunk: pa.Table) -> None:
+        if self._writer is not None:
+            conformed = self._conform(chunk)
+            if conformed is None or self._file_rows >= self.rows_per_file:
+                self._close_file()
+            else:
+                chunk = conformed
+        if self._writer is None:
+            self._open(chunk.schema)
+        assert self._writer is not None
+        self._writer.write_table(chunk, row_group_size=self.row_group_size)
+        self._file_rows += chunk.num_rows
+        self.rows_written += chunk.num_rows
+
+    def close(self) -> list[Path]:
+        self._flush()
+        self._close_file()
+        return self.files
@@ -0,0 +1,334 @@
+"""
+Index of bronze Parquet partition files, persisted in the warehouse as meta.bronze_files.
+
+One row per file: path (relative to the bronze root), table, partition values
+(season / round / grand_prix / session), row count, size, mtime and a hash of
+the Arrow schema. Readers resolve exact file lists from this table instead of
+re-globbing the directory tree and re-reading footers on every query.
+
+Each distinct schema is stored once in meta.bronze_schemas (schema_hash ->
+column names and types), so the unioned columns of any set of files can be
+answered without opening them.
+
+Refreshes are incremental: only files whose (size, mtime) changed are re-read.
+
+Writers that cannot open the warehouse (the ingestor while a build or the API
+holds the file lock) record the paths they touched in <bronze root>/_catalog_pending.json
+instead. Readers treat the catalog as stale while that file exists; the next
+refresh that covers those paths indexes them and clears it.
+"""
+
+import hashlib
+import json
+import logging
+import os
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Iterable, Optional
+
+import pandas as pd
+import pyarrow.parquet as pq
+
+try:
+    import duckdb  # type: ignore
+except ImportError:
+    duckdb = None
+
+logger = logging.getLogger("openf1_ingestion")
+
+CATALOG_TABLE = "meta.bronze_files"
+SCHEMAS_TABLE = "meta.bronze_schemas"
+PENDING_FILE = "_catalog_pending.json"
+
+# Directory key -> catalog column. FastF1 exports use the *_slug / *_code spellings.
+_PARTITION_KEYS = {
+    "season": "season",
+    "round": "round",
+    "grand_prix": "grand_prix",
+    "grand_prix_slug": "grand_prix",
+    "session": "session",
+    "session_code": "session",
+}
+
+_CATALOG_COLUMNS = [
+    "path",
+    "table_name",
+    "season",
+    "round",
+    "grand_prix",
+    "session",
+    "row_count",
+    "file_size",
+    "mtime_ns",
+    "schema_hash",
+    "indexed_at",
+]
+
+
+def ensure_catalog(con: "duckdb.DuckDBPyConnection") -> None:
+    con.execute("CREATE SCHEMA IF NOT EXISTS meta;")
+    con.execute(
+        f"""
+        CREATE TABLE IF NOT EXISTS {CATALOG_TABLE} (
+          path        VARCHAR PRIMARY KEY,
+          table_name  VARCHAR NOT NULL,
+          season      INTEGER,
+          round       INTEGER,
+          grand_prix  VARCHAR,
+          session     VARCHAR,
+          row_count   BIGINT,
+          file_size   BIGINT,
+          mtime_ns    BIGINT,
+          schema_hash VARCHAR,
+          indexed_at  TIMESTAMP
+        );
+        """
+    )
+    con.execute(
+        f"""
+        CREATE TABLE IF NOT EXISTS {SCHEMAS_TABLE} (
+          schema_hash VARCHAR PRIMARY KEY,
+          columns     VARCHAR NOT NULL  -- JSON [[name, arrow type], ...]
+        );
+        """
+    )
+
+
+def parse_partition(rel_path: str) -> dict[str, Any]:
+    """Split 'laps/season=2024/round=01/.../part-00000.parquet' into catalog fields."""
+    parts = Path(rel_path).parts
+    out: dict[str, Any] = {"table_name": parts[0], "season": None, "round": None, "grand_prix": None, "session": None}
+    for part in parts[1:-1]:
+        if "=" not in part:
+            continue
+        key, value = part.split("=", 1)
+        col = _PARTITION_KEYS.get(key)
+        if col is None:
+            continue
+        if col in {"season", "round"}:
+            out[col] = int(value) if value.isdigit() else None
+        else:
+            out[col] = value
+    return out
+
+
+def schema_hash(schema: Any) -> str:
+    text = ";".join(f"{field.name}:{field.type}" for field in schema)
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()[:16]
+
+
+def schema_columns(schema: Any) -> list[list[str]]:
+    return [[field.name, str(field.type)] for field in schema]
+
+
+def scan_bronze_files(bronze_root: Path, tables: Optional[Iterable[str]] = None) -> list[str]:
+    """Walk the bronze tree and return Parquet paths relative to bronze_root."""
+    roots = [bronze_root / t for t in tables] if tables else [bronze_root]
+    found: list[str] = []
+    for root in roots:
+        if not root.exists():
+            continue
+        for dirpath, dirnames, filenames in os.walk(root):
+            dirnames[:] = [d for d in dirnames if not d.startswith((".", "_"))]
+            for name in filenames:
+                if name.endswith(".parquet"):
+                    found.append(Path(dirpath, name).relative_to(bronze_root).as_posix())
+    return found
+
+
+def describe_file(bronze_root: Path, rel_path: str, stat: Optional[os.stat_result] = None) -> dict[str, Any]:
+    full = bronze_root / rel_path
+    st = stat or full.stat()
+    meta = pq.read_metadata(full)
+    arrow_schema = meta.schema.to_arrow_schema()
+    return {
+        "path": rel_path,
+        **parse_partition(rel_path),
+        "row_count": int(meta.num_rows),
+        "file_size": int(st.st_size),
+        "mtime_ns": int(st.st_mtime_ns),
+        "schema_hash": schema_hash(arrow_schema),
+        "indexed_at": datetime.utcnow(),
+        # not a catalog column: stored once per hash in SCHEMAS_TABLE
+        "schema_columns": schema_columns(arrow_schema),
+    }
+
+
+def load_pending(bronze_root: Path) -> list[str]:
+    """Paths written or removed since the last refresh that could not be indexed."""
+    try:
+        return list(json.loads((bronze_root / PENDING_FILE).read_text()).get("paths", []))
+    except FileNotFoundError:
+        return []
+    except (OSError, ValueError) as exc:
+        logger.warning("Could not read %s: %s", bronze_root / PENDING_FILE, exc)
+        return []
+
+
+def _write_pending(bronze_root: Path, paths: list[str]) -> None:
+    target = bronze_root / PENDING_FILE
+    if not paths:
+        target.unlink(missing_ok=True)
+        return
+    tmp = target.with_suffix(".json.tmp")
+    tmp.write_text(json.dumps({"paths": paths}, indent=0))
+    os.replace(tmp, target)
+
+
+def add_pending(bronze_root: Path, paths: Iterable[str]) -> None:
+    bronze_root.mkdir(parents=True, exist_ok=True)
+    _write_pending(bronze_root, list(dict.fromkeys([*load_pending(bronze_root), *paths])))
+
+
+def _clear_pending(bronze_root: Path, covered: set[str]) -> None:
+    # Re-read so paths added by a concurrent writer since the refresh started survive.
+    pending = load_pending(bronze_root)
+    if pending:
+        _write_pending(bronze_root, [p for p in pending if p not in covered])
+
+
+def _store_schemas(con: "duckdb.DuckDBPyConnection", schemas: dict[str, list[list[str]]]) -> None:
+    for digest, columns in schemas.items():
+        con.execute(f"INSERT OR IGNORE INTO {SCHEMAS_TABLE} VALUES (?, ?)", [digest, json.dumps(columns)])
+
+
+def union_columns(
+    con: "duckdb.DuckDBPyConnection", bronze_root: Path, files: Iterable[tuple[str, str]]
+) -> list[str]:
+    """
+    Column names of the union_by_name scan of `files` ((path, schema_hash) pairs from
+    the catalog), in first-seen order, from the cached schemas. A schema missing from
+    the cache (catalog rows indexed before it existed) is read from one of its files
+    and stored.
+    """
+    ensure_catalog(con)
+    sample_path: dict[str, str] = {}
+    for path, digest in files:
+        sample_path.setdefault(digest, path)
+    if not sample_path:
+        return []
+    cached = {
+        digest: json.loads(columns)
+        for digest, columns in con.execute(
+            f"SELECT schema_hash, columns FROM {SCHEMAS_TABLE} WHERE schema_hash IN ({', '.join('?' * len(sample_path))})",
+            list(sample_path),
+        ).fetchall()
+    }
+    missing = {}
+    for digest, path in sample_path.items():
+        if digest not in cached:
+            missing[digest] = schema_columns(pq.read_schema(bronze_root / path))
+    if missing:
+        _store_schemas(con, missing)
+        cached.update(missing)
+    names: list[str] = []
+    for digest in sample_path:
+        for name, _ in cached[digest]:
+            if name not in names:
+                names.append(name)
+    return names
+
+
+def refresh_catalog(
+    con: "duckdb.DuckDBPyConnection",
+    bronze_root: Path,
+    paths: Optional[Iterable[str]] = None,
+    removed: Optional[Iterable[str]] = None,
+    tables: Optional[Iterable[str]] = None,
+) -> dict[str, int]:
+    """
+    Bring meta.bronze_files in line with the files on disk.
+
+    - paths=None: walk the tree (optionally limited to `tables`), re-read only new or
+      changed files and drop rows for files that disappeared.
+    - paths given: only (re)index those files plus drop `removed`; used by the ingestor,
+      which knows exactly what it wrote.
+
+    Pending paths (PENDING_FILE) are indexed too and cleared once committed.
+    """
+    ensure_catalog(con)
+    pending = load_pending(bronze_root)
+    known = {
+        row[0]: (row[1], row[2])
+        for row in con.execute(f"SELECT path, file_size, mtime_ns FROM {CATALOG_TABLE}").fetchall()
+    }
+
+    full_scan = paths is None
+    if full_scan:
+        candidates = scan_bronze_files(bronze_root, tables)
+        covered = {p for p in pending if tables is None or Path(p).parts[0] in set(tables)}
+    else:
+        candidates = list(dict.fromkeys([*paths, *pending]))
+        covered = set(pending)
+    to_drop = set(removed or [])
+
+    rows: list[dict[str, Any]] = []
+    unchanged = 0
+    for rel in candidates:
+        full = bronze_root / rel
+        try:
+            st = full.stat()
+        except FileNotFoundError:
+            to_drop.add(rel)
+            continue
+        if known.get(rel) == (st.st_size, st.st_mtime_ns):
+            unchanged += 1
+            continue
+        try:
+            rows.append(describe_file(bronze_root, rel, st))
+        except Exception as exc:
+            logger.warning("Could not index %s: %s", full, exc)
+
+    if full_scan:
+        scanned_tables = set(tables) if tables else None
+        on_disk = set(candidates)
+        for rel in known:
+            if rel in on_disk:
+                continue
+            if scanned_tables is None or Path(rel).parts[0] in scanned_tables:
+                to_drop.add(rel)
+
+    removed_count = len(to_drop)
+    to_drop.update(r["path"] for r in rows)
+    con.execute("BEGIN TRANSACTION;")
+    try:
+        if to_drop:
+            drop_df = pd.DataFrame({"path": sorted(to_drop)})
+            con.register("catalog_drop", drop_df)
+            con.execute(f"DELETE FROM {CATALOG_TABLE} WHERE path IN (SELECT path FROM catalog_drop)")
+            con.unregister("catalog_drop")
+        if rows:
+            new_df = pd.DataFrame(rows, columns=_CATALOG_COLUMNS)
+            con.register("catalog_new", new_df)
+            con.execute(f"INSERT INTO {CATALOG_TABLE} SELECT {', '.join(_CATALOG_COLUMNS)} FROM catalog_new")
+            con.unregister("catalog_new")
+            _store_schemas(con, {r["schema_hash"]: r["schema_columns"] for r in rows})
+        con.execute("COMMIT;")
+    except Exception:
+        con.execute("ROLLBACK;")
+        raise
+    if covered:
+        _clear_pending(bronze_root, covered)
+
+    stats = {"indexed": len(rows), "unchanged": unchanged, "removed": removed_count}
+    logger.info("Bronze catalog refreshed: %s", stats)
+    return stats
+
+
+def refresh_catalog_at(
+    warehouse_path: Path,
+    bronze_root: Path,
+    paths: Optional[Iterable[str]] = None,
+    removed: Optional[Iterable[str]] = None,
+    tables: Optional[Iterable[str]] = None,
+) -> Optional[dict[str, int]]:
+    """Open the warehouse for writing, refresh the catalog and close it again."""
+    if duckdb is None:
+        logger.warning("duckdb not installed; skipping bronze catalog refresh.")
+        return None
+    warehouse_path.parent.mkdir(parents=True, exist_ok=True)
+    con = duckdb.connect(str(warehouse_path))
+    try:
+        return refresh_catalog(con, bronze_root, paths=paths, removed=removed, tables=tables)
+    finally:
+        con.close()
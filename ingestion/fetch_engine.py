@@ -0,0 +1,204 @@
+"""
+Concurrent fetch engine for the OpenF1 API.
+
+Requests run on a thread pool (one requests.Session per worker thread) and are
+throttled by:
+- a global token bucket shared by every request (OPENF1_RATE_LIMIT req/s with
+  OPENF1_RATE_BURST burst); a 429 pauses the whole bucket for Retry-After
+  seconds instead of letting each worker hammer the API on its own backoff;
+- a per-endpoint concurrency cap (OPENF1_ENDPOINT_CONCURRENCY, with tighter
+  defaults for the heavy paginated endpoints).
+
+Throughput therefore tracks the allowed request rate rather than round-trip
+latency, and callers fan out with FetchEngine.map().
+"""
+
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from email.utils import parsedate_to_datetime
+from typing import Any, Callable, Iterable, Optional, TypeVar
+
+import requests
+
+logger = logging.getLogger("openf1_ingestion")
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+# Heavy endpoints return large pages; keep fewer of them in flight.
+DEFAULT_ENDPOINT_LIMITS = {
+    "car_data": 2,
+    "location": 2,
+    "position": 4,
+    "intervals": 4,
+}
+
+
+class RetryableStatus(Exception):
+    def __init__(self, status_code: int, retry_after: Optional[float]):
+        super().__init__(f"HTTP {status_code}")
+        self.status_code = status_code
+        self.retry_after = retry_after
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Retry-After is either delta-seconds or an HTTP date."""
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class TokenBucket:
+    """Thread-safe token bucket; acquire() blocks until a token is available."""
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.capacity = max(1, burst)
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def pause(self, seconds: float) -> None:
+        """Stop handing out tokens for `seconds` (server asked us to back off)."""
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+            self._tokens = 0.0
+
+    def acquire(self) -> None:
+        if self.rate <= 0:
+            return
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                if now < self._paused_until:
+                    wait = self._paused_until - now
+                else:
+                    self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                    self._updated = now
+                    if self._tokens >= 1.0:
+                        self._tokens -= 1.0
+                        return
+                    wait = (1.0 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+class FetchEngine:
+    def __init__(
+        self,
+        base_url: str,
+        rate_limit: float,
+        burst: int,
+        max_workers: int,
+        endpoint_concurrency: int,
+        endpoint_limits: Optional[dict[str, int]] = None,
+        request_timeout: int = 30,
+        max_retries: int = 4,
+        backoff_seconds: float = 1.0,
+    ):
+        self.base_url = base_url
+        self.request_timeout = request_timeout
+        self.max_retries = max_retries
+        self.backoff_seconds = backoff_seconds
+        self.bucket = TokenBucket(rate_limit, burst)
+        self.endpoint_concurrency = endpoint_concurrency
+        self.endpoint_limits = {**DEFAULT_ENDPOINT_LIMITS, **(endpoint_limits or {})}
+        self._semaphores: dict[str, threading.BoundedSemaphore] = {}
+        self._sem_lock = threading.Lock()
+        self._local = threading.local()
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="openf1-fetch")
+        self._stats_lock = threading.Lock()
+        self.requests_sent = 0
+        self.throttled = 0
+
+    def _session(self) -> requests.Session:
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = requests.Session()
+            session.headers.update({"User-Agent": "f1-openf1-backend/ingestion"})
+            self._local.session = session
+        return session
+
+    def _semaphore(self, endpoint: str) -> threading.BoundedSemaphore:
+        with self._sem_lock:
+            sem = self._semaphores.get(endpoint)
+            if sem is None:
+                limit = min(self.endpoint_concurrency, self.endpoint_limits.get(endpoint, self.endpoint_concurrency))
+                sem = threading.BoundedSemaphore(max(1, limit))
+                self._semaphores[endpoint] = sem
+            return sem
+
+    def _get_once(self, endpoint: str, url: str, params: list[tuple[str, Any]]) -> Any:
+        with self._semaphore(endpoint):
+            self.bucket.acquire()
+            with self._stats_lock:
+                self.requests_sent += 1
+            resp = self._session().get(url, params=params, timeout=self.request_timeout)
+        if resp.status_code == 429 or resp.status_code >= 500:
+            raise RetryableStatus(resp.status_code, parse_retry_after(resp.headers.get("Retry-After")))
+        resp.raise_for_status()
+        data = resp.json()
+        if not isinstance(data, list):
+            logger.error(
+                "Unexpected response for %s params=%s status=%s body=%s",
+                endpoint,
+                params,
+                resp.status_code,
+                resp.text[:500],
+            )
+            raise ValueError(f"Unexpected response type for {endpoint}: {type(data)}")
+        return data
+
+    def request(self, endpoint: str, params: list[tuple[str, Any]]) -> list[dict]:
+        """GET /v1/<endpoint> with retries; blocks the calling thread."""
+        url = f"{self.base_url}/v1/{endpoint.lstrip('/')}"
+        attempt = 0
+        while True:
+            try:
+                return self._get_once(endpoint, url, params)
+            except ValueError:
+                raise
+            except Exception as exc:
+                attempt += 1
+                if attempt > self.max_retries:
+                    logger.error("Failed request %s params=%s error=%s", url, params, exc)
+                    raise
+                sleep_s = self.backoff_seconds * (2 ** (attempt - 1))
+                if isinstance(exc, RetryableStatus) and exc.status_code == 429:
+                    with self._stats_lock:
+                        self.throttled += 1
+                    pause = exc.retry_after if exc.retry_after is not None else sleep_s
+                    # Global pause: every worker waits, not just this one.
+                    self.bucket.pause(pause)
+                    logger.warning("Rate limited on %s; pausing all requests for %.1fs", url, pause)
+                    continue
+                logger.warning("Error on request %s (attempt %s): %s. Sleeping %.1fs", url, attempt, exc, sleep_s)
+                time.sleep(sleep_s)
+
+    def map(self, fn: Callable[[T], R], items: Iterable[T]) -> list[R | BaseException]:
+        """Run fn over items on the fetch pool; failures are returned in place, not raised."""
+        futures = [self._pool.submit(fn, item) for item in items]
+        results: list[R | BaseException] = []
+        for fut in futures:
+            try:
+                results.append(fut.result())
+            except Exception as exc:
+                results.append(exc)
+        return results
+
+    def stats(self) -> dict[str, int]:
+        with self._stats_lock:
+            return {"requests": self.requests_sent, "throttled": self.throttled}
+
+    def close(self) -> None:
+        self._pool.shutdown(wait=True)
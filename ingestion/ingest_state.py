@@ -0,0 +1,122 @@
+"""
+Persisted ingestion state for incremental OpenF1 runs.
+
+One entry per bronze partition (i.e. per session and endpoint), keyed by the
+partition path relative to the bronze root:
+
+    {"table": "laps", "session_key": 9472, "rows": 1180, "parts": 3,
+     "content_hash": "...", "watermark": "2024-03-02T16:58:01.123000+00:00",
+     "watermarks": {"1": "...", "11": "..."}, "updated_at": "..."}
+
+`watermark` is the largest value of the endpoint's date column written so far;
+endpoints fetched per driver (laps) keep one watermark per driver instead.
+Sessions that finished long enough ago are recorded in `complete_sessions` and
+skipped entirely by later incremental runs.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Optional
+
+import pandas as pd
+
+logger = logging.getLogger("openf1_ingestion")
+
+# Endpoint -> date column usable as an OpenF1 `<column>>` filter. Endpoints not
+# listed (drivers, stints, session_result, starting_grid, ...) have no reliable
+# timestamp and are refetched whole, then rewritten only if their content changed.
+DATE_FIELDS = {
+    "laps": "date_start",
+    "car_data": "date",
+    "intervals": "date",
+    "location": "date",
+    "overtakes": "date",
+    "pit": "date",
+    "position": "date",
+    "race_control": "date",
+    "team_radio": "date",
+    "weather": "date",
+}
+
+
+def content_hash(df: pd.DataFrame, ignore: tuple[str, ...] = ("ingested_at",)) -> str:
+    """Order-sensitive hash of a batch, ignoring per-run bookkeeping columns."""
+    data = df.drop(columns=[c for c in ignore if c in df.columns])
+    try:
+        row_hashes = pd.util.hash_pandas_object(data, index=False).to_numpy()
+    except TypeError:
+        # Unhashable cells (lists such as segments_sector_1): hash their text form instead.
+        data = data.apply(lambda col: col.astype(str) if col.dtype == object else col)
+        row_hashes = pd.util.hash_pandas_object(data, index=False).to_numpy()
+    digest = hashlib.sha1(row_hashes.tobytes())
+    digest.update(",".join(map(str, data.columns)).encode("utf-8"))
+    return digest.hexdigest()
+
+
+class IngestState:
+    def __init__(self, path: Path):
+        self.path = path
+        self._lock = threading.Lock()
+        self.partitions: dict[str, dict[str, Any]] = {}
+        self.complete_sessions: set[int] = set()
+        try:
+            payload = json.loads(path.read_text())
+            self.partitions = payload.get("partitions", {})
+            self.complete_sessions = set(payload.get("complete_sessions", []))
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError) as exc:
+            logger.warning("Ignoring unreadable ingestion state %s: %s", path, exc)
+
+    def get(self, partition: str) -> Optional[dict[str, Any]]:
+        with self._lock:
+            entry = self.partitions.get(partition)
+            return dict(entry) if entry is not None else None
+
+    def record(
+        self,
+        partition: str,
+        table: str,
+        session_key: Optional[int],
+        rows_added: int,
+        replaced: bool,
+        content_hash: str,
+        watermark: Optional[str] = None,
+        watermarks: Optional[dict[str, str]] = None,
+    ) -> None:
+        """Fold a write into the partition entry (replaced=True resets row/part counts)."""
+        with self._lock:
+            entry = self.partitions.get(partition)
+            if entry is None or replaced:
+                entry = {"table": table, "session_key": session_key, "rows": 0, "parts": 0, "watermarks": {}}
+            entry["rows"] += rows_added
+            entry["parts"] += 1
+            entry["content_hash"] = content_hash
+            if watermark is not None and (entry.get("watermark") is None or watermark > entry["watermark"]):
+                entry["watermark"] = watermark
+            for key, value in (watermarks or {}).items():
+                if value > entry["watermarks"].get(key, ""):
+                    entry["watermarks"][key] = value
+            entry["updated_at"] = datetime.utcnow().isoformat()
+            self.partitions[partition] = entry
+
+    def is_complete(self, session_key: Any) -> bool:
+        with self._lock:
+            return session_key in self.complete_sessions
+
+    def mark_complete(self, session_key: Any) -> None:
+        with self._lock:
+            self.complete_sessions.add(session_key)
+
+    def save(self) -> None:
+        with self._lock:
+            payload = {"partitions": self.partitions, "complete_sessions": sorted(self.complete_sessions)}
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+        tmp.write_text(json.dumps(payload, default=str))
+        os.replace(tmp, self.path)
@@ -0,0 +1,84 @@
+"""
+On-disk cache of OpenF1 meetings, keyed by season.
+
+Meeting lists for finished seasons never change, so an entry fetched after its
+season ended (in a later calendar year) is kept indefinitely; any other entry,
+including one for a past season that was cached while that season was running,
+expires after a TTL. The highest cached
+meeting_key is the high-water mark: discovery only probes keys above it.
+"""
+
+import json
+import logging
+import os
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Iterable, Optional
+
+logger = logging.getLogger("openf1_ingestion")
+
+
+class MeetingCache:
+    def __init__(self, path: Path, ttl_seconds: float):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        # "2024" -> {"fetched_at": epoch seconds, "meetings": [...]}
+        self.years: dict[str, dict] = {}
+        self._load()
+
+    def _load(self) -> None:
+        try:
+            payload = json.loads(self.path.read_text())
+            self.years = payload.get("years", {})
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as exc:
+            logger.warning("Ignoring unreadable meetings cache %s: %s", self.path, exc)
+
+    def fresh_years(self, years: Iterable[int]) -> dict[int, list[dict]]:
+        """Cached meetings for every requested year whose entry is still valid."""
+        now = time.time()
+        out: dict[int, list[dict]] = {}
+        for year in years:
+            entry = self.years.get(str(year))
+            if entry is None:
+                continue
+            fetched_at = entry.get("fetched_at", 0)
+            final = datetime.utcfromtimestamp(fetched_at).year > year
+            if not final and now - fetched_at > self.ttl_seconds:
+                continue
+            out[year] = entry.get("meetings", [])
+        return out
+
+    def store_year(self, year: int, meetings: list[dict]) -> None:
+        self.years[str(year)] = {"fetched_at": time.time(), "meetings": meetings}
+
+    def add_meetings(self, meetings: list[dict]) -> None:
+        """
+        Merge individually probed meetings into already-cached seasons (keeps fetched_at).
+        Meetings of uncached seasons are dropped: a partial list must not pass as complete.
+        """
+        for m in meetings:
+            entry = self.years.get(str(m.get("year")))
+            if entry is None:
+                continue
+            known = {x.get("meeting_key") for x in entry["meetings"]}
+            if m.get("meeting_key") not in known:
+                entry["meetings"].append(m)
+
+    @property
+    def high_water_mark(self) -> Optional[int]:
+        keys = [
+            m["meeting_key"]
+            for entry in self.years.values()
+            for m in entry.get("meetings", [])
+            if isinstance(m.get("meeting_key"), int)
+        ]
+        return max(keys) if keys else None
+
+    def save(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+        tmp.write_text(json.dumps({"years": self.years}, default=str))
+        os.replace(tmp, self.path)
@@ -1,14 +1,35 @@
+import hashlib
+import json
 import logging
 import os
 import re
+import threading
 import time
-from dataclasses import dataclass
-from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Optional
+from typing import Any, Iterator, Optional
 
 import pandas as pd
-import requests
+import pyarrow.parquet as pq
+
+try:
+    from .arrow_writer import RollingParquetWriter
+    from .bronze_catalog import add_pending, refresh_catalog_at
+    from .fetch_engine import FetchEngine
+    from .ingest_state import DATE_FIELDS, IngestState, content_hash
+    from .meeting_cache import MeetingCache
+    from .schema_registry import SchemaRegistry
+except ImportError:
+    # Running as a script from within the ingestion directory
+    from arrow_writer import RollingParquetWriter  # type: ignore
+    from bronze_catalog import add_pending, refresh_catalog_at  # type: ignore
+    from fetch_engine import FetchEngine  # type: ignore
+    from ingest_state import DATE_FIELDS, IngestState, content_hash  # type: ignore
+    from meeting_cache import MeetingCache  # type: ignore
+    from schema_registry import SchemaRegistry  # type: ignore
 
 # Basic logging setup
 logging.basicConfig(
@@ -17,7 +38,12 @@ logging.basicConfig(
 )
 logger = logging.getLogger("openf1_ingestion")
 
+# Parts of a forced streaming rewrite, renamed to part-NNNNN.parquet once the fetch completed.
+STREAM_TMP_TEMPLATE = ".part-{index:05d}.parquet.tmp"
+GENERATION_SUFFIX = ".generation.json"  # kept in sync with scripts/warehouse_generation.py
 
+
+@lru_cache(maxsize=4096)
 def _snake_case(s: str) -> str:
     s = s.replace(" ", "_").replace("-", "_")
     s = re.sub(r"(?<!^)(?=[A-Z])", "_", s)
@@ -35,26 +61,6 @@ def _normalize_team_name(name: Optional[str]) -> Optional[str]:
     return "Visa Cash App Racing Bulls" if name.strip().upper() == "RB" else name
 
 
-def _sanitize_df_for_parquet(df: pd.DataFrame) -> pd.DataFrame:
-    """
-    Ensure columns have Arrow-friendly types.
-    - If an object column has mixed types or list/dict values, cast whole column to string.
-    This keeps bronze close to raw while avoiding ArrowInvalid errors (e.g. '+1 LAP' vs float).
-    """
-    for col in df.columns:
-        series = df[col]
-        if not isinstance(series.dtype, pd.api.types.CategoricalDtype) and not pd.api.types.is_object_dtype(series):
-            # Non-object dtypes (numeric, datetime, bool) are fine.
-            continue
-        non_null = series.dropna()
-        if non_null.empty:
-            continue
-        types_in_col = {type(x) for x in non_null}
-        if len(types_in_col) > 1 or any(isinstance(x, (list, dict)) for x in non_null):
-            df[col] = series.astype(str)
-    return df
-
-
 def _parse_int_list(value: str) -> list[int]:
     return [int(v.strip()) for v in value.split(",") if v.strip()]
 
@@ -63,6 +69,44 @@ def _parse_str_list(value: str) -> list[str]:
     return [v.strip() for v in value.split(",") if v.strip()]
 
 
+def _parse_limits(value: str) -> dict[str, int]:
+    """'car_data=2,laps=6' -> {'car_data': 2, 'laps': 6}"""
+    out: dict[str, int] = {}
+    for item in _parse_str_list(value):
+        key, _, limit = item.partition("=")
+        if key and limit.strip().isdigit():
+            out[key.strip()] = int(limit)
+    return out
+
+
+def _parse_iso(value: Any) -> Optional[datetime]:
+    if not value:
+        return None
+    try:
+        dt = datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    return dt if dt.tzinfo else dt.replace(tzinfo=timezone.utc)
+
+
+def _bump_generation(stamp_path: Path, writer: str) -> None:
+    """Same format as scripts/warehouse_generation.bump_generation (the image ships without scripts/)."""
+    try:
+        current = int(json.loads(stamp_path.read_text()).get("generation") or 0)
+    except (FileNotFoundError, ValueError):
+        current = 0
+    stamp = {"generation": current + 1, "writer": writer, "updated_at": datetime.utcnow().isoformat()}
+    stamp_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = stamp_path.with_name(f"{stamp_path.name}.{os.getpid()}.tmp")
+    tmp.write_text(json.dumps(stamp))
+    os.replace(tmp, stamp_path)
+
+
+def _max_str(values: Any) -> Optional[str]:
+    present = [str(v) for v in values if v is not None and not (isinstance(v, float) and pd.isna(v))]
+    return max(present) if present else None
+
+
 def _slugify(name: str) -> str:
     name = name.strip().lower()
     name = re.sub(r"[^a-z0-9]+", "-", name)
@@ -109,60 +153,52 @@ class IngestConfig:
     enable_intervals: bool
     enable_overtakes: bool
     force_reingest_laps: bool
-    driver_sleep_seconds: float
     max_meeting_key: int
+    warehouse_path: Optional[Path] = None
+    # Warehouse generation stamp, bumped whenever bronze files change so the API's
+    # response cache drops bronze-backed entries even if the catalog could not be updated.
+    generation_path: Optional[Path] = None
+    meetings_cache_path: Optional[Path] = None
+    meetings_cache_ttl_hours: float = 24.0
+    # Incremental mode: fetch only rows newer than the per-partition watermarks in state_path
+    # and append them as new part files; sessions that ended before the lookback are skipped.
+    incremental: bool = False
+    state_path: Optional[Path] = None
+    incremental_lookback_hours: float = 48.0
     request_timeout: int = 30
     page_limit: int = 1000
     max_retries: int = 4
     backoff_seconds: float = 1.0
+    # Fetch engine: global rate limit (req/s), in-flight caps and session-level parallelism.
+    rate_limit: float = 3.0
+    rate_burst: int = 3
+    fetch_workers: int = 8
+    endpoint_concurrency: int = 4
+    endpoint_limits: dict[str, int] = field(default_factory=dict)
+    session_concurrency: int = 2
+    # Tables written page by page through Arrow instead of being collected in memory.
+    streaming_tables: set[str] = field(default_factory=lambda: {"car_data", "intervals", "location"})
+    stream_rows_per_file: int = 1_000_000
+    stream_row_group_size: int = 128_000
 
 
 class OpenF1Client:
     def __init__(self, config: IngestConfig):
         self.config = config
-        self.session = requests.Session()
-        self.session.headers.update({"User-Agent": "f1-openf1-backend/ingestion"})
+        self.engine = FetchEngine(
+            base_url=config.base_url,
+            rate_limit=config.rate_limit,
+            burst=config.rate_burst,
+            max_workers=config.fetch_workers,
+            endpoint_concurrency=config.endpoint_concurrency,
+            endpoint_limits=config.endpoint_limits,
+            request_timeout=config.request_timeout,
+            max_retries=config.max_retries,
+            backoff_seconds=config.backoff_seconds,
+        )
 
     def _request(self, endpoint: str, params: list[tuple[str, Any]]) -> list[dict]:
-        url = f"{self.config.base_url}/v1/{endpoint.lstrip('/')}"
-        attempt = 0
-        while True:
-            try:
-                resp = self.session.get(url, params=params, timeout=self.config.request_timeout)
-                if resp.status_code in {429} or resp.status_code >= 500:
-                    attempt += 1
-                    if attempt > self.config.max_retries:
-                        resp.raise_for_status()
-                    sleep_s = self.config.backoff_seconds * (2 ** (attempt - 1))
-                    logger.warning(
-                        "Retrying %s (status=%s attempt=%s) in %.1fs",
-                        url,
-                        resp.status_code,
-                        attempt,
-                        sleep_s,
-                    )
-                    time.sleep(sleep_s)
-                    continue
-                resp.raise_for_status()
-                data = resp.json()
-                if not isinstance(data, list):
-                    logger.error(
-                        "Unexpected response for %s params=%s status=%s body=%s",
-                        endpoint,
-                        params,
-                        resp.status_code,
-                        resp.text[:500],
-                    )
-                    raise ValueError(f"Unexpected response type for {endpoint}: {type(data)}")
-                return data
-            except Exception as exc:
-                attempt += 1
-                if attempt > self.config.max_retries:
-                    logger.error("Failed request %s params=%s error=%s", url, params, exc)
-                    raise
-                sleep_s = self.config.backoff_seconds * (2 ** (attempt - 1))
-                logger.warning("Error on request %s (attempt %s): %s. Sleeping %.1fs", url, attempt, exc, sleep_s)
-                time.sleep(sleep_s)
+        return self.engine.request(endpoint, params)
 
     def fetch_all(
         self,
@@ -176,6 +212,17 @@ class OpenF1Client:
         - Some OpenF1 endpoints return empty when limit/offset are present, so we skip pagination there.
         """
         records: list[dict] = []
+        for batch in self.iter_pages(endpoint, base_params, allow_pagination=allow_pagination):
+            records.extend(batch)
+        return records
+
+    def iter_pages(
+        self,
+        endpoint: str,
+        base_params: dict | list[tuple[str, Any]],
+        allow_pagination: bool = True,
+    ) -> Iterator[list[dict]]:
+        """Like fetch_all, but yields one page at a time so callers can stream them to disk."""
 
         def to_param_list(obj: dict | list[tuple[str, Any]]) -> list[tuple[str, Any]]:
             if isinstance(obj, dict):
@@ -191,7 +238,8 @@ class OpenF1Client:
         base_param_list = to_param_list(base_params)
 
         if not allow_pagination:
-            return self._request(endpoint, params=base_param_list)
+            yield self._request(endpoint, params=base_param_list)
+            return
 
         offset = 0
         while True:
@@ -199,11 +247,10 @@ class OpenF1Client:
             batch = self._request(endpoint, params=params)
             if not batch:
                 break
-            records.extend(batch)
+            yield batch
             if len(batch) < self.config.page_limit:
                 break
             offset += self.config.page_limit
-        return records
 
 
 class OpenF1Ingestor:
@@ -212,7 +259,13 @@ class OpenF1Ingestor:
         self.client = OpenF1Client(config)
         self.bronze_root = self.config.data_root / "bronze"
         self.ingested_at = datetime.utcnow().isoformat()
+        self._lock = threading.Lock()
         self.lap_rows_written = 0
+        # Bronze files written/deleted this run, relative to bronze_root (for the catalog).
+        self.files_written: list[str] = []
+        self.files_removed: list[str] = []
+        self.state = IngestState(self.config.state_path) if self.config.state_path is not None else None
+        self.schemas = SchemaRegistry(self.config.data_root / "cache" / "openf1_schema_cache.json")
 
     def run(self) -> None:
         logger.info("Starting ingestion for seasons=%s session_codes=%s", self.config.seasons, self.config.session_codes)
@@ -228,11 +281,183 @@ class OpenF1Ingestor:
         for m in meetings_sorted:
             meetings_by_season.setdefault(m.get("year"), []).append(m)
 
-        for season, season_meetings in meetings_by_season.items():
-            self._ingest_season_meetings(season=int(season), meetings=season_meetings)
-        logger.info("Ingestion completed. lap_rows_written=%s", self.lap_rows_written)
+        started = time.monotonic()
+        with ThreadPoolExecutor(
+            max_workers=max(1, self.config.session_concurrency), thread_name_prefix="openf1-session"
+        ) as session_pool:
+            for season, season_meetings in meetings_by_season.items():
+                try:
+                    self._ingest_season_meetings(
+                        season=int(season), meetings=season_meetings, session_pool=session_pool
+                    )
+                finally:
+                    self._save_state()
+        self.client.engine.close()
+        logger.info(
+            "Ingestion completed. lap_rows_written=%s elapsed=%.1fs fetch=%s",
+            self.lap_rows_written,
+            time.monotonic() - started,
+            self.client.engine.stats(),
+        )
+        self._update_catalog()
+
+    def _save_state(self) -> None:
+        try:
+            self.schemas.save()
+            if self.state is not None:
+                self.state.save()
+        except OSError as exc:
+            logger.warning("Could not write ingestion state: %s", exc)
+
+    def _session_finished(self, date_end: Optional[str]) -> bool:
+        """True once a session ended before the incremental lookback window."""
+        end = _parse_iso(date_end)
+        if end is None:
+            return False
+        return end < datetime.now(timezone.utc) - timedelta(hours=self.config.incremental_lookback_hours)
+
+    def _partition_key(self, table: str, **partition: Any) -> str:
+        return self._build_partition_path(table=table, **partition).relative_to(self.bronze_root).as_posix()
+
+    def _watermarks(
+        self, table: str, date_field: str, by: Optional[str] = None, **partition: Any
+    ) -> tuple[Optional[str], dict[str, str]]:
+        """
+        (watermark, per-`by` watermarks) for a partition. Partitions written before state
+        tracking existed are bootstrapped from the date column of their Parquet files.
+        """
+        key = self._partition_key(table, **partition)
+        entry = self.state.get(key) if self.state is not None else None
+        if entry is not None:
+            return entry.get("watermark"), entry.get("watermarks", {})
+        files = sorted((self.bronze_root / key).glob("*.parquet"))
+        if not files:
+            return None, {}
+        columns = [date_field] + ([by] if by else [])
+        try:
+            df = pd.concat([pd.read_parquet(f, columns=columns) for f in files], ignore_index=True)
+        except Exception as exc:
+            logger.warning("Could not bootstrap watermark for %s: %s", key, exc)
+            return None, {}
+        per_key = {str(k): _max_str(g[date_field]) for k, g in df.groupby(by)} if by else {}
+        return _max_str(df[date_field]), {k: v for k, v in per_key.items() if v is not None}
+
+    def _update_catalog(self) -> None:
+        if not (self.files_written or self.files_removed):
+            return
+        try:
+            self._refresh_catalog()
+        finally:
+            if self.config.generation_path is not None:
+                try:
+                    _bump_generation(self.config.generation_path, writer="openf1_ingest")
+                except OSError as exc:
+                    logger.warning("Could not bump warehouse generation %s: %s", self.config.generation_path, exc)
+
+    def _refresh_catalog(self) -> None:
+        if self.config.warehouse_path is None:
+            # Catalog updates disabled: flag the files so readers don't trust the stale catalog.
+            add_pending(self.bronze_root, [*self.files_written, *self.files_removed])
+            return
+        try:
+            refresh_catalog_at(
+                self.config.warehouse_path,
+                self.bronze_root,
+                paths=self.files_written,
+                removed=self.files_removed,
+            )
+        except Exception as exc:
+            # e.g. the warehouse is locked by a build or the API. Readers glob the bronze
+            # tree while paths are pending; the next catalog refresh indexes them.
+            logger.warning("Bronze catalog update failed for %s: %s", self.config.warehouse_path, exc)
+            try:
+                add_pending(self.bronze_root, [*self.files_written, *self.files_removed])
+            except OSError as pending_exc:
+                logger.warning("Could not record pending catalog paths: %s", pending_exc)
 
     def _discover_meetings(self, min_season: int, max_season: int) -> list[dict]:
+        """
+        Meetings for the requested seasons: cached seasons are reused, the rest are
+        fetched with one meetings?year=Y call each, then keys above the cached
+        high-water mark are probed so a meeting added since the last run is picked up.
+        """
+        years = list(range(min_season, max_season + 1))
+        cache = (
+            MeetingCache(self.config.meetings_cache_path, self.config.meetings_cache_ttl_hours * 3600)
+            if self.config.meetings_cache_path is not None
+            else None
+        )
+        by_year: dict[int, list[dict]] = cache.fresh_years(years) if cache else {}
+        if by_year:
+            logger.info("Meetings cache hit for seasons %s", sorted(by_year))
+
+        missing = [y for y in years if y not in by_year]
+        fetched = self.client.engine.map(
+            lambda year: self.client.fetch_all("meetings", {"year": year}, allow_pagination=False),
+            missing,
+        )
+        failed: list[int] = []
+        for year, batch in zip(missing, fetched):
+            if isinstance(batch, BaseException):
+                logger.warning("Fetching meetings for year=%s failed: %s", year, batch)
+                failed.append(year)
+                continue
+            by_year[year] = [m for m in _normalize_records(batch) if m.get("year") == year]
+            if cache:
+                cache.store_year(year, by_year[year])
+
+        if failed:
+            logger.warning("Falling back to meeting_key scan for seasons %s", failed)
+            for m in self._scan_meetings_descending(min(failed), max(failed)):
+                if m.get("year") in failed:
+                    by_year.setdefault(m["year"], []).append(m)
+        elif cache:
+            newer = self._probe_new_meetings(cache.high_water_mark)
+            cache.add_meetings(newer)
+            for m in newer:
+                if m.get("year") in by_year and m not in by_year[m["year"]]:
+                    by_year[m["year"]].append(m)
+
+        if cache:
+            try:
+                cache.save()
+            except OSError as exc:
+                logger.warning("Could not write meetings cache %s: %s", cache.path, exc)
+
+        meetings = [m for year in years for m in by_year.get(year, [])]
+        logger.info("Discovered %s meetings in seasons %s-%s", len(meetings), min_season, max_season)
+        return meetings
+
+    def _probe_new_meetings(self, high_water_mark: Optional[int]) -> list[dict]:
+        """Meetings with keys above high_water_mark, up to meeting_key=latest."""
+        if high_water_mark is None:
+            return []
+        try:
+            latest = _normalize_records(
+                self.client.fetch_all("meetings", {"meeting_key": "latest"}, allow_pagination=False)
+            )
+        except Exception as exc:
+            logger.warning("Fetching latest meeting failed; skipping new-meeting probe. Error: %s", exc)
+            return []
+        latest_key = latest[0].get("meeting_key") if latest else None
+        if latest_key is None or latest_key <= high_water_mark:
+            return []
+        keys = list(range(high_water_mark + 1, latest_key))
+        batches = self.client.engine.map(
+            lambda key: self.client.fetch_all("meetings", {"meeting_key": key}, allow_pagination=False),
+            keys,
+        )
+        found = list(latest)
+        for key, batch in zip(keys, batches):
+            if isinstance(batch, BaseException):
+                logger.warning("Fetch failed for meeting_key=%s: %s", key, batch)
+                continue
+            found.extend(_normalize_records(batch))
+        logger.info("Probed meeting keys %s-%s: %s new meetings", high_water_mark + 1, latest_key, len(found))
+        return found
+
+    def _scan_meetings_descending(self, min_season: int, max_season: int) -> list[dict]:
+        """Legacy discovery: probe meeting keys one by one downward from the latest."""
         latest_key: Optional[int] = None
         try:
             latest = self.client.fetch_all("meetings", {"meeting_key": "latest"}, allow_pagination=False)
@@ -281,12 +506,10 @@ class OpenF1Ingestor:
                     continue
                 meetings.append(m)
 
-            time.sleep(0.05)
-
         logger.info("Discovered %s meetings in seasons %s-%s", len(meetings), min_season, max_season)
         return meetings
 
-    def _ingest_season_meetings(self, season: int, meetings: list[dict]) -> None:
+    def _ingest_season_meetings(self, season: int, meetings: list[dict], session_pool: ThreadPoolExecutor) -> None:
         if not meetings:
             logger.warning("No meetings to ingest for season %s", season)
             return
@@ -325,22 +548,34 @@ class OpenF1Ingestor:
             include_session=False,
         )
 
-        for meeting_key, meta in meeting_meta.items():
-            self._ingest_meeting(meta)
-
-    def _ingest_meeting(self, meta: dict) -> None:
+        metas = list(meeting_meta.values())
+        sessions_by_meeting = self.client.engine.map(
+            lambda meta: self.client.fetch_all("sessions", {"meeting_key": meta["meeting_key"]}, allow_pagination=False),
+            metas,
+        )
+        # Sessions of every meeting in the season share the session pool.
+        session_jobs = []
+        for meta, sessions_raw in zip(metas, sessions_by_meeting):
+            if isinstance(sessions_raw, BaseException):
+                raise sessions_raw
+            session_jobs.extend(self._ingest_meeting(meta, sessions_raw))
+        for fut in [session_pool.submit(self._ingest_session_tables, **job) for job in session_jobs]:
+            fut.result()
+
+    def _ingest_meeting(self, meta: dict, sessions_raw: list[dict]) -> list[dict]:
+        """Write the meeting's sessions partition and return one job per session to ingest."""
         meeting_key = meta["meeting_key"]
         season = meta["season"]
         round_number = meta["round"]
         grand_prix_slug = meta["grand_prix_slug"]
 
-        sessions_raw = self.client.fetch_all("sessions", {"meeting_key": meeting_key}, allow_pagination=False)
         sessions = _normalize_records(sessions_raw)
         if not sessions:
             logger.warning("No sessions for meeting_key=%s", meeting_key)
-            return
+            return []
 
         session_records: list[dict] = []
+        jobs: list[dict] = []
         for session in sessions:
             session_key = session.get("session_key")
             session_code = _derive_session_code(session.get("session_name"), session.get("session_type"))
@@ -364,14 +599,16 @@ class OpenF1Ingestor:
                 session_key=session_key,
             )
             session_records.append(session_row)
-
-            self._ingest_session_tables(
-                season=season,
-                round_number=round_number,
-                grand_prix_slug=grand_prix_slug,
-                meeting_key=meeting_key,
-                session_key=session_key,
-                session_code=session_code,
+            jobs.append(
+                dict(
+                    season=season,
+                    round_number=round_number,
+                    grand_prix_slug=grand_prix_slug,
+                    meeting_key=meeting_key,
+                    session_key=session_key,
+                    session_code=session_code,
+                    date_end=session.get("date_end"),
+                )
             )
 
         self._write_partitioned(
@@ -380,6 +617,7 @@ class OpenF1Ingestor:
             partition_keys=["season", "round", "grand_prix_slug", "session_code"],
             include_session=True,
         )
+        return jobs
 
     def _ingest_session_tables(
         self,
@@ -389,6 +627,7 @@ class OpenF1Ingestor:
         meeting_key: int,
         session_key: int,
         session_code: str,
+        date_end: Optional[str] = None,
     ) -> None:
         common_kwargs = dict(
             season=season,
@@ -398,6 +637,25 @@ class OpenF1Ingestor:
             meeting_key=meeting_key,
             session_key=session_key,
         )
+        partition = dict(
+            season=season,
+            round_number=round_number,
+            grand_prix_slug=grand_prix_slug,
+            session_code=session_code,
+        )
+
+        finished = self._session_finished(date_end)
+        if self.config.incremental and self.state is not None and finished:
+            drivers_key = self._partition_key("drivers", **partition)
+            legacy = self.state.get(drivers_key) is None and (self.bronze_root / drivers_key).exists()
+            if self.state.is_complete(session_key) or legacy:
+                # Legacy partitions predate state tracking; they were written after the session ended.
+                self.state.mark_complete(session_key)
+                logger.info("Skipping finished session_key=%s (%s %s R%s)", session_key, session_code, season, round_number)
+                return
+
+        # Cleared by any failed fetch, so incremental runs retry the session.
+        complete = True
 
         # Drivers (session_key only)
         drivers_raw = self.client.fetch_all("drivers", {"session_key": session_key}, allow_pagination=False)
@@ -429,22 +687,30 @@ class OpenF1Ingestor:
         else:
             logger.info("No rows for drivers session_key=%s", session_key)
 
-        # Laps: requires session_key + driver_number
+        # Laps: requires session_key + driver_number. Laps are published per driver as they
+        # complete, so incremental runs keep one date_start watermark per driver.
         if driver_numbers:
             laps_all: list[dict] = []
-            for dn in driver_numbers:
-                try:
-                    laps_raw = self.client.fetch_all(
-                        "laps",
-                        {"session_key": session_key, "driver_number": dn},
-                        allow_pagination=False,
-                    )
-                except Exception as exc:
-                    logger.warning("Failed laps fetch for session_key=%s driver_number=%s: %s", session_key, dn, exc)
+            lap_marks: dict[str, str] = {}
+            if self.config.incremental:
+                _, lap_marks = self._watermarks("laps", DATE_FIELDS["laps"], by="driver_number", **partition)
+
+            def fetch_laps(dn: Any) -> list[dict]:
+                params: list[tuple[str, Any]] = [("session_key", session_key), ("driver_number", dn)]
+                mark = lap_marks.get(str(dn))
+                if mark:
+                    params.append(("date_start>", mark))
+                rows = self.client.fetch_all("laps", params, allow_pagination=False)
+                return [r for r in rows if not mark or str(r.get("date_start") or "") > mark]
+
+            laps_by_driver = self.client.engine.map(fetch_laps, driver_numbers)
+            for dn, laps_raw in zip(driver_numbers, laps_by_driver):
+                if isinstance(laps_raw, BaseException):
+                    logger.warning("Failed laps fetch for session_key=%s driver_number=%s: %s", session_key, dn, laps_raw)
+                    complete = False
                     continue
                 if laps_raw:
                     laps_all.extend(laps_raw)
-                time.sleep(self.config.driver_sleep_seconds)
 
             if laps_all:
                 laps_norm = _normalize_records(laps_all)
@@ -466,8 +732,10 @@ class OpenF1Ingestor:
                     partition_keys=["season", "round", "grand_prix_slug", "session_code"],
                     include_session=True,
                     force_override=self.config.force_reingest_laps,
+                    watermark_by="driver_number",
                 )
-                self.lap_rows_written += len(laps_aug)
+                with self._lock:
+                    self.lap_rows_written += len(laps_aug)
                 logger.info(
                     "[laps] season=%s round=%s session_code=%s meeting_key=%s session_key=%s drivers=%s laps_rows=%s",
                     season,
@@ -490,48 +758,47 @@ class OpenF1Ingestor:
         else:
             logger.info("Skipping laps; no drivers for session_key=%s", session_key)
 
-        # Tables that work with session_key only
-        simple_tables = [
-            ("stints", False),
-            ("pit", False),
-            ("session_result", False),
-            ("starting_grid", False),
+        # (table, allow_pagination, quiet_if_empty); fetched concurrently, one partition each.
+        table_specs = [
+            # Tables that work with session_key only
+            ("stints", False, False),
+            ("pit", False, False),
+            ("session_result", False, False),
+            ("starting_grid", False, False),
+            # Weather, position, race_control can be sparse
+            ("weather", False, True),
+            ("position", False, True),
+            ("race_control", False, True),
         ]
-        for table_name, allow_pagination in simple_tables:
-            self._ingest_simple_table(
-                table_name=table_name,
-                allow_pagination=allow_pagination,
-                **common_kwargs,
-            )
-
-        # Weather, position, race_control can be sparse
-        sparse_tables = [
-            ("weather", False),
-            ("position", False),
-            ("race_control", False),
-        ]
-        for table_name, allow_pagination in sparse_tables:
-            self._ingest_simple_table(
-                table_name=table_name,
-                allow_pagination=allow_pagination,
-                quiet_if_empty=True,
-                **common_kwargs,
-            )
-
         # Optional heavy tables
         optional_tables = [
-            ("car_data", self.config.enable_car_data, True),
-            ("intervals", self.config.enable_intervals, True),
-            ("overtakes", self.config.enable_overtakes, True),
+            ("car_data", self.config.enable_car_data),
+            ("intervals", self.config.enable_intervals),
+            ("overtakes", self.config.enable_overtakes),
         ]
-        for table_name, enabled, allow_pagination in optional_tables:
-            if not enabled:
-                continue
-            self._ingest_simple_table(
-                table_name=table_name,
-                allow_pagination=allow_pagination,
+        table_specs.extend((table_name, True, False) for table_name, enabled in optional_tables if enabled)
+
+        table_results = self.client.engine.map(
+            lambda spec: self._ingest_simple_table(
+                table_name=spec[0],
+                allow_pagination=spec[1],
+                quiet_if_empty=spec[2],
                 **common_kwargs,
-            )
+            ),
+            table_specs,
+        )
+        # engine.map returns failures in place; write/cast errors still fail the run.
+        failures = [(spec[0], res) for spec, res in zip(table_specs, table_results) if isinstance(res, BaseException)]
+        for table_name, exc in failures:
+            logger.error("Failed to ingest %s session_key=%s: %s", table_name, session_key, exc, exc_info=exc)
+        if failures:
+            raise failures[0][1]
+        complete = complete and all(table_results)
+
+        if finished and complete and self.state is not None:
+            self.state.mark_complete(session_key)
+        elif finished and self.state is not None:
+            logger.warning("Not marking session_key=%s complete: some fetches failed and will be retried", session_key)
 
     def _ingest_simple_table(
         self,
@@ -544,20 +811,49 @@ class OpenF1Ingestor:
         session_key: int,
         allow_pagination: bool,
         quiet_if_empty: bool = False,
-    ) -> None:
-        try:
-            records_raw = self.client.fetch_all(
-                table_name, {"session_key": session_key}, allow_pagination=allow_pagination
+    ) -> bool:
+        """Fetch and write one table of a session; False when the fetch failed."""
+        params: list[tuple[str, Any]] = [("session_key", session_key)]
+        date_field = DATE_FIELDS.get(table_name) if self.config.incremental else None
+        watermark: Optional[str] = None
+        if date_field:
+            watermark, _ = self._watermarks(
+                table_name,
+                date_field,
+                season=season,
+                round_number=round_number,
+                grand_prix_slug=grand_prix_slug,
+                session_code=session_code,
             )
+            if watermark:
+                # Sent as `date>`=<value>; OpenF1 may read that as >=, so the boundary row is dropped below.
+                params.append((f"{date_field}>", watermark))
+        if table_name in self.config.streaming_tables:
+            return self._stream_table(
+                table_name=table_name,
+                params=params,
+                allow_pagination=allow_pagination,
+                watermark=watermark,
+                season=season,
+                round_number=round_number,
+                grand_prix_slug=grand_prix_slug,
+                session_code=session_code,
+                meeting_key=meeting_key,
+                session_key=session_key,
+            )
+        try:
+            records_raw = self.client.fetch_all(table_name, params, allow_pagination=allow_pagination)
         except Exception as exc:
             logger.warning("Failed fetch for %s session_key=%s: %s", table_name, session_key, exc)
-            return
+            return False
 
         records = _normalize_records(records_raw)
+        if watermark:
+            records = [r for r in records if str(r.get(date_field) or "") > watermark]
         if not records:
             if not quiet_if_empty:
                 logger.info("No rows for %s session_key=%s", table_name, session_key)
-            return
+            return True
 
         augmented = [
             self._add_common_columns(
@@ -578,6 +874,120 @@ class OpenF1Ingestor:
             partition_keys=["season", "round", "grand_prix_slug", "session_code"],
             include_session=True,
         )
+        return True
+
+    def _stream_table(
+        self,
+        table_name: str,
+        params: list[tuple[str, Any]],
+        allow_pagination: bool,
+        watermark: Optional[str],
+        season: int,
+        round_number: int,
+        grand_prix_slug: str,
+        session_code: str,
+        meeting_key: int,
+        session_key: int,
+    ) -> bool:
+        """
+        Streaming counterpart of fetch_all + _write_partitioned for heavy tables: each page
+        goes straight to Arrow and into rolling part files. Same skip / force / incremental
+        append semantics; a failed fetch removes the parts written so far and returns False.
+        A forced rewrite streams into hidden temporary files and only replaces the existing
+        parts once the whole table was fetched.
+        """
+        partition_dir = self._build_partition_path(
+            table=table_name,
+            season=season,
+            round_number=round_number,
+            grand_prix_slug=grand_prix_slug,
+            session_code=session_code,
+        )
+        existing = sorted(partition_dir.glob("*.parquet"))
+        force = self.config.force_reingest
+        if existing and not force and not (self.config.incremental and self.state is not None):
+            logger.info("Skipping %s partition %s (files already exist)", table_name, partition_dir)
+            return True
+
+        start_index = 0
+        replace = bool(existing) and force
+        if existing and not force:
+            indexes = [int(f.stem.rsplit("-", 1)[-1]) for f in existing if f.stem.rsplit("-", 1)[-1].isdigit()]
+            start_index = max(indexes, default=-1) + 1
+
+        writer = RollingParquetWriter(
+            partition_dir,
+            table=table_name,
+            registry=self.schemas,
+            constants={
+                "season": season,
+                "round": round_number,
+                "grand_prix_slug": grand_prix_slug,
+                "session_code": session_code,
+                "meeting_key": meeting_key,
+                "session_key": session_key,
+                "ingested_at": self.ingested_at,
+            },
+            rename=_snake_case,
+            start_index=start_index,
+            rows_per_file=self.config.stream_rows_per_file,
+            row_group_size=self.config.stream_row_group_size,
+            # Not matched by part-*.parquet / *.parquet readers until renamed below.
+            name_template=STREAM_TMP_TEMPLATE if replace else "part-{index:05d}.parquet",
+        )
+        date_field = DATE_FIELDS.get(table_name)
+        digest = hashlib.sha1()
+        max_date: Optional[str] = None
+        try:
+            for page in self.client.iter_pages(table_name, params, allow_pagination=allow_pagination):
+                if watermark:
+                    page = [r for r in page if str(r.get(date_field) or "") > watermark]
+                if not page:
+                    continue
+                if date_field:
+                    page_max = _max_str(r.get(date_field) for r in page)
+                    if page_max is not None and (max_date is None or page_max > max_date):
+                        max_date = page_max
+                digest.update(json.dumps(page, sort_keys=True, default=str).encode("utf-8"))
+                writer.write_page(page)
+            files = writer.close()
+        except Exception as exc:
+            logger.warning("Failed streaming fetch for %s session_key=%s: %s", table_name, session_key, exc)
+            for f in writer.close():
+                f.unlink(missing_ok=True)
+            return False
+
+        if not files:
+            logger.info("No rows for %s session_key=%s", table_name, session_key)
+            return True
+        if replace:
+            files = self._swap_in_parts(existing, files)
+        with self._lock:
+            self.files_written.extend(f.relative_to(self.bronze_root).as_posix() for f in files)
+        if self.state is not None:
+            self.state.record(
+                partition_dir.relative_to(self.bronze_root).as_posix(),
+                table=table_name,
+                session_key=session_key,
+                rows_added=writer.rows_written,
+                replaced=force or not existing,
+                content_hash=digest.hexdigest(),
+                watermark=max_date,
+            )
+        return True
+
+    def _swap_in_parts(self, existing: list[Path], tmp_files: list[Path]) -> list[Path]:
+        """Replace a partition's part files with freshly streamed temporary ones."""
+        final = [tmp.with_name(f"part-{i:05d}.parquet") for i, tmp in enumerate(tmp_files)]
+        final_names = {f.name for f in final}
+        for f in existing:
+            if f.name not in final_names:
+                f.unlink()
+                with self._lock:
+                    self.files_removed.append(f.relative_to(self.bronze_root).as_posix())
+        for tmp, target in zip(tmp_files, final):
+            os.replace(tmp, target)
+        return final
 
     def _add_common_columns(
         self,
@@ -607,11 +1017,17 @@ class OpenF1Ingestor:
         partition_keys: list[str],
         include_session: bool,
         force_override: Optional[bool] = None,
+        watermark_by: Optional[str] = None,
     ) -> None:
+        """
+        Write one partition. Default: skip partitions that already have files unless forced.
+        Incremental mode: tables with a date column get the (already filtered) new rows
+        appended as the next part file; other tables are rewritten only if their content
+        hash changed.
+        """
         if not records:
             return
         df = pd.DataFrame(records)
-        df = _sanitize_df_for_parquet(df)
 
         partition_values = {key: records[0].get(key) for key in partition_keys}
         partition_dir = self._build_partition_path(
@@ -622,21 +1038,58 @@ class OpenF1Ingestor:
             session_code=partition_values.get("session_code") if include_session else None,
         )
 
-        existing = list(partition_dir.glob("*.parquet"))
+        existing = sorted(partition_dir.glob("*.parquet"))
         force = self.config.force_reingest if force_override is None else force_override
+        state_key = partition_dir.relative_to(self.bronze_root).as_posix()
+        date_field = DATE_FIELDS.get(table)
+        digest = content_hash(df)
+        replace = bool(existing) and force
+        target_file = partition_dir / "part-00000.parquet"
         if existing and not force:
-            logger.info("Skipping %s partition %s (files already exist)", table, partition_dir)
-            return
+            if not (self.config.incremental and self.state is not None):
+                logger.info("Skipping %s partition %s (files already exist)", table, partition_dir)
+                return
+            if date_field:
+                indexes = [int(f.stem.rsplit("-", 1)[-1]) for f in existing if f.stem.rsplit("-", 1)[-1].isdigit()]
+                target_file = partition_dir / f"part-{max(indexes, default=-1) + 1:05d}.parquet"
+            else:
+                previous = self.state.get(state_key)
+                if previous is not None and previous.get("content_hash") == digest:
+                    logger.info("Skipping %s partition %s (unchanged)", table, partition_dir)
+                    return
+                replace = True
 
         partition_dir.mkdir(parents=True, exist_ok=True)
-        if existing and force:
+        if replace:
             for f in existing:
                 f.unlink()
+                with self._lock:
+                    self.files_removed.append(f.relative_to(self.bronze_root).as_posix())
 
-        target_file = partition_dir / "part-00000.parquet"
-        df.to_parquet(target_file, index=False)
+        pq.write_table(self.schemas.to_arrow(table, df), target_file)
+        with self._lock:
+            self.files_written.append(target_file.relative_to(self.bronze_root).as_posix())
         logger.info("Wrote %s rows to %s", len(df), target_file)
 
+        if self.state is not None:
+            marks: dict[str, str] = {}
+            if date_field and watermark_by:
+                for rec in records:
+                    value = rec.get(date_field)
+                    key = str(rec.get(watermark_by))
+                    if value is not None and str(value) > marks.get(key, ""):
+                        marks[key] = str(value)
+            self.state.record(
+                state_key,
+                table=table,
+                session_key=records[0].get("session_key"),
+                rows_added=len(df),
+                replaced=replace or not existing,
+                content_hash=digest,
+                watermark=_max_str(rec.get(date_field) for rec in records) if date_field else None,
+                watermarks=marks,
+            )
+
     def _build_partition_path(
         self,
         table: str,
@@ -673,8 +1126,26 @@ def load_config() -> IngestConfig:
     enable_intervals = os.getenv("OPENF1_ENABLE_INTERVALS", "0") == "1"
     enable_overtakes = os.getenv("OPENF1_ENABLE_OVERTAKES", "0") == "1"
     force_reingest_laps = os.getenv("OPENF1_FORCE_REINGEST_LAPS", "0") == "1"
-    driver_sleep_seconds = float(os.getenv("OPENF1_DRIVER_SLEEP_SECONDS", "0.1"))
+    rate_limit = float(os.getenv("OPENF1_RATE_LIMIT", "3"))
+    rate_burst = int(os.getenv("OPENF1_RATE_BURST", "3"))
+    fetch_workers = int(os.getenv("OPENF1_FETCH_WORKERS", "8"))
+    endpoint_concurrency = int(os.getenv("OPENF1_ENDPOINT_CONCURRENCY", "4"))
+    endpoint_limits = _parse_limits(os.getenv("OPENF1_ENDPOINT_LIMITS", ""))
+    session_concurrency = int(os.getenv("OPENF1_SESSION_CONCURRENCY", "2"))
+    streaming_tables = set(_parse_str_list(os.getenv("OPENF1_STREAMING_TABLES", "car_data,intervals,location")))
+    stream_rows_per_file = int(os.getenv("OPENF1_STREAM_ROWS_PER_FILE", "1000000"))
+    stream_row_group_size = int(os.getenv("OPENF1_STREAM_ROW_GROUP_SIZE", "128000"))
     max_meeting_key = int(os.getenv("OPENF1_MAX_MEETING_KEY", "1400"))
+    # Meetings discovered per season are cached here; OPENF1_MEETINGS_CACHE=off disables it.
+    meetings_cache_env = os.getenv("OPENF1_MEETINGS_CACHE") or str(data_root / "cache" / "openf1_meetings.json")
+    meetings_cache_path = None if meetings_cache_env.lower() in {"0", "off"} else Path(meetings_cache_env)
+    meetings_cache_ttl_hours = float(os.getenv("OPENF1_MEETINGS_CACHE_TTL_HOURS", "24"))
+    incremental = os.getenv("OPENF1_INCREMENTAL", "0") == "1"
+    state_path = Path(os.getenv("OPENF1_STATE_PATH") or str(data_root / "cache" / "openf1_ingest_state.json"))
+    incremental_lookback_hours = float(os.getenv("OPENF1_INCREMENTAL_LOOKBACK_HOURS", "48"))
+    # Warehouse holding meta.bronze_files; set OPENF1_UPDATE_CATALOG=0 to skip catalog updates.
+    warehouse = Path(os.getenv("F1_WAREHOUSE", str(data_root / "warehouse" / "f1_openf1.duckdb")))
+    warehouse_path = warehouse if os.getenv("OPENF1_UPDATE_CATALOG", "1") == "1" else None
 
     return IngestConfig(
         base_url=base_url,
@@ -686,8 +1157,23 @@ def load_config() -> IngestConfig:
         enable_intervals=enable_intervals,
         enable_overtakes=enable_overtakes,
         force_reingest_laps=force_reingest_laps,
-        driver_sleep_seconds=driver_sleep_seconds,
         max_meeting_key=max_meeting_key,
+        warehouse_path=warehouse_path,
+        generation_path=warehouse.with_suffix(GENERATION_SUFFIX),
+        meetings_cache_path=meetings_cache_path,
+        meetings_cache_ttl_hours=meetings_cache_ttl_hours,
+        incremental=incremental,
+        state_path=state_path,
+        incremental_lookback_hours=incremental_lookback_hours,
+        rate_limit=rate_limit,
+        rate_burst=rate_burst,
+        fetch_workers=fetch_workers,
+        endpoint_concurrency=endpoint_concurrency,
+        endpoint_limits=endpoint_limits,
+        session_concurrency=session_concurrency,
+        streaming_tables=streaming_tables,
+        stream_rows_per_file=stream_rows_per_file,
+        stream_row_group_size=stream_row_group_size,
     )
 
 
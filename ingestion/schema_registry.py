@@ -0,0 +1,247 @@
+"""
+Declared Arrow schemas for bronze OpenF1 tables.
+
+Every write casts to a stable per-endpoint schema instead of letting pandas/Arrow
+infer types from whatever a given session happened to return (int vs double
+speeds, all-null columns typed `null`, gap_to_leader as double in one race and
+"+1 LAP" in the next), which is what forced union_by_name scans downstream.
+Numeric columns that OpenF1 sometimes fills with text keep their numeric type;
+the text values go to a companion column (TEXT_OVERFLOW).
+
+Columns not declared here are typed once by sampling their values; the decision
+is cached per (endpoint, column) and persisted so later runs write the same type.
+Casting is done column-wise by Arrow; only columns whose values cannot be cast
+fall back to a vectorized string conversion.
+"""
+
+import json
+import logging
+import os
+import threading
+from pathlib import Path
+from typing import Optional
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+
+logger = logging.getLogger("openf1_ingestion")
+
+I64 = pa.int64()
+F64 = pa.float64()
+STR = pa.string()
+BOOL = pa.bool_()
+
+# Added to every bronze row by the ingestor.
+COMMON_COLUMNS: dict[str, pa.DataType] = {
+    "meeting_key": I64,
+    "session_key": I64,
+    "season": I64,
+    "round": I64,
+    "grand_prix_slug": STR,
+    "session_code": STR,
+    "ingested_at": STR,
+}
+
+# Timestamps stay ISO strings (as OpenF1 returns them and as bronze has always stored them).
+DECLARED_SCHEMAS: dict[str, dict[str, pa.DataType]] = {
+    "meetings": {
+        "meeting_key": I64, "meeting_name": STR, "meeting_official_name": STR, "meeting_code": STR,
+        "location": STR, "country_key": I64, "country_code": STR, "country_name": STR,
+        "circuit_key": I64, "circuit_short_name": STR, "gmt_offset": STR, "date_start": STR, "year": I64,
+    },
+    "sessions": {
+        "session_key": I64, "session_name": STR, "session_type": STR, "date_start": STR, "date_end": STR,
+        "location": STR, "country_key": I64, "country_code": STR, "country_name": STR,
+        "circuit_key": I64, "circuit_short_name": STR, "gmt_offset": STR, "year": I64,
+    },
+    "drivers": {
+        "driver_number": I64, "broadcast_name": STR, "full_name": STR, "name_acronym": STR,
+        "team_name": STR, "team_colour": STR, "first_name": STR, "last_name": STR,
+        "headshot_url": STR, "country_code": STR,
+    },
+    "laps": {
+        "driver_number": I64, "lap_number": I64, "date_start": STR,
+        "duration_sector_1": F64, "duration_sector_2": F64, "duration_sector_3": F64,
+        "i1_speed": F64, "i2_speed": F64, "st_speed": F64, "is_pit_out_lap": BOOL, "lap_duration": F64,
+        "segments_sector_1": STR, "segments_sector_2": STR, "segments_sector_3": STR,
+    },
+    "stints": {
+        "stint_number": I64, "driver_number": I64, "lap_start": I64, "lap_end": I64,
+        "compound": STR, "tyre_age_at_start": I64,
+    },
+    "pit": {"date": STR, "driver_number": I64, "lap_number": I64, "pit_duration": F64},
+    # duration / gap_to_leader are seconds in races (as existing bronze stores them);
+    # "+1 LAP" for lapped cars and [Q1, Q2, Q3] lists in qualifying go to the *_text columns.
+    "session_result": {
+        "position": I64, "driver_number": I64, "number_of_laps": I64, "points": F64,
+        "dnf": BOOL, "dns": BOOL, "dsq": BOOL, "duration": F64, "gap_to_leader": F64,
+        "duration_text": STR, "gap_to_leader_text": STR,
+    },
+    "starting_grid": {"position": I64, "driver_number": I64, "lap_duration": F64},
+    "weather": {
+        "date": STR, "air_temperature": F64, "humidity": F64, "pressure": F64, "rainfall": I64,
+        "track_temperature": F64, "wind_direction": I64, "wind_speed": F64,
+    },
+    "position": {"date": STR, "driver_number": I64, "position": I64},
+    "race_control": {
+        "date": STR, "driver_number": I64, "lap_number": I64, "category": STR, "flag": STR,
+        "scope": STR, "sector": I64, "message": STR,
+    },
+    "car_data": {
+        "date": STR, "driver_number": I64, "speed": I64, "rpm": I64, "n_gear": I64,
+        "throttle": I64, "brake": I64, "drs": I64,
+    },
+    "intervals": {"date": STR, "driver_number": I64, "gap_to_leader": STR, "interval": STR},
+    "location": {"date": STR, "driver_number": I64, "x": I64, "y": I64, "z": I64},
+    "overtakes": {"date": STR, "overtaking_driver_number": I64, "overtaken_driver_number": I64, "position": I64},
+}
+
+# Numeric column -> text column that receives its values that are not numbers.
+TEXT_OVERFLOW: dict[str, dict[str, str]] = {
+    "session_result": {"duration": "duration_text", "gap_to_leader": "gap_to_leader_text"},
+}
+
+_TYPE_NAMES = {"int64": I64, "double": F64, "string": STR, "bool": BOOL}
+_SAMPLE_SIZE = 1000
+
+
+def _infer_type(values: pd.Series) -> pa.DataType:
+    sample = values.dropna()
+    if len(sample) > _SAMPLE_SIZE:
+        sample = sample.sample(_SAMPLE_SIZE, random_state=0)
+    if sample.empty:
+        return STR
+    kinds = {type(v) for v in sample}
+    if kinds <= {bool}:
+        return BOOL
+    if kinds <= {int}:
+        return I64
+    if kinds <= {int, float}:
+        return F64
+    return STR
+
+
+def _int_lists_to_text(values: pd.Series) -> Optional[pa.Array]:
+    """Render list<int> cells as "[2049, 2051, None]" (same text as str()) with Arrow kernels."""
+    try:
+        arr = pa.array(values, from_pandas=True)
+    except (pa.ArrowInvalid, pa.ArrowTypeError, TypeError, ValueError):
+        return None
+    if not pa.types.is_list(arr.type) or not pa.types.is_integer(arr.type.value_type):
+        return None
+    items = arr.values.cast(STR).fill_null("None")
+    as_text = pa.ListArray.from_arrays(arr.offsets, items, mask=arr.is_null())
+    return pc.binary_join_element_wise("[", pc.binary_join(as_text, ", "), "]", "")
+
+
+def _to_string_array(values: pd.Series) -> pa.Array:
+    lists = _int_lists_to_text(values)
+    if lists is not None:
+        return lists
+    mask = values.isna().to_numpy()
+    return pa.array(values.astype(str).to_numpy(dtype=object), type=STR, mask=mask)
+
+
+def _split_overflow(values: pd.Series) -> tuple[pd.Series, pd.Series]:
+    """(numeric values, str() of the non-null values that are not numbers) of one column."""
+    nested = values.map(lambda v: isinstance(v, (list, tuple, dict)))
+    numeric = pd.to_numeric(values.mask(nested), errors="coerce")
+    overflow = values.notna() & numeric.isna()
+    text = pd.Series([str(v) if o else None for v, o in zip(values, overflow)], index=values.index, dtype=object)
+    return numeric, text
+
+
+class SchemaRegistry:
+    def __init__(self, cache_path: Optional[Path] = None):
+        self.cache_path = cache_path
+        self._lock = threading.Lock()
+        # "table.column" -> type name, for columns not declared above
+        self._inferred: dict[str, str] = {}
+        # text columns that last needed the str() fallback (mixed values): skip the Arrow attempts
+        self._mixed: set[str] = set()
+        self._dirty = False
+        if cache_path is not None:
+            try:
+                self._inferred = json.loads(cache_path.read_text())
+            except FileNotFoundError:
+                pass
+            except (OSError, ValueError) as exc:
+                logger.warning("Ignoring unreadable schema cache %s: %s", cache_path, exc)
+
+    def column_type(self, table: str, column: str, values: pd.Series) -> pa.DataType:
+        declared = DECLARED_SCHEMAS.get(table, {}).get(column) or COMMON_COLUMNS.get(column)
+        if declared is not None:
+            return declared
+        key = f"{table}.{column}"
+        with self._lock:
+            name = self._inferred.get(key)
+            if name is None and values.notna().any():
+                name = str(_infer_type(values))
+                self._inferred[key] = name
+                self._dirty = True
+                logger.info("Schema registry: inferred %s as %s", key, name)
+        # All-null columns stay untyped-as-string until real values show up.
+        return _TYPE_NAMES.get(name or "string", STR)
+
+    def column_array(self, table: str, column: str, values: pd.Series) -> pa.Array:
+        target = self.column_type(table, column, values)
+        key = f"{table}.{column}"
+        if key in self._mixed and values.dtype == object:
+            return _to_string_array(values)
+        try:
+            return pa.array(values, type=target, from_pandas=True)
+        except (pa.ArrowInvalid, pa.ArrowTypeError, TypeError, ValueError):
+            pass
+        try:
+            # Homogeneous but differently typed (e.g. float seconds into a text column): Arrow cast.
+            return pa.array(values, from_pandas=True).cast(target)
+        except (pa.ArrowInvalid, pa.ArrowTypeError, pa.ArrowNotImplementedError, TypeError, ValueError):
+            pass
+        if target == STR:
+            self._mixed.add(key)
+            return _to_string_array(values)
+        numeric = pd.to_numeric(values, errors="coerce")
+        if pa.types.is_integer(target):
+            # Fractional or out-of-range values would be truncated or wrap around.
+            numeric = numeric.mask((numeric != numeric.round()) | (numeric.abs() >= 2**63))
+        elif pa.types.is_boolean(target):
+            numeric = numeric.where(numeric.isin([0, 1]))
+        lost = int(numeric.isna().sum() - values.isna().sum())
+        if lost:
+            logger.warning(
+                "Schema registry: %s values of %s.%s not castable to %s; stored as null", lost, table, column, target
+            )
+        return pa.array(numeric, type=target, from_pandas=True, safe=True)
+
+    def schema_columns(self, table: str, present: list[str]) -> list[str]:
+        """Declared columns first (so every file has them, null-filled if absent), then extras."""
+        declared = list(DECLARED_SCHEMAS.get(table, {}))
+        ordered = declared + [c for c in COMMON_COLUMNS if c not in declared]
+        if table not in DECLARED_SCHEMAS:
+            ordered = []
+        return ordered + [c for c in present if c not in ordered]
+
+    def to_arrow(self, table: str, df: pd.DataFrame) -> pa.Table:
+        n = len(df)
+        overflow = {c: t for c, t in TEXT_OVERFLOW.get(table, {}).items() if c in df.columns}
+        if overflow:
+            df = df.copy()
+            for column, text_column in overflow.items():
+                df[column], df[text_column] = _split_overflow(df[column])
+        arrays = {}
+        for column in self.schema_columns(table, list(df.columns)):
+            values = df[column] if column in df.columns else pd.Series([None] * n, dtype=object)
+            arrays[column] = self.column_array(table, column, values)
+        return pa.table(arrays)
+
+    def save(self) -> None:
+        if self.cache_path is None or not self._dirty:
+            return
+        with self._lock:
+            payload = json.dumps(self._inferred, indent=2, sort_keys=True)
+            self._dirty = False
+        self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.cache_path.with_name(f"{self.cache_path.name}.{os.getpid()}.tmp")
+        tmp.write_text(payload)
+        os.replace(tmp, self.cache_path)
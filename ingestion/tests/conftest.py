@@ -0,0 +1,24 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+TESTS_DIR = Path(__file__).resolve().parent
+INGESTION_DIR = TESTS_DIR.parent
+for path in (INGESTION_DIR, TESTS_DIR):
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
+
+from fake_openf1 import FakeOpenF1
+
+
+@pytest.fixture
+def fake_openf1():
+    with FakeOpenF1(
+        {
+            "sessions": [{"session_key": 9158, "session_name": "Race", "year": 2023}],
+            "car_data": [{"driver_number": 1, "speed": 301}],
+            "laps": [{"driver_number": 1, "lap_number": 1, "lap_duration": 92.5}],
+        }
+    ) as api:
+        yield api
@@ -0,0 +1,127 @@
+"""
+Local stand-in for the OpenF1 API, for exercising the fetch engine and ingestor.
+
+Serves canned JSON lists for /v1/<endpoint> from an http.server on an ephemeral
+port. Responses can be scripted per endpoint (e.g. a 429 with Retry-After, then
+500, then the canned body) and every request is logged with its arrival time, so
+tests can assert on rate limiting, global pauses and per-endpoint concurrency.
+
+    with FakeOpenF1({"sessions": [{"session_key": 1}]}) as api:
+        api.script("sessions", Reply(429, headers={"Retry-After": "1"}))
+        engine = FetchEngine(api.base_url, ...)
+"""
+
+import json
+import threading
+import time
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Optional
+from urllib.parse import parse_qsl, urlsplit
+
+
+@dataclass
+class Reply:
+    status: int = 200
+    body: Any = None  # JSON-encoded unless already str/bytes; None -> the endpoint's canned rows
+    headers: dict[str, str] = field(default_factory=dict)
+
+
+@dataclass
+class Hit:
+    endpoint: str
+    params: list[tuple[str, str]]
+    status: int
+    started: float  # time.monotonic() on arrival
+
+
+class FakeOpenF1:
+    def __init__(self, data: Optional[dict[str, list[dict]]] = None, delay: float = 0.0):
+        self.data = dict(data or {})
+        self.delay = delay  # seconds each request is held before replying
+        self.hits: list[Hit] = []
+        self.max_in_flight: dict[str, int] = {}
+        self._scripts: dict[str, list[Reply]] = {}
+        self._in_flight: dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def script(self, endpoint: str, *replies: Reply) -> None:
+        """Queue replies for the next requests to `endpoint`; then it falls back to the canned rows."""
+        with self._lock:
+            self._scripts.setdefault(endpoint, []).extend(replies)
+
+    def hits_for(self, endpoint: str) -> list[Hit]:
+        with self._lock:
+            return [h for h in self.hits if h.endpoint == endpoint]
+
+    def start(self) -> "FakeOpenF1":
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+        self._thread.join()
+
+    def __enter__(self) -> "FakeOpenF1":
+        return self.start()
+
+    def __exit__(self, *exc: Any) -> None:
+        self.stop()
+
+    def _next_reply(self, endpoint: str) -> Reply:
+        with self._lock:
+            queued = self._scripts.get(endpoint)
+            if queued:
+                return queued.pop(0)
+        if endpoint not in self.data:
+            return Reply(404, {"detail": "Not Found"})
+        return Reply()
+
+    def _handler(self) -> type[BaseHTTPRequestHandler]:
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:
+                started = time.monotonic()
+                url = urlsplit(self.path)
+                endpoint = url.path.removeprefix("/v1/").strip("/")
+                with fake._lock:
+                    fake._in_flight[endpoint] = fake._in_flight.get(endpoint, 0) + 1
+                    fake.max_in_flight[endpoint] = max(
+                        fake.max_in_flight.get(endpoint, 0), fake._in_flight[endpoint]
+                    )
+                try:
+                    if fake.delay:
+                        time.sleep(fake.delay)
+                    reply = fake._next_reply(endpoint)
+                    body = fake.data.get(endpoint, []) if reply.body is None and reply.status == 200 else reply.body
+                    if isinstance(body, str):
+                        body = body.encode("utf-8")
+                    elif not isinstance(body, bytes):
+                        body = json.dumps(body).encode("utf-8")
+                    with fake._lock:
+                        fake.hits.append(Hit(endpoint, parse_qsl(url.query), reply.status, started))
+                    self.send_response(reply.status)
+                    self.send_header("Content-Type", "application/json")
+                    self.send_header("Content-Length", str(len(body)))
+                    for name, value in reply.headers.items():
+                        self.send_header(name, value)
+                    self.end_headers()
+                    self.wfile.write(body)
+                finally:
+                    with fake._lock:
+                        fake._in_flight[endpoint] -= 1
+
+            def log_message(self, format: str, *args: Any) -> None:
+                pass
+
+        return Handler
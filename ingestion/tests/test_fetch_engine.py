@@ -0,0 +1,109 @@
+import time
+
+import pytest
+from fake_openf1 import Reply
+from fetch_engine import FetchEngine
+
+
+def make_engine(base_url: str, **overrides) -> FetchEngine:
+    options = dict(
+        rate_limit=0,
+        burst=1,
+        max_workers=8,
+        endpoint_concurrency=8,
+        request_timeout=5,
+        max_retries=3,
+        backoff_seconds=0.01,
+    )
+    options.update(overrides)
+    return FetchEngine(base_url, **options)
+
+
+def test_request_returns_rows_and_sends_params(fake_openf1):
+    engine = make_engine(fake_openf1.base_url)
+    try:
+        rows = engine.request("sessions", [("year", 2023), ("session_name", "Race")])
+    finally:
+        engine.close()
+    assert rows == fake_openf1.data["sessions"]
+    assert fake_openf1.hits_for("sessions")[0].params == [("year", "2023"), ("session_name", "Race")]
+
+
+def test_server_errors_are_retried(fake_openf1):
+    fake_openf1.script("laps", Reply(500), Reply(503))
+    engine = make_engine(fake_openf1.base_url)
+    try:
+        rows = engine.request("laps", [])
+    finally:
+        engine.close()
+    assert rows == fake_openf1.data["laps"]
+    assert [h.status for h in fake_openf1.hits_for("laps")] == [500, 503, 200]
+    assert engine.stats()["throttled"] == 0
+
+
+def test_429_pauses_every_worker_for_retry_after(fake_openf1):
+    fake_openf1.script("sessions", Reply(429, headers={"Retry-After": "1"}))
+    engine = make_engine(fake_openf1.base_url, rate_limit=100, burst=10)
+
+    def fetch(item):
+        endpoint, start_after = item
+        time.sleep(start_after)
+        return engine.request(endpoint, [])
+
+    try:
+        # laps is requested while sessions is paused and has never been throttled itself.
+        results = engine.map(fetch, [("sessions", 0.0), ("laps", 0.3)])
+    finally:
+        engine.close()
+    assert not any(isinstance(r, BaseException) for r in results)
+    throttled_at = fake_openf1.hits_for("sessions")[0].started
+    retried_at = fake_openf1.hits_for("sessions")[1].started
+    laps_at = fake_openf1.hits_for("laps")[0].started
+    assert retried_at - throttled_at >= 0.9
+    assert laps_at - throttled_at >= 0.9
+    assert engine.stats()["throttled"] == 1
+
+
+def test_token_bucket_limits_request_rate(fake_openf1):
+    engine = make_engine(fake_openf1.base_url, rate_limit=20, burst=1)
+    started = time.monotonic()
+    try:
+        engine.map(lambda _: engine.request("sessions", []), range(11))
+    finally:
+        engine.close()
+    # One token up front, then 10 more at 20/s.
+    assert time.monotonic() - started >= 0.45
+    assert engine.stats()["requests"] == 11
+
+
+def test_endpoint_semaphore_caps_in_flight_requests(fake_openf1):
+    fake_openf1.delay = 0.1
+    engine = make_engine(fake_openf1.base_url, endpoint_limits={"laps": 3})
+    try:
+        engine.map(lambda endpoint: engine.request(endpoint, []), ["car_data"] * 6 + ["laps"] * 6)
+    finally:
+        engine.close()
+    assert fake_openf1.max_in_flight["car_data"] == 2  # DEFAULT_ENDPOINT_LIMITS
+    assert fake_openf1.max_in_flight["laps"] == 3
+
+
+def test_invalid_json_is_not_retried(fake_openf1):
+    fake_openf1.script("sessions", Reply(200, body="<html>maintenance</html>"))
+    engine = make_engine(fake_openf1.base_url)
+    try:
+        with pytest.raises(ValueError):
+            engine.request("sessions", [])
+    finally:
+        engine.close()
+    assert len(fake_openf1.hits_for("sessions")) == 1
+
+
+def test_map_returns_failures_in_place(fake_openf1):
+    engine = make_engine(fake_openf1.base_url, max_retries=0)
+    try:
+        results = engine.map(lambda endpoint: engine.request(endpoint, []), ["laps", "unknown", "sessions"])
+    finally:
+        engine.close()
+    assert results[0] == fake_openf1.data["laps"]
+    assert isinstance(results[1], Exception)
+    assert results[2] == fake_openf1.data["sessions"]
@@ -1,22 +1,17 @@
-
-import subprocess
 import sys
 from pathlib import Path
 
 REPO_ROOT = Path(__file__).resolve().parent
-SCRIPTS_DIR = REPO_ROOT / "scripts"
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from scripts.build_dag import main as run_build_dag
 
-def run_script(script_name):
-    script_path = SCRIPTS_DIR / script_name
-    print(f"Running {script_name}...")
-    subprocess.run([sys.executable, str(script_path)])
 
 def main():
-    run_script("build_silver.py")
-    run_script("build_gold.py")
-    run_script("build_ml_features.py")
-    run_script("train_models.py")
-    run_script("generate_race_predictions.py")
+    # Stages run in dependency order, skip when their inputs are unchanged, and stop
+    # only the branch below a failure (see scripts/build_dag.py).
+    return run_build_dag(sys.argv[1:])
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
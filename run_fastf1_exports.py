@@ -1,15 +1,16 @@
-
-import subprocess
 import sys
 from pathlib import Path
 
 REPO_ROOT = Path(__file__).resolve().parent
-SCRIPT_PATH = REPO_ROOT / "scripts" / "fastf1_export_season.py"
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from scripts.fastf1_export_orchestrator import main as run_orchestrator
+
 
 def main():
-    for year in range(2018, 2025):
-        print(f"Running export for year {year}...")
-        subprocess.run([sys.executable, str(SCRIPT_PATH), "--year", str(year), "--auto-format", "--include-testing"])
+    # All seasons go through one process pool; the manifest makes reruns retry only failed sessions.
+    return run_orchestrator(["--years", "2018-2024", "--auto-format", "--data-types", "laps"])
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
@@ -24,7 +24,6 @@ Usage:
 import argparse
 import json
 import logging
-import subprocess
 import sys
 from pathlib import Path
 from typing import Dict, List, Optional
@@ -36,26 +35,34 @@ logging.basicConfig(
 )
 logger = logging.getLogger("fastf1_ml_pipeline")
 
-REPO_ROOT = Path(__file__).resolve().parent.parent
+REPO_ROOT = Path(__file__).resolve().parent
 SCRIPTS_DIR = REPO_ROOT / "scripts"
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from scripts.build_dag import STAGES, BuildGraph, log_report, run_stages
 
 PIPELINE_STAGES = {
     "bronze": {
+        "dag_stage": "fastf1_bronze",
         "script": "build_bronze_fastf1_ml.py",
         "description": "Ingest raw race and weather data (2018-2025)",
         "depends_on": []
     },
     "silver": {
+        "dag_stage": "fastf1_silver",
         "script": "build_silver_fastf1_ml.py",
         "description": "Create aggregated features with weather & venue stats",
         "depends_on": ["bronze"]
     },
     "gold": {
+        "dag_stage": "fastf1_gold",
         "script": "build_gold_fastf1_ml.py",
         "description": "Build comprehensive feature-engineered training dataset",
         "depends_on": ["silver"]
     },
     "train": {
+        "dag_stage": "fastf1_train",
         "script": "train_fastf1_models.py",
         "description": "Train prediction models on gold dataset",
         "depends_on": ["gold"]
@@ -63,69 +70,20 @@ PIPELINE_STAGES = {
 }
 
 
-def run_stage(stage: str, debug: bool = False) -> bool:
-    """Run a single pipeline stage."""
-    if stage not in PIPELINE_STAGES:
-        logger.error(f"Unknown stage: {stage}")
-        return False
-    
-    config = PIPELINE_STAGES[stage]
-    script_path = SCRIPTS_DIR / config["script"]
-    
-    if not script_path.exists():
-        logger.error(f"Script not found: {script_path}")
-        return False
-    
-    logger.info(f"\n{'='*70}")
-    logger.info(f"Stage: {stage.upper()}")
-    logger.info(f"Description: {config['description']}")
-    logger.info(f"Script: {script_path}")
-    logger.info(f"{'='*70}\n")
-    
-    try:
-        cmd = [sys.executable, str(script_path)]
-        result = subprocess.run(cmd, check=True, capture_output=False)
-        logger.info(f"✓ Stage '{stage}' completed successfully\n")
-        return True
-    except subprocess.CalledProcessError as e:
-        logger.error(f"✗ Stage '{stage}' failed with exit code {e.returncode}")
-        return False
-    except Exception as e:
-        logger.error(f"✗ Stage '{stage}' failed: {e}")
-        return False
-
-
 def run_pipeline(stages: List[str], debug: bool = False) -> bool:
-    """Run multiple pipeline stages in sequence."""
+    """Run pipeline stages through the build DAG (dependency order, skipped when up to date)."""
     logger.info(f"Starting F1 ML Pipeline with stages: {', '.join(stages)}")
     logger.info(f"Debug mode: {debug}\n")
-    
-    completed = []
-    failed = []
-    
-    for stage in stages:
-        logger.info(f"[{len(completed)+1}/{len(stages)}] Running stage: {stage}")
-        
-        if run_stage(stage, debug):
-            completed.append(stage)
-        else:
-            failed.append(stage)
-            logger.warning(f"Stopping pipeline due to failure in stage: {stage}")
-            break
-    
-    # Summary
-    logger.info(f"\n{'='*70}")
-    logger.info("PIPELINE SUMMARY")
-    logger.info(f"{'='*70}")
-    logger.info(f"Completed: {len(completed)}/{len(stages)}")
-    if completed:
-        logger.info(f"  ✓ {', '.join(completed)}")
+
+    graph = BuildGraph(STAGES)
+    names = [PIPELINE_STAGES[stage]["dag_stage"] for stage in stages]
+    results = run_stages(graph, names, workers=1)
+    log_report(results, sum(r.seconds for r in results))
+
+    failed = [r.name for r in results if r.status in {"failed", "blocked"}]
     if failed:
-        logger.info(f"Failed: {len(failed)}")
-        logger.info(f"  ✗ {', '.join(failed)}")
-    logger.info(f"{'='*70}\n")
-    
-    return len(failed) == 0
+        logger.warning(f"Failed or blocked stages: {', '.join(failed)}")
+    return not failed
 
 
 def show_pipeline_info():
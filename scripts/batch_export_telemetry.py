@@ -1,7 +1,7 @@
 #!/usr/bin/env python3
 """
 Batch export orchestrator for FastF1 data.
-Exports weather, race control messages, and GPS position data in controlled batches
+Exports weather, race control messages, GPS position data and car telemetry in controlled batches
 to avoid hitting FastF1 rate limits.
 """
 
@@ -78,6 +78,18 @@ def export_year_batch(year: int, data_types: list, delay_between_types: float =
             sample_rate=10,
             delay=3.0
         )
+        if delay_between_types > 0 and 'telemetry' in data_types:
+            logger.info(f"Waiting {delay_between_types}s before next data type...")
+            sleep(delay_between_types)
+    
+    if 'telemetry' in data_types:
+        logger.info(f"\n>>> Exporting CAR TELEMETRY for {year} (Q,R sessions, all laps)")
+        results['telemetry'] = run_export_script(
+            "export_telemetry_data.py",
+            year=year,
+            sessions="Q,R",
+            delay=3.0
+        )
     
     return results
 
@@ -86,14 +98,23 @@ def main():
     parser = argparse.ArgumentParser(description="Batch export FastF1 data with rate limiting")
     parser.add_argument("--years", type=str, required=True, help="Comma-separated years (e.g., 2025,2024,2023)")
     parser.add_argument("--data-types", type=str, default="weather,race_control,position", 
-                       help="Comma-separated data types to export")
+                       help="Comma-separated data types to export (weather,race_control,position,telemetry)")
     parser.add_argument("--delay-between-years", type=float, default=60.0, 
                        help="Delay between years (seconds)")
     parser.add_argument("--delay-between-types", type=float, default=30.0,
                        help="Delay between data types (seconds)")
+    parser.add_argument("--workers", type=int, default=0,
+                       help="Run through fastf1_export_orchestrator with N worker processes "
+                            "(one session load shared by all data types, no fixed delays). 0 = sequential scripts")
     
     args = parser.parse_args()
     
+    if args.workers > 0:
+        from fastf1_export_orchestrator import main as run_orchestrator
+        raise SystemExit(
+            run_orchestrator(["--years", args.years, "--data-types", args.data_types, "--workers", str(args.workers)])
+        )
+    
     years = [int(y.strip()) for y in args.years.split(',')]
     data_types = [dt.strip() for dt in args.data_types.split(',')]
     
@@ -0,0 +1,319 @@
+#!/usr/bin/env python3
+"""
+Latency / throughput benchmark for the API hot paths.
+
+1. Generates (or reuses) a synthetic bronze tree and warehouse of the requested size
+   with scripts/synthetic_warehouse.py.
+2. Points api/app.py (F1_API_WAREHOUSE / F1_API_BRONZE) and the backend
+   (F1_WAREHOUSE) at it and loads both apps in-process.
+3. For every endpoint, sends --requests requests from --concurrency concurrent
+   clients through httpx's ASGI transport, after --warmup unmeasured requests.
+   Path parameters rotate over all (season, round) pairs so requests do not all hit
+   the same partition.
+4. Writes p50/p95/p99/mean/max latency (ms), throughput (req/s) and status counts per
+   endpoint to --output as JSON and, with --baseline, compares against a saved run.
+
+A metric regresses when it is more than --threshold (relative) and --min-delta-ms
+(absolute) worse than the baseline; throughput regresses when it drops by more than
+--threshold. Regressions and new errors exit with status 1. Compare runs made with the
+same synthetic size and concurrency on the same machine; the results record both.
+
+The API response cache is disabled by default (--api-cache enables it) so the
+numbers measure the queries rather than cache hits.
+
+Examples:
+  python scripts/benchmark_api.py --save-baseline benchmark_baseline.json
+  python scripts/benchmark_api.py --baseline benchmark_baseline.json
+  python scripts/benchmark_api.py --seasons 4 --rounds 22 --laps 70 --concurrency 16 --endpoints api
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from collections import Counter
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import duckdb
+import httpx
+import numpy as np
+
+SCRIPT_DIR = Path(__file__).resolve().parent
+REPO_ROOT = SCRIPT_DIR.parent
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from scripts.synthetic_warehouse import SyntheticConfig, add_config_args, config_from_args, ensure_synthetic
+
+DEFAULT_WORKDIR = Path(tempfile.gettempdir()) / "f1-benchmark"
+LATENCY_METRICS = ("p50_ms", "p95_ms", "p99_ms")
+
+
+@dataclass
+class Endpoint:
+    name: str
+    app: str  # "api" (api/app.py) or "backend" (backend/app/main.py)
+    path: str  # may use {season}, {round}, {driver_number}
+
+
+ENDPOINTS = [
+    Endpoint("api.meta_seasons", "api", "/api/meta/seasons"),
+    Endpoint("api.meta_races", "api", "/api/meta/races?season={season}"),
+    Endpoint("api.race_drivers", "api", "/api/races/{season}/{round}/drivers"),
+    Endpoint("api.race_sessions", "api", "/api/races/{season}/{round}/sessions"),
+    Endpoint("api.race_results", "api", "/api/races/{season}/{round}/results"),
+    Endpoint("api.driver_pace", "api", "/api/season/{season}/driver_pace"),
+    Endpoint("api.standings_drivers", "api", "/api/standings/drivers?season={season}"),
+    Endpoint("api.standings_constructors", "api", "/api/standings/constructors?season={season}"),
+    Endpoint("api.predictions_race_win", "api", "/api/predictions/race_win?season={season}&round={round}"),
+    Endpoint("api.predictions_summary", "api", "/api/predictions/race_win/summary?season={season}"),
+    Endpoint("backend.standings_drivers", "backend", "/standings/drivers?season={season}&round={round}"),
+    Endpoint("backend.standings_teams", "backend", "/standings/teams?season={season}&round={round}"),
+    Endpoint("backend.results_session", "backend", "/results/session?season={season}&round={round}&session_code=R"),
+    Endpoint(
+        "backend.results_driver_season",
+        "backend",
+        "/results/driver-season?season={season}&driver_number={driver_number}",
+    ),
+    Endpoint("backend.pace_session", "backend", "/pace/session?season={season}&round={round}&session_code=R"),
+    Endpoint("backend.pace_season", "backend", "/pace/season?season={season}"),
+    Endpoint("backend.meta_seasons", "backend", "/meta/seasons"),
+    Endpoint("backend.meta_races", "backend", "/meta/races?season={season}"),
+    Endpoint("backend.catalog_calendar", "backend", "/catalog/calendar/{season}"),
+]
+
+
+def git_revision() -> str:
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=REPO_ROOT, capture_output=True, text=True, timeout=5
+        )
+        return out.stdout.strip() or "unknown"
+    except (OSError, subprocess.SubprocessError):
+        return "unknown"
+
+
+def load_apps(warehouse: Path, bronze_root: Path, api_cache: bool) -> Dict[str, Any]:
+    """Import both apps configured for the synthetic warehouse (env is read at import time)."""
+    os.environ["F1_API_WAREHOUSE"] = str(warehouse)
+    os.environ["F1_API_BRONZE"] = str(bronze_root)
+    os.environ["F1_WAREHOUSE"] = str(warehouse)
+    if not api_cache:
+        os.environ["F1_API_CACHE_SIZE"] = "0"
+        os.environ.pop("F1_API_CACHE_DIR", None)
+    from api.app import app as api_app
+    from backend.app.main import app as backend_app
+
+    return {"api": api_app, "backend": backend_app}
+
+
+def request_paths(endpoint: Endpoint, cfg: SyntheticConfig, count: int) -> List[str]:
+    combos = [
+        {"season": season, "round": round_num, "driver_number": 1 + (i % cfg.drivers)}
+        for i, (season, round_num) in enumerate(
+            (s, r) for s in cfg.season_list for r in range(1, cfg.rounds + 1)
+        )
+    ]
+    return [endpoint.path.format(**combos[i % len(combos)]) for i in range(count)]
+
+
+def summarize(latencies_ms: List[float], statuses: Counter, wall_seconds: float) -> Dict[str, Any]:
+    total = sum(statuses.values())
+    ok = np.asarray(latencies_ms) if latencies_ms else None
+    return {
+        "requests": total,
+        "errors": total - len(latencies_ms),
+        "status_counts": {str(k): v for k, v in sorted(statuses.items(), key=lambda kv: str(kv[0]))},
+        "p50_ms": float(np.percentile(ok, 50)) if ok is not None else None,
+        "p95_ms": float(np.percentile(ok, 95)) if ok is not None else None,
+        "p99_ms": float(np.percentile(ok, 99)) if ok is not None else None,
+        "mean_ms": float(ok.mean()) if ok is not None else None,
+        "max_ms": float(ok.max()) if ok is not None else None,
+        "throughput_rps": total / wall_seconds if wall_seconds > 0 else None,
+        "wall_seconds": wall_seconds,
+    }
+
+
+async def run_endpoint(client: httpx.AsyncClient, paths: List[str], concurrency: int, warmup: int) -> Dict[str, Any]:
+    for path in paths[:warmup]:
+        await client.get(path)
+
+    pending = iter(paths[warmup:])
+    latencies_ms: List[float] = []
+    statuses: Counter = Counter()
+
+    async def worker() -> None:
+        for path in pending:  # shared iterator: each path is taken by exactly one worker
+            started = time.perf_counter()
+            try:
+                resp = await client.get(path)
+                status: Any = resp.status_code
+            except httpx.HTTPError as exc:
+                status = type(exc).__name__
+            elapsed_ms = (time.perf_counter() - started) * 1000.0
+            statuses[status] += 1
+            if isinstance(status, int) and status < 400:
+                latencies_ms.append(elapsed_ms)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(max(1, concurrency))))
+    return summarize(latencies_ms, statuses, time.perf_counter() - started)
+
+
+async def run_benchmarks(
+    apps: Dict[str, Any], endpoints: List[Endpoint], cfg: SyntheticConfig, args: argparse.Namespace
+) -> Dict[str, Dict[str, Any]]:
+    clients = {
+        name: httpx.AsyncClient(
+            # Unhandled exceptions become 500 responses (counted as errors), as under uvicorn.
+            transport=httpx.ASGITransport(app=app, raise_app_exceptions=False),
+            base_url=f"http://{name}",
+            timeout=60.0,
+        )
+        for name, app in apps.items()
+    }
+    results: Dict[str, Dict[str, Any]] = {}
+    try:
+        for endpoint in endpoints:
+            paths = request_paths(endpoint, cfg, args.requests + args.warmup)
+            stats = await run_endpoint(clients[endpoint.app], paths, args.concurrency, args.warmup)
+            stats["path"] = endpoint.path
+            results[endpoint.name] = stats
+            print(
+                f"[bench] {endpoint.name:<32} p50={_fmt(stats['p50_ms'])} p95={_fmt(stats['p95_ms'])} "
+                f"p99={_fmt(stats['p99_ms'])} rps={_fmt(stats['throughput_rps'], 1)} errors={stats['errors']}"
+            )
+    finally:
+        for client in clients.values():
+            await client.aclose()
+    return results
+
+
+def _fmt(value: Optional[float], digits: int = 2) -> str:
+    return "-" if value is None else f"{value:.{digits}f}"
+
+
+def compare(
+    results: Dict[str, Any], baseline: Dict[str, Any], threshold: float, min_delta_ms: float
+) -> List[str]:
+    """Human-readable regressions of `results` against `baseline` (both full result documents)."""
+    regressions = []
+    base_endpoints = baseline.get("endpoints", {})
+    for name, cur in results["endpoints"].items():
+        base = base_endpoints.get(name)
+        if not base:
+            continue
+        for metric in LATENCY_METRICS:
+            old, new = base.get(metric), cur.get(metric)
+            if old is None or new is None:
+                continue
+            if new > old * (1.0 + threshold) and new - old > min_delta_ms:
+                regressions.append(f"{name}: {metric} {old:.2f} -> {new:.2f} ms (+{(new / old - 1) * 100:.0f}%)")
+        old_rps, new_rps = base.get("throughput_rps"), cur.get("throughput_rps")
+        if old_rps and new_rps and new_rps < old_rps / (1.0 + threshold):
+            regressions.append(f"{name}: throughput {old_rps:.1f} -> {new_rps:.1f} req/s")
+        if cur.get("errors", 0) > base.get("errors", 0):
+            regressions.append(f"{name}: errors {base.get('errors', 0)} -> {cur['errors']} ({cur['status_counts']})")
+    return regressions
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark the API hot paths against a synthetic warehouse")
+    parser.add_argument("--workdir", type=Path, default=DEFAULT_WORKDIR, help="Synthetic data directory")
+    parser.add_argument("--rebuild", action="store_true", help="Regenerate the synthetic warehouse")
+    add_config_args(parser)
+    parser.add_argument("--requests", type=int, default=200, help="Measured requests per endpoint")
+    parser.add_argument("--warmup", type=int, default=10, help="Unmeasured requests per endpoint")
+    parser.add_argument("--concurrency", type=int, default=8, help="Concurrent clients")
+    parser.add_argument(
+        "--endpoints", type=str, default="", help="Comma-separated endpoint names or apps (api, backend); default all"
+    )
+    parser.add_argument("--api-cache", action="store_true", help="Keep the API response cache enabled")
+    parser.add_argument("--output", type=Path, help="Results JSON (default: <workdir>/results-<timestamp>.json)")
+    parser.add_argument("--baseline", type=Path, help="Compare against this results JSON")
+    parser.add_argument("--save-baseline", type=Path, help="Also write the results to this baseline path")
+    parser.add_argument("--threshold", type=float, default=0.25, help="Relative slowdown that counts as a regression")
+    parser.add_argument("--min-delta-ms", type=float, default=2.0, help="Ignore latency increases below this")
+    parser.add_argument("--list", action="store_true", help="List endpoints and exit")
+    return parser.parse_args()
+
+
+def select_endpoints(spec: str) -> List[Endpoint]:
+    wanted = {s.strip() for s in spec.split(",") if s.strip()}
+    if not wanted:
+        return list(ENDPOINTS)
+    selected = [e for e in ENDPOINTS if e.name in wanted or e.app in wanted]
+    unknown = wanted - {e.name for e in ENDPOINTS} - {e.app for e in ENDPOINTS}
+    if unknown:
+        raise SystemExit(f"Unknown endpoints: {sorted(unknown)}. Use --list.")
+    return selected
+
+
+def write_json(path: Path, doc: Dict[str, Any]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    tmp.write_text(json.dumps(doc, indent=1, sort_keys=True))
+    os.replace(tmp, path)
+
+
+def main() -> int:
+    args = parse_args()
+    if args.list:
+        for e in ENDPOINTS:
+            print(f"{e.name:<32} {e.app:<8} {e.path}")
+        return 0
+    endpoints = select_endpoints(args.endpoints)
+    cfg = config_from_args(args)
+
+    warehouse = ensure_synthetic(args.workdir, cfg, rebuild=args.rebuild)
+    apps = load_apps(warehouse, args.workdir / "bronze", args.api_cache)
+    print(f"[info] {len(endpoints)} endpoints, {args.requests} requests each, concurrency={args.concurrency}")
+    endpoint_results = asyncio.run(run_benchmarks(apps, endpoints, cfg, args))
+
+    results = {
+        "created_at": datetime.utcnow().isoformat(),
+        "git_revision": git_revision(),
+        "python": platform.python_version(),
+        "duckdb": duckdb.__version__,
+        "machine": f"{platform.system()} {platform.machine()} cpus={os.cpu_count()}",
+        "config": {
+            "synthetic": asdict(cfg),
+            "requests": args.requests,
+            "warmup": args.warmup,
+            "concurrency": args.concurrency,
+            "api_cache": args.api_cache,
+        },
+        "endpoints": endpoint_results,
+    }
+    output = args.output or args.workdir / f"results-{datetime.utcnow():%Y%m%dT%H%M%S}.json"
+    write_json(output, results)
+    print(f"[info] results written to {output}")
+    if args.save_baseline:
+        write_json(args.save_baseline, results)
+        print(f"[info] baseline saved to {args.save_baseline}")
+
+    if not args.baseline:
+        return 0
+    baseline = json.loads(args.baseline.read_text())
+    if baseline.get("config") != results["config"]:
+        print(f"[warn] baseline config differs: {baseline.get('config')} vs {results['config']}")
+    regressions = compare(results, baseline, args.threshold, args.min_delta_ms)
+    if regressions:
+        print(f"[regression] {len(regressions)} regressions vs {args.baseline} ({baseline.get('git_revision')}):")
+        for line in regressions:
+            print(f"[regression]   {line}")
+        return 1
+    print(f"[info] no regressions vs {args.baseline} ({baseline.get('git_revision')})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
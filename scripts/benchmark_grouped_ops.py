@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Benchmark the vectorized per-race operations in scripts/grouped_ops.py against the
+pandas groupby loops they replaced, on synthetic multi-season data.
+
+Covers the three per-race passes of the build and training scripts:
+- softmax      build_predictions_table.py (pred_win_proba_softmax by season/round)
+- hit@k        train_models.py / train_fastf1_models.py (hit@1 and hit@3)
+- winner rank  train_race_win_model_full.py evaluate_ranking
+
+Every case checks the vectorized result against the loop before timing it.
+
+Usage:
+  python scripts/benchmark_grouped_ops.py
+  python scripts/benchmark_grouped_ops.py --seasons 10,40 --repeats 5
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+SCRIPT_DIR = Path(__file__).resolve().parent
+REPO_ROOT = SCRIPT_DIR.parent
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from scripts import grouped_ops
+
+RACES_PER_SEASON = 24
+DRIVERS_PER_RACE = 20
+
+
+def synthetic_races(n_seasons: int, seed: int = 0) -> pd.DataFrame:
+    """One row per driver and race, shuffled, with one winner per race (none in the last race)."""
+    rng = np.random.default_rng(seed)
+    n_races = n_seasons * RACES_PER_SEASON
+    race = np.repeat(np.arange(n_races), DRIVERS_PER_RACE)
+    df = pd.DataFrame(
+        {
+            "season": 2000 + race // RACES_PER_SEASON,
+            "round": race % RACES_PER_SEASON + 1,
+            "grand_prix_slug": [f"gp-{r % RACES_PER_SEASON}" for r in race],
+            "driver_code": [f"D{d:02d}" for d in np.tile(np.arange(DRIVERS_PER_RACE), n_races)],
+            "proba": rng.random(len(race)),
+            "win": 0,
+        }
+    )
+    df.loc[rng.integers(0, DRIVERS_PER_RACE, n_races) + np.arange(n_races) * DRIVERS_PER_RACE, "win"] = 1
+    df.loc[race == n_races - 1, "win"] = 0  # a future race
+    return df.sample(frac=1.0, random_state=seed).reset_index(drop=True)
+
+
+# --- the groupby loops as they were in the scripts ---------------------------------
+
+
+def loop_softmax(df: pd.DataFrame) -> np.ndarray:
+    out = pd.Series(0.0, index=df.index)
+    for _, group in df.groupby(["season", "round"]):
+        arr = np.nan_to_num(group["proba"].to_numpy(), nan=0.0)
+        exp = np.exp(arr - arr.max())
+        denom = exp.sum()
+        out.loc[group.index] = exp / (denom if denom != 0 else 1)
+    return out.to_numpy()
+
+
+def loop_hit_at_k(df: pd.DataFrame, k: int) -> float:
+    hits = 0
+    races = 0
+    for _, grp in df.groupby(["season", "round", "grand_prix_slug"]):
+        races += 1
+        ordered = grp.sort_values("proba", ascending=False, kind="stable")
+        true_codes = set(ordered[ordered["win"] == 1]["driver_code"])
+        topk_codes = set(ordered.head(k)["driver_code"])
+        if true_codes & topk_codes:
+            hits += 1
+    return hits / races if races else 0.0
+
+
+def loop_winner_ranks(df: pd.DataFrame) -> np.ndarray:
+    ranks = []
+    for _, group in df.groupby(["season", "round"]):
+        if group["win"].sum() == 0:
+            continue
+        sorted_indices = np.argsort(-group["proba"].to_numpy(), kind="stable")
+        ranks.append(np.where(group["win"].to_numpy()[sorted_indices] == 1)[0][0] + 1)
+    return np.asarray(ranks)
+
+
+# --- the grouped_ops versions ------------------------------------------------------
+
+
+def vec_softmax(df: pd.DataFrame) -> np.ndarray:
+    races = grouped_ops.Segments.from_frame(df, ["season", "round"])
+    return races.scatter(grouped_ops.segment_softmax(races.gather(df["proba"]), races), fill=0.0)
+
+
+def vec_hit_at_k(df: pd.DataFrame, k: int) -> float:
+    races = grouped_ops.Segments.from_frame(df, ["season", "round", "grand_prix_slug"])
+    return grouped_ops.hit_at_k(df["proba"].to_numpy(), df["win"].to_numpy(), races, k)
+
+
+def vec_winner_ranks(df: pd.DataFrame) -> np.ndarray:
+    races = grouped_ops.Segments.from_frame(df, ["season", "round"])
+    return grouped_ops.winner_ranks(df["proba"].to_numpy(), df["win"].to_numpy(), races)["rank"]
+
+
+def best_of(fn: Callable[[], object], repeats: int) -> float:
+    timings = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def run_case(df: pd.DataFrame, repeats: int) -> List[Dict[str, object]]:
+    cases = [
+        ("softmax", lambda: loop_softmax(df), lambda: vec_softmax(df)),
+        ("hit@1", lambda: loop_hit_at_k(df, 1), lambda: vec_hit_at_k(df, 1)),
+        ("hit@3", lambda: loop_hit_at_k(df, 3), lambda: vec_hit_at_k(df, 3)),
+        ("winner_rank", lambda: loop_winner_ranks(df), lambda: vec_winner_ranks(df)),
+    ]
+    rows = []
+    for name, loop_fn, vec_fn in cases:
+        expected, actual = np.asarray(loop_fn()), np.asarray(vec_fn())
+        if expected.shape != actual.shape or not np.allclose(expected, actual, rtol=0, atol=1e-12):
+            raise AssertionError(f"{name}: vectorized result differs from the groupby loop")
+        loop_s = best_of(loop_fn, repeats)
+        vec_s = best_of(vec_fn, repeats)
+        rows.append({"op": name, "loop_ms": loop_s * 1000, "vectorized_ms": vec_s * 1000, "speedup": loop_s / vec_s})
+    return rows
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark grouped_ops against pandas groupby loops.")
+    parser.add_argument("--seasons", default="10,40", help="Comma-separated season counts to benchmark")
+    parser.add_argument("--repeats", type=int, default=3, help="Timed runs per case (best is reported)")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = parse_args(argv)
+    for n_seasons in (int(s) for s in args.seasons.split(",")):
+        df = synthetic_races(n_seasons)
+        print(f"\n{n_seasons} seasons: {n_seasons * RACES_PER_SEASON} races, {len(df)} rows")
+        print(f"  {'op':<12} {'loop ms':>10} {'vectorized ms':>14} {'speedup':>9}")
+        for row in run_case(df, args.repeats):
+            print(f"  {row['op']:<12} {row['loop_ms']:>10.1f} {row['vectorized_ms']:>14.2f} {row['speedup']:>8.0f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
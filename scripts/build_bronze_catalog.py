@@ -0,0 +1,88 @@
+"""
+Refresh meta.bronze_files (the bronze partition file catalog) in the DuckDB warehouse.
+
+Incremental: only files whose size/mtime changed since the last refresh have their
+Parquet footers re-read; rows for deleted files are dropped.
+
+Environment:
+- EXTERNAL_DATA_ROOT (required): host path containing bronze/.
+- F1_WAREHOUSE (optional): override warehouse path. Default:
+      /Volumes/SAMSUNG/apps/f1-dash/warehouse/f1_openf1.duckdb
+
+Usage:
+  python scripts/build_bronze_catalog.py [--tables laps,session_result]
+"""
+
+import argparse
+import logging
+import os
+import sys
+from pathlib import Path
+
+import duckdb
+
+SCRIPT_DIR = Path(__file__).resolve().parent
+REPO_ROOT = SCRIPT_DIR.parent
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from ingestion.bronze_catalog import CATALOG_TABLE, refresh_catalog
+
+DEFAULT_WAREHOUSE = "/Volumes/SAMSUNG/apps/f1-dash/warehouse/f1_openf1.duckdb"
+
+
+def fail(msg: str) -> None:
+    print(f"[error] {msg}")
+    sys.exit(1)
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Refresh the bronze file catalog (meta.bronze_files).")
+    parser.add_argument(
+        "--tables",
+        type=str,
+        default="",
+        help="Comma-separated bronze tables to rescan (default: all).",
+    )
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
+
+    external_root = os.getenv("EXTERNAL_DATA_ROOT")
+    if not external_root:
+        fail("EXTERNAL_DATA_ROOT is not set. Please export it before running this script.")
+    bronze_root = Path(external_root) / "bronze"
+    if not bronze_root.exists():
+        fail(f"Bronze root does not exist: {bronze_root}")
+    warehouse_path = Path(os.getenv("F1_WAREHOUSE", DEFAULT_WAREHOUSE))
+    warehouse_path.parent.mkdir(parents=True, exist_ok=True)
+
+    tables = [t.strip() for t in args.tables.split(",") if t.strip()] or None
+    print(f"[info] bronze_root={bronze_root}")
+    print(f"[info] warehouse_path={warehouse_path}")
+
+    con = duckdb.connect(str(warehouse_path))
+    try:
+        stats = refresh_catalog(con, bronze_root, tables=tables)
+        print(f"[info] catalog refresh: {stats}")
+        summary = con.execute(
+            f"""
+            SELECT table_name, COUNT(*) AS files, SUM(row_count) AS rows, COUNT(DISTINCT schema_hash) AS schemas
+            FROM {CATALOG_TABLE}
+            GROUP BY table_name
+            ORDER BY table_name
+            """
+        ).fetchdf()
+        print(f"[info] {CATALOG_TABLE} summary:")
+        print(summary)
+    finally:
+        con.close()
+
+    print(f"[success] {CATALOG_TABLE} refreshed at {warehouse_path}")
+
+
+if __name__ == "__main__":
+    main()
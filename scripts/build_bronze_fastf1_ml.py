@@ -7,12 +7,20 @@ Creates unified bronze layer with all raw race performance and environmental dat
 """
 
 import logging
+import sys
 from pathlib import Path
 
 import duckdb
 
-WAREHOUSE_PATH = "/Volumes/SAMSUNG/apps/f1-dash/warehouse/f1_openf1.duckdb"
-BRONZE_FASTF1_ROOT = "/Volumes/SAMSUNG/apps/f1-dash/bronze_fastf1"
+SCRIPT_DIR = Path(__file__).resolve().parent
+REPO_ROOT = SCRIPT_DIR.parent
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from scripts.data_paths import bronze_fastf1_dir, warehouse_path
+
+WAREHOUSE_PATH = str(warehouse_path())
+BRONZE_FASTF1_ROOT = str(bronze_fastf1_dir())
 
 logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
 logger = logging.getLogger("build_bronze_fastf1_ml")
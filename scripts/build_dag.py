@@ -0,0 +1,603 @@
+#!/usr/bin/env python3
+"""
+Dependency-aware build orchestrator for the warehouse and ML pipeline.
+
+Every build script is a Stage that declares the tables and files it reads and
+writes. Stage dependencies are derived from those declarations (a stage depends on
+whichever stage produces one of its inputs), so the run order is a topological
+sort rather than a hand-kept list.
+
+Up-to-date stages are skipped. A stage's key is a hash of its script source and
+arguments, the keys of the stages producing its inputs, and a fingerprint of its
+external file inputs (bronze trees: path/size/mtime of every file; single files:
+content). When the key matches the one recorded by the last successful run and its
+outputs still exist, the stage is not rerun. Keys are recorded in a JSON state file
+next to the warehouse (f1_openf1.duckdb -> f1_openf1.build_state.json).
+
+Independent stages run concurrently (--workers). A DuckDB file accepts one
+read-write process at a time, so stages that open the warehouse hold the
+"warehouse" resource and run one after another (each one still uses every core
+inside DuckDB); stages that only read Parquet or the FastF1 cache overlap with
+them. A failed stage blocks its dependents only; other branches keep going.
+
+References in inputs/outputs:
+- "schema.table"              a warehouse table or view
+- "bronze/laps/"              a directory tree under EXTERNAL_DATA_ROOT (default: repo root)
+- "ml_artifacts/foo_*.joblib" a file or glob under the same root
+
+Environment:
+- F1_WAREHOUSE (optional): DuckDB file whose tables are checked and counted.
+- EXTERNAL_DATA_ROOT (optional): root of bronze/, bronze_fastf1/ and ml_artifacts/.
+Both are passed on to every stage script (resolved via scripts/data_paths.py), so
+stages read and write exactly what is fingerprinted and checked here.
+
+Usage:
+  python scripts/build_dag.py                       # everything that is out of date
+  python scripts/build_dag.py --targets gold        # gold and whatever it needs
+  python scripts/build_dag.py --only fastf1_silver  # just that stage
+  python scripts/build_dag.py --list
+"""
+
+import argparse
+import hashlib
+import json
+import logging
+import os
+import subprocess
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import duckdb
+
+SCRIPT_DIR = Path(__file__).resolve().parent
+REPO_ROOT = SCRIPT_DIR.parent
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from scripts.data_paths import data_root, warehouse_path
+STATE_SUFFIX = ".build_state.json"
+WAREHOUSE = "warehouse"
+
+logger = logging.getLogger("build_dag")
+
+
+@dataclass(frozen=True)
+class Stage:
+    name: str
+    script: str
+    inputs: Tuple[str, ...] = ()
+    outputs: Tuple[str, ...] = ()
+    args: Tuple[str, ...] = ()
+    resources: Tuple[str, ...] = (WAREHOUSE,)
+    description: str = ""
+
+
+GOLD_SESSION_TABLES = ("gold.driver_session_summary", "gold.team_session_summary")
+GOLD_STANDINGS_TABLES = (
+    "gold.driver_season_standings",
+    "gold.team_season_standings",
+    "gold.driver_sprint_standings",
+    "gold.team_sprint_standings",
+)
+SILVER_FASTF1_TABLES = (
+    "silver_fastf1.race_data",
+    "silver_fastf1.driver_career_stats",
+    "silver_fastf1.driver_venue_stats",
+    "silver_fastf1.driver_weather_stats",
+    "silver_fastf1.team_stats",
+    "silver_fastf1.driver_season_form",
+)
+
+STAGES: List[Stage] = [
+    # OpenF1 branch
+    Stage(
+        "silver",
+        "build_silver.py",
+        inputs=("bronze/laps/", "bronze/session_result/", "bronze/drivers/"),
+        outputs=("silver.laps", "silver.session_results", "silver.drivers"),
+        description="OpenF1 bronze -> silver.laps / session_results / drivers",
+    ),
+    Stage(
+        "gold",
+        "build_gold.py",
+        args=("--incremental",),
+        inputs=("silver.laps", "silver.session_results", "silver.drivers"),
+        outputs=GOLD_SESSION_TABLES + GOLD_STANDINGS_TABLES,
+        description="Session summaries and standings",
+    ),
+    Stage(
+        "ml_features",
+        "build_ml_features.py",
+        inputs=(
+            "gold.driver_session_summary",
+            "gold.driver_season_standings",
+            "gold.team_season_standings",
+            "bronze/weather/",
+            "bronze/stints/",
+        ),
+        outputs=("features.race_win_training", "features.race_top3_training", "features.quali_top3_training"),
+        description="Race/qualifying training feature tables",
+    ),
+    Stage(
+        "silver_ml",
+        "build_silver_ml.py",
+        inputs=("bronze_fastf1/session_result/",),
+        outputs=("silver.driver_race_clean",),
+        description="Cleaned per-driver race rows for the race-win model",
+    ),
+    Stage(
+        "gold_ml",
+        "build_gold_ml.py",
+        inputs=("silver.driver_race_clean",),
+        outputs=("gold.race_winner_top3",),
+        description="Race winner / top-3 targets",
+    ),
+    Stage(
+        "feature_views",
+        "build_feature_views.py",
+        inputs=("gold.race_winner_top3",),
+        outputs=("features.race_win_training_enriched",),
+        description="Enriched race-win training view",
+    ),
+    Stage(
+        "train",
+        "train_models.py",
+        inputs=("features.race_win_training_enriched",),
+        outputs=("ml_artifacts/race_win_best.joblib", "ml_artifacts/race_top3_best.joblib"),
+        description="Race win / top-3 models",
+    ),
+    Stage(
+        "predict",
+        "generate_race_predictions.py",
+        inputs=("features.race_win_training_enriched", "ml_artifacts/race_win_logreg.joblib"),
+        description="Race prediction inputs check",
+    ),
+    Stage(
+        "predictions_table",
+        "build_predictions_table.py",
+        inputs=("features.race_win_training_enriched", "ml_artifacts/race_win_logreg.joblib"),
+        outputs=("predictions.race_win",),
+        description="predictions.race_win from the logistic race-win model",
+    ),
+    Stage(
+        "scenario_cube",
+        "build_scenario_cube.py",
+        inputs=(
+            "predictions.race_win",
+            "gold_fastf1.win_prediction_dataset",
+            "ml_artifacts/race_win_full.*",
+        ),
+        outputs=("predictions.race_win_scenario_cube",),
+        description="Precomputed what-if grid served by the race-win scenario endpoints",
+    ),
+    Stage(
+        "rf_position",
+        "train_bronze_rf_position.py",
+        inputs=("bronze/session_result/", "bronze/drivers/", "bronze/starting_grid/", "bronze/sessions/"),
+        outputs=("ml_artifacts/rf_position_model.joblib",),
+        resources=(),
+        description="Random-forest finishing position model (reads bronze Parquet directly)",
+    ),
+    # FastF1 branch
+    Stage(
+        "fastf1_views",
+        "build_fastf1_views.py",
+        inputs=("bronze_fastf1/laps/", "bronze_fastf1/session_result/"),
+        outputs=(
+            "fastf1.laps",
+            "fastf1.session_result",
+            "fastf1.race_calendar",
+            "fastf1.session_result_enriched",
+            "fastf1.race_results",
+            "fastf1.points_pre",
+            "fastf1.ml_race_win",
+        ),
+        description="fastf1.* tables and views served by the API",
+    ),
+    Stage(
+        "fastf1_metadata",
+        "build_fastf1_metadata.py",
+        inputs=("fastf1.laps",),
+        outputs=("fastf1.sessions",),
+        description="fastf1.sessions",
+    ),
+    Stage(
+        "telemetry_views",
+        "build_telemetry_views.py",
+        inputs=(
+            "fastf1.session_result_enriched",
+            "bronze_fastf1/weather/",
+            "bronze_fastf1/race_control/",
+            "bronze_fastf1/position/",
+        ),
+        outputs=(
+            "fastf1.weather",
+            "fastf1.race_control_messages",
+            "fastf1.position_data",
+            "fastf1.race_visualization_data",
+        ),
+        description="Weather / race control / position views",
+    ),
+    Stage(
+        "fastf1_bronze",
+        "build_bronze_fastf1_ml.py",
+        inputs=("bronze_fastf1/session_result/", "bronze_fastf1/weather/", "bronze_fastf1/laps/"),
+        outputs=("bronze_fastf1.session_result", "bronze_fastf1.weather", "bronze_fastf1.laps"),
+        description="FastF1 Parquet -> bronze_fastf1 tables",
+    ),
+    Stage(
+        "fastf1_silver",
+        "build_silver_fastf1_ml.py",
+        inputs=("bronze_fastf1.session_result", "bronze_fastf1.weather", "bronze_fastf1.laps"),
+        outputs=SILVER_FASTF1_TABLES,
+        description="Career / venue / weather / form aggregates",
+    ),
+    Stage(
+        "fastf1_gold",
+        "build_gold_fastf1_ml.py",
+        inputs=SILVER_FASTF1_TABLES,
+        outputs=(
+            "gold_fastf1.race_prediction_features",
+            "gold_fastf1.win_prediction_dataset",
+            "gold_fastf1.podium_prediction_dataset",
+        ),
+        description="Feature-engineered FastF1 training datasets",
+    ),
+    Stage(
+        "fastf1_train",
+        "train_fastf1_models.py",
+        inputs=("gold_fastf1.race_prediction_features",),
+        outputs=("ml_artifacts/race_podium_*.joblib", "ml_artifacts/race_finish_*.joblib"),
+        description="Win / podium / finish models",
+    ),
+    Stage(
+        "fastf1_predict",
+        "generate_fastf1_predictions.py",
+        inputs=(
+            "gold_fastf1.race_prediction_features",
+            "ml_artifacts/race_podium_*.joblib",
+            "ml_artifacts/race_finish_*.joblib",
+        ),
+        outputs=("gold_fastf1.race_predictions",),
+        description="gold_fastf1.race_predictions",
+    ),
+]
+
+
+def is_table(ref: str) -> bool:
+    return "/" not in ref
+
+
+def state_path(warehouse: Path) -> Path:
+    return warehouse.with_suffix(STATE_SUFFIX)
+
+
+def path_matches(ref: str) -> List[Path]:
+    root = data_root()
+    if any(ch in ref for ch in "*?["):
+        return sorted(root.glob(ref))
+    path = root / ref
+    return [path] if path.exists() else []
+
+
+def path_fingerprint(ref: str) -> str:
+    """Directory trees: path/size/mtime of every file (as the bronze catalog tracks them). Files: content."""
+    digest = hashlib.sha256(ref.encode("utf-8"))
+    root = data_root()
+    for match in path_matches(ref):
+        if match.is_dir():
+            for dirpath, dirnames, filenames in os.walk(match):
+                dirnames.sort()
+                for name in sorted(filenames):
+                    full = Path(dirpath, name)
+                    st = full.stat()
+                    digest.update(f"{full.relative_to(root)}:{st.st_size}:{st.st_mtime_ns};".encode("utf-8"))
+        else:
+            digest.update(str(match.relative_to(root)).encode("utf-8"))
+            with open(match, "rb") as fh:
+                for block in iter(lambda: fh.read(1 << 20), b""):
+                    digest.update(block)
+    return digest.hexdigest()
+
+
+class BuildGraph:
+    def __init__(self, stages: Sequence[Stage]):
+        self.stages: Dict[str, Stage] = {}
+        self.producer: Dict[str, str] = {}
+        for stage in stages:
+            if stage.name in self.stages:
+                raise ValueError(f"Duplicate stage name: {stage.name}")
+            self.stages[stage.name] = stage
+            for out in stage.outputs:
+                if out in self.producer:
+                    raise ValueError(f"{out} is produced by both {self.producer[out]} and {stage.name}")
+                self.producer[out] = stage.name
+        self.deps: Dict[str, List[str]] = {
+            name: sorted({self.producer[i] for i in stage.inputs if i in self.producer} - {name})
+            for name, stage in self.stages.items()
+        }
+        for name, stage in self.stages.items():
+            external_tables = [i for i in stage.inputs if is_table(i) and i not in self.producer]
+            if external_tables:
+                raise ValueError(f"Stage {name} reads tables no stage builds: {external_tables}")
+        self.order = self._toposort()
+
+    def _toposort(self) -> List[str]:
+        order: List[str] = []
+        state: Dict[str, int] = {}
+
+        def visit(name: str, path: Tuple[str, ...]) -> None:
+            if state.get(name) == 2:
+                return
+            if state.get(name) == 1:
+                raise ValueError(f"Dependency cycle: {' -> '.join(path + (name,))}")
+            state[name] = 1
+            for dep in self.deps[name]:
+                visit(dep, path + (name,))
+            state[name] = 2
+            order.append(name)
+
+        for name in self.stages:
+            visit(name, ())
+        return order
+
+    def upstream(self, names: Iterable[str]) -> List[str]:
+        wanted: set = set()
+        stack = list(names)
+        while stack:
+            name = stack.pop()
+            if name not in wanted:
+                wanted.add(name)
+                stack.extend(self.deps[name])
+        return [n for n in self.order if n in wanted]
+
+    def stage_key(self, name: str, upstream_keys: Dict[str, str], fingerprints: Dict[str, str]) -> str:
+        """
+        Hash of the stage's script, arguments and inputs. Inputs built by another stage
+        contribute that stage's key (upstream_keys: what its outputs were last built
+        from); external files contribute their fingerprint (cached in `fingerprints`).
+        """
+        stage = self.stages[name]
+        digest = hashlib.sha256()
+        digest.update((SCRIPT_DIR / stage.script).read_bytes())
+        digest.update(json.dumps([stage.args, stage.outputs]).encode("utf-8"))
+        for ref in sorted(stage.inputs):
+            producer = self.producer.get(ref)
+            if producer is not None and producer != name:
+                part = upstream_keys.get(producer, "unbuilt")
+            else:
+                if ref not in fingerprints:
+                    fingerprints[ref] = path_fingerprint(ref)
+                part = fingerprints[ref]
+            digest.update(f"{ref}={part};".encode("utf-8"))
+        return digest.hexdigest()[:20]
+
+    def planned_keys(self) -> Dict[str, str]:
+        """Keys every stage would have after a full run (for --list)."""
+        keys: Dict[str, str] = {}
+        fingerprints: Dict[str, str] = {}
+        for name in self.order:
+            keys[name] = self.stage_key(name, keys, fingerprints)
+        return keys
+
+
+@dataclass
+class StageResult:
+    name: str
+    status: str  # "ok", "skipped" (up to date), "failed" or "blocked" (an upstream stage failed)
+    seconds: float = 0.0
+    rows: Dict[str, Optional[int]] = field(default_factory=dict)
+    error: Optional[str] = None
+
+
+def load_state(path: Path) -> Dict[str, Any]:
+    try:
+        return json.loads(path.read_text()).get("stages", {})
+    except FileNotFoundError:
+        return {}
+    except (OSError, ValueError) as exc:
+        logger.warning("Ignoring unreadable build state %s: %s", path, exc)
+        return {}
+
+
+def save_state(path: Path, stages: Dict[str, Any]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    tmp.write_text(json.dumps({"stages": stages}, indent=1, sort_keys=True))
+    os.replace(tmp, path)
+
+
+def _warehouse_objects(warehouse: Path) -> Dict[str, str]:
+    """'schema.table' -> table_type for everything in the warehouse ({} if it does not exist yet)."""
+    if not warehouse.exists():
+        return {}
+    con = duckdb.connect(str(warehouse), read_only=True)
+    try:
+        rows = con.execute("SELECT table_schema, table_name, table_type FROM information_schema.tables").fetchall()
+    finally:
+        con.close()
+    return {f"{schema}.{name}": table_type for schema, name, table_type in rows}
+
+
+def outputs_exist(stage: Stage, warehouse: Path) -> bool:
+    tables = [o for o in stage.outputs if is_table(o)]
+    if tables:
+        objects = _warehouse_objects(warehouse)
+        if any(t not in objects for t in tables):
+            return False
+    return all(path_matches(o) for o in stage.outputs if not is_table(o))
+
+
+def count_outputs(stage: Stage, warehouse: Path) -> Dict[str, Optional[int]]:
+    """Row counts of output tables (views are not scanned: None) and file counts of path outputs."""
+    rows: Dict[str, Optional[int]] = {}
+    tables = [o for o in stage.outputs if is_table(o)]
+    if tables:
+        objects = _warehouse_objects(warehouse)
+        con = duckdb.connect(str(warehouse), read_only=True)
+        try:
+            for table in tables:
+                if objects.get(table) == "BASE TABLE":
+                    rows[table] = con.execute(f"SELECT count(*) FROM {table}").fetchone()[0]
+                else:
+                    rows[table] = None
+        finally:
+            con.close()
+    for ref in stage.outputs:
+        if not is_table(ref):
+            rows[ref] = len(path_matches(ref))
+    return rows
+
+
+def run_stage(stage: Stage, key: str, recorded: Dict[str, Any], warehouse: Path, force: bool) -> StageResult:
+    """Skip-or-run one stage. Runs on a pool thread while the scheduler holds the stage's resources."""
+    started = time.perf_counter()
+    if not force and recorded.get("key") == key and recorded.get("status") == "ok" and outputs_exist(stage, warehouse):
+        logger.info("[skip] %s is up to date (key %s)", stage.name, key)
+        return StageResult(stage.name, "skipped", rows=recorded.get("rows") or {})
+
+    cmd = [sys.executable, str(SCRIPT_DIR / stage.script), *stage.args]
+    logger.info("[run] %s: %s", stage.name, " ".join(cmd[1:]))
+    # Pin the data root and warehouse so scripts read and write where the DAG looks.
+    env = {**os.environ, "EXTERNAL_DATA_ROOT": str(data_root()), "F1_WAREHOUSE": str(warehouse)}
+    proc = subprocess.run(cmd, cwd=str(REPO_ROOT), env=env)
+    seconds = time.perf_counter() - started
+    if proc.returncode != 0:
+        logger.error("[fail] %s exited with %s after %.1fs", stage.name, proc.returncode, seconds)
+        return StageResult(stage.name, "failed", seconds, error=f"exit code {proc.returncode}")
+    try:
+        rows = count_outputs(stage, warehouse)
+    except Exception as exc:
+        return StageResult(stage.name, "failed", seconds, error=f"output check failed: {exc}")
+    logger.info("[done] %s in %.1fs", stage.name, seconds)
+    return StageResult(stage.name, "ok", seconds, rows)
+
+
+def run_stages(
+    graph: BuildGraph,
+    names: Sequence[str],
+    workers: int = 2,
+    force: bool = False,
+    warehouse: Optional[Path] = None,
+) -> List[StageResult]:
+    """Run the named stages (in dependency order, independent ones concurrently)."""
+    warehouse = warehouse or warehouse_path()
+    state_file = state_path(warehouse)
+    state = load_state(state_file)
+    built = {name: entry["key"] for name, entry in state.items() if entry.get("status") == "ok" and entry.get("key")}
+    fingerprints: Dict[str, str] = {}
+    keys: Dict[str, str] = {}
+    selected = [n for n in graph.order if n in set(names)]
+
+    results: Dict[str, StageResult] = {}
+    busy: set = set()
+    running: Dict[Future, str] = {}
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        while len(results) < len(selected):
+            for name in selected:
+                if name in results or name in running.values():
+                    continue
+                deps = [d for d in graph.deps[name] if d in selected]
+                failed = [d for d in deps if results.get(d) and results[d].status in {"failed", "blocked"}]
+                if failed:
+                    results[name] = StageResult(name, "blocked", error=f"upstream failed: {', '.join(failed)}")
+                    logger.warning("[blocked] %s (upstream failed: %s)", name, ", ".join(failed))
+                    continue
+                if any(d not in results for d in deps) or len(running) >= max(1, workers):
+                    continue
+                stage = graph.stages[name]
+                if busy & set(stage.resources):
+                    continue
+                busy |= set(stage.resources)
+                keys[name] = graph.stage_key(name, built, fingerprints)
+                fut = pool.submit(run_stage, stage, keys[name], state.get(name, {}), warehouse, force)
+                running[fut] = name
+            if not running:
+                continue
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for fut in done:
+                name = running.pop(fut)
+                busy -= set(graph.stages[name].resources)
+                try:
+                    result = fut.result()
+                except Exception as exc:
+                    result = StageResult(name, "failed", error=str(exc))
+                results[name] = result
+                if result.status in {"ok", "skipped"}:
+                    built[name] = keys[name]
+                if result.status == "ok":
+                    state[name] = {
+                        "key": keys[name],
+                        "status": "ok",
+                        "seconds": round(result.seconds, 3),
+                        "rows": result.rows,
+                        "finished_at": datetime.utcnow().isoformat(),
+                    }
+                    save_state(state_file, state)
+                elif result.status == "failed":
+                    state[name] = {**state.get(name, {}), "status": "failed", "error": result.error}
+                    save_state(state_file, state)
+    return [results[n] for n in selected]
+
+
+def log_report(results: Sequence[StageResult], elapsed: float) -> None:
+    lines = [f"[report] {len(results)} stages in {elapsed:.1f}s"]
+    for r in results:
+        counts = ", ".join(f"{k}={'view' if v is None else v}" for k, v in r.rows.items())
+        detail = f" error={r.error}" if r.error else ""
+        lines.append(f"[report]   {r.name:<18} {r.status:<8} {r.seconds:8.1f}s  {counts}{detail}")
+    logger.info("\n".join(lines))
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Run the warehouse/ML build as a dependency graph")
+    parser.add_argument("--targets", type=str, default="", help="Comma-separated stages to bring up to date, with their upstream")
+    parser.add_argument("--only", type=str, default="", help="Comma-separated stages to run without their upstream")
+    parser.add_argument("--workers", type=int, default=2, help="Stages run at the same time (default: 2)")
+    parser.add_argument("--force", action="store_true", help="Rerun stages even if their inputs are unchanged")
+    parser.add_argument("--list", action="store_true", help="Print the stages, dependencies and up-to-date status")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
+    args = parse_args(argv)
+    graph = BuildGraph(STAGES)
+
+    def split(value: str) -> List[str]:
+        names = [n.strip() for n in value.split(",") if n.strip()]
+        unknown = [n for n in names if n not in graph.stages]
+        if unknown:
+            raise SystemExit(f"Unknown stage(s) {unknown}. Valid: {graph.order}")
+        return names
+
+    if args.list:
+        keys = graph.planned_keys()
+        state = load_state(state_path(warehouse_path()))
+        for name in graph.order:
+            stage = graph.stages[name]
+            fresh = "up to date" if state.get(name, {}).get("key") == keys[name] else "stale"
+            deps = ", ".join(graph.deps[name]) or "-"
+            print(f"{name:<18} {fresh:<10} needs: {deps:<40} {stage.description}")
+        return 0
+
+    if args.only:
+        names = split(args.only)
+    elif args.targets:
+        names = graph.upstream(split(args.targets))
+    else:
+        names = list(graph.order)
+
+    started = time.perf_counter()
+    results = run_stages(graph, names, workers=args.workers, force=args.force)
+    log_report(results, time.perf_counter() - started)
+    return 1 if any(r.status in {"failed", "blocked"} for r in results) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,9 +1,18 @@
 import logging
+import sys
+from pathlib import Path
 
 import duckdb
 import pandas as pd
 
-WAREHOUSE_PATH = "/Volumes/SAMSUNG/apps/f1-dash/warehouse/f1_openf1.duckdb"
+SCRIPT_DIR = Path(__file__).resolve().parent
+REPO_ROOT = SCRIPT_DIR.parent
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from scripts.data_paths import warehouse_path
+
+WAREHOUSE_PATH = str(warehouse_path())
 
 
 def main() -> None:
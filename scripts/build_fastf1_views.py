@@ -1,16 +1,114 @@
+"""
+Build the fastf1 schema: fastf1.laps and fastf1.session_result from bronze_fastf1
+Parquet, plus the derived objects session_result_enriched, race_results,
+points_pre and ml_race_win.
+
+Each derived object is either a view or a materialized table (default). Tables are
+rebuilt by every run and written sorted by (season, round, session_code), so the
+per-row-group min/max zonemaps let DuckDB skip everything outside a season/round
+filter instead of re-running the enrichment joins and window functions on each
+API query.
+
+Choose per object with --objects or F1_FASTF1_OBJECTS: a default mode followed by
+name=mode overrides, e.g. "table", "view" or "table,ml_race_win=view".
+
+Usage:
+  python scripts/build_fastf1_views.py [--objects table,points_pre=view]
+"""
+
+import argparse
 import logging
+import os
+import sys
 from pathlib import Path
+from typing import Dict
 
 import duckdb
 import pandas as pd
 
-WAREHOUSE_PATH = "/Volumes/SAMSUNG/apps/f1-dash/warehouse/f1_openf1.duckdb"
-FASTF1_BRONZE_LAPS_ROOT = "/Volumes/SAMSUNG/apps/f1-dash/bronze_fastf1/laps"
+SCRIPT_DIR = Path(__file__).resolve().parent
+REPO_ROOT = SCRIPT_DIR.parent
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from scripts.data_paths import bronze_fastf1_dir, warehouse_path
+from scripts.warehouse_generation import bump_generation
+
+WAREHOUSE_PATH = str(warehouse_path())
+FASTF1_BRONZE_LAPS_ROOT = str(bronze_fastf1_dir() / "laps")
+
+OBJECT_MODES = ("table", "view")
+# Derived object -> sort key of its materialized table (zonemap-friendly for season/round filters).
+DERIVED_OBJECTS = {
+    "session_result_enriched": "season, round_inferred, session_code, grand_prix_slug",
+    "race_results": "season, round, session_code, grand_prix_slug",
+    "points_pre": "season, round, grand_prix_slug",
+    "ml_race_win": "season, round, session_code, grand_prix_slug",
+}
+DEFAULT_OBJECTS = "table"
+
+logger = logging.getLogger("build_fastf1_views")
+
+
+def parse_object_modes(spec: str) -> Dict[str, str]:
+    """'table,ml_race_win=view' -> {'session_result_enriched': 'table', ..., 'ml_race_win': 'view'}"""
+    default = "table"
+    overrides: Dict[str, str] = {}
+    for item in (part.strip() for part in spec.split(",")):
+        if not item:
+            continue
+        name, sep, mode = item.partition("=")
+        if not sep:
+            name, mode = "", name
+        mode = mode.strip().lower()
+        if mode not in OBJECT_MODES:
+            raise ValueError(f"Unknown mode '{mode}' in '{spec}'. Valid: {OBJECT_MODES}")
+        if not name:
+            default = mode
+        elif name.strip() in DERIVED_OBJECTS:
+            overrides[name.strip()] = mode
+        else:
+            raise ValueError(f"Unknown object '{name}'. Valid: {list(DERIVED_OBJECTS)}")
+    return {name: overrides.get(name, default) for name in DERIVED_OBJECTS}
+
+
+def create_object(con: duckdb.DuckDBPyConnection, name: str, select_sql: str, mode: str) -> None:
+    """(Re)create fastf1.<name> as a view or as a table sorted by its DERIVED_OBJECTS key."""
+    existing = con.execute(
+        "SELECT table_type FROM information_schema.tables WHERE table_schema = 'fastf1' AND table_name = ?",
+        [name],
+    ).fetchone()
+    if existing:
+        is_view = existing[0] == "VIEW"
+        if is_view != (mode == "view"):
+            con.execute(f"DROP {'VIEW' if is_view else 'TABLE'} fastf1.{name}")
+    if mode == "view":
+        con.execute(f"CREATE OR REPLACE VIEW fastf1.{name} AS {select_sql}")
+    else:
+        con.execute(
+            f"CREATE OR REPLACE TABLE fastf1.{name} AS SELECT * FROM ({select_sql}) ORDER BY {DERIVED_OBJECTS[name]}"
+        )
+    logger.info("fastf1.%s created as %s", name, mode)
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Build the fastf1 schema from bronze_fastf1 Parquet.")
+    parser.add_argument(
+        "--objects",
+        default=os.getenv("F1_FASTF1_OBJECTS") or DEFAULT_OBJECTS,
+        help=f"View vs. table per derived object, e.g. 'table' or 'table,ml_race_win=view' ({', '.join(DERIVED_OBJECTS)})",
+    )
+    return parser.parse_args()
 
 
 def main() -> None:
     logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
-    logger = logging.getLogger("build_fastf1_views")
+    args = parse_args()
+    try:
+        modes = parse_object_modes(args.objects)
+    except ValueError as exc:
+        raise SystemExit(str(exc))
+    logger.info("Derived objects: %s", modes)
 
     logger.info("Connecting to DuckDB warehouse at %s", WAREHOUSE_PATH)
     con = duckdb.connect(WAREHOUSE_PATH)
@@ -56,7 +154,7 @@ def main() -> None:
 
 
     # Build fastf1.session_result
-    session_result_glob = "/Volumes/SAMSUNG/apps/f1-dash/bronze_fastf1/session_result/**/*.parquet"
+    session_result_glob = f"{bronze_fastf1_dir()}/session_result/**/*.parquet"
     logger.info("Building fastf1.session_result from %s", session_result_glob)
     try:
         con.execute("CREATE SCHEMA IF NOT EXISTS fastf1;")
@@ -103,9 +201,10 @@ def main() -> None:
             """
         )
         
-        con.execute(
+        create_object(
+            con,
+            "session_result_enriched",
             """
-            CREATE OR REPLACE VIEW fastf1.session_result_enriched AS
             SELECT sr.*,
                    COALESCE(sr.round,
                      CASE 
@@ -114,8 +213,9 @@ def main() -> None:
                      END
                    ) AS round_inferred
             FROM fastf1.session_result sr
-            LEFT JOIN fastf1.race_calendar rc ON sr.season = rc.season AND sr.grand_prix_slug = rc.grand_prix_slug;
-            """
+            LEFT JOIN fastf1.race_calendar rc ON sr.season = rc.season AND sr.grand_prix_slug = rc.grand_prix_slug
+            """,
+            modes["session_result_enriched"],
         )
         sr_count = con.execute("SELECT COUNT(*) FROM fastf1.session_result").fetchone()[0]
         logger.info("fastf1.session_result row count: %s", sr_count)
@@ -127,12 +227,13 @@ def main() -> None:
         logger.warning("Failed to build fastf1.session_result from parquet: %s", exc)
         return
 
-    # Build fastf1.race_results view
-    logger.info("Building fastf1.race_results view from fastf1.session_result (session_code='R')")
+    # Build fastf1.race_results
+    logger.info("Building fastf1.race_results from fastf1.session_result (session_code='R')")
     try:
-        con.execute(
+        create_object(
+            con,
+            "race_results",
             """
-            CREATE OR REPLACE VIEW fastf1.race_results AS
             SELECT
               season,
               round_inferred AS round,
@@ -147,8 +248,9 @@ def main() -> None:
               status,
               points
             FROM fastf1.session_result_enriched
-            WHERE session_code = 'R';
-            """
+            WHERE session_code = 'R'
+            """,
+            modes["race_results"],
         )
         rr_count = con.execute("SELECT COUNT(*) FROM fastf1.race_results").fetchone()[0]
         logger.info("fastf1.race_results row count: %s", rr_count)
@@ -157,15 +259,16 @@ def main() -> None:
         ).fetchdf()
         logger.info("fastf1.race_results preview:\n%s", rr_preview)
     except duckdb.Error as exc:
-        logger.warning("Failed to build fastf1.race_results view: %s", exc)
+        logger.warning("Failed to build fastf1.race_results: %s", exc)
         return
 
-    # Build fastf1.points_pre view
-    logger.info("Building fastf1.points_pre view using cumulative points before each race")
+    # Build fastf1.points_pre
+    logger.info("Building fastf1.points_pre using cumulative points before each race")
     try:
-        con.execute(
+        create_object(
+            con,
+            "points_pre",
             """
-            CREATE OR REPLACE VIEW fastf1.points_pre AS
             WITH base AS (
                 SELECT
                     season,
@@ -210,8 +313,9 @@ def main() -> None:
                     ),
                     0
                 ) AS team_points_pre
-            FROM base;
-            """
+            FROM base
+            """,
+            modes["points_pre"],
         )
         pp_count = con.execute("SELECT COUNT(*) FROM fastf1.points_pre").fetchone()[0]
         logger.info("fastf1.points_pre row count: %s", pp_count)
@@ -220,14 +324,15 @@ def main() -> None:
         ).fetchdf()
         logger.info("fastf1.points_pre preview:\n%s", pp_preview)
     except duckdb.Error as exc:
-        logger.warning("Failed to build fastf1.points_pre view: %s", exc)
+        logger.warning("Failed to build fastf1.points_pre: %s", exc)
 
-    # Build fastf1.ml_race_win view
-    logger.info("Building fastf1.ml_race_win view from fastf1.race_results and fastf1.points_pre")
+    # Build fastf1.ml_race_win
+    logger.info("Building fastf1.ml_race_win from fastf1.race_results and fastf1.points_pre")
     try:
-        con.execute(
+        create_object(
+            con,
+            "ml_race_win",
             """
-            CREATE OR REPLACE VIEW fastf1.ml_race_win AS
             WITH base AS (
                 SELECT
                     r.season,
@@ -267,8 +372,9 @@ def main() -> None:
                 COALESCE(driver_points_pre, 0) AS driver_points_pre,
                 COALESCE(team_points_pre, 0)    AS team_points_pre,
                 CASE WHEN finish_position = 1 THEN 1 ELSE 0 END AS target_win_race
-            FROM base;
-            """
+            FROM base
+            """,
+            modes["ml_race_win"],
         )
         count_ml = con.execute("SELECT COUNT(*) FROM fastf1.ml_race_win").fetchone()[0]
         logger.info("fastf1.ml_race_win row count: %d", count_ml)
@@ -277,8 +383,12 @@ def main() -> None:
         ).df()
         logger.info("fastf1.ml_race_win preview:\n%s", preview_ml)
     except duckdb.Error as exc:
-        logger.warning("Failed to build fastf1.ml_race_win view: %s", exc)
+        logger.warning("Failed to build fastf1.ml_race_win: %s", exc)
 
 
 if __name__ == "__main__":
-    main()
+    try:
+        main()
+    finally:
+        # Views may have been (re)created even if a later step bailed out or raised.
+        bump_generation(WAREHOUSE_PATH, writer="build_fastf1_views")
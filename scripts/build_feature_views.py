@@ -1,10 +1,18 @@
-import duckdb
+import sys
 from pathlib import Path
 
+import duckdb
+
+SCRIPT_DIR = Path(__file__).resolve().parent
+REPO_ROOT = SCRIPT_DIR.parent
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from scripts.data_paths import warehouse_path
+
 
 def main() -> None:
-    repo_root = Path(__file__).resolve().parent.parent
-    db_path = repo_root / "warehouse" / "f1_openf1.duckdb"
+    db_path = warehouse_path()
     print(f"[info] Connecting to DuckDB warehouse at {db_path}")
     con = duckdb.connect(str(db_path))
 
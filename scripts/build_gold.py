@@ -9,15 +9,55 @@ Environment:
 Guardrails:
 - Reads silver tables only; writes to gold schema only.
 - Fails fast with clear messages if required tables/columns are missing.
+
+Incremental mode (--incremental):
+- Fingerprints every (season, round, session_code) partition of silver.laps,
+  silver.session_results and silver.drivers (row count + content hash; table
+  timestamps and ingested_at say nothing about which races actually changed) and
+  compares them with meta.gold_partitions.
+- Session summaries are deleted and re-inserted for changed/removed partitions only.
+- Cumulative standings are recomputed per affected season from its earliest
+  changed round forward; earlier rounds are left as they are.
+- Falls back to a full rebuild when there is no previous state, a gold table is
+  missing, or the summary columns changed. Nothing changed -> nothing is written.
+
+Usage:
+  python scripts/build_gold.py [--incremental]
 """
 
-import os
+import argparse
 import sys
+from pathlib import Path
+from typing import Optional
 
 import duckdb
 
+SCRIPT_DIR = Path(__file__).resolve().parent
+REPO_ROOT = SCRIPT_DIR.parent
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from scripts.build_instrumentation import instrument
+from scripts.data_paths import warehouse_path as default_warehouse_path
+from scripts.warehouse_generation import bump_generation
+
+PARTITIONS_TABLE = "meta.gold_partitions"
+GOLD_TABLES = [
+    "gold.driver_session_summary",
+    "gold.team_session_summary",
+    "gold.driver_season_standings",
+    "gold.team_season_standings",
+    "gold.driver_sprint_standings",
+    "gold.team_sprint_standings",
+]
 
-DEFAULT_WAREHOUSE = "/Volumes/SAMSUNG/apps/f1-dash/warehouse/f1_openf1.duckdb"
+# Temp tables describing what an incremental run rebuilds.
+CHANGED_SESSIONS = "_gold_changed_sessions"  # (season, round, session_code)
+CHANGED_SEASONS = "_gold_changed_seasons"  # (season, from_round)
+
+SESSION_SCOPE = f"(season, round, session_code) IN (SELECT season, round, session_code FROM {CHANGED_SESSIONS})"
+SEASON_SCOPE = f"season IN (SELECT season FROM {CHANGED_SEASONS})"
+ROUND_SCOPE = f"round >= (SELECT s.from_round FROM {CHANGED_SEASONS} s WHERE s.season = cumulative.season)"
 
 
 def fail(msg: str) -> None:
@@ -52,7 +92,20 @@ def assert_keys(cols: list[str], required: list[str], context: str) -> None:
         sys.exit(1)
 
 
-def build_driver_session_summary(con: duckdb.DuckDBPyConnection) -> None:
+def write_table(con: duckdb.DuckDBPyConnection, table: str, select_sql: str, delete_sql: Optional[str]) -> None:
+    """Full build: CREATE OR REPLACE. Incremental: delete the rows in scope, insert their recomputation."""
+    if delete_sql is None:
+        con.execute(f"CREATE OR REPLACE TABLE {table} AS {select_sql}")
+        return
+    con.execute(delete_sql)
+    con.execute(f"INSERT INTO {table} BY NAME {select_sql}")
+
+
+def season_delete_sql(table: str) -> str:
+    return f"DELETE FROM {table} USING {CHANGED_SEASONS} s WHERE {table}.season = s.season AND {table}.round >= s.from_round"
+
+
+def driver_session_summary_sql(con: duckdb.DuckDBPyConnection, incremental: bool = False) -> str:
     ensure_table_exists(con, "silver.laps")
     ensure_table_exists(con, "silver.session_results")
     ensure_table_exists(con, "silver.drivers")
@@ -101,9 +154,8 @@ def build_driver_session_summary(con: duckdb.DuckDBPyConnection) -> None:
         "points": "points" if "points" in sr_cols else "NULL",
     }
 
+    scope = f"WHERE (l.season, l.round, l.session_code) IN (SELECT season, round, session_code FROM {CHANGED_SESSIONS})"
     sql = f"""
-    DROP TABLE IF EXISTS gold.driver_session_summary;
-    CREATE TABLE gold.driver_session_summary AS
     WITH base AS (
       SELECT
         l.season,
@@ -138,6 +190,7 @@ def build_driver_session_summary(con: duckdb.DuckDBPyConnection) -> None:
       LEFT JOIN silver.session_results sr
         USING (season, round, grand_prix_slug, session_code,
                meeting_key, session_key, driver_number)
+      {scope if incremental else ""}
     )
     SELECT
       season,
@@ -188,14 +241,20 @@ def build_driver_session_summary(con: duckdb.DuckDBPyConnection) -> None:
       finish_position,
       grid_position,
       status,
-      points;
+      points
     """
-    print("[sql] gold.driver_session_summary DDL:")
+    return sql
+
+
+def build_driver_session_summary(con: duckdb.DuckDBPyConnection, incremental: bool = False) -> None:
+    sql = driver_session_summary_sql(con, incremental)
+    print("[sql] gold.driver_session_summary query:")
     print(sql)
-    con.execute(sql)
+    delete_sql = f"DELETE FROM gold.driver_session_summary WHERE {SESSION_SCOPE}" if incremental else None
+    write_table(con, "gold.driver_session_summary", sql, delete_sql)
 
 
-def build_team_session_summary(con: duckdb.DuckDBPyConnection) -> None:
+def build_team_session_summary(con: duckdb.DuckDBPyConnection, incremental: bool = False) -> None:
     ensure_table_exists(con, "gold.driver_session_summary")
     use_mode = True
     mode_expr = "mode() WITHIN GROUP (ORDER BY country_code)"
@@ -207,8 +266,6 @@ def build_team_session_summary(con: duckdb.DuckDBPyConnection) -> None:
     team_country_expr = mode_expr if use_mode else "NULL"
 
     sql = f"""
-    DROP TABLE IF EXISTS gold.team_session_summary;
-    CREATE TABLE gold.team_session_summary AS
     SELECT
       season,
       round,
@@ -223,19 +280,21 @@ def build_team_session_summary(con: duckdb.DuckDBPyConnection) -> None:
       AVG(CAST(finish_position AS DOUBLE)) FILTER (WHERE finish_position IS NOT NULL) AS avg_finish_position,
       SUM(points) AS points_team
     FROM gold.driver_session_summary
+    {"WHERE " + SESSION_SCOPE if incremental else ""}
     GROUP BY
       season,
       round,
       grand_prix_slug,
       session_code,
-      team_name;
+      team_name
     """
-    print("[sql] gold.team_session_summary DDL:")
+    print("[sql] gold.team_session_summary query:")
     print(sql)
-    con.execute(sql)
+    delete_sql = f"DELETE FROM gold.team_session_summary WHERE {SESSION_SCOPE}" if incremental else None
+    write_table(con, "gold.team_session_summary", sql, delete_sql)
 
 
-def build_driver_sprint_standings(con: duckdb.DuckDBPyConnection) -> None:
+def build_driver_sprint_standings(con: duckdb.DuckDBPyConnection, incremental: bool = False) -> None:
     ensure_table_exists(con, "gold.driver_session_summary")
     cols = [r[1] for r in con.execute("PRAGMA table_info('gold.driver_session_summary')").fetchall()]
     required = [
@@ -255,8 +314,7 @@ def build_driver_sprint_standings(con: duckdb.DuckDBPyConnection) -> None:
             f"Schema mismatch – missing columns in gold.driver_session_summary: {missing}. Actual: {cols}"
         )
 
-    sql = """
-    CREATE OR REPLACE TABLE gold.driver_sprint_standings AS
+    sql = f"""
     WITH per_round AS (
       SELECT
         season,
@@ -270,6 +328,7 @@ def build_driver_sprint_standings(con: duckdb.DuckDBPyConnection) -> None:
       FROM gold.driver_session_summary
       WHERE session_code IN ('S','SQ')
         AND points IS NOT NULL
+        {"AND " + SEASON_SCOPE if incremental else ""}
       GROUP BY season, round, driver_number
     ),
     cumulative AS (
@@ -303,14 +362,15 @@ def build_driver_sprint_standings(con: duckdb.DuckDBPyConnection) -> None:
         PARTITION BY season, round
         ORDER BY sprint_points_cumulative DESC
       ) AS sprint_championship_position
-    FROM cumulative;
+    FROM cumulative
+    {"WHERE " + ROUND_SCOPE if incremental else ""}
     """
-    con.execute(sql)
+    write_table(con, "gold.driver_sprint_standings", sql, season_delete_sql("gold.driver_sprint_standings") if incremental else None)
     cnt = con.execute("SELECT count(*) FROM gold.driver_sprint_standings").fetchone()[0]
     print(f"[gold] built gold.driver_sprint_standings ({cnt} rows)")
 
 
-def build_team_sprint_standings(con: duckdb.DuckDBPyConnection) -> None:
+def build_team_sprint_standings(con: duckdb.DuckDBPyConnection, incremental: bool = False) -> None:
     ensure_table_exists(con, "gold.team_session_summary")
     cols = [r[1] for r in con.execute("PRAGMA table_info('gold.team_session_summary')").fetchall()]
     required = [
@@ -327,8 +387,7 @@ def build_team_sprint_standings(con: duckdb.DuckDBPyConnection) -> None:
             f"Schema mismatch – missing columns in gold.team_session_summary: {missing}. Actual: {cols}"
         )
 
-    sql = """
-    CREATE OR REPLACE TABLE gold.team_sprint_standings AS
+    sql = f"""
     WITH per_round AS (
       SELECT
         season,
@@ -339,6 +398,7 @@ def build_team_sprint_standings(con: duckdb.DuckDBPyConnection) -> None:
       FROM gold.team_session_summary
       WHERE session_code IN ('S','SQ')
         AND points_team IS NOT NULL
+        {"AND " + SEASON_SCOPE if incremental else ""}
       GROUP BY season, round, team_name
     ),
     cumulative AS (
@@ -366,14 +426,15 @@ def build_team_sprint_standings(con: duckdb.DuckDBPyConnection) -> None:
         PARTITION BY season, round
         ORDER BY sprint_points_cumulative_team DESC
       ) AS sprint_championship_position_team
-    FROM cumulative;
+    FROM cumulative
+    {"WHERE " + ROUND_SCOPE if incremental else ""}
     """
-    con.execute(sql)
+    write_table(con, "gold.team_sprint_standings", sql, season_delete_sql("gold.team_sprint_standings") if incremental else None)
     cnt = con.execute("SELECT count(*) FROM gold.team_sprint_standings").fetchone()[0]
     print(f"[gold] built gold.team_sprint_standings ({cnt} rows)")
 
 
-def build_driver_season_standings(con: duckdb.DuckDBPyConnection) -> None:
+def build_driver_season_standings(con: duckdb.DuckDBPyConnection, incremental: bool = False) -> None:
     ensure_table_exists(con, "gold.driver_session_summary")
     cols = [r[1] for r in con.execute("PRAGMA table_info('gold.driver_session_summary')").fetchall()]
     required = [
@@ -394,8 +455,7 @@ def build_driver_season_standings(con: duckdb.DuckDBPyConnection) -> None:
             f"Schema mismatch – missing columns in gold.driver_session_summary: {missing}. Actual: {cols}"
         )
 
-    sql = """
-    CREATE OR REPLACE TABLE gold.driver_season_standings AS
+    sql = f"""
     WITH per_round AS (
       SELECT
         season,
@@ -410,6 +470,7 @@ def build_driver_season_standings(con: duckdb.DuckDBPyConnection) -> None:
         COUNT(DISTINCT grand_prix_slug) AS races_entered_round
       FROM gold.driver_session_summary
       WHERE points IS NOT NULL
+        {"AND " + SEASON_SCOPE if incremental else ""}
       GROUP BY season, round, driver_number
     ),
     cumulative AS (
@@ -447,14 +508,15 @@ def build_driver_season_standings(con: duckdb.DuckDBPyConnection) -> None:
         PARTITION BY season, round
         ORDER BY points_cumulative DESC
       ) AS championship_position
-    FROM cumulative;
+    FROM cumulative
+    {"WHERE " + ROUND_SCOPE if incremental else ""}
     """
-    con.execute(sql)
+    write_table(con, "gold.driver_season_standings", sql, season_delete_sql("gold.driver_season_standings") if incremental else None)
     cnt = con.execute("SELECT count(*) FROM gold.driver_season_standings").fetchone()[0]
     print(f"[gold] built gold.driver_season_standings ({cnt} rows)")
 
 
-def build_team_season_standings(con: duckdb.DuckDBPyConnection) -> None:
+def build_team_season_standings(con: duckdb.DuckDBPyConnection, incremental: bool = False) -> None:
     ensure_table_exists(con, "gold.team_session_summary")
     cols = [r[1] for r in con.execute("PRAGMA table_info('gold.team_session_summary')").fetchall()]
     required = [
@@ -471,8 +533,7 @@ def build_team_season_standings(con: duckdb.DuckDBPyConnection) -> None:
             f"Schema mismatch – missing columns in gold.team_session_summary: {missing}. Actual: {cols}"
         )
 
-    sql = """
-    CREATE OR REPLACE TABLE gold.team_season_standings AS
+    sql = f"""
     WITH per_round AS (
       SELECT
         season,
@@ -483,6 +544,7 @@ def build_team_season_standings(con: duckdb.DuckDBPyConnection) -> None:
         COUNT(DISTINCT grand_prix_slug) AS races_entered_round
       FROM gold.team_session_summary
       WHERE points_team IS NOT NULL
+        {"AND " + SEASON_SCOPE if incremental else ""}
       GROUP BY season, round, team_name
     ),
     cumulative AS (
@@ -512,25 +574,145 @@ def build_team_season_standings(con: duckdb.DuckDBPyConnection) -> None:
         PARTITION BY season, round
         ORDER BY points_cumulative_team DESC
       ) AS championship_position_team
-    FROM cumulative;
+    FROM cumulative
+    {"WHERE " + ROUND_SCOPE if incremental else ""}
     """
-    con.execute(sql)
+    write_table(con, "gold.team_season_standings", sql, season_delete_sql("gold.team_season_standings") if incremental else None)
     cnt = con.execute("SELECT count(*) FROM gold.team_season_standings").fetchone()[0]
     print(f"[gold] built gold.team_season_standings ({cnt} rows)")
 
 
+def compute_fingerprints(con: duckdb.DuckDBPyConnection) -> None:
+    """Fingerprint each silver (season, round, session_code) partition into temp table _gold_fingerprints."""
+    for table in ["silver.laps", "silver.session_results", "silver.drivers"]:
+        ensure_table_exists(con, table)
+    con.execute(
+        """
+        CREATE OR REPLACE TEMP TABLE _gold_fingerprints AS
+        WITH parts AS (
+          SELECT season, round, session_code, 'laps' AS src, COUNT(*) AS n, SUM(hash(t)) AS h
+          FROM silver.laps t GROUP BY ALL
+          UNION ALL
+          SELECT season, round, session_code, 'session_results', COUNT(*), SUM(hash(t))
+          FROM silver.session_results t GROUP BY ALL
+          UNION ALL
+          SELECT season, round, session_code, 'drivers', COUNT(*), SUM(hash(t))
+          FROM silver.drivers t GROUP BY ALL
+        )
+        SELECT
+          season,
+          round,
+          session_code,
+          md5(string_agg(src || ':' || n || ':' || h, ',' ORDER BY src)) AS fingerprint
+        FROM parts
+        GROUP BY season, round, session_code
+        """
+    )
+
+
+def save_fingerprints(con: duckdb.DuckDBPyConnection) -> None:
+    con.execute("CREATE SCHEMA IF NOT EXISTS meta;")
+    con.execute(
+        f"CREATE OR REPLACE TABLE {PARTITIONS_TABLE} AS "
+        "SELECT *, CAST(now() AS TIMESTAMP) AS built_at FROM _gold_fingerprints"
+    )
+
+
+def table_exists(con: duckdb.DuckDBPyConnection, table: str) -> bool:
+    schema, name = table.split(".", 1)
+    row = con.execute(
+        "SELECT count(*) FROM information_schema.tables WHERE table_schema = ? AND table_name = ?",
+        [schema, name],
+    ).fetchone()
+    return bool(row and row[0])
+
+
+def table_columns(con: duckdb.DuckDBPyConnection, relation: str) -> list[tuple[str, str]]:
+    return [(r[0], r[1]) for r in con.execute(f"DESCRIBE {relation}").fetchall()]
+
+
+def plan_incremental(con: duckdb.DuckDBPyConnection) -> Optional[int]:
+    """
+    Fill the CHANGED_SESSIONS / CHANGED_SEASONS temp tables from the fingerprints.
+
+    Returns the number of changed partitions, or None when a full rebuild is needed.
+    """
+    missing = [t for t in GOLD_TABLES + [PARTITIONS_TABLE] if not table_exists(con, t)]
+    if missing:
+        print(f"[info] incremental: no previous build state ({', '.join(missing)} missing); full rebuild")
+        return None
+    expected = table_columns(con, f"({driver_session_summary_sql(con)})")
+    if table_columns(con, "gold.driver_session_summary") != expected:
+        print("[info] incremental: gold.driver_session_summary columns changed; full rebuild")
+        return None
+
+    con.execute(
+        f"""
+        CREATE OR REPLACE TEMP TABLE {CHANGED_SESSIONS} AS
+        SELECT COALESCE(f.season, p.season) AS season,
+               COALESCE(f.round, p.round) AS round,
+               COALESCE(f.session_code, p.session_code) AS session_code
+        FROM _gold_fingerprints f
+        FULL OUTER JOIN {PARTITIONS_TABLE} p
+          USING (season, round, session_code)
+        WHERE f.fingerprint IS DISTINCT FROM p.fingerprint
+        """
+    )
+    con.execute(
+        f"""
+        CREATE OR REPLACE TEMP TABLE {CHANGED_SEASONS} AS
+        SELECT season, MIN(round) AS from_round
+        FROM {CHANGED_SESSIONS}
+        GROUP BY season
+        """
+    )
+    changed = con.execute(f"SELECT count(*) FROM {CHANGED_SESSIONS}").fetchone()[0]
+    for season, from_round, sessions in con.execute(
+        f"""
+        SELECT c.season, s.from_round, string_agg(c.round || '/' || c.session_code, ' ' ORDER BY c.round, c.session_code)
+        FROM {CHANGED_SESSIONS} c JOIN {CHANGED_SEASONS} s USING (season)
+        GROUP BY c.season, s.from_round
+        ORDER BY c.season
+        """
+    ).fetchall():
+        print(f"[info] incremental: season {season}: changed {sessions}; standings from round {from_round}")
+    return changed
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Build the gold tables from silver.")
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help=f"Rebuild only the (season, round, session) partitions whose silver rows changed since the last build ({PARTITIONS_TABLE}).",
+    )
+    return parser.parse_args()
+
+
 def main() -> None:
-    warehouse_path = os.getenv("F1_WAREHOUSE", DEFAULT_WAREHOUSE)
+    args = parse_args()
+    warehouse_path = str(default_warehouse_path())
     print(f"[info] warehouse_path={warehouse_path}")
-    con = duckdb.connect(warehouse_path)
+    con = instrument(duckdb.connect(warehouse_path), "build_gold")
     con.execute("CREATE SCHEMA IF NOT EXISTS gold;")
 
-    build_driver_session_summary(con)
-    build_team_session_summary(con)
-    build_driver_season_standings(con)
-    build_team_season_standings(con)
-    build_driver_sprint_standings(con)
-    build_team_sprint_standings(con)
+    compute_fingerprints(con)
+    incremental = False
+    if args.incremental:
+        changed = plan_incremental(con)
+        if changed == 0:
+            print("[info] incremental: no silver partitions changed; gold is up to date")
+            con.close()
+            return
+        incremental = changed is not None
+
+    build_driver_session_summary(con, incremental)
+    build_team_session_summary(con, incremental)
+    build_driver_season_standings(con, incremental)
+    build_team_season_standings(con, incremental)
+    build_driver_sprint_standings(con, incremental)
+    build_team_sprint_standings(con, incremental)
+    save_fingerprints(con)
 
     drv_cnt = con.execute("SELECT count(*) FROM gold.driver_session_summary").fetchone()[0]
     team_cnt = con.execute("SELECT count(*) FROM gold.team_session_summary").fetchone()[0]
@@ -646,6 +828,9 @@ def main() -> None:
         ).fetchdf()
     )
 
+    con.close()
+    generation = bump_generation(warehouse_path, writer="build_gold")
+    print(f"[info] warehouse generation -> {generation}")
     print(f"[success] gold tables built at {warehouse_path}")
 
 
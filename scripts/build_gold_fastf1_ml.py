@@ -13,11 +13,20 @@ Outputs gold_fastf1.race_prediction_features for ML training (2018-2025).
 """
 
 import logging
+import sys
 from pathlib import Path
 
 import duckdb
 
-WAREHOUSE_PATH = "/Volumes/SAMSUNG/apps/f1-dash/warehouse/f1_openf1.duckdb"
+SCRIPT_DIR = Path(__file__).resolve().parent
+REPO_ROOT = SCRIPT_DIR.parent
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from scripts.build_instrumentation import instrument
+from scripts.data_paths import warehouse_path
+
+WAREHOUSE_PATH = str(warehouse_path())
 
 logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
 logger = logging.getLogger("build_gold_fastf1_ml")
@@ -25,7 +34,7 @@ logger = logging.getLogger("build_gold_fastf1_ml")
 
 def main() -> None:
     logger.info("Connecting to DuckDB warehouse at %s", WAREHOUSE_PATH)
-    con = duckdb.connect(WAREHOUSE_PATH)
+    con = instrument(duckdb.connect(WAREHOUSE_PATH), "build_gold_fastf1_ml")
 
     # Ensure schema exists
     con.execute("CREATE SCHEMA IF NOT EXISTS gold_fastf1;")
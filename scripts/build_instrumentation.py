@@ -0,0 +1,284 @@
+"""
+Statement-level timing and query profiles for warehouse build scripts.
+
+Build scripts wrap their DuckDB connection:
+
+    con = instrument(duckdb.connect(warehouse_path), "build_gold")
+
+and keep calling con.execute() as before. Every statement that materializes data
+(CREATE TABLE ... AS, INSERT, DELETE, UPDATE) is recorded as one row of
+meta.build_runs:
+
+- wall and CPU time, rows produced (the statement's own row count), rows
+  scanned, bytes read from Parquet/disk, bytes written and peak buffer memory;
+- the operator tree DuckDB's profiler captured for it (the same timings
+  EXPLAIN ANALYZE prints) as JSON, plus the five slowest operators in
+  hot_operators, which is usually enough to tell which CTE dominates;
+- the release (F1_RELEASE, else the git revision) and DuckDB version, so build
+  times can be compared across releases.
+
+Rows are written as each statement finishes, through a separate cursor with its
+own transaction, so a failed build still records everything up to and including
+the failing statement (status = 'failed'), even when it failed inside a
+transaction the build then rolls back.
+
+Environment:
+- F1_BUILD_PROFILE=0 disables operator profiles (timings and row counts are kept).
+- F1_RELEASE (optional): label recorded in the release column.
+
+Example queries:
+    -- slowest statements of the latest gold build
+    SELECT target, wall_seconds, rows_produced, hot_operators
+    FROM meta.build_runs
+    WHERE run_id = (SELECT max(run_id) FROM meta.build_runs WHERE script = 'build_gold')
+    ORDER BY wall_seconds DESC;
+
+    -- build time per release
+    SELECT release, script, target, median(wall_seconds)
+    FROM meta.build_runs WHERE status = 'ok' GROUP BY ALL ORDER BY script, target, release;
+"""
+
+import json
+import os
+import re
+import subprocess
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import duckdb
+
+RUNS_TABLE = "meta.build_runs"
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+_TARGET = re.compile(
+    r"\b(?:CREATE\s+(?:OR\s+REPLACE\s+)?(?:TEMP(?:ORARY)?\s+)?TABLE\s+(?:IF\s+NOT\s+EXISTS\s+)?"
+    r"|INSERT\s+INTO\s+|DELETE\s+FROM\s+|UPDATE\s+)([\w.\"]+)",
+    re.IGNORECASE,
+)
+# extra_info keys worth showing next to an operator in hot_operators
+_INFO_KEYS = ("Table", "Function", "Filename(s)", "Join Type", "Conditions", "Groups", "Aggregates", "CTE Name")
+
+
+def _release() -> str:
+    if os.getenv("F1_RELEASE"):
+        return os.environ["F1_RELEASE"]
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=REPO_ROOT, capture_output=True, text=True, timeout=5
+        )
+        return out.stdout.strip() or "unknown"
+    except (OSError, subprocess.SubprocessError):
+        return "unknown"
+
+
+def statement_target(sql: str) -> Optional[Tuple[str, str]]:
+    """(operation, table) a statement writes, e.g. ('CREATE', 'gold.driver_session_summary'); None for reads / views / DDL."""
+    match = _TARGET.search(sql)
+    if not match:
+        return None
+    return match.group(0).split()[0].upper(), match.group(1).replace('"', "")
+
+
+def _operators(node: Dict[str, Any]) -> List[Dict[str, Any]]:
+    found = []
+    stack = list(node.get("children", []))
+    while stack:
+        op = stack.pop()
+        found.append(op)
+        stack.extend(op.get("children", []))
+    return found
+
+
+def hot_operators(profile: Dict[str, Any], limit: int = 5) -> str:
+    """'HASH_GROUP_BY 1.92s rows=120000 [Groups: #0, #1]; ...' for the slowest operators."""
+    ops = sorted(_operators(profile), key=lambda op: op.get("operator_timing") or 0.0, reverse=True)
+    parts = []
+    for op in ops[:limit]:
+        info = op.get("extra_info") or {}
+        detail = "; ".join(f"{k}: {info[k]}" for k in _INFO_KEYS if info.get(k))
+        detail = f" [{detail[:120]}]" if detail else ""
+        parts.append(
+            f"{op.get('operator_name', '?').strip()} {op.get('operator_timing') or 0.0:.3f}s "
+            f"rows={op.get('operator_cardinality', 0)}{detail}"
+        )
+    return " | ".join(parts)
+
+
+def ensure_runs_table(con: duckdb.DuckDBPyConnection) -> None:
+    con.execute("CREATE SCHEMA IF NOT EXISTS meta;")
+    con.execute(
+        f"""
+        CREATE TABLE IF NOT EXISTS {RUNS_TABLE} (
+          run_id            VARCHAR,
+          script            VARCHAR,
+          release           VARCHAR,
+          duckdb_version    VARCHAR,
+          statement_no      INTEGER,
+          operation         VARCHAR,
+          target            VARCHAR,
+          status            VARCHAR,
+          error             VARCHAR,
+          started_at        TIMESTAMP,
+          wall_seconds      DOUBLE,
+          cpu_seconds       DOUBLE,
+          rows_produced     BIGINT,
+          rows_scanned      BIGINT,
+          bytes_read        BIGINT,
+          bytes_written     BIGINT,
+          peak_memory_bytes BIGINT,
+          hot_operators     VARCHAR,
+          profile           VARCHAR,
+          sql               VARCHAR
+        );
+        """
+    )
+
+
+class StatementResult:
+    """Buffered result of a recorded statement (its row count row, already fetched)."""
+
+    def __init__(self, description: Any, rows: List[Tuple[Any, ...]]):
+        self.description = description
+        self._rows = rows
+
+    def fetchone(self) -> Optional[Tuple[Any, ...]]:
+        return self._rows.pop(0) if self._rows else None
+
+    def fetchall(self) -> List[Tuple[Any, ...]]:
+        rows, self._rows = self._rows, []
+        return rows
+
+    def fetchdf(self) -> Any:
+        import pandas as pd
+
+        columns = [d[0] for d in self.description] if self.description else []
+        return pd.DataFrame(self.fetchall(), columns=columns)
+
+    df = fetchdf
+
+
+class InstrumentedConnection:
+    """DuckDB connection proxy that records materializing statements into meta.build_runs."""
+
+    def __init__(self, con: duckdb.DuckDBPyConnection, script: str, profile: Optional[bool] = None):
+        self._con = con
+        self.script = script
+        self.run_id = f"{datetime.utcnow():%Y%m%dT%H%M%S}-{script}-{os.getpid()}"
+        self.release = _release()
+        self.profile = profile if profile is not None else os.getenv("F1_BUILD_PROFILE", "1") != "0"
+        self.statement_no = 0
+        self.total_seconds = 0.0
+        self._profile_path: Optional[str] = None
+        # meta.build_runs rows go through their own cursor: an INSERT on `con` would replace
+        # the caller's pending result and fail inside an aborted transaction.
+        self._meta = con.cursor()
+        ensure_runs_table(self._meta)
+        if self.profile:
+            fd, self._profile_path = tempfile.mkstemp(prefix=f"{script}-", suffix=".profile.json")
+            os.close(fd)
+            con.execute("PRAGMA enable_profiling='json'")
+            con.execute(f"PRAGMA profiling_output='{self._profile_path}'")
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._con, name)
+
+    def _read_profile(self) -> Dict[str, Any]:
+        if not self._profile_path:
+            return {}
+        try:
+            with open(self._profile_path) as fh:
+                return json.load(fh)
+        except (OSError, ValueError):
+            return {}
+
+    def execute(self, query: str, parameters: Any = None) -> Any:
+        written = statement_target(query)
+        if written is None:
+            return self._con.execute(query, parameters) if parameters is not None else self._con.execute(query)
+        operation, target = written
+
+        self.statement_no += 1
+        started_at = datetime.utcnow()
+        started = time.perf_counter()
+        try:
+            result = self._con.execute(query, parameters) if parameters is not None else self._con.execute(query)
+        except Exception as exc:
+            self._record(operation, target, started_at, time.perf_counter() - started, query, None, {}, "failed", str(exc))
+            raise
+        seconds = time.perf_counter() - started
+        try:
+            buffered = StatementResult(result.description, result.fetchall())
+        except duckdb.Error:
+            buffered = StatementResult(None, [])
+        first = buffered._rows[0] if buffered._rows else None
+        rows = int(first[0]) if first and isinstance(first[0], int) else None
+        self._record(operation, target, started_at, seconds, query, rows, self._read_profile(), "ok", None)
+        return buffered
+
+    def _record(
+        self,
+        operation: str,
+        target: str,
+        started_at: datetime,
+        seconds: float,
+        sql: str,
+        rows: Optional[int],
+        profile: Dict[str, Any],
+        status: str,
+        error: Optional[str],
+    ) -> None:
+        self.total_seconds += seconds
+        if status == "ok":
+            scanned = profile.get("cumulative_rows_scanned")
+            read = profile.get("total_bytes_read")
+            print(
+                f"[timing] {operation} {target}: {seconds:.2f}s rows={rows if rows is not None else '-'}"
+                + (f" scanned={scanned} read={read / 1e6:.1f}MB" if profile else "")
+            )
+        self._meta.execute(
+            f"INSERT INTO {RUNS_TABLE} VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            [
+                self.run_id,
+                self.script,
+                self.release,
+                duckdb.__version__,
+                self.statement_no,
+                operation,
+                target,
+                status,
+                error,
+                started_at,
+                seconds,
+                profile.get("cpu_time"),
+                rows,
+                profile.get("cumulative_rows_scanned"),
+                profile.get("total_bytes_read"),
+                profile.get("total_bytes_written"),
+                profile.get("system_peak_buffer_memory"),
+                hot_operators(profile) if profile else None,
+                json.dumps(profile) if profile else None,
+                sql.strip(),
+            ],
+        )
+
+    def close(self) -> None:
+        print(f"[timing] {self.script}: {self.statement_no} statements, {self.total_seconds:.2f}s (run_id={self.run_id})")
+        if self._profile_path:
+            try:
+                self._con.execute("PRAGMA disable_profiling")
+            except duckdb.Error:
+                pass
+            try:
+                os.unlink(self._profile_path)
+            except OSError:
+                pass
+            self._profile_path = None
+        self._meta.close()
+        self._con.close()
+
+
+def instrument(con: duckdb.DuckDBPyConnection, script: str, profile: Optional[bool] = None) -> InstrumentedConnection:
+    return InstrumentedConnection(con, script, profile)
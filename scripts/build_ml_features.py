@@ -1,22 +1,27 @@
 import argparse
 import os
 import sys
+from pathlib import Path
 from textwrap import dedent
 
 import duckdb
 
-DEFAULT_WAREHOUSE = "/Volumes/SAMSUNG/apps/f1-dash/warehouse/f1_openf1.duckdb"
-DEFAULT_ROOT = "/Volumes/SAMSUNG/apps/f1-dash"
+SCRIPT_DIR = Path(__file__).resolve().parent
+REPO_ROOT = SCRIPT_DIR.parent
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from scripts.build_instrumentation import instrument
+from scripts.data_paths import bronze_dir, warehouse_path as default_warehouse_path
 
 
 def bronze_path(relative: str) -> str:
     """
     Build an absolute path for bronze parquet globs.
 
-    Allows EXTERNAL_DATA_ROOT override to point at a different lake root.
+    EXTERNAL_DATA_ROOT points at the lake root (see scripts/data_paths.py).
     """
-    root = os.getenv("EXTERNAL_DATA_ROOT", DEFAULT_ROOT)
-    return os.path.join(root, "bronze", relative)
+    return os.path.join(bronze_dir(), relative)
 
 
 def _table_exists(con: duckdb.DuckDBPyConnection, schema: str, table: str) -> bool:
@@ -587,14 +592,14 @@ def main():
     parser = argparse.ArgumentParser(description="Build ML feature tables inside DuckDB warehouse.")
     parser.add_argument(
         "--warehouse",
-        default=os.getenv("F1_WAREHOUSE", DEFAULT_WAREHOUSE),
+        default=str(default_warehouse_path()),
         help="Path to DuckDB warehouse",
     )
     args = parser.parse_args()
 
     warehouse_path = args.warehouse
     print(f"Using warehouse: {warehouse_path}")
-    con = duckdb.connect(warehouse_path)
+    con = instrument(duckdb.connect(warehouse_path), "build_ml_features")
 
     con.execute("CREATE SCHEMA IF NOT EXISTS features;")
     _require_gold_tables(con)
@@ -602,6 +607,7 @@ def main():
     build_race_top3_training(con)
     build_quali_top3_training(con)
     build_race_win_training(con)
+    con.close()
     print("\nFeature tables built successfully.")
 
 
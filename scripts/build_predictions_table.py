@@ -4,18 +4,26 @@ Build the predictions.race_win table by inference on the training data.
 Creates predictions for all rows in the gold.race_winner_top3 table for 2023 and 2024.
 """
 import logging
+import sys
 from pathlib import Path
 import json
 import duckdb
 import joblib
-import numpy as np
 import pandas as pd
 
+SCRIPT_DIR = Path(__file__).resolve().parent
+REPO_ROOT = SCRIPT_DIR.parent
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from scripts.data_paths import ml_artifacts_dir, warehouse_path
+from scripts.grouped_ops import Segments, segment_softmax
+from scripts.warehouse_generation import bump_generation
+
 # Setup paths
-BASE_DIR = Path(__file__).resolve().parent.parent
-WAREHOUSE_PATH = BASE_DIR / "warehouse" / "f1_openf1.duckdb"
-MODEL_PATH = BASE_DIR / "ml_artifacts" / "race_win_logreg.joblib"
-META_PATH = BASE_DIR / "ml_artifacts" / "race_win_logreg.json"
+WAREHOUSE_PATH = warehouse_path()
+MODEL_PATH = ml_artifacts_dir() / "race_win_logreg.joblib"
+META_PATH = ml_artifacts_dir() / "race_win_logreg.json"
 
 def load_feature_cols() -> list[str]:
     """Read feature column list from the model metadata."""
@@ -45,15 +53,6 @@ def load_feature_cols() -> list[str]:
         "team_track_points_last_3_at_gp",
     ]
 
-def softmax(arr: np.ndarray) -> np.ndarray:
-    """Compute softmax across races (axis 0) per driver."""
-    arr = np.nan_to_num(arr, nan=0.0)
-    arr = arr - np.max(arr, axis=0, keepdims=True)
-    exp = np.exp(arr)
-    denom = exp.sum(axis=0, keepdims=True)
-    denom = np.where(denom == 0, 1, denom)
-    return exp / denom
-
 def main():
     logging.basicConfig(
         level=logging.INFO,
@@ -102,12 +101,9 @@ def main():
 
     # Compute softmax by race
     logger.info("Computing softmax probabilities by race...")
-    df['pred_win_proba_softmax'] = 0.0
-    for (season, round_num), group in df.groupby(['season', 'round']):
-        indices = group.index
-        race_probs = df.loc[indices, 'pred_win_proba'].values.reshape(-1, 1)
-        softmax_probs = softmax(race_probs).flatten()
-        df.loc[indices, 'pred_win_proba_softmax'] = softmax_probs
+    races = Segments.from_frame(df, ['season', 'round'])
+    softmax_probs = segment_softmax(races.gather(pred_proba), races)
+    df['pred_win_proba_softmax'] = races.scatter(softmax_probs, fill=0.0)
 
     # Select relevant columns for the prediction table
     output_cols = [
@@ -159,6 +155,8 @@ def main():
         logger.info(f"  Season {row[0]}: {row[1]} rows, {row[2]} races")
 
     con.close()
+    generation = bump_generation(WAREHOUSE_PATH, writer="build_predictions_table")
+    logger.info(f"Warehouse generation -> {generation}")
     logger.info("Done!")
 
 if __name__ == "__main__":
@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""
+Precompute race-win what-if predictions into predictions.race_win_scenario_cube.
+
+For every (season, round, driver) row of gold_fastf1.win_prediction_dataset, scores
+the race-win model (ml_artifacts/race_win_full.joblib) over the discrete scenario
+space the what-if panel uses:
+grid positions 1-20 x rain 0-100% in 5% steps (plus 51%) x starting compound when
+the model has that feature (see api/race_win_scenarios.py). The API's scenario
+endpoints then answer in-grid requests with a keyed lookup, interpolating rain
+between cube points, and only score out-of-grid inputs live.
+
+Each row carries the sha256 of the model it was scored with; the API ignores rows
+from any other model, so a retrained model falls back to live scoring until the
+cube is rebuilt.
+
+Runs after build_predictions_table.py in the build DAG.
+
+Environment (resolved like build_dag.py, see scripts/data_paths.py):
+- F1_WAREHOUSE (optional): DuckDB file to write
+- EXTERNAL_DATA_ROOT (optional): root of ml_artifacts/ (default --artifact-dir)
+
+Usage:
+  python scripts/build_scenario_cube.py
+  python scripts/build_scenario_cube.py --seasons 2024,2025
+"""
+
+import argparse
+import logging
+import sys
+import time
+from pathlib import Path
+from typing import List, Optional
+
+import duckdb
+import numpy as np
+import pandas as pd
+
+SCRIPT_DIR = Path(__file__).resolve().parent
+REPO_ROOT = SCRIPT_DIR.parent
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from api import race_win_scenarios
+from api.model_registry import ModelRegistry
+from scripts.build_instrumentation import instrument
+from scripts.data_paths import ml_artifacts_dir, warehouse_path
+from scripts.warehouse_generation import bump_generation
+
+MODEL_NAME = "race_win_full"
+# Same fallback as api/app.py get_race_win_model
+FALLBACK_FEATURES = ["grid_position", "rain_probability", "starting_compound_index"]
+BASELINES_PER_CHUNK = 250
+
+logger = logging.getLogger("build_scenario_cube")
+
+
+def load_baselines(con: duckdb.DuckDBPyConnection, seasons: Optional[List[int]]) -> pd.DataFrame:
+    """One win_prediction_dataset row per (season, round, driver)."""
+    where = "AND season IN (SELECT unnest(?))" if seasons else ""
+    return con.execute(
+        f"""
+        SELECT *
+        FROM gold_fastf1.win_prediction_dataset
+        WHERE round IS NOT NULL AND driver_code IS NOT NULL {where}
+        QUALIFY row_number() OVER (
+          PARTITION BY season, CAST(round AS INTEGER), UPPER(driver_code)
+        ) = 1
+        """,
+        [seasons] if seasons else [],
+    ).df()
+
+
+def score_cube(model, feature_cols: List[str], baselines: pd.DataFrame) -> pd.DataFrame:
+    """Cube rows (keys + raw win probability) for every baseline row x scenario point."""
+    space = race_win_scenarios.scenario_space(feature_cols)
+    n_points = len(space)
+    chunks = []
+    for start in range(0, len(baselines), BASELINES_PER_CHUNK):
+        part = baselines.iloc[start : start + BASELINES_PER_CHUNK].reset_index(drop=True)
+        expanded = part.loc[part.index.repeat(n_points)].reset_index(drop=True)
+        grid = np.tile(space["grid_position"].to_numpy(), len(part))
+        rain_pct = np.tile(space["rain_pct"].to_numpy(), len(part))
+        compound = np.tile(space["starting_compound_index"].to_numpy(), len(part))
+        frame = race_win_scenarios.scenario_feature_frame(expanded, feature_cols, grid, rain_pct / 100.0, compound)
+        chunks.append(
+            pd.DataFrame(
+                {
+                    "season": expanded["season"].astype(np.int32),
+                    "round": pd.to_numeric(expanded["round"]).astype(np.int32),
+                    "driver_code": expanded["driver_code"].astype(str).str.upper(),
+                    "grid_position": grid,
+                    "rain_pct": rain_pct,
+                    "starting_compound_index": compound,
+                    "pred_win_proba": model.predict_proba(frame)[:, 1],
+                }
+            )
+        )
+    return pd.concat(chunks, ignore_index=True) if chunks else pd.DataFrame()
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Precompute the race-win scenario cube.")
+    parser.add_argument("--seasons", help="Comma-separated seasons (default: every season in the dataset)")
+    parser.add_argument("--artifact-dir", type=Path, default=ml_artifacts_dir())
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
+    args = parse_args(argv)
+    seasons = [int(s) for s in args.seasons.split(",")] if args.seasons else None
+    warehouse = warehouse_path()
+
+    # The sklearn model, not the compact .forest export: for hundreds of thousands of rows
+    # sklearn's tree traversal is faster, the compact scorer pays off on small requests.
+    # Both give the same probabilities and share model_sha256.
+    try:
+        loaded = ModelRegistry(args.artifact_dir).get(MODEL_NAME)
+    except FileNotFoundError as exc:
+        logger.error(str(exc))
+        return 1
+    if hasattr(loaded.model, "verbose"):
+        loaded.model.verbose = 0
+    feature_cols = loaded.feature_list("feature_list", "feature_cols") or FALLBACK_FEATURES
+    logger.info(
+        "Model %s (%s, %s): %d features", MODEL_NAME, loaded.source, loaded.model_sha256[:12], len(feature_cols)
+    )
+
+    con = instrument(duckdb.connect(str(warehouse)), "build_scenario_cube")
+    try:
+        baselines = load_baselines(con, seasons)
+        if baselines.empty:
+            logger.error("No rows in gold_fastf1.win_prediction_dataset%s", f" for {seasons}" if seasons else "")
+            return 1
+        started = time.perf_counter()
+        cube = score_cube(loaded.model, feature_cols, baselines)
+        logger.info(
+            "Scored %d scenarios for %d drivers/races in %.1fs",
+            len(cube),
+            len(baselines),
+            time.perf_counter() - started,
+        )
+
+        con.execute("CREATE SCHEMA IF NOT EXISTS predictions")
+        con.register("cube_df", cube)
+        con.execute("BEGIN")
+        if seasons:
+            con.execute(
+                f"""
+                CREATE TABLE IF NOT EXISTS {race_win_scenarios.CUBE_TABLE} AS
+                SELECT *, ''::VARCHAR AS model_sha256 FROM cube_df LIMIT 0
+                """
+            )
+            con.execute(f"DELETE FROM {race_win_scenarios.CUBE_TABLE} WHERE season IN (SELECT unnest(?))", [seasons])
+            # Rows of other seasons scored by an older model stay; the API ignores them.
+            con.execute(
+                f"""
+                INSERT INTO {race_win_scenarios.CUBE_TABLE} BY NAME
+                SELECT *, ? AS model_sha256 FROM cube_df
+                ORDER BY season, round, driver_code, grid_position, starting_compound_index, rain_pct
+                """,
+                [loaded.model_sha256],
+            )
+        else:
+            # Sorted on the lookup key so row-group min/max prunes lookups to a few row groups
+            con.execute(
+                f"""
+                CREATE OR REPLACE TABLE {race_win_scenarios.CUBE_TABLE} AS
+                SELECT *, ? AS model_sha256 FROM cube_df
+                ORDER BY season, round, driver_code, grid_position, starting_compound_index, rain_pct
+                """,
+                [loaded.model_sha256],
+            )
+        con.execute("COMMIT")
+        con.unregister("cube_df")
+
+        for season, n_rows, n_races in con.execute(
+            f"""
+            SELECT season, count(*), count(DISTINCT round)
+            FROM {race_win_scenarios.CUBE_TABLE}
+            GROUP BY season ORDER BY season
+            """
+        ).fetchall():
+            logger.info("  Season %s: %d rows, %d races", season, n_rows, n_races)
+    finally:
+        con.close()
+
+    generation = bump_generation(warehouse, writer="build_scenario_cube")
+    logger.info("Warehouse generation -> %s", generation)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -6,20 +6,44 @@ Environment:
 - F1_WAREHOUSE (optional): override warehouse path. Default:
       /Volumes/SAMSUNG/apps/f1-dash/warehouse/f1_openf1.duckdb
 
+Incremental builds:
+- File lists and unioned columns come from the bronze catalog (meta.bronze_files /
+  meta.bronze_schemas, ingestion/bronze_catalog.py), refreshed by a stat walk; only
+  new or changed files have their footers read.
+- Each (season, round, grand_prix, session) partition is fingerprinted from its
+  catalog entries and compared with meta.silver_partitions. Only new, rewritten or
+  removed partitions are deleted from silver and re-read; when nothing changed the
+  table is skipped.
+- --years / --start-round / --end-round restrict the build to a season/round range;
+  --full rebuilds every partition in range (and recreates the tables without a range).
+
 Guardrails:
-- Only touches silver.laps, silver.session_results, silver.drivers (drops/recreates).
+- Only touches silver.laps, silver.session_results, silver.drivers and meta.silver_partitions.
 - Stops with clear messages if required env vars or columns are missing.
 - Avoids reading unused problematic columns (e.g., duration DOUBLE vs DOUBLE[] in session_result).
+
+Usage:
+  python scripts/build_silver.py [--years 2024] [--start-round 5 --end-round 8] [--full]
 """
 
-import glob
+import argparse
 import os
 import sys
 from pathlib import Path
 from typing import Iterable, Set
 
 import duckdb
-import pyarrow.parquet as pq
+
+SCRIPT_DIR = Path(__file__).resolve().parent
+REPO_ROOT = SCRIPT_DIR.parent
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from ingestion.bronze_catalog import CATALOG_TABLE, refresh_catalog, union_columns
+from scripts.build_instrumentation import instrument
+from scripts.data_paths import warehouse_path as default_warehouse_path
+
+PARTITIONS_TABLE = "meta.silver_partitions"
 
 
 def fail(msg: str) -> None:
@@ -34,24 +58,11 @@ def get_env_paths() -> tuple[Path, Path]:
     bronze_root = Path(external_root) / "bronze"
     if not bronze_root.exists():
         fail(f"Bronze root does not exist: {bronze_root}")
-    warehouse_path = Path(
-        os.getenv("F1_WAREHOUSE", "/Volumes/SAMSUNG/apps/f1-dash/warehouse/f1_openf1.duckdb")
-    )
+    warehouse_path = default_warehouse_path()
     warehouse_path.parent.mkdir(parents=True, exist_ok=True)
     return bronze_root, warehouse_path
 
 
-def fetch_sample(con: duckdb.DuckDBPyConnection, sql: str, label: str):
-    try:
-        df = con.execute(sql).fetchdf()
-        print(f"[info] Sample for {label}: {len(df)} rows")
-        print(f"[info] Columns for {label}: {list(df.columns)}")
-        return df
-    except Exception as exc:
-        print(f"[warn] Sample failed for {label}: {exc}")
-        return None
-
-
 def assert_columns(actual: Iterable[str], required: list[str], context: str):
     actual_list = list(actual)
     missing = [c for c in required if c not in actual_list]
@@ -61,31 +72,7 @@ def assert_columns(actual: Iterable[str], required: list[str], context: str):
         sys.exit(1)
 
 
-def get_columns_from_parquet_files(glob_path: str) -> Set[str]:
-    files = glob.glob(glob_path, recursive=True)
-    if not files:
-        fail(f"No Parquet files found for pattern: {glob_path}")
-    cols: Set[str] = set()
-    for fp in files:
-        try:
-            schema = pq.ParquetFile(fp).schema
-            cols.update(schema.names)
-        except Exception as exc:
-            print(f"[warn] Could not read schema from {fp}: {exc}")
-            continue
-    if not cols:
-        fail(f"Could not determine columns from any Parquet file matching {glob_path}")
-    return cols
-
-
-def build_silver_laps(con: duckdb.DuckDBPyConnection, bronze_root: Path):
-    src = f"{bronze_root}/laps/**/*.parquet"
-    scan = f"read_parquet('{src}', hive_partitioning=1, union_by_name=true)"
-
-    sample_df = fetch_sample(con, f"select * from {scan} limit 5", "bronze.laps")
-    if sample_df is None:
-        fail("Unable to read sample from bronze.laps; cannot proceed.")
-
+def silver_laps_select(scan: str, columns: Set[str]) -> str:
     required_cols = [
         "season",
         "round",
@@ -102,11 +89,9 @@ def build_silver_laps(con: duckdb.DuckDBPyConnection, bronze_root: Path):
         "duration_sector_3",
         "ingested_at",
     ]
-    assert_columns(sample_df.columns, required_cols, "bronze.laps")
+    assert_columns(columns, required_cols, "bronze.laps")
 
-    sql = f"""
-    DROP TABLE IF EXISTS silver.laps;
-    CREATE TABLE silver.laps AS
+    return f"""
     SELECT
       CAST(season AS INTEGER)          AS season,
       CAST(round AS INTEGER)           AS round,
@@ -130,25 +115,11 @@ def build_silver_laps(con: duckdb.DuckDBPyConnection, bronze_root: Path):
         duration_sector_1, duration_sector_2, duration_sector_3,
         ingested_at
       )
-    FROM {scan};
+    FROM {scan}
     """
-    print("[sql] silver.laps DDL:")
-    print(sql)
-    con.execute(sql)
-
-
-def build_silver_session_results(con: duckdb.DuckDBPyConnection, bronze_root: Path):
-    src = f"{bronze_root}/session_result/**/*.parquet"
-    scan = f"read_parquet('{src}', hive_partitioning=1, union_by_name=true)"
 
-    sample_df = fetch_sample(con, f"select * from {scan} limit 5", "bronze.session_result")
-    if sample_df is not None:
-        columns_set = set(sample_df.columns)
-    else:
-        print("[info] Falling back to schema inspection for session_result due to sample failure.")
-        columns_set = get_columns_from_parquet_files(src)
-        print(f"[info] Columns from schema inspection: {sorted(columns_set)}")
 
+def silver_session_results_select(scan: str, columns: Set[str]) -> str:
     required_cols = [
         "season",
         "round",
@@ -158,12 +129,12 @@ def build_silver_session_results(con: duckdb.DuckDBPyConnection, bronze_root: Pa
         "session_key",
         "driver_number",
     ]
-    assert_columns(columns_set, required_cols, "bronze.session_result")
+    assert_columns(columns, required_cols, "bronze.session_result")
 
-    has_position = "position" in columns_set
-    has_grid = "grid_position" in columns_set
-    has_status = "status" in columns_set
-    has_points = "points" in columns_set
+    has_position = "position" in columns
+    has_grid = "grid_position" in columns
+    has_status = "status" in columns
+    has_points = "points" in columns
 
     select_parts = [
         "CAST(season AS INTEGER)          AS season",
@@ -179,30 +150,14 @@ def build_silver_session_results(con: duckdb.DuckDBPyConnection, bronze_root: Pa
         f"{'TRY_CAST(points AS DOUBLE)' if has_points else 'NULL'} AS points",
     ]
 
-    sql = f"""
-    DROP TABLE IF EXISTS silver.session_results;
-    CREATE TABLE silver.session_results AS
+    return f"""
     SELECT
       {', '.join(select_parts)}
-    FROM {scan};
+    FROM {scan}
     """
-    print("[sql] silver.session_results DDL:")
-    print(sql)
-    con.execute(sql)
 
 
-def build_silver_drivers(con: duckdb.DuckDBPyConnection, bronze_root: Path):
-    src = f"{bronze_root}/drivers/**/*.parquet"
-    scan = f"read_parquet('{src}', hive_partitioning=1, union_by_name=true)"
-
-    sample_df = fetch_sample(con, f"select * from {scan} limit 5", "bronze.drivers")
-    if sample_df is not None:
-        columns_set = set(sample_df.columns)
-    else:
-        print("[info] Falling back to schema inspection for drivers due to sample failure.")
-        columns_set = get_columns_from_parquet_files(src)
-        print(f"[info] Columns from schema inspection: {sorted(columns_set)}")
-
+def silver_drivers_select(scan: str, columns: Set[str]) -> str:
     required_cols = [
         "season",
         "round",
@@ -218,13 +173,13 @@ def build_silver_drivers(con: duckdb.DuckDBPyConnection, bronze_root: Path):
         "country_code",
         "ingested_at",
     ]
-    assert_columns(columns_set, required_cols, "bronze.drivers")
+    assert_columns(columns, required_cols, "bronze.drivers")
 
     # Soft/optional attributes
-    broadcast_name_expr = "CAST(broadcast_name AS VARCHAR)" if "broadcast_name" in columns_set else "NULL"
-    headshot_url_expr = "CAST(headshot_url AS VARCHAR)" if "headshot_url" in columns_set else "NULL"
-    first_name_expr = "CAST(first_name AS VARCHAR)" if "first_name" in columns_set else "NULL"
-    last_name_expr = "CAST(last_name AS VARCHAR)" if "last_name" in columns_set else "NULL"
+    broadcast_name_expr = "CAST(broadcast_name AS VARCHAR)" if "broadcast_name" in columns else "NULL"
+    headshot_url_expr = "CAST(headshot_url AS VARCHAR)" if "headshot_url" in columns else "NULL"
+    first_name_expr = "CAST(first_name AS VARCHAR)" if "first_name" in columns else "NULL"
+    last_name_expr = "CAST(last_name AS VARCHAR)" if "last_name" in columns else "NULL"
 
     select_parts = [
         "CAST(season AS INTEGER)          AS season",
@@ -246,34 +201,252 @@ def build_silver_drivers(con: duckdb.DuckDBPyConnection, bronze_root: Path):
         f"{last_name_expr}                AS last_name",
     ]
 
-    sql = f"""
-    DROP TABLE IF EXISTS silver.drivers;
-    CREATE TABLE silver.drivers AS
+    return f"""
     SELECT
       {', '.join(select_parts)}
-    FROM {scan};
+    FROM {scan}
     """
-    print("[sql] silver.drivers DDL:")
-    print(sql)
-    con.execute(sql)
+
+
+
+
+# bronze table -> (silver table, SELECT builder)
+SILVER_TABLES = {
+    "laps": ("silver.laps", silver_laps_select),
+    "session_result": ("silver.session_results", silver_session_results_select),
+    "drivers": ("silver.drivers", silver_drivers_select),
+}
+PARTITION_KEYS = "season, round, grand_prix, session"
+SILVER_KEYS = "season, round, grand_prix_slug, session_code"
+
+
+def parse_years(value: str) -> list[int]:
+    years: list[int] = []
+    for part in value.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        if "-" in part:
+            start, end = part.split("-", 1)
+            years.extend(range(int(start), int(end) + 1))
+        else:
+            years.append(int(part))
+    return years
+
+
+def range_filter(args: argparse.Namespace) -> tuple[str, list]:
+    """WHERE clause (over season / round) for the CLI range; 'TRUE' when unrestricted."""
+    clauses, params = [], []
+    if args.years:
+        years = parse_years(args.years)
+        clauses.append(f"season IN ({', '.join('?' * len(years))})")
+        params.extend(years)
+    if args.start_round is not None:
+        clauses.append("round >= ?")
+        params.append(args.start_round)
+    if args.end_round is not None:
+        clauses.append("round <= ?")
+        params.append(args.end_round)
+    return " AND ".join(clauses) or "TRUE", params
+
+
+def ensure_partitions_table(con: duckdb.DuckDBPyConnection) -> None:
+    con.execute("CREATE SCHEMA IF NOT EXISTS meta;")
+    con.execute(
+        f"""
+        CREATE TABLE IF NOT EXISTS {PARTITIONS_TABLE} (
+          table_name  VARCHAR,
+          season      INTEGER,
+          round       INTEGER,
+          grand_prix  VARCHAR,
+          session     VARCHAR,
+          fingerprint VARCHAR,
+          built_at    TIMESTAMP
+        );
+        """
+    )
+
+
+def table_exists(con: duckdb.DuckDBPyConnection, table: str) -> bool:
+    schema, name = table.split(".", 1)
+    return (
+        con.execute(
+            "SELECT count(*) FROM information_schema.tables WHERE table_schema = ? AND table_name = ?",
+            [schema, name],
+        ).fetchone()[0]
+        > 0
+    )
+
+
+def parquet_scan(bronze_root: Path, paths: list[str]) -> str:
+    files = ", ".join("'" + str(bronze_root / p).replace("'", "''") + "'" for p in paths)
+    return f"read_parquet([{files}], hive_partitioning=1, union_by_name=true)"
+
+
+def add_new_columns(con: duckdb.DuckDBPyConnection, table: str, select_sql: str) -> None:
+    """Columns the new files bring (laps keeps every bronze column) are added before appending."""
+    existing = {row[0] for row in con.execute(f"DESCRIBE {table}").fetchall()}
+    for name, col_type, *_ in con.execute(f"DESCRIBE {select_sql}").fetchall():
+        if name not in existing:
+            print(f"[info] {table}: adding column {name} {col_type}")
+            con.execute(f'ALTER TABLE {table} ADD COLUMN "{name}" {col_type}')
+
+
+def build_silver_table(
+    con: duckdb.DuckDBPyConnection, bronze_root: Path, bronze_table: str, where: str, params: list, full: bool
+) -> None:
+    """
+    Rebuild the silver partitions of one bronze table whose files changed.
+
+    A partition's fingerprint is the md5 of its catalog entries (path, size, mtime).
+    Partitions whose fingerprint differs from meta.silver_partitions (new, rewritten
+    or removed) are deleted from the silver table and re-read from just their files.
+    The table is created from scratch when it does not exist yet, or on --full
+    without a season/round range.
+    """
+    silver_table, select_builder = SILVER_TABLES[bronze_table]
+    con.execute(
+        f"""
+        CREATE OR REPLACE TEMP TABLE _silver_files AS
+        SELECT path, schema_hash, season, round, grand_prix, session, file_size, mtime_ns
+        FROM {CATALOG_TABLE}
+        WHERE table_name = ? AND {where}
+        """,
+        [bronze_table, *params],
+    )
+    con.execute(
+        f"""
+        CREATE OR REPLACE TEMP TABLE _silver_current AS
+        SELECT {PARTITION_KEYS},
+               md5(string_agg(path || ':' || file_size || ':' || mtime_ns, ',' ORDER BY path)) AS fingerprint
+        FROM _silver_files
+        GROUP BY ALL
+        """
+    )
+
+    recreate = not table_exists(con, silver_table) or (full and where == "TRUE")
+    # --full with a range: every partition in range is treated as changed.
+    previous = "FALSE" if recreate or full else where
+    con.execute(
+        f"""
+        CREATE OR REPLACE TEMP TABLE _silver_changed AS
+        SELECT {PARTITION_KEYS}, c.fingerprint
+        FROM _silver_current c
+        FULL OUTER JOIN (
+          SELECT * FROM {PARTITIONS_TABLE} WHERE table_name = ? AND {previous}
+        ) p USING ({PARTITION_KEYS})
+        WHERE c.fingerprint IS DISTINCT FROM p.fingerprint
+        """,
+        [bronze_table, *(params if previous == where else [])],
+    )
+    changed, removed = con.execute(
+        "SELECT count(fingerprint), count(*) - count(fingerprint) FROM _silver_changed"
+    ).fetchone()
+    if not recreate and not full and changed + removed == 0:
+        print(f"[info] {silver_table}: all bronze partitions unchanged; skipping")
+        return
+
+    paths = [
+        row[0]
+        for row in con.execute(
+            f"""
+            SELECT path FROM _silver_files
+            WHERE ({PARTITION_KEYS}) IN (SELECT {PARTITION_KEYS} FROM _silver_changed WHERE fingerprint IS NOT NULL)
+            ORDER BY path
+            """
+        ).fetchall()
+    ]
+    if recreate and not paths:
+        fail(f"No {bronze_table} files in {CATALOG_TABLE} for the requested range under {bronze_root}")
+    print(f"[info] {silver_table}: {changed} partitions to (re)build, {removed} removed, {len(paths)} files")
+
+    select_sql = scan = None
+    if paths:
+        files = con.execute("SELECT path, schema_hash FROM _silver_files ORDER BY path").fetchall()
+        wanted = set(paths)
+        columns = set(union_columns(con, bronze_root, [f for f in files if f[0] in wanted]))
+        scan = parquet_scan(bronze_root, paths)
+        select_sql = select_builder(scan, columns)
+        if not recreate:
+            # DuckDB cannot alter a table the same transaction modifies; a nullable column is harmless on failure.
+            add_new_columns(con, silver_table, select_sql)
+
+    con.execute("BEGIN TRANSACTION;")
+    try:
+        if recreate:
+            sql = f"CREATE OR REPLACE TABLE {silver_table} AS {select_sql}"
+            con.execute(f"DELETE FROM {PARTITIONS_TABLE} WHERE table_name = ?", [bronze_table])
+        else:
+            if full:
+                con.execute(f"DELETE FROM {silver_table} WHERE {where}", params)
+                con.execute(f"DELETE FROM {PARTITIONS_TABLE} WHERE table_name = ? AND {where}", [bronze_table, *params])
+            else:
+                con.execute(
+                    f"""
+                    DELETE FROM {silver_table}
+                    WHERE ({SILVER_KEYS}) IN (SELECT {PARTITION_KEYS} FROM _silver_changed)
+                    """
+                )
+                con.execute(
+                    f"""
+                    DELETE FROM {PARTITIONS_TABLE}
+                    WHERE table_name = ? AND ({PARTITION_KEYS}) IN (SELECT {PARTITION_KEYS} FROM _silver_changed)
+                    """,
+                    [bronze_table],
+                )
+            sql = None
+            if select_sql:
+                sql = f"INSERT INTO {silver_table} BY NAME {select_sql}"
+        if sql:
+            print(f"[sql] {silver_table}:")
+            print(sql.replace(scan, f"read_parquet([<{len(paths)} files>], hive_partitioning=1, union_by_name=true)"))
+            con.execute(sql)
+        con.execute(
+            f"""
+            INSERT INTO {PARTITIONS_TABLE}
+            SELECT ?, {PARTITION_KEYS}, fingerprint, now()
+            FROM _silver_changed WHERE fingerprint IS NOT NULL
+            """,
+            [bronze_table],
+        )
+        con.execute("COMMIT;")
+    except Exception:
+        con.execute("ROLLBACK;")
+        raise
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Build the silver tables from bronze Parquet.")
+    parser.add_argument("--years", type=str, help="Only these seasons, e.g. 2024 or 2023,2024 or 2018-2024")
+    parser.add_argument("--start-round", type=int, help="Only rounds >= this")
+    parser.add_argument("--end-round", type=int, help="Only rounds <= this (inclusive)")
+    parser.add_argument(
+        "--full",
+        action="store_true",
+        help="Rebuild every partition in range regardless of fingerprints (recreates the tables without a range)",
+    )
+    return parser.parse_args()
 
 
 def main() -> None:
+    args = parse_args()
     bronze_root, warehouse_path = get_env_paths()
     print(f"[info] bronze_root={bronze_root}")
     print(f"[info] warehouse_path={warehouse_path}")
+    where, params = range_filter(args)
 
-    con = duckdb.connect(str(warehouse_path))
+    con = instrument(duckdb.connect(str(warehouse_path)), "build_silver")
     con.execute("CREATE SCHEMA IF NOT EXISTS silver;")
+    ensure_partitions_table(con)
+    stats = refresh_catalog(con, bronze_root, tables=list(SILVER_TABLES))
+    print(f"[info] bronze catalog: {stats}")
 
-    build_silver_laps(con, bronze_root)
-    build_silver_session_results(con, bronze_root)
-
-    try:
-        build_silver_drivers(con, bronze_root)
-    except Exception as exc:
-        print(f"[error] failed to build silver.drivers: {exc}")
-        raise
+    for bronze_table in SILVER_TABLES:
+        try:
+            build_silver_table(con, bronze_root, bronze_table, where, params, args.full)
+        except Exception as exc:
+            print(f"[error] failed to build {SILVER_TABLES[bronze_table][0]}: {exc}")
+            raise
 
     laps_cnt = con.execute("select count(*) from silver.laps").fetchone()[0]
     sess_cnt = con.execute("select count(*) from silver.session_results").fetchone()[0]
@@ -288,6 +461,7 @@ def main() -> None:
     print(con.execute("select * from silver.session_results limit 5").fetchdf())
     print("[info] silver.drivers preview:")
     print(con.execute("select * from silver.drivers limit 5").fetchdf())
+    con.close()
 
     print(f"[success] silver.laps, silver.session_results, silver.drivers built successfully at {warehouse_path}")
 
@@ -1,11 +1,19 @@
-import duckdb
+import sys
 from pathlib import Path
 
+import duckdb
+
+SCRIPT_DIR = Path(__file__).resolve().parent
+REPO_ROOT = SCRIPT_DIR.parent
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from scripts.data_paths import warehouse_path
+
 
 def main() -> None:
-    repo_root = Path(__file__).resolve().parent.parent
-    warehouse_path = repo_root / "warehouse" / "f1_openf1.duckdb"
-    con = duckdb.connect(str(warehouse_path))
+    warehouse = warehouse_path()
+    con = duckdb.connect(str(warehouse))
     con.execute("CREATE SCHEMA IF NOT EXISTS silver;")
 
     con.execute(
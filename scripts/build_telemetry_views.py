@@ -3,14 +3,23 @@ Build DuckDB views for new telemetry data: weather, race control, position data.
 """
 
 import logging
+import sys
 from pathlib import Path
 
 import duckdb
 
+SCRIPT_DIR = Path(__file__).resolve().parent
+REPO_ROOT = SCRIPT_DIR.parent
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from scripts.data_paths import bronze_fastf1_dir, warehouse_path
+
 logger = logging.getLogger(__name__)
 logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
 
-WAREHOUSE_PATH = Path("/Volumes/SAMSUNG/apps/f1-dash/warehouse/f1_openf1.duckdb")
+WAREHOUSE_PATH = warehouse_path()
+BRONZE_FASTF1_ROOT = bronze_fastf1_dir()
 
 
 def main():
@@ -21,7 +30,7 @@ def main():
     # ============================================================================
     logger.info("Building fastf1.weather view...")
     
-    con.execute("""
+    con.execute(f"""
         CREATE OR REPLACE VIEW fastf1.weather AS
         SELECT 
             season,
@@ -36,7 +45,7 @@ def main():
             "Rainfall",
             "WindSpeed",
             "WindDirection"
-        FROM read_parquet('/Volumes/SAMSUNG/apps/f1-dash/bronze_fastf1/weather/**/*.parquet')
+        FROM read_parquet('{BRONZE_FASTF1_ROOT}/weather/**/*.parquet')
         WHERE season >= 2020
         ORDER BY season, round, session_code, "Time"
     """)
@@ -49,7 +58,7 @@ def main():
     # ============================================================================
     logger.info("Building fastf1.race_control_messages view...")
     
-    con.execute("""
+    con.execute(f"""
         CREATE OR REPLACE VIEW fastf1.race_control_messages AS
         SELECT 
             season,
@@ -62,7 +71,7 @@ def main():
             "Flag",
             "Sector",
             "RacingNumber"
-        FROM read_parquet('/Volumes/SAMSUNG/apps/f1-dash/bronze_fastf1/race_control/**/*.parquet')
+        FROM read_parquet('{BRONZE_FASTF1_ROOT}/race_control/**/*.parquet')
         WHERE season >= 2020
         ORDER BY season, round, session_code, "Time"
     """)
@@ -75,28 +84,46 @@ def main():
     # ============================================================================
     logger.info("Building fastf1.position_data view...")
     
-    con.execute("""
+    # Files in the position-store format (api/position_store.py) are sorted by
+    # (driver_number, session_time_ms) with small row groups; older exports have
+    # float X/Y/Z, string driver numbers and session_time_seconds. union_by_name
+    # reads both. No ORDER BY here: it would force a full scan and sort on every
+    # query and defeat row-group pruning on driver_number / session_time_ms.
+    position_glob = f"{BRONZE_FASTF1_ROOT}/position/**/*.parquet"
+    position_cols = {
+        row[0]
+        for row in con.execute(
+            f"DESCRIBE SELECT * FROM read_parquet('{position_glob}', union_by_name=true)"
+        ).fetchall()
+    }
+    session_time_parts = []
+    if "session_time_ms" in position_cols:
+        session_time_parts.append("session_time_ms")
+    if "session_time_seconds" in position_cols:
+        session_time_parts.append("CAST(round(session_time_seconds * 1000) AS INTEGER)")
+    session_time_expr = (
+        f"COALESCE({', '.join(session_time_parts)})" if session_time_parts else "CAST(NULL AS INTEGER)"
+    )
+    con.execute(f"""
         CREATE OR REPLACE VIEW fastf1.position_data AS
         SELECT 
             season,
             round,
             grand_prix_slug,
             session_code,
-            driver_number,
+            CAST(driver_number AS INTEGER) AS driver_number,
+            {session_time_expr} AS session_time_ms,
             "Date",
             "Status",
             "X",
             "Y",
-            "Z",
-            "Time",
-            "SessionTime"
-        FROM read_parquet('/Volumes/SAMSUNG/apps/f1-dash/bronze_fastf1/position/**/*.parquet')
+            "Z"
+        FROM read_parquet('{position_glob}', union_by_name=true)
         WHERE season >= 2020
-        ORDER BY season, round, session_code, driver_number, "SessionTime"
     """)
     
     pos_count = con.execute("SELECT COUNT(*) as count FROM fastf1.position_data").fetchdf()
-    logger.info(f"fastf1.position_data: {pos_count['count'].values[0]:,} records (sampled)")
+    logger.info(f"fastf1.position_data: {pos_count['count'].values[0]:,} records (simplified)")
     
     # ============================================================================
     # ENRICHED RACE DATA VIEW (for visualization)
@@ -145,7 +172,7 @@ def main():
     logger.info("\nAvailable views:")
     logger.info("  - fastf1.weather (temperature, humidity, wind data)")
     logger.info("  - fastf1.race_control_messages (flags, safety car, incidents)")
-    logger.info("  - fastf1.position_data (GPS coordinates, sampled)")
+    logger.info("  - fastf1.position_data (GPS coordinates, simplified)")
     logger.info("  - fastf1.race_visualization_data (enriched race data with weather)")
     
     con.close()
@@ -0,0 +1,39 @@
+"""
+Where build scripts find the data lake and the warehouse.
+
+Every stage run by scripts/build_dag.py resolves its paths through these helpers,
+so the files a stage reads and writes are the ones the DAG fingerprints and checks:
+
+- data_root():      EXTERNAL_DATA_ROOT (default: repo root), holding bronze/,
+                    bronze_fastf1/ and ml_artifacts/
+- warehouse_path(): F1_WAREHOUSE (default: DEFAULT_WAREHOUSE)
+
+build_dag.py passes its data root on to each stage as EXTERNAL_DATA_ROOT.
+"""
+
+import os
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+DEFAULT_WAREHOUSE = "/Volumes/SAMSUNG/apps/f1-dash/warehouse/f1_openf1.duckdb"
+
+
+def data_root() -> Path:
+    return Path(os.getenv("EXTERNAL_DATA_ROOT") or REPO_ROOT)
+
+
+def warehouse_path() -> Path:
+    return Path(os.getenv("F1_WAREHOUSE", DEFAULT_WAREHOUSE))
+
+
+def bronze_dir() -> Path:
+    return data_root() / "bronze"
+
+
+def bronze_fastf1_dir() -> Path:
+    return data_root() / "bronze_fastf1"
+
+
+def ml_artifacts_dir() -> Path:
+    return data_root() / "ml_artifacts"
@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""
+Export trained random forests in ml_artifacts/ as compact .forest files.
+
+For every <name>.joblib that holds a fitted RandomForest / ExtraTrees model (others
+are skipped), compiles the trees into flat node arrays (api/compact_forest.py),
+checks parity against sklearn and writes ml_artifacts/<name>.forest next to the
+joblib. The API serves the .forest file instead of unpickling the forest as long
+as it was exported from the current .joblib (the source hash is stored in it).
+
+Parity is checked on synthetic rows drawn around every split threshold and, when
+given, on --sample (a Parquet file with the training feature columns). An export
+whose predictions differ from sklearn by more than --atol is not written and the
+script exits with status 1.
+
+Examples:
+  python scripts/export_compact_forest.py                      # every forest in ml_artifacts/
+  python scripts/export_compact_forest.py race_win_full rf_position_model
+  python scripts/export_compact_forest.py --check              # verify existing exports only
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import joblib
+import numpy as np
+import pandas as pd
+
+SCRIPT_DIR = Path(__file__).resolve().parent
+REPO_ROOT = SCRIPT_DIR.parent
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from api.compact_forest import (
+    SUFFIX,
+    compile_forest,
+    file_sha256,
+    load_forest,
+    parity_check,
+    parity_sample,
+    sample_frame,
+    write_forest,
+)
+
+ML_ARTIFACTS_DIR = REPO_ROOT / "ml_artifacts"
+DEFAULT_ATOL = 1e-9
+
+
+def quiet(model: Any) -> Any:
+    """Silence joblib's per-batch progress output on models trained with verbose > 0."""
+    if hasattr(model, "verbose"):
+        model.verbose = 0
+    return model
+
+
+def is_forest(model: Any) -> bool:
+    estimators = getattr(model, "estimators_", None)
+    return bool(estimators) and all(hasattr(est, "tree_") for est in estimators)
+
+
+def check_parity(model: Any, forest: Any, sample: Optional[pd.DataFrame], atol: float) -> Dict[str, Any]:
+    """Parity on synthetic threshold-straddling rows plus the optional real sample."""
+    report = parity_check(model, forest, sample_frame(forest, parity_sample(forest)), atol=atol)
+    if sample is not None and forest.feature_names_in_ is not None:
+        cols = [c for c in forest.feature_names_in_ if c in sample.columns]
+        if len(cols) == forest.n_features_in_:
+            real = parity_check(model, forest, sample[cols].astype(float).fillna(0), atol=atol)
+            report = {
+                "rows": report["rows"] + real["rows"],
+                "max_abs_diff": max(report["max_abs_diff"], real["max_abs_diff"]),
+                "ok": report["ok"] and real["ok"],
+            }
+    return report
+
+
+def export_model(
+    name: str,
+    artifact_dir: Path = ML_ARTIFACTS_DIR,
+    sample: Optional[pd.DataFrame] = None,
+    atol: float = DEFAULT_ATOL,
+    model: Any = None,
+) -> Optional[Dict[str, Any]]:
+    """
+    Compile <name>.joblib into <name>.forest. Returns a report dict, or None when the
+    artifact is not a forest. Raises RuntimeError when parity fails (nothing is written).
+    """
+    model_path = artifact_dir / f"{name}.joblib"
+    if model is None:
+        model = joblib.load(model_path)
+    quiet(model)
+    if not is_forest(model):
+        return None
+
+    started = time.perf_counter()
+    forest = compile_forest(model, source_sha256=file_sha256(model_path))
+    report = check_parity(model, forest, sample, atol)
+    if not report["ok"]:
+        raise RuntimeError(f"{name}: compact forest differs from sklearn by {report['max_abs_diff']:.3g}")
+
+    out_path = artifact_dir / f"{name}{SUFFIX}"
+    write_forest(forest, out_path)
+    # re-check what was written, through the memory-mapped reader the API uses
+    report = check_parity(model, load_forest(out_path), sample, atol)
+    if not report["ok"]:
+        out_path.unlink()
+        raise RuntimeError(f"{name}: written forest differs from sklearn by {report['max_abs_diff']:.3g}")
+    return dict(
+        report,
+        name=name,
+        trees=forest.n_estimators,
+        nodes=forest.n_nodes,
+        joblib_bytes=model_path.stat().st_size,
+        forest_bytes=out_path.stat().st_size,
+        seconds=time.perf_counter() - started,
+    )
+
+
+def check_export(name: str, artifact_dir: Path = ML_ARTIFACTS_DIR, atol: float = DEFAULT_ATOL) -> Dict[str, Any]:
+    """Verify an existing <name>.forest: same source hash as the joblib and parity with it."""
+    model_path = artifact_dir / f"{name}.joblib"
+    forest = load_forest(artifact_dir / f"{name}{SUFFIX}")
+    fresh = forest.source_sha256 == file_sha256(model_path)
+    report = check_parity(quiet(joblib.load(model_path)), forest, None, atol)
+    return dict(report, name=name, fresh=fresh, ok=report["ok"] and fresh)
+
+
+def latency(model: Any, forest: Any, rows: int, repeats: int = 50) -> Dict[str, float]:
+    """Median per-call latency (ms) of sklearn vs the compact scorer on `rows` rows."""
+    X = sample_frame(forest, parity_sample(forest, n_rows=rows, seed=1))
+    timings = {}
+    for label, fn in (("sklearn_ms", model.predict), ("compact_ms", forest.predict)):
+        calls = []
+        for _ in range(repeats):
+            started = time.perf_counter()
+            fn(X)
+            calls.append((time.perf_counter() - started) * 1000)
+        timings[label] = float(np.median(calls))
+    return timings
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Export random forests as compact .forest files.")
+    parser.add_argument("names", nargs="*", help="Artifact names (default: every forest in the artifact dir)")
+    parser.add_argument("--artifact-dir", type=Path, default=ML_ARTIFACTS_DIR)
+    parser.add_argument("--sample", type=Path, help="Parquet file with feature rows for the parity check")
+    parser.add_argument("--atol", type=float, default=DEFAULT_ATOL, help="Max allowed prediction difference")
+    parser.add_argument("--check", action="store_true", help="Verify existing .forest files instead of exporting")
+    parser.add_argument("--latency", action="store_true", help="Also time single-row and 20-row predict calls")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = parse_args(argv)
+    artifact_dir = args.artifact_dir
+    names = args.names or sorted(p.stem for p in artifact_dir.glob("*.joblib"))
+    sample = pd.read_parquet(args.sample) if args.sample else None
+
+    failed = False
+    for name in names:
+        try:
+            if args.check:
+                if not (artifact_dir / f"{name}{SUFFIX}").exists():
+                    continue
+                report = check_export(name, artifact_dir, args.atol)
+                status = "ok" if report["ok"] else ("stale" if not report["fresh"] else "MISMATCH")
+                print(f"[check] {name}: {status} rows={report['rows']} max_abs_diff={report['max_abs_diff']:.3g}")
+                failed |= not report["ok"]
+                continue
+            report = export_model(name, artifact_dir, sample, args.atol)
+        except (OSError, ValueError, RuntimeError) as exc:
+            print(f"[error] {name}: {exc}")
+            failed = True
+            continue
+        if report is None:
+            print(f"[info] {name}: not a tree ensemble, skipped")
+            continue
+        print(
+            f"[info] {name}: {report['trees']} trees, {report['nodes']} nodes, "
+            f"{report['joblib_bytes'] / 1e6:.2f} MB joblib -> {report['forest_bytes'] / 1e6:.2f} MB forest, "
+            f"parity max_abs_diff={report['max_abs_diff']:.3g} on {report['rows']} rows"
+        )
+        if args.latency:
+            model = quiet(joblib.load(artifact_dir / f"{name}.joblib"))
+            forest = load_forest(artifact_dir / f"{name}{SUFFIX}")
+            for rows in (1, 20):
+                t = latency(model, forest, rows)
+                print(f"[info] {name}: predict {rows} row(s) sklearn {t['sklearn_ms']:.2f} ms, compact {t['compact_ms']:.2f} ms")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -19,6 +19,40 @@ logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(me
 logger = logging.getLogger("export_race_control")
 
 
+def write_session_race_control(
+    session, year: int, round_num: int, session_code: str, output_root: Path = RACE_CONTROL_OUTPUT_ROOT
+) -> int:
+    """Write race control messages for an already loaded session. Returns rows written."""
+    if session.race_control_messages is None or len(session.race_control_messages) == 0:
+        logger.warning(f"No race control messages for {year} R{round_num} {session_code}")
+        return 0
+
+    # Get event slug for partitioning
+    event_name = session.event['EventName']
+    slug = event_name.lower().replace(' ', '-')
+
+    # Add metadata columns
+    messages = session.race_control_messages.copy()
+    messages['season'] = year
+    messages['round'] = round_num
+    messages['grand_prix_slug'] = slug
+    messages['session_code'] = session_code
+
+    # Convert datetime to string for parquet compatibility
+    if 'Time' in messages.columns:
+        messages['time_str'] = messages['Time'].astype(str)
+
+    # Output path with partitioning
+    output_dir = output_root / f"season={year}" / f"grand_prix_slug={slug}" / f"session_code={session_code}"
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    output_file = output_dir / "part-00000.parquet"
+    messages.to_parquet(output_file, index=False)
+
+    logger.info(f"  ✓ Exported {len(messages)} race control messages to {output_file}")
+    return len(messages)
+
+
 def export_session_race_control(year: int, round_num: int, session_code: str) -> bool:
     """Export race control messages for a single session."""
     try:
@@ -27,35 +61,7 @@ def export_session_race_control(year: int, round_num: int, session_code: str) ->
         logger.info(f"Loading {year} Round {round_num} {session_code}...")
         session = fastf1.get_session(year, round_num, session_code)
         session.load(telemetry=False, weather=False)
-        
-        if session.race_control_messages is None or len(session.race_control_messages) == 0:
-            logger.warning(f"No race control messages for {year} R{round_num} {session_code}")
-            return False
-        
-        # Get event slug for partitioning
-        event_name = session.event['EventName']
-        slug = event_name.lower().replace(' ', '-')
-        
-        # Add metadata columns
-        messages = session.race_control_messages.copy()
-        messages['season'] = year
-        messages['round'] = round_num
-        messages['grand_prix_slug'] = slug
-        messages['session_code'] = session_code
-        
-        # Convert datetime to string for parquet compatibility
-        if 'Time' in messages.columns:
-            messages['time_str'] = messages['Time'].astype(str)
-        
-        # Output path with partitioning
-        output_dir = RACE_CONTROL_OUTPUT_ROOT / f"season={year}" / f"grand_prix_slug={slug}" / f"session_code={session_code}"
-        output_dir.mkdir(parents=True, exist_ok=True)
-        
-        output_file = output_dir / "part-00000.parquet"
-        messages.to_parquet(output_file, index=False)
-        
-        logger.info(f"  ✓ Exported {len(messages)} race control messages to {output_file}")
-        return True
+        return write_session_race_control(session, year, round_num, session_code) > 0
         
     except Exception as e:
         logger.error(f"  ✗ Failed to export {year} R{round_num} {session_code}: {e}")
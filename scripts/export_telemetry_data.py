@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Export FastF1 car telemetry to the partitioned store served by /api/telemetry.
+Writes every lap for every driver (or only fastest laps with --fastest-only) plus a
+per-session results/weather summary, so the API never loads FastF1 sessions inline.
+See api/telemetry_store.py for the layout.
+"""
+
+import argparse
+import logging
+import sys
+from pathlib import Path
+from time import sleep
+
+import fastf1
+
+SCRIPT_DIR = Path(__file__).resolve().parent
+REPO_ROOT = SCRIPT_DIR.parent
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from api.telemetry_store import FULL_EXPORT, export_mode, export_session_telemetry
+
+CACHE_PATH = Path("/Volumes/SAMSUNG/apps/f1-dash/fastf1_cache")
+TELEMETRY_OUTPUT_ROOT = Path("/Volumes/SAMSUNG/apps/f1-dash/bronze_fastf1")
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
+logger = logging.getLogger("export_telemetry")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export FastF1 lap telemetry to the telemetry store")
+    parser.add_argument("--year", type=int, required=True, help="Season year")
+    parser.add_argument("--start-round", type=int, default=1, help="Starting round number")
+    parser.add_argument("--end-round", type=int, help="Ending round number (inclusive)")
+    parser.add_argument("--sessions", type=str, default="Q,R", help="Comma-separated session codes (default: Q,R)")
+    parser.add_argument("--output-root", type=Path, default=TELEMETRY_OUTPUT_ROOT, help="Store root (F1_TELEMETRY_STORE for the API)")
+    parser.add_argument("--fastest-only", action="store_true", help="Only export each driver's fastest lap")
+    parser.add_argument("--force", action="store_true", help="Re-export sessions already in the store")
+    parser.add_argument("--delay", type=float, default=3.0, help="Delay between requests (seconds)")
+
+    args = parser.parse_args()
+
+    sessions = args.sessions.split(',')
+
+    fastf1.Cache.enable_cache(str(CACHE_PATH))
+    schedule = fastf1.get_event_schedule(args.year, include_testing=False)
+    max_round = int(schedule['RoundNumber'].max())
+
+    end_round = args.end_round if args.end_round else max_round
+
+    logger.info(f"Exporting telemetry for {args.year} rounds {args.start_round}-{end_round}")
+    logger.info(f"Sessions: {sessions} -> {args.output_root}")
+
+    success_count = 0
+    skip_count = 0
+    fail_count = 0
+
+    for round_num in range(args.start_round, end_round + 1):
+        for session_code in sessions:
+            # A fastest-only export (e.g. from an API cache miss) does not satisfy a full run.
+            mode = export_mode(args.output_root, args.year, round_num, session_code)
+            if mode is not None and (mode == FULL_EXPORT or args.fastest_only) and not args.force:
+                skip_count += 1
+                continue
+            try:
+                export_session_telemetry(
+                    args.year,
+                    round_num,
+                    session_code,
+                    args.output_root,
+                    cache_dir=CACHE_PATH,
+                    fastest_only=args.fastest_only,
+                )
+                success_count += 1
+            except Exception as e:
+                logger.error(f"  ✗ Failed to export {args.year} R{round_num} {session_code}: {e}")
+                fail_count += 1
+
+            # Rate limiting - telemetry loads are heavy
+            sleep(args.delay)
+
+    logger.info(f"\nCompleted: {success_count} successful, {skip_count} skipped, {fail_count} failed")
+
+
+if __name__ == "__main__":
+    main()
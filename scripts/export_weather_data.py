@@ -20,6 +20,40 @@ logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(me
 logger = logging.getLogger("export_weather")
 
 
+def write_session_weather(
+    session, year: int, round_num: int, session_code: str, output_root: Path = WEATHER_OUTPUT_ROOT
+) -> int:
+    """Write weather for an already loaded session (loaded with weather=True). Returns rows written."""
+    if session.weather_data is None or len(session.weather_data) == 0:
+        logger.warning(f"No weather data for {year} R{round_num} {session_code}")
+        return 0
+
+    # Get event slug for partitioning
+    event_name = session.event['EventName']
+    slug = event_name.lower().replace(' ', '-')
+
+    # Add metadata columns
+    weather = session.weather_data.copy()
+    weather['season'] = year
+    weather['round'] = round_num
+    weather['grand_prix_slug'] = slug
+    weather['session_code'] = session_code
+
+    # Convert timedelta to seconds for easier querying
+    if 'Time' in weather.columns:
+        weather['time_seconds'] = weather['Time'].dt.total_seconds()
+
+    # Output path with partitioning
+    output_dir = output_root / f"season={year}" / f"grand_prix_slug={slug}" / f"session_code={session_code}"
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    output_file = output_dir / "part-00000.parquet"
+    weather.to_parquet(output_file, index=False)
+
+    logger.info(f"  ✓ Exported {len(weather)} weather records to {output_file}")
+    return len(weather)
+
+
 def export_session_weather(year: int, round_num: int, session_code: str) -> bool:
     """Export weather data for a single session."""
     try:
@@ -28,35 +62,7 @@ def export_session_weather(year: int, round_num: int, session_code: str) -> bool
         logger.info(f"Loading {year} Round {round_num} {session_code}...")
         session = fastf1.get_session(year, round_num, session_code)
         session.load(telemetry=False, weather=True)
-        
-        if session.weather_data is None or len(session.weather_data) == 0:
-            logger.warning(f"No weather data for {year} R{round_num} {session_code}")
-            return False
-        
-        # Get event slug for partitioning
-        event_name = session.event['EventName']
-        slug = event_name.lower().replace(' ', '-')
-        
-        # Add metadata columns
-        weather = session.weather_data.copy()
-        weather['season'] = year
-        weather['round'] = round_num
-        weather['grand_prix_slug'] = slug
-        weather['session_code'] = session_code
-        
-        # Convert timedelta to seconds for easier querying
-        if 'Time' in weather.columns:
-            weather['time_seconds'] = weather['Time'].dt.total_seconds()
-        
-        # Output path with partitioning
-        output_dir = WEATHER_OUTPUT_ROOT / f"season={year}" / f"grand_prix_slug={slug}" / f"session_code={session_code}"
-        output_dir.mkdir(parents=True, exist_ok=True)
-        
-        output_file = output_dir / "part-00000.parquet"
-        weather.to_parquet(output_file, index=False)
-        
-        logger.info(f"  ✓ Exported {len(weather)} weather records to {output_file}")
-        return True
+        return write_session_weather(session, year, round_num, session_code) > 0
         
     except Exception as e:
         logger.error(f"  ✗ Failed to export {year} R{round_num} {session_code}: {e}")
@@ -0,0 +1,316 @@
+#!/usr/bin/env python3
+"""
+Parallel FastF1 export orchestrator.
+
+Plans (season, round, session, data type) units from the event schedule and runs
+them on a process pool. Units of the same session go to one worker, which hands
+them to extract_session(): the FastF1 session is loaded once and every requested
+output is written from it, instead of each export script reloading and
+re-parsing the same session.
+
+Per-unit outcomes are recorded in a JSON manifest (default:
+<output-root>/_export_manifest.json):
+
+    {"units": {"2024/05/R/weather": {"status": "ok", "rows": 160, "seconds": 0.4,
+                                      "load_seconds": 12.3, "error": null, "updated_at": "..."}}}
+
+`seconds` is the output's own write time; `load_seconds` is the shared session
+load (see scripts/fastf1_session_extractor.py).
+
+A rerun skips units that are "ok" (or "empty": FastF1 had no data) and only
+retries failed or never-run ones; --force reruns everything.
+
+FastF1 enforces its own API rate limits per process, so keep --workers modest
+(the default 4 stays well within them once the FastF1 cache is warm).
+
+Examples:
+    python scripts/fastf1_export_orchestrator.py --years 2023,2024
+    python scripts/fastf1_export_orchestrator.py --years 2018-2024 --auto-format --data-types laps,results
+    python scripts/fastf1_export_orchestrator.py --years 2024 --data-types telemetry --sessions Q,R --workers 2
+"""
+
+import argparse
+import json
+import logging
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import fastf1
+import pandas as pd
+
+SCRIPT_DIR = Path(__file__).resolve().parent
+REPO_ROOT = SCRIPT_DIR.parent
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from api.position_store import DEFAULT_TOLERANCE
+from scripts.fastf1_export_to_parquet import CACHE_DIR, DEFAULT_OUTPUT_ROOT
+from scripts.fastf1_session_extractor import DEFAULT_OUTPUTS, OUTPUTS, extract_session
+
+logger = logging.getLogger("fastf1_export_orchestrator")
+
+# Heavy outputs are only exported for these sessions (as batch_export_telemetry always did).
+SESSION_FILTER = {
+    "position": {"R"},
+    "telemetry": {"Q", "R"},
+}
+
+SESSION_CODES = {
+    "Practice 1": "FP1",
+    "Practice 2": "FP2",
+    "Practice 3": "FP3",
+    "Qualifying": "Q",
+    "Sprint Qualifying": "SQ",
+    "Sprint Shootout": "SQ",
+    "Sprint": "S",
+    "Race": "R",
+}
+
+DONE_STATUSES = {"ok", "empty"}
+
+
+def unit_key(season: int, round_num: int, session_code: str, data_type: str) -> str:
+    return f"{season}/{round_num:02d}/{session_code}/{data_type}"
+
+
+class ExportManifest:
+    def __init__(self, path: Path):
+        self.path = path
+        self.units: Dict[str, Dict[str, Any]] = {}
+        try:
+            self.units = json.loads(path.read_text()).get("units", {})
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError) as exc:
+            logger.warning("Ignoring unreadable export manifest %s: %s", path, exc)
+
+    def is_done(self, key: str) -> bool:
+        return self.units.get(key, {}).get("status") in DONE_STATUSES
+
+    def record(self, result: Dict[str, Any]) -> None:
+        self.units[result["key"]] = {
+            "status": result["status"],
+            "rows": result.get("rows", 0),
+            "seconds": result.get("seconds"),
+            "load_seconds": result.get("load_seconds"),
+            "error": result.get("error"),
+            "updated_at": datetime.utcnow().isoformat(),
+        }
+
+    def save(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+        tmp.write_text(json.dumps({"units": self.units}, indent=1, sort_keys=True))
+        os.replace(tmp, self.path)
+
+
+def _init_worker(cache_dir: str) -> None:
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(processName)s %(message)s")
+    fastf1.set_log_level("WARNING")
+    Path(cache_dir).mkdir(parents=True, exist_ok=True)
+    fastf1.Cache.enable_cache(cache_dir)
+
+
+def run_session_job(job: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Extract every pending output of one session from a single load. Runs in a pool worker."""
+    season, round_num, code = job["season"], job["round"], job["session_code"]
+    report = extract_session(
+        season,
+        round_num,
+        code,
+        job["data_types"],
+        Path(job["output_root"]),
+        position_sample_rate=job["position_sample_rate"],
+        fastest_only=job["fastest_only"],
+        position_tolerance=job["position_tolerance"],
+    )
+    report.log_summary(logger)
+    if report.load_error:
+        return [
+            {
+                "key": unit_key(season, round_num, code, dt),
+                "status": "failed",
+                "error": f"load failed: {report.load_error}",
+                "load_seconds": round(report.load_seconds, 3),
+            }
+            for dt in job["data_types"]
+        ]
+    return [
+        {
+            "key": unit_key(season, round_num, code, out.name),
+            "status": out.status,
+            "rows": out.rows,
+            "error": out.error,
+            "seconds": round(out.seconds, 3),
+            "load_seconds": round(report.load_seconds, 3),
+        }
+        for out in report.outputs
+    ]
+
+
+def parse_years(value: str) -> List[int]:
+    years: List[int] = []
+    for part in value.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        if "-" in part:
+            start, end = part.split("-", 1)
+            years.extend(range(int(start), int(end) + 1))
+        else:
+            years.append(int(part))
+    return years
+
+
+def event_session_codes(row: pd.Series) -> List[str]:
+    """Session codes of an event from its schedule row (Session1..Session5 names)."""
+    codes = []
+    for i in range(1, 6):
+        code = SESSION_CODES.get(str(row.get(f"Session{i}") or ""))
+        if code and code not in codes:
+            codes.append(code)
+    return codes
+
+
+def plan_jobs(args: argparse.Namespace, manifest: ExportManifest) -> List[Dict[str, Any]]:
+    data_types = [dt.strip() for dt in args.data_types.split(",") if dt.strip()]
+    for dt in data_types:
+        if dt not in OUTPUTS:
+            raise SystemExit(f"Unknown data type '{dt}'. Valid: {OUTPUTS}")
+    session_codes = [s.strip() for s in args.sessions.split(",") if s.strip()]
+    now = pd.Timestamp.now()
+
+    jobs = []
+    for season in parse_years(args.years):
+        try:
+            schedule = fastf1.get_event_schedule(season, include_testing=False)
+        except Exception as exc:
+            logger.error("Failed to fetch event schedule for %s: %s", season, exc)
+            continue
+        for _, row in schedule.sort_values("RoundNumber").iterrows():
+            round_num = int(row["RoundNumber"])
+            if round_num < args.start_round or (args.end_round is not None and round_num > args.end_round):
+                continue
+            if pd.notna(row.get("EventDate")) and pd.Timestamp(row["EventDate"]) > now:
+                continue
+            codes = event_session_codes(row) if args.auto_format else session_codes
+            for code in codes:
+                pending = [
+                    dt
+                    for dt in data_types
+                    if code in SESSION_FILTER.get(dt, {code})
+                    and (args.force or not manifest.is_done(unit_key(season, round_num, code, dt)))
+                ]
+                if not pending:
+                    continue
+                jobs.append(
+                    {
+                        "season": season,
+                        "round": round_num,
+                        "session_code": code,
+                        "event_name": row.get("EventName"),
+                        "data_types": pending,
+                        "output_root": str(args.output_root),
+                        "position_sample_rate": args.position_sample_rate,
+                        "position_tolerance": args.position_tolerance,
+                        "fastest_only": args.fastest_only,
+                    }
+                )
+    return jobs
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Export FastF1 sessions to Parquet on a process pool")
+    parser.add_argument("--years", type=str, required=True, help="Seasons, e.g. 2024 or 2023,2024 or 2018-2024")
+    parser.add_argument(
+        "--data-types",
+        type=str,
+        default=",".join(DEFAULT_OUTPUTS),
+        help=f"Comma-separated outputs ({','.join(OUTPUTS)})",
+    )
+    parser.add_argument("--sessions", type=str, default="FP1,FP2,FP3,Q,R", help="Comma-separated session codes")
+    parser.add_argument(
+        "--auto-format", action="store_true", help="Take each event's sessions from the schedule (sprint vs. standard)"
+    )
+    parser.add_argument("--start-round", type=int, default=1, help="Starting round number")
+    parser.add_argument("--end-round", type=int, help="Ending round number (inclusive)")
+    parser.add_argument("--workers", type=int, default=4, help="Worker processes (default: 4)")
+    parser.add_argument("--output-root", type=Path, default=DEFAULT_OUTPUT_ROOT, help="bronze_fastf1 root")
+    parser.add_argument("--cache-dir", type=Path, default=CACHE_DIR, help="FastF1 cache directory")
+    parser.add_argument("--manifest", type=Path, help="Manifest path (default: <output-root>/_export_manifest.json)")
+    parser.add_argument(
+        "--position-tolerance",
+        type=float,
+        default=DEFAULT_TOLERANCE,
+        help="GPS simplification error bound in FastF1 units (1/10 m); 0 = keep every Nth sample",
+    )
+    parser.add_argument("--position-sample-rate", type=int, default=10, help="N for --position-tolerance 0")
+    parser.add_argument("--fastest-only", action="store_true", help="Telemetry: only each driver's fastest lap")
+    parser.add_argument("--force", action="store_true", help="Rerun units already recorded as done")
+    parser.add_argument("--dry-run", action="store_true", help="Only log the planned units")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
+    args = parse_args(argv)
+    manifest = ExportManifest(args.manifest or args.output_root / "_export_manifest.json")
+
+    args.cache_dir.mkdir(parents=True, exist_ok=True)
+    fastf1.Cache.enable_cache(str(args.cache_dir))
+    jobs = plan_jobs(args, manifest)
+    total_units = sum(len(job["data_types"]) for job in jobs)
+    logger.info("[plan] %s sessions, %s units, workers=%s", len(jobs), total_units, args.workers)
+    if args.dry_run:
+        for job in jobs:
+            logger.info("[dry-run] %s R%s %s: %s", job["season"], job["round"], job["session_code"], job["data_types"])
+        return 0
+
+    counts = {"ok": 0, "empty": 0, "failed": 0}
+    started = time.perf_counter()
+    with ProcessPoolExecutor(
+        max_workers=max(1, args.workers), initializer=_init_worker, initargs=(str(args.cache_dir),)
+    ) as pool:
+        futures = {pool.submit(run_session_job, job): job for job in jobs}
+        for fut in as_completed(futures):
+            job = futures[fut]
+            try:
+                results = fut.result()
+            except Exception as exc:
+                # Worker died (e.g. out of memory): mark the whole session failed so it is retried.
+                results = [
+                    {"key": unit_key(job["season"], job["round"], job["session_code"], dt), "status": "failed", "error": str(exc)}
+                    for dt in job["data_types"]
+                ]
+            for result in results:
+                manifest.record(result)
+                counts[result["status"]] += 1
+            manifest.save()
+            logger.info(
+                "[progress] %s/%s units (ok=%s empty=%s failed=%s)",
+                sum(counts.values()),
+                total_units,
+                counts["ok"],
+                counts["empty"],
+                counts["failed"],
+            )
+
+    logger.info(
+        "[summary] units=%s ok=%s empty=%s failed=%s elapsed=%.1fs manifest=%s",
+        total_units,
+        counts["ok"],
+        counts["empty"],
+        counts["failed"],
+        time.perf_counter() - started,
+        manifest.path,
+    )
+    return 1 if counts["failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
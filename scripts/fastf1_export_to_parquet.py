@@ -141,31 +141,16 @@ def write_parquet(df: pd.DataFrame, output_root: Path, season: int, gp_slug: str
     return out_file
 
 
-def export_fastf1_session_to_parquet(
+def write_session_laps(
+    sess: fastf1.core.Session,
     year: int,
     event_name: str,
     session_type: str,
-    output_root: str,
-    logger: logging.Logger,
+    output_root: Path,
+    logger: Optional[logging.Logger] = None,
 ) -> int:
+    """Normalize and write laps of an already loaded session. Returns rows written."""
     log = logger or logging.getLogger(__name__)
-    output_path = Path(output_root)
-
-    enable_fastf1_cache()
-    sess = load_session(year, event_name, session_type, log)
-
-    event = getattr(sess, "event", None)
-    if isinstance(event, pd.Series):
-        log.info(
-            "Session resolved: EventName=%s, SessionName=%s, Country=%s, Location=%s",
-            event.get("EventName"),
-            getattr(sess, "name", None),
-            event.get("Country"),
-            event.get("Location"),
-        )
-    else:
-        log.info("Session resolved: EventName=%s, SessionName=%s", getattr(sess, "eventName", None), getattr(sess, "name", None))
-
     norm = normalize_laps(sess, session_type, year, log)
     if norm is None or norm.empty:
         reason = "laps empty"
@@ -185,11 +170,39 @@ def export_fastf1_session_to_parquet(
     log.info("Normalized laps shape: %s, columns: %s", norm.shape, list(norm.columns))
     log.info("Normalized laps head:\n%s", norm.head(5))
 
-    out_file = write_parquet(norm, output_path, year, norm["grand_prix_slug"].iloc[0], session_type)
+    out_file = write_parquet(norm, output_root, year, norm["grand_prix_slug"].iloc[0], session_type)
     log.info("Wrote %s rows to %s", len(norm), out_file)
     return len(norm)
 
 
+def export_fastf1_session_to_parquet(
+    year: int,
+    event_name: str,
+    session_type: str,
+    output_root: str,
+    logger: logging.Logger,
+) -> int:
+    log = logger or logging.getLogger(__name__)
+    output_path = Path(output_root)
+
+    enable_fastf1_cache()
+    sess = load_session(year, event_name, session_type, log)
+
+    event = getattr(sess, "event", None)
+    if isinstance(event, pd.Series):
+        log.info(
+            "Session resolved: EventName=%s, SessionName=%s, Country=%s, Location=%s",
+            event.get("EventName"),
+            getattr(sess, "name", None),
+            event.get("Country"),
+            event.get("Location"),
+        )
+    else:
+        log.info("Session resolved: EventName=%s, SessionName=%s", getattr(sess, "eventName", None), getattr(sess, "name", None))
+
+    return write_session_laps(sess, year, event_name, session_type, output_path, log)
+
+
 def main() -> None:
     parser = argparse.ArgumentParser(description="Export FastF1 session laps to partitioned Parquet.")
     parser.add_argument("--year", type=int, required=True, help="Season year, e.g. 2018")
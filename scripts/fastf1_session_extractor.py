@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+"""
+Single-load, multi-output FastF1 session extractor.
+
+Loads a FastF1 session once, with the union of the Session.load() flags the
+requested outputs need, and writes each output's Parquet partition from that
+one object:
+
+    laps          <root>/laps/season=/grand_prix_slug=/session_code=/
+    results       <root>/session_result/...
+    weather       <root>/weather/...
+    race_control  <root>/race_control/...
+    position      <root>/position/...          (simplified GPS, api/position_store.py)
+    telemetry     <root>/telemetry/... and telemetry_session/... (api/telemetry_store.py)
+
+The standalone export scripts each load the session themselves with their own
+flags; exporting a race through all of them parses the FastF1 cache once per
+script. The returned report carries the load time and per-output rows/seconds.
+
+Example:
+    python scripts/fastf1_session_extractor.py --year 2024 --round 5 --session R
+    python scripts/fastf1_session_extractor.py --year 2024 --round 5 --session Q --outputs laps,results,telemetry
+"""
+
+import argparse
+import logging
+import sys
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, List, Optional, Sequence
+
+import fastf1
+
+SCRIPT_DIR = Path(__file__).resolve().parent
+REPO_ROOT = SCRIPT_DIR.parent
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from api.position_store import DEFAULT_TOLERANCE
+from api.telemetry_store import write_session_telemetry
+from scripts.export_position_data import write_session_position_data
+from scripts.export_race_control import write_session_race_control
+from scripts.export_weather_data import write_session_weather
+from scripts.fastf1_export_to_parquet import CACHE_DIR, DEFAULT_OUTPUT_ROOT, log_missing, write_session_laps
+from scripts.ingest_fastf1_results import write_session_results
+
+logger = logging.getLogger("fastf1_session_extractor")
+
+OUTPUTS = ["laps", "results", "weather", "race_control", "position", "telemetry"]
+DEFAULT_OUTPUTS = ["laps", "results", "weather", "race_control", "position"]
+
+# Session.load() flags each output needs; the session is loaded once with the union.
+LOAD_FLAGS = {
+    "laps": {"laps", "messages"},
+    "results": set(),
+    "weather": {"weather"},
+    "race_control": {"messages"},
+    "position": {"telemetry"},
+    "telemetry": {"laps", "telemetry", "weather"},
+}
+
+
+@dataclass
+class OutputResult:
+    name: str
+    status: str  # "ok", "empty" (FastF1 had no data) or "failed"
+    rows: int = 0
+    seconds: float = 0.0
+    error: Optional[str] = None
+
+
+@dataclass
+class ExtractionReport:
+    season: int
+    round_num: int
+    session_code: str
+    load_seconds: float = 0.0
+    load_error: Optional[str] = None
+    outputs: List[OutputResult] = field(default_factory=list)
+
+    @property
+    def total_seconds(self) -> float:
+        return self.load_seconds + sum(o.seconds for o in self.outputs)
+
+    def log_summary(self, log: Optional[logging.Logger] = None) -> None:
+        log = log or logger
+        label = f"{self.season} R{self.round_num} {self.session_code}"
+        if self.load_error:
+            log.error("[extract] %s load failed after %.2fs: %s", label, self.load_seconds, self.load_error)
+            return
+        # One record, so summaries from pool workers do not interleave.
+        lines = [f"[extract] {label} load={self.load_seconds:.2f}s total={self.total_seconds:.2f}s"]
+        for out in self.outputs:
+            detail = f" error={out.error}" if out.error else ""
+            lines.append(f"[extract]   {out.name:<12} {out.status:<6} rows={out.rows:<8} {out.seconds:.2f}s{detail}")
+        log.info("\n".join(lines))
+
+
+def load_flags(outputs: Sequence[str]) -> dict:
+    flags = set().union(*(LOAD_FLAGS[name] for name in outputs))
+    return {name: name in flags for name in ("laps", "telemetry", "weather", "messages")}
+
+
+def write_output(
+    session: Any,
+    name: str,
+    season: int,
+    round_num: int,
+    session_code: str,
+    output_root: Path,
+    position_sample_rate: int = 10,
+    fastest_only: bool = False,
+    position_tolerance: float = DEFAULT_TOLERANCE,
+) -> int:
+    """Write one output from a loaded session. Returns rows written."""
+    if name == "laps":
+        event_name = session.event.get("EventName")
+        return write_session_laps(session, season, event_name, session_code, output_root, logger)
+    if name == "results":
+        return write_session_results(session, season, round_num, session_code, output_root / "session_result")
+    if name == "weather":
+        return write_session_weather(session, season, round_num, session_code, output_root / "weather")
+    if name == "race_control":
+        return write_session_race_control(session, season, round_num, session_code, output_root / "race_control")
+    if name == "position":
+        return write_session_position_data(
+            session,
+            season,
+            round_num,
+            session_code,
+            position_sample_rate,
+            output_root / "position",
+            tolerance=position_tolerance,
+        )
+    if name == "telemetry":
+        return write_session_telemetry(session, season, round_num, session_code, output_root, fastest_only=fastest_only)
+    raise ValueError(f"Unknown output: {name}")
+
+
+def extract_session(
+    season: int,
+    round_num: int,
+    session_code: str,
+    outputs: Sequence[str] = DEFAULT_OUTPUTS,
+    output_root: Path = DEFAULT_OUTPUT_ROOT,
+    position_sample_rate: int = 10,
+    fastest_only: bool = False,
+    position_tolerance: float = DEFAULT_TOLERANCE,
+) -> ExtractionReport:
+    """
+    Load the session once and write every requested output.
+
+    Never raises for data problems: a failed load or output is reported in the
+    returned ExtractionReport so callers can record and retry it.
+    """
+    for name in outputs:
+        if name not in LOAD_FLAGS:
+            raise ValueError(f"Unknown output '{name}'. Valid: {OUTPUTS}")
+    report = ExtractionReport(season, round_num, session_code)
+    flags = load_flags(outputs)
+
+    started = time.perf_counter()
+    try:
+        session = fastf1.get_session(season, round_num, session_code)
+        session.load(**flags)
+    except Exception as exc:
+        report.load_seconds = time.perf_counter() - started
+        report.load_error = str(exc)
+        log_missing(season, f"round {round_num}", session_code, f"load failed: {exc}")
+        return report
+    report.load_seconds = time.perf_counter() - started
+
+    for name in outputs:
+        started = time.perf_counter()
+        try:
+            rows = write_output(
+                session,
+                name,
+                season,
+                round_num,
+                session_code,
+                Path(output_root),
+                position_sample_rate,
+                fastest_only,
+                position_tolerance,
+            )
+            result = OutputResult(name, "ok" if rows > 0 else "empty", rows)
+        except Exception as exc:
+            logger.warning("Failed %s for %s R%s %s: %s", name, season, round_num, session_code, exc)
+            result = OutputResult(name, "failed", error=str(exc))
+        result.seconds = time.perf_counter() - started
+        report.outputs.append(result)
+    return report
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Load one FastF1 session once and export several outputs from it")
+    parser.add_argument("--year", type=int, required=True, help="Season year")
+    parser.add_argument("--round", type=int, required=True, help="Round number")
+    parser.add_argument("--session", type=str, required=True, help="Session code, e.g. FP1, Q, S, R")
+    parser.add_argument(
+        "--outputs", type=str, default=",".join(DEFAULT_OUTPUTS), help=f"Comma-separated outputs ({','.join(OUTPUTS)})"
+    )
+    parser.add_argument("--output-root", type=Path, default=DEFAULT_OUTPUT_ROOT, help="bronze_fastf1 root")
+    parser.add_argument("--cache-dir", type=Path, default=CACHE_DIR, help="FastF1 cache directory")
+    parser.add_argument(
+        "--position-tolerance",
+        type=float,
+        default=DEFAULT_TOLERANCE,
+        help="GPS simplification error bound in FastF1 units (1/10 m); 0 = keep every Nth sample",
+    )
+    parser.add_argument("--position-sample-rate", type=int, default=10, help="N for --position-tolerance 0")
+    parser.add_argument("--fastest-only", action="store_true", help="Telemetry: only each driver's fastest lap")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
+    args.cache_dir.mkdir(parents=True, exist_ok=True)
+    fastf1.Cache.enable_cache(str(args.cache_dir))
+
+    outputs = [o.strip() for o in args.outputs.split(",") if o.strip()]
+    report = extract_session(
+        args.year,
+        args.round,
+        args.session,
+        outputs,
+        args.output_root,
+        position_sample_rate=args.position_sample_rate,
+        fastest_only=args.fastest_only,
+        position_tolerance=args.position_tolerance,
+    )
+    report.log_summary()
+    if report.load_error or any(o.status == "failed" for o in report.outputs):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -4,14 +4,19 @@ Generate race win predictions for 2025 season using the trained model.
 """
 
 import json
+import sys
 from pathlib import Path
 import duckdb
-import numpy as np
 import pandas as pd
 import joblib
 
 # Paths
 REPO_ROOT = Path(__file__).resolve().parent.parent
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from scripts.grouped_ops import Segments, segment_softmax
+
 DB_PATH = REPO_ROOT / "warehouse" / "f1_openf1.duckdb"
 MODEL_PATH = REPO_ROOT / "ml_artifacts" / "race_win_full.joblib"
 META_PATH = REPO_ROOT / "ml_artifacts" / "race_win_full.json"
@@ -75,16 +80,9 @@ def generate_predictions(model, feature_cols, df):
     df['pred_win_proba'] = pred_proba
     
     # Calculate softmax probabilities per race
-    races = []
-    for gp_slug, group in df.groupby('grand_prix_slug'):
-        indices = group.index
-        probs = pred_proba[indices - df.index[0]]  # Adjust for dataframe index
-        
-        # Softmax
-        exp_probs = np.exp(probs - np.max(probs))  # Subtract max for numerical stability
-        softmax_probs = exp_probs / exp_probs.sum()
-        
-        df.loc[indices, 'pred_win_proba_softmax'] = softmax_probs
+    races = Segments.from_frame(df, ['grand_prix_slug'])
+    softmax_probs = segment_softmax(races.gather(pred_proba), races)
+    df['pred_win_proba_softmax'] = races.scatter(softmax_probs)
     
     print(f"Generated predictions for {len(df)} entries")
     
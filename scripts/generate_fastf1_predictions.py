@@ -14,6 +14,7 @@ Outputs predictions to gold_fastf1.race_predictions table.
 
 import json
 import logging
+import sys
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 
@@ -22,8 +23,15 @@ import joblib
 import numpy as np
 import pandas as pd
 
-WAREHOUSE_PATH = "/Volumes/SAMSUNG/apps/f1-dash/warehouse/f1_openf1.duckdb"
-ARTIFACT_DIR = Path("/Volumes/SAMSUNG/apps/f1-dash/ml_artifacts")
+SCRIPT_DIR = Path(__file__).resolve().parent
+REPO_ROOT = SCRIPT_DIR.parent
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from scripts.data_paths import ml_artifacts_dir, warehouse_path
+
+WAREHOUSE_PATH = str(warehouse_path())
+ARTIFACT_DIR = ml_artifacts_dir()
 
 logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
 logger = logging.getLogger("fastf1_predictions")
@@ -1,4 +1,5 @@
 import logging
+import sys
 from pathlib import Path
 
 import duckdb
@@ -7,11 +8,16 @@ import numpy as np
 import pandas as pd
 import json
 
-# Paths
 BASE_DIR = Path(__file__).resolve().parent.parent
-WAREHOUSE_PATH = BASE_DIR / "warehouse" / "f1_openf1.duckdb"
-MODEL_PATH = BASE_DIR / "ml_artifacts" / "race_win_logreg.joblib"
-META_PATH = BASE_DIR / "ml_artifacts" / "race_win_logreg.json"
+if str(BASE_DIR) not in sys.path:
+    sys.path.insert(0, str(BASE_DIR))
+
+from scripts.data_paths import ml_artifacts_dir, warehouse_path
+
+# Paths
+WAREHOUSE_PATH = warehouse_path()
+MODEL_PATH = ml_artifacts_dir() / "race_win_logreg.joblib"
+META_PATH = ml_artifacts_dir() / "race_win_logreg.json"
 
 
 def _load_feature_cols() -> list[str]:
@@ -0,0 +1,144 @@
+"""
+Vectorized per-race (segment) operations for prediction building and evaluation.
+
+Rows are grouped once into segments (one per race):
+
+    seg = Segments.from_frame(df, ["season", "round"])
+
+`seg.order` lists row positions sorted by segment (stable, so rows keep their
+original order inside a race) and `seg.starts` the offset where each segment
+begins in that order. The segment_* functions take values already gathered in
+that order (`seg.gather(values)`) and work with NumPy ufunc.reduceat over the
+segment boundaries, so the cost is a few array passes instead of one pandas
+group per race. Results in segment order go back to row order with
+`seg.scatter()`.
+
+Conventions match the loops they replace:
+- rows whose key has a null are not in any segment (pandas groupby dropna);
+- segment_softmax treats NaN as 0 and subtracts the segment max first;
+- segment_rank is 1-based, descending by default, ties ranked by row order,
+  NaN last.
+
+scripts/benchmark_grouped_ops.py compares these against the groupby loops.
+"""
+
+from dataclasses import dataclass
+from typing import Dict, Sequence
+
+import numpy as np
+import pandas as pd
+
+
+@dataclass
+class Segments:
+    order: np.ndarray  # row positions, grouped by segment
+    starts: np.ndarray  # offset of each segment's first row in `order`
+    n_rows: int  # rows in the source frame (including rows without a segment)
+
+    @classmethod
+    def from_codes(cls, codes: np.ndarray) -> "Segments":
+        """Segments from per-row integer group codes (-1 = no segment)."""
+        codes = np.asarray(codes)
+        order = np.argsort(codes, kind="stable")
+        order = order[codes[order] >= 0]
+        sorted_codes = codes[order]
+        starts = np.flatnonzero(np.r_[True, sorted_codes[1:] != sorted_codes[:-1]]) if len(order) else order[:0]
+        return cls(order=order, starts=starts, n_rows=len(codes))
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame, keys: Sequence[str]) -> "Segments":
+        """One segment per distinct key tuple, in sorted key order."""
+        # ngroup() is NaN for rows with a null key
+        codes = df.groupby(list(keys), sort=True, dropna=True).ngroup().fillna(-1).to_numpy(dtype=np.int64)
+        return cls.from_codes(codes)
+
+    @property
+    def n_segments(self) -> int:
+        return len(self.starts)
+
+    @property
+    def lengths(self) -> np.ndarray:
+        return np.diff(np.r_[self.starts, len(self.order)])
+
+    @property
+    def ids(self) -> np.ndarray:
+        """Segment number of every row in segment order."""
+        return np.repeat(np.arange(self.n_segments), self.lengths)
+
+    def gather(self, values) -> np.ndarray:
+        return np.asarray(values)[self.order]
+
+    def scatter(self, sorted_values: np.ndarray, fill: float = np.nan) -> np.ndarray:
+        """Row-order array from values in segment order; rows without a segment get `fill`."""
+        out = np.full(self.n_rows, fill, dtype=np.result_type(sorted_values, type(fill)))
+        out[self.order] = sorted_values
+        return out
+
+    def broadcast(self, per_segment: np.ndarray) -> np.ndarray:
+        """Repeat one value per segment over that segment's rows (segment order)."""
+        return np.repeat(per_segment, self.lengths)
+
+
+def segment_max(values: np.ndarray, seg: Segments) -> np.ndarray:
+    return np.maximum.reduceat(values, seg.starts) if seg.n_segments else values[:0]
+
+
+def segment_sum(values: np.ndarray, seg: Segments) -> np.ndarray:
+    return np.add.reduceat(values, seg.starts) if seg.n_segments else values[:0]
+
+
+def segment_any(mask: np.ndarray, seg: Segments) -> np.ndarray:
+    mask = np.asarray(mask, dtype=bool)
+    return np.logical_or.reduceat(mask, seg.starts) if seg.n_segments else mask[:0]
+
+
+def segment_softmax(values: np.ndarray, seg: Segments) -> np.ndarray:
+    """Softmax within each segment (values in segment order)."""
+    values = np.nan_to_num(np.asarray(values, dtype=float), nan=0.0)
+    if not seg.n_segments:
+        return values
+    exp = np.exp(values - seg.broadcast(segment_max(values, seg)))
+    denom = segment_sum(exp, seg)
+    denom = np.where(denom == 0, 1, denom)
+    return exp / seg.broadcast(denom)
+
+
+def segment_rank(values: np.ndarray, seg: Segments, descending: bool = True) -> np.ndarray:
+    """1-based rank within each segment (values in segment order); ties by row order, NaN last."""
+    values = np.asarray(values, dtype=float)
+    if not seg.n_segments:
+        return np.zeros(0, dtype=np.int64)
+    key = -values if descending else values
+    # lexsort is stable: last key is primary (segment), then value, then position
+    by_value = np.lexsort((key, seg.ids))
+    ranks = np.empty(len(values), dtype=np.int64)
+    ranks[by_value] = np.arange(len(values)) - seg.broadcast(seg.starts) + 1
+    return ranks
+
+
+def segment_topk(values: np.ndarray, seg: Segments, k: int, descending: bool = True) -> np.ndarray:
+    """Boolean mask of the top-k rows of each segment (values in segment order)."""
+    return segment_rank(values, seg, descending) <= k
+
+
+def hit_at_k(scores: np.ndarray, targets: np.ndarray, seg: Segments, k: int) -> float:
+    """Share of segments with at least one positive target among the top-k scores (scores/targets in row order)."""
+    if not seg.n_segments:
+        return 0.0
+    hits = segment_any((seg.gather(targets) == 1) & segment_topk(seg.gather(scores), seg, k), seg)
+    return float(hits.mean())
+
+
+def winner_ranks(scores: np.ndarray, targets: np.ndarray, seg: Segments) -> Dict[str, np.ndarray]:
+    """
+    Rank of the best-ranked positive row per segment, for segments that have one.
+
+    Returns {"segment": segment numbers, "rank": 1-based ranks}.
+    """
+    if not seg.n_segments:
+        return {"segment": np.zeros(0, dtype=np.int64), "rank": np.zeros(0, dtype=np.int64)}
+    ranks = segment_rank(seg.gather(scores), seg)
+    positive = seg.gather(targets) == 1
+    best = np.minimum.reduceat(np.where(positive, ranks, np.iinfo(np.int64).max), seg.starts)
+    has_winner = segment_any(positive, seg)
+    return {"segment": np.flatnonzero(has_winner), "rank": best[has_winner]}
@@ -102,6 +102,36 @@ def normalize_results_df(
     return norm
 
 
+def results_path(root: Path, season: int, event_name: str, session_code: str) -> Path:
+    return (
+        root
+        / f"season={season}"
+        / f"grand_prix_slug={slugify_grand_prix(event_name)}"
+        / f"session_code={session_code}"
+        / "part-00000.parquet"
+    )
+
+
+def write_session_results(session, season: int, round_num: int, session_code: str, root: Path = BRONZE_BASE) -> int:
+    """Normalize and write results of an already loaded session. Returns rows written."""
+    event_name = session.event.get("EventName")
+    norm = normalize_results_df(season, round_num, event_name, session_code, session.name, session)
+    if norm is None or norm.empty:
+        logger.info(
+            "[info] No results for season=%s round=%s event='%s' session=%s; skipping.", season, round_num, event_name, session_code
+        )
+        return 0
+    out_path = results_path(root, season, event_name, session_code)
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    norm.to_parquet(out_path, index=False)
+    logger.info(
+        "[info] Wrote %s rows to %s",
+        len(norm),
+        out_path,
+    )
+    return len(norm)
+
+
 def ingest_season(season: int, session_codes: Iterable[str], delay: float = 0.5) -> None:
     logger.info("[info] Ingesting FastF1 results for season=%s, sessions=%s", season, list(session_codes))
     fastf1.Cache.enable_cache(str(CACHE_DIR))
@@ -122,20 +152,7 @@ def ingest_season(season: int, session_codes: Iterable[str], delay: float = 0.5)
             if not event_name or round_num is None:
                 continue
             for code in session_codes:
-                session = fastf1.get_session(season, round_num, code)
-                session.load()
-                norm = normalize_results_df(season, round_num, event_name, code, session.name, session)
-                if norm is None or norm.empty:
-                    logger.info("[info] No results for season=%s round=%s event='%s' session=%s; skipping.", season, round_num, event_name, code)
-                    continue
-                out_dir = (
-                    BRONZE_BASE
-                    / f"season={season}"
-                    / f"grand_prix_slug={slugify_grand_prix(event_name)}"
-                    / f"session_code={code}"
-                )
-                out_dir.mkdir(parents=True, exist_ok=True)
-                out_path = out_dir / "part-00000.parquet"
+                out_path = results_path(BRONZE_BASE, season, event_name, code)
                 if out_path.exists():
                     logger.info(
                         "[info] Skipping season=%s round=%s session=%s (file already exists): %s",
@@ -145,12 +162,10 @@ def ingest_season(season: int, session_codes: Iterable[str], delay: float = 0.5)
                         out_path,
                     )
                     continue
-                norm.to_parquet(out_path, index=False)
-                logger.info(
-                    "[info] Wrote %s rows to %s",
-                    len(norm),
-                    out_path,
-                )
+                session = fastf1.get_session(season, round_num, code)
+                session.load()
+                if write_session_results(session, season, round_num, code) == 0:
+                    continue
                 if delay > 0:
                     time.sleep(delay)
         except Exception as exc:  # pragma: no cover - runtime safety
@@ -0,0 +1,347 @@
+#!/usr/bin/env python3
+"""
+Generate a synthetic OpenF1 bronze tree and build a warehouse from it.
+
+The bronze tree has the same layout and columns as the OpenF1 ingestor's output
+(<root>/bronze/<table>/season=/round=/grand_prix=/session=/part-00000.parquet) for
+sessions, drivers, laps, session_result and starting_grid. Its size is
+seasons x rounds x sessions x drivers x laps. The warehouse is then built by the
+real pipeline (build_bronze_catalog.py, build_silver.py, build_gold.py), so
+benchmarks exercise the same tables and catalog the API reads in production.
+Finally, gold.race_winner_top3 and predictions.race_win get synthetic rows, since
+those normally come from the ML stages.
+
+Everything derives from --seed, so the same arguments always produce the same data.
+
+Usage:
+  python scripts/synthetic_warehouse.py --root /tmp/f1-synthetic --seasons 2 --rounds 10 --drivers 20 --laps 60
+"""
+
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+import time
+from dataclasses import asdict, dataclass
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, List
+
+import duckdb
+import numpy as np
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+SCRIPT_DIR = Path(__file__).resolve().parent
+REPO_ROOT = SCRIPT_DIR.parent
+
+CONFIG_FILE = "synthetic.json"
+# Bump when the generated data changes, so existing synthetic warehouses are rebuilt.
+GENERATOR_VERSION = 1
+WAREHOUSE_FILE = "f1_synthetic.duckdb"
+SESSION_NAMES = {
+    "FP1": ("Practice", "Practice 1"),
+    "FP2": ("Practice", "Practice 2"),
+    "FP3": ("Practice", "Practice 3"),
+    "Q": ("Qualifying", "Qualifying"),
+    "R": ("Race", "Race"),
+}
+POINTS = [25, 18, 15, 12, 10, 8, 6, 4, 2, 1]
+BUILD_STEPS = ["build_bronze_catalog.py", "build_silver.py", "build_gold.py"]
+
+
+@dataclass
+class SyntheticConfig:
+    seasons: int = 2
+    rounds: int = 10
+    drivers: int = 20
+    laps: int = 60
+    sessions: str = "FP1,Q,R"
+    first_season: int = 2023
+    seed: int = 42
+
+    @property
+    def session_codes(self) -> List[str]:
+        return [s.strip() for s in self.sessions.split(",") if s.strip()]
+
+    @property
+    def season_list(self) -> List[int]:
+        return list(range(self.first_season, self.first_season + self.seasons))
+
+
+def grand_prix_slug(round_num: int) -> str:
+    return f"synthetic-{round_num:02d}-grand-prix"
+
+
+def _write(bronze_root: Path, table: str, season: int, round_num: int, session: str, rows: Dict[str, Any]) -> None:
+    out_dir = (
+        bronze_root
+        / table
+        / f"season={season}"
+        / f"round={round_num:02d}"
+        / f"grand_prix={grand_prix_slug(round_num)}"
+        / f"session={session}"
+    )
+    out_dir.mkdir(parents=True, exist_ok=True)
+    pq.write_table(pa.table(rows), out_dir / "part-00000.parquet")
+
+
+def _keys(n: int, season: int, round_num: int, session: str, meeting_key: int, session_key: int, ingested: str):
+    return {
+        "meeting_key": [meeting_key] * n,
+        "session_key": [session_key] * n,
+        "season": [season] * n,
+        "round": [round_num] * n,
+        "grand_prix_slug": [grand_prix_slug(round_num)] * n,
+        "session_code": [session] * n,
+        "ingested_at": [ingested] * n,
+    }
+
+
+def generate_bronze(root: Path, cfg: SyntheticConfig) -> int:
+    """Write the bronze tree under root/bronze. Returns the number of files written."""
+    rng = np.random.RandomState(cfg.seed)
+    bronze_root = root / "bronze"
+    ingested = "2025-01-01T00:00:00"
+    numbers = list(range(1, cfg.drivers + 1))
+    codes = [f"D{n:02d}" for n in numbers]
+    teams = [f"Team {chr(ord('A') + (n - 1) // 2)}" for n in numbers]
+    skill = rng.normal(0.0, 0.6, cfg.drivers)  # seconds per lap, lower is faster
+    files = 0
+    grid = np.arange(1, cfg.drivers + 1)
+
+    for season in cfg.season_list:
+        for round_num in range(1, cfg.rounds + 1):
+            meeting_key = season * 100 + round_num
+            race_day = datetime(season, 3, 1) + timedelta(days=14 * (round_num - 1))
+            base_lap = 80.0 + 10.0 * rng.rand()
+            for s_idx, session in enumerate(cfg.session_codes):
+                session_key = meeting_key * 10 + s_idx
+                start = race_day - timedelta(days=len(cfg.session_codes) - 1 - s_idx)
+                session_type, session_name = SESSION_NAMES.get(session, ("Practice", session))
+                n_laps = cfg.laps if session == "R" else max(cfg.laps // 3, 1)
+
+                _write(bronze_root, "sessions", season, round_num, session, {
+                    "meeting_key": [meeting_key],
+                    "session_key": [session_key],
+                    "location": [f"Circuit {round_num}"],
+                    "date_start": [start.isoformat() + "+00:00"],
+                    "date_end": [(start + timedelta(hours=2)).isoformat() + "+00:00"],
+                    "session_type": [session_type],
+                    "session_name": [session_name],
+                    "country_key": [round_num],
+                    "country_code": ["SYN"],
+                    "country_name": ["Synthetica"],
+                    "circuit_key": [round_num],
+                    "circuit_short_name": [f"Circuit {round_num}"],
+                    "gmt_offset": ["00:00:00"],
+                    "year": [season],
+                    **{k: v for k, v in _keys(1, season, round_num, session, meeting_key, session_key, ingested).items()
+                       if k not in {"meeting_key", "session_key"}},
+                })
+                _write(bronze_root, "drivers", season, round_num, session, {
+                    "driver_number": numbers,
+                    "broadcast_name": [f"{c[0]} DRIVER{c[1:]}" for c in codes],
+                    "full_name": [f"Driver {c}" for c in codes],
+                    "name_acronym": codes,
+                    "team_name": teams,
+                    "team_colour": [f"{(n * 2654435761) % 0xFFFFFF:06X}" for n in numbers],
+                    "first_name": ["Driver"] * cfg.drivers,
+                    "last_name": codes,
+                    "headshot_url": [None] * cfg.drivers,
+                    "country_code": ["SYN"] * cfg.drivers,
+                    **_keys(cfg.drivers, season, round_num, session, meeting_key, session_key, ingested),
+                })
+
+                # Lap times: base + driver skill + noise; sectors split the lap.
+                lap_times = base_lap + skill[:, None] + rng.gamma(2.0, 0.4, (cfg.drivers, n_laps))
+                split = rng.dirichlet([30, 40, 30], (cfg.drivers, n_laps))
+                n = cfg.drivers * n_laps
+                lap_start = [
+                    (start + timedelta(seconds=float(t))).isoformat()
+                    for t in np.cumsum(lap_times, axis=1).ravel() - lap_times.ravel()
+                ]
+                _write(bronze_root, "laps", season, round_num, session, {
+                    "driver_number": np.repeat(numbers, n_laps),
+                    "lap_number": np.tile(np.arange(1, n_laps + 1), cfg.drivers),
+                    "date_start": lap_start,
+                    "duration_sector_1": (lap_times * split[..., 0]).ravel().round(3),
+                    "duration_sector_2": (lap_times * split[..., 1]).ravel().round(3),
+                    "duration_sector_3": (lap_times * split[..., 2]).ravel().round(3),
+                    "i1_speed": rng.uniform(250, 320, n).round(),
+                    "is_pit_out_lap": rng.rand(n) < 0.03,
+                    "lap_duration": lap_times.ravel().round(3),
+                    "st_speed": rng.randint(280, 340, n),
+                    **_keys(n, season, round_num, session, meeting_key, session_key, ingested),
+                })
+
+                total = lap_times.sum(axis=1)
+                order = np.argsort(total)
+                position = np.empty(cfg.drivers)
+                position[order] = np.arange(1, cfg.drivers + 1)
+                dnf = rng.rand(cfg.drivers) < (0.05 if session == "R" else 0.0)
+                points = [
+                    float(POINTS[int(p) - 1]) if session == "R" and p <= len(POINTS) and not d else 0.0
+                    for p, d in zip(position, dnf)
+                ]
+                _write(bronze_root, "session_result", season, round_num, session, {
+                    "position": position,
+                    "driver_number": numbers,
+                    "number_of_laps": [n_laps] * cfg.drivers,
+                    "points": points,
+                    "dnf": dnf,
+                    "dns": [False] * cfg.drivers,
+                    "dsq": [False] * cfg.drivers,
+                    "duration": total.round(3),
+                    "gap_to_leader": [f"+{g:.3f}" if g > 0 else "0" for g in total - total.min()],
+                    "grid_position": grid if session == "R" else [None] * cfg.drivers,
+                    **_keys(cfg.drivers, season, round_num, session, meeting_key, session_key, ingested),
+                })
+                if session == "Q":
+                    grid = position.astype(int)
+                    _write(bronze_root, "starting_grid", season, round_num, session, {
+                        "position": position.astype(int),
+                        "driver_number": numbers,
+                        "lap_duration": lap_times.min(axis=1).round(3),
+                        **_keys(cfg.drivers, season, round_num, session, meeting_key, session_key, ingested),
+                    })
+                    files += 1
+                files += 4
+    return files
+
+
+def add_serving_tables(warehouse: Path, seed: int) -> None:
+    """Rows the ML stages would normally write: gold.race_winner_top3 and predictions.race_win."""
+    con = duckdb.connect(str(warehouse))
+    try:
+        con.execute("SELECT setseed(?)", [(seed % 1000) / 1000.0])
+        con.execute("CREATE SCHEMA IF NOT EXISTS predictions;")
+        con.execute(
+            """
+            CREATE OR REPLACE TABLE gold.race_winner_top3 AS
+            SELECT
+              season, round, grand_prix_slug, driver_code, driver_name, team_name,
+              grid_position, finish_position, points AS points_race,
+              25.0 + 10.0 * random() AS track_temp_c,
+              random() * 0.3 AS rain_probability,
+              NULL::DATE AS event_date,
+              CASE WHEN finish_position = 1 THEN 1 ELSE 0 END AS target_win_race,
+              CASE WHEN finish_position <= 3 THEN 1 ELSE 0 END AS target_top3
+            FROM gold.driver_session_summary
+            WHERE session_code = 'R'
+            """
+        )
+        con.execute(
+            """
+            CREATE OR REPLACE TABLE predictions.race_win AS
+            WITH scored AS (
+              SELECT
+                *,
+                exp(-0.35 * coalesce(grid_position, 20) + 0.5 * random()) AS score
+              FROM gold.race_winner_top3
+            )
+            SELECT
+              season, round, grand_prix_slug, NULL::INTEGER AS driver_number, driver_name, driver_code, team_name,
+              grid_position, grid_position / 20.0 AS grid_position_norm,
+              0.0 AS driver_points_pre, 0.0 AS team_points_pre,
+              track_temp_c, rain_probability,
+              target_win_race,
+              score / (1.0 + score) AS pred_win_proba,
+              score / sum(score) OVER (PARTITION BY season, round) AS pred_win_proba_softmax
+            FROM scored
+            """
+        )
+    finally:
+        con.close()
+
+
+def run_builds(root: Path, warehouse: Path) -> None:
+    env = {
+        **os.environ,
+        "EXTERNAL_DATA_ROOT": str(root),
+        "F1_WAREHOUSE": str(warehouse),
+        "F1_BUILD_PROFILE": "0",
+        "F1_RELEASE": "synthetic",
+    }
+    for script in BUILD_STEPS:
+        started = time.perf_counter()
+        proc = subprocess.run(
+            [sys.executable, str(SCRIPT_DIR / script)], cwd=REPO_ROOT, env=env, capture_output=True, text=True
+        )
+        if proc.returncode != 0:
+            print(proc.stdout[-4000:])
+            print(proc.stderr[-4000:])
+            raise RuntimeError(f"{script} failed with exit code {proc.returncode}")
+        print(f"[info] {script}: {time.perf_counter() - started:.1f}s")
+
+
+def ensure_synthetic(root: Path, cfg: SyntheticConfig, rebuild: bool = False) -> Path:
+    """
+    Generate and build the synthetic warehouse under root unless one with the same
+    config already exists there. Returns the warehouse path.
+    """
+    warehouse = root / WAREHOUSE_FILE
+    config_path = root / CONFIG_FILE
+    wanted = {**asdict(cfg), "generator_version": GENERATOR_VERSION}
+    if not rebuild and warehouse.exists():
+        try:
+            if json.loads(config_path.read_text()) == wanted:
+                print(f"[info] reusing synthetic warehouse {warehouse}")
+                return warehouse
+        except (OSError, ValueError):
+            pass
+
+    for path in (root / "bronze", warehouse):
+        if path.is_dir():
+            shutil.rmtree(path)
+        elif path.exists():
+            path.unlink()
+    config_path.unlink(missing_ok=True)
+    root.mkdir(parents=True, exist_ok=True)
+
+    started = time.perf_counter()
+    files = generate_bronze(root, cfg)
+    print(f"[info] wrote {files} bronze files in {time.perf_counter() - started:.1f}s ({wanted})")
+    run_builds(root, warehouse)
+    add_serving_tables(warehouse, cfg.seed)
+    config_path.write_text(json.dumps(wanted, indent=1, sort_keys=True))
+    return warehouse
+
+
+def add_config_args(parser: argparse.ArgumentParser) -> None:
+    defaults = SyntheticConfig()
+    parser.add_argument("--seasons", type=int, default=defaults.seasons, help="Number of seasons")
+    parser.add_argument("--rounds", type=int, default=defaults.rounds, help="Rounds per season")
+    parser.add_argument("--drivers", type=int, default=defaults.drivers, help="Drivers per session")
+    parser.add_argument("--laps", type=int, default=defaults.laps, help="Race laps per driver (other sessions: a third)")
+    parser.add_argument("--sessions", type=str, default=defaults.sessions, help="Session codes per round")
+    parser.add_argument("--first-season", type=int, default=defaults.first_season, help="First season year")
+    parser.add_argument("--seed", type=int, default=defaults.seed, help="Random seed")
+
+
+def config_from_args(args: argparse.Namespace) -> SyntheticConfig:
+    return SyntheticConfig(
+        seasons=args.seasons,
+        rounds=args.rounds,
+        drivers=args.drivers,
+        laps=args.laps,
+        sessions=args.sessions,
+        first_season=args.first_season,
+        seed=args.seed,
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Generate a synthetic bronze tree and warehouse")
+    parser.add_argument("--root", type=Path, required=True, help="Output directory (bronze/ and the warehouse)")
+    parser.add_argument("--rebuild", action="store_true", help="Regenerate even if the config is unchanged")
+    add_config_args(parser)
+    args = parser.parse_args()
+    warehouse = ensure_synthetic(args.root, config_from_args(args), rebuild=args.rebuild)
+    print(f"[success] synthetic warehouse at {warehouse}")
+
+
+if __name__ == "__main__":
+    main()
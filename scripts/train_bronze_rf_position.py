@@ -10,10 +10,10 @@ from train_fastf1_rf_position import (  # type: ignore[import]
     engineer_features,
     train_random_forest,
 )
+from scripts.data_paths import bronze_dir
 
 
-BASE_DIR = Path(__file__).resolve().parent.parent
-BRONZE_DIR = BASE_DIR / "bronze"
+BRONZE_DIR = bronze_dir()
 
 logger = logging.getLogger(__name__)
 
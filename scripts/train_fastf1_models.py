@@ -22,6 +22,7 @@ Saves best models to ml_artifacts/
 
 import json
 import logging
+import sys
 from pathlib import Path
 from typing import Dict, List, Tuple
 
@@ -36,13 +37,20 @@ from sklearn.model_selection import train_test_split
 from sklearn.pipeline import Pipeline
 from sklearn.preprocessing import StandardScaler
 
+REPO_ROOT = Path(__file__).resolve().parent.parent
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from scripts import grouped_ops
+from scripts.data_paths import ml_artifacts_dir, warehouse_path
+
 try:
     from xgboost import XGBClassifier
 except ImportError:
     XGBClassifier = None
 
-WAREHOUSE_PATH = "/Volumes/SAMSUNG/apps/f1-dash/warehouse/f1_openf1.duckdb"
-ARTIFACT_DIR = Path("/Volumes/SAMSUNG/apps/f1-dash/ml_artifacts")
+WAREHOUSE_PATH = str(warehouse_path())
+ARTIFACT_DIR = ml_artifacts_dir()
 ARTIFACT_DIR.mkdir(parents=True, exist_ok=True)
 
 logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
@@ -151,23 +159,8 @@ def evaluate_model(model, X_train, y_train, X_val, y_val, val_df, target_col: st
 
 def hit_at_k(df: pd.DataFrame, proba: np.ndarray, target_col: str, k: int = 1) -> float:
     """Calculate hit rate at K per race."""
-    df_tmp = df.copy()
-    df_tmp["proba"] = proba
-    
-    hits = 0
-    races = 0
-    
-    for _, race_group in df_tmp.groupby(["season", "round", "grand_prix_slug"]):
-        races += 1
-        race_group = race_group.sort_values("proba", ascending=False)
-        
-        true_codes = set(race_group[race_group[target_col] == 1]["driver_code"].unique())
-        topk_codes = set(race_group.head(k)["driver_code"].unique())
-        
-        if true_codes & topk_codes:
-            hits += 1
-    
-    return hits / races if races > 0 else 0.0
+    races = grouped_ops.Segments.from_frame(df, ["season", "round", "grand_prix_slug"])
+    return grouped_ops.hit_at_k(np.asarray(proba), df[target_col].to_numpy(), races, k)
 
 
 def train_prediction_task(df: pd.DataFrame, target_col: str, model_prefix: str):
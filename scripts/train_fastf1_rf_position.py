@@ -1,5 +1,6 @@
 import json
 import logging
+import sys
 from pathlib import Path
 from typing import Iterable, List
 
@@ -17,8 +18,14 @@ except ImportError:  # pragma: no cover - optional dependency
 
 
 BASE_DIR = Path(__file__).resolve().parent.parent
+if str(BASE_DIR) not in sys.path:
+    sys.path.insert(0, str(BASE_DIR))
+
+from scripts.data_paths import ml_artifacts_dir
+from scripts.export_compact_forest import export_model
+
 FASTF1_CACHE = BASE_DIR / "fastf1_cache"
-ML_ARTIFACTS_DIR = BASE_DIR / "ml_artifacts"
+ML_ARTIFACTS_DIR = ml_artifacts_dir()
 
 logger = logging.getLogger(__name__)
 
@@ -227,6 +234,10 @@ def train_random_forest(df: pd.DataFrame) -> dict:
     with meta_path.open("w") as f:
         json.dump(metadata, f, indent=2)
 
+    # Compact forest served by the API instead of the pickled sklearn model
+    forest = export_model(model_path.stem, ML_ARTIFACTS_DIR, sample=X_test, model=rf)
+    logger.info("Compact forest: %.2f MB, parity max_abs_diff=%.3g", forest["forest_bytes"] / 1e6, forest["max_abs_diff"])
+
     return metadata
 
 
@@ -1,4 +1,5 @@
 import json
+import sys
 from pathlib import Path
 from typing import Dict, List, Tuple
 
@@ -14,8 +15,15 @@ from sklearn.model_selection import TimeSeriesSplit
 from sklearn.pipeline import make_pipeline
 from sklearn.preprocessing import StandardScaler
 
-WAREHOUSE = "/Volumes/SAMSUNG/apps/f1-dash/warehouse/f1_openf1.duckdb"
-ARTIFACT_DIR = Path("/Volumes/SAMSUNG/apps/f1-dash/ml_artifacts")
+REPO_ROOT = Path(__file__).resolve().parent.parent
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from scripts import grouped_ops
+from scripts.data_paths import ml_artifacts_dir, warehouse_path
+
+WAREHOUSE = str(warehouse_path())
+ARTIFACT_DIR = ml_artifacts_dir()
 ARTIFACT_DIR.mkdir(parents=True, exist_ok=True)
 
 CV_SPLITS = 5
@@ -86,18 +94,8 @@ def prune_correlated_features(X: pd.DataFrame, threshold: float = CORR_THRESHOLD
 
 
 def hit_at_k(df: pd.DataFrame, proba: np.ndarray, target_col: str, k: int = 1) -> float:
-    df = df.copy()
-    df["proba"] = proba
-    hits = 0
-    races = 0
-    for _, grp in df.groupby(["season", "round", "grand_prix_slug"]):
-        races += 1
-        ordered = grp.sort_values("proba", ascending=False)
-        true_codes = set(ordered[ordered[target_col] == 1]["driver_code"])
-        topk_codes = set(ordered.head(k)["driver_code"])
-        if true_codes & topk_codes:
-            hits += 1
-    return hits / races if races else 0.0
+    races = grouped_ops.Segments.from_frame(df, ["season", "round", "grand_prix_slug"])
+    return grouped_ops.hit_at_k(np.asarray(proba), df[target_col].to_numpy(), races, k)
 
 
 def compute_metrics(y_true: pd.Series, proba: np.ndarray, df: pd.DataFrame, target_col: str) -> Dict[str, float]:
@@ -5,6 +5,7 @@ Uses gold_fastf1.win_prediction_dataset table.
 """
 
 import json
+import sys
 from pathlib import Path
 import duckdb
 import numpy as np
@@ -15,6 +16,12 @@ import joblib
 
 # Paths
 REPO_ROOT = Path(__file__).resolve().parent.parent
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from scripts import grouped_ops
+from scripts.export_compact_forest import export_model
+
 DB_PATH = REPO_ROOT / "warehouse" / "f1_openf1.duckdb"
 ML_ARTIFACTS_DIR = REPO_ROOT / "ml_artifacts"
 ML_ARTIFACTS_DIR.mkdir(exist_ok=True)
@@ -139,42 +146,19 @@ def prepare_features(df, feature_cols):
 
 def evaluate_ranking(y_true, y_pred_proba, races_df):
     """Evaluate how well the model ranks winners."""
-    results = []
-    
-    # Reset index to ensure alignment
-    races_df = races_df.reset_index(drop=True)
-    
-    for (season, round_num), group in races_df.groupby(['season', 'round']):
-        if group[TARGET_COL].sum() == 0:
-            continue  # No winner in this race (e.g., future race)
-        
-        # Get predictions for this race using reset indices
-        indices = group.index.tolist()
-        true_winner = group[TARGET_COL].values
-        pred_proba = y_pred_proba[indices]
-        
-        # Rank by prediction
-        sorted_indices = np.argsort(-pred_proba)
-        winner_rank = np.where(true_winner[sorted_indices] == 1)[0]
-        
-        if len(winner_rank) > 0:
-            results.append({
-                'season': season,
-                'round': round_num,
-                'winner_rank': winner_rank[0] + 1,  # 1-indexed
-                'hit1': winner_rank[0] < 1,
-                'hit3': winner_rank[0] < 3,
-            })
-    
-    if not results:
+    races = grouped_ops.Segments.from_frame(races_df, ['season', 'round'])
+    # Races without a winner (e.g. future races) are skipped
+    winners = grouped_ops.winner_ranks(np.asarray(y_pred_proba), races_df[TARGET_COL].to_numpy(), races)
+    winner_rank = winners["rank"]
+
+    if not len(winner_rank):
         return {}
-    
-    results_df = pd.DataFrame(results)
+
     return {
-        'races_evaluated': len(results_df),
-        'hit1': results_df['hit1'].mean(),
-        'hit3': results_df['hit3'].mean(),
-        'avg_winner_rank': results_df['winner_rank'].mean(),
+        'races_evaluated': len(winner_rank),
+        'hit1': float((winner_rank <= 1).mean()),
+        'hit3': float((winner_rank <= 3).mean()),
+        'avg_winner_rank': float(winner_rank.mean()),
     }
 
 def train_model(X_train, y_train, X_val, y_val):
@@ -309,6 +293,10 @@ def main():
     print(f"Saving metadata to {OUTPUT_META_PATH}...")
     with open(OUTPUT_META_PATH, 'w') as f:
         json.dump(metadata, f, indent=2)
+
+    # Compact forest served by the API instead of the pickled sklearn model
+    forest = export_model(OUTPUT_MODEL_PATH.stem, ML_ARTIFACTS_DIR, sample=X_val, model=model)
+    print(f"Compact forest: {forest['forest_bytes'] / 1e6:.2f} MB, parity max_abs_diff={forest['max_abs_diff']:.3g}")
     
     print("\n" + "=" * 60)
     print("✓ Training complete!")
@@ -0,0 +1,44 @@
+"""
+Warehouse generation stamp.
+
+Build scripts that rewrite tables served by the API call bump_generation() when they
+finish. The stamp is a small JSON file next to the DuckDB file
+(f1_openf1.duckdb -> f1_openf1.generation.json) so the API can check it with a stat()
+instead of opening the database, and fold it into response-cache keys and ETags.
+"""
+
+import json
+import os
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict
+
+GENERATION_SUFFIX = ".generation.json"
+
+
+def generation_path(warehouse_path: Path | str) -> Path:
+    return Path(warehouse_path).with_suffix(GENERATION_SUFFIX)
+
+
+def read_generation(warehouse_path: Path | str) -> Dict[str, Any]:
+    path = generation_path(warehouse_path)
+    try:
+        return json.loads(path.read_text())
+    except (FileNotFoundError, ValueError):
+        return {"generation": 0}
+
+
+def bump_generation(warehouse_path: Path | str, writer: str) -> int:
+    """Increment the stamp atomically (write temp file + rename) and return the new value."""
+    path = generation_path(warehouse_path)
+    current = int(read_generation(warehouse_path).get("generation") or 0)
+    stamp = {
+        "generation": current + 1,
+        "writer": writer,
+        "updated_at": datetime.utcnow().isoformat(),
+    }
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    tmp.write_text(json.dumps(stamp))
+    os.replace(tmp, path)
+    return stamp["generation"]